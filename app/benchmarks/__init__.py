@@ -4,5 +4,11 @@ Performance testing and resilience validation
 """
 
 from .provider_performance import ProviderBenchmark, BenchmarkResult, BenchmarkConfig, quick_benchmark
+from .mock_ollama import MockOllamaServer, MockOllamaConfig, LatencyDistribution
+from .load_generator import OpenLoopLoadGenerator, LoadConfig, LoadResult, run_mock_benchmark
+from .history import BenchmarkHistory, BenchmarkComparison, compare_revisions, compare_samples
 
-__all__ = ['ProviderBenchmark', 'BenchmarkResult', 'BenchmarkConfig', 'quick_benchmark']
\ No newline at end of file
+__all__ = ['ProviderBenchmark', 'BenchmarkResult', 'BenchmarkConfig', 'quick_benchmark',
+           'MockOllamaServer', 'MockOllamaConfig', 'LatencyDistribution',
+           'OpenLoopLoadGenerator', 'LoadConfig', 'LoadResult', 'run_mock_benchmark',
+           'BenchmarkHistory', 'BenchmarkComparison', 'compare_revisions', 'compare_samples']
\ No newline at end of file
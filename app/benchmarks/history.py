@@ -0,0 +1,480 @@
+"""
+Benchmark History and Regression Detection
+Stores benchmark samples per git revision and machine, and compares
+revisions with bootstrap confidence intervals and Mann-Whitney U tests
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = Path("benchmark_results") / "history.sqlite3"
+LATENCY_METRICS = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+INSUFFICIENT = "insufficient data"
+
+
+def machine_info() -> Dict[str, Any]:
+    """Hardware and interpreter details that make timings comparable"""
+    return {
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': f"{platform.python_implementation()} {sys.version_info.major}.{sys.version_info.minor}"
+    }
+
+
+def machine_fingerprint(info: Optional[Dict[str, Any]] = None) -> str:
+    """Short stable hash of machine_info()"""
+    payload = json.dumps(info or machine_info(), sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def git_revision(cwd: Optional[Path] = None) -> str:
+    """Current commit (BENCHMARK_REVISION overrides), suffixed -dirty for local changes"""
+    override = os.environ.get('BENCHMARK_REVISION')
+    if override:
+        return override
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short=12', 'HEAD'], cwd=cwd,
+            capture_output=True, text=True, timeout=10, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+@dataclass
+class BenchmarkRun:
+    """One stored benchmark run"""
+    name: str
+    revision: str
+    machine: str
+    created_at: float
+    samples: List[float]
+    throughput: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    run_id: Optional[int] = None
+
+
+class BenchmarkHistory:
+    """
+    SQLite store of benchmark runs
+
+    Each run keeps its raw latency samples (seconds) and throughput, keyed
+    by benchmark name, git revision and machine fingerprint, so revisions
+    can be compared on the same hardware long after the run.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            revision TEXT NOT NULL,
+            machine TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            samples TEXT NOT NULL,
+            throughput REAL,
+            metadata TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_key ON runs (name, machine, revision);
+        CREATE TABLE IF NOT EXISTS machines (
+            fingerprint TEXT PRIMARY KEY,
+            info TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "BenchmarkHistory":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def record(
+        self,
+        name: str,
+        samples: Sequence[float],
+        throughput: Optional[float] = None,
+        revision: Optional[str] = None,
+        machine: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> BenchmarkRun:
+        """Store a run; revision and machine default to the current checkout and host"""
+        if machine is None:
+            info = machine_info()
+            machine = machine_fingerprint(info)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO machines (fingerprint, info) VALUES (?, ?)",
+                (machine, json.dumps(info))
+            )
+        run = BenchmarkRun(
+            name=name,
+            revision=revision or git_revision(),
+            machine=machine,
+            created_at=time.time(),
+            samples=[float(s) for s in samples],
+            throughput=throughput,
+            metadata=metadata or {}
+        )
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (name, revision, machine, created_at, samples, throughput, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run.name, run.revision, run.machine, run.created_at,
+                 json.dumps(run.samples), run.throughput, json.dumps(run.metadata, default=str))
+            )
+        run.run_id = cursor.lastrowid
+        return run
+
+    def runs(
+        self,
+        name: Optional[str] = None,
+        revision: Optional[str] = None,
+        machine: Optional[str] = None
+    ) -> List[BenchmarkRun]:
+        clauses, params = [], []
+        for column, value in (('name', name), ('revision', revision), ('machine', machine)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            "SELECT id, name, revision, machine, created_at, samples, throughput, metadata "
+            f"FROM runs{where} ORDER BY id", params
+        ).fetchall()
+        return [
+            BenchmarkRun(name=r[1], revision=r[2], machine=r[3], created_at=r[4],
+                         samples=json.loads(r[5]), throughput=r[6], metadata=json.loads(r[7]), run_id=r[0])
+            for r in rows
+        ]
+
+    def revisions(self, name: Optional[str] = None) -> List[str]:
+        """Revisions in the order they were first recorded"""
+        query = "SELECT revision, MIN(id) FROM runs"
+        params: List[Any] = []
+        if name is not None:
+            query += " WHERE name = ?"
+            params.append(name)
+        rows = self._conn.execute(query + " GROUP BY revision ORDER BY MIN(id)", params).fetchall()
+        return [r[0] for r in rows]
+
+    def benchmark_names(self) -> List[str]:
+        return [r[0] for r in self._conn.execute("SELECT DISTINCT name FROM runs ORDER BY name")]
+
+    def machines(self) -> Dict[str, Dict[str, Any]]:
+        return {r[0]: json.loads(r[1]) for r in self._conn.execute("SELECT fingerprint, info FROM machines")}
+
+
+# Statistics
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile, q in [0, 1]"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = q * (len(ordered) - 1)
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def mann_whitney_u(baseline: Sequence[float], candidate: Sequence[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie-corrected)"""
+    n1, n2 = len(baseline), len(candidate)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in candidate])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_ratio_ci(
+    baseline: Sequence[float],
+    candidate: Sequence[float],
+    statistic: str,
+    q: float = 0.5,
+    resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """
+    Bootstrap CI of ``stat(candidate) / stat(baseline) - 1``
+
+    ``statistic`` is ``'percentile'`` (at ``q``) or ``'mean'``.
+    """
+    alpha = (1 - confidence) / 2
+    if NUMPY_AVAILABLE:
+        rng = np.random.default_rng(seed)
+        base = np.asarray(baseline, dtype=float)
+        cand = np.asarray(candidate, dtype=float)
+        base_resamples = base[rng.integers(0, len(base), (resamples, len(base)))]
+        cand_resamples = cand[rng.integers(0, len(cand), (resamples, len(cand)))]
+        if statistic == 'mean':
+            base_stats, cand_stats = base_resamples.mean(axis=1), cand_resamples.mean(axis=1)
+        else:
+            base_stats = np.quantile(base_resamples, q, axis=1)
+            cand_stats = np.quantile(cand_resamples, q, axis=1)
+        ratios = cand_stats / np.where(base_stats == 0, np.nan, base_stats) - 1
+        ratios = ratios[~np.isnan(ratios)]
+        if ratios.size == 0:
+            return 0.0, 0.0
+        return float(np.quantile(ratios, alpha)), float(np.quantile(ratios, 1 - alpha))
+
+    rng = random.Random(seed)
+
+    def stat(values: List[float]) -> float:
+        return sum(values) / len(values) if statistic == 'mean' else percentile(values, q)
+
+    ratios = []
+    for _ in range(resamples):
+        base_stat = stat(rng.choices(baseline, k=len(baseline)))
+        if base_stat:
+            ratios.append(stat(rng.choices(candidate, k=len(candidate))) / base_stat - 1)
+    if not ratios:
+        return 0.0, 0.0
+    return percentile(ratios, alpha), percentile(ratios, 1 - alpha)
+
+
+@dataclass
+class MetricComparison:
+    """Change in one metric between a baseline and a candidate revision"""
+    metric: str
+    baseline: float
+    candidate: float
+    change: float                    # relative, candidate / baseline - 1
+    ci_low: float
+    ci_high: float
+    p_value: Optional[float]
+    status: str
+
+
+@dataclass
+class BenchmarkComparison:
+    """All metric comparisons for one benchmark"""
+    name: str
+    machine: str
+    baseline_revision: str
+    candidate_revision: str
+    baseline_samples: int
+    candidate_samples: int
+    metrics: List[MetricComparison] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[MetricComparison]:
+        return [m for m in self.metrics if m.status == REGRESSION]
+
+
+def _classify(change: float, ci_low: float, ci_high: float, threshold: float, higher_is_better: bool) -> str:
+    """Significant (CI excludes zero) and larger than the practical threshold"""
+    worse = -change if higher_is_better else change
+    worse_low, worse_high = (-ci_high, -ci_low) if higher_is_better else (ci_low, ci_high)
+    if worse_low > 0 and worse > threshold:
+        return REGRESSION
+    if worse_high < 0 and -worse > threshold:
+        return IMPROVEMENT
+    return UNCHANGED
+
+
+def compare_samples(
+    baseline: Sequence[float],
+    candidate: Sequence[float],
+    baseline_throughput: Sequence[float] = (),
+    candidate_throughput: Sequence[float] = (),
+    threshold: float = 0.05,
+    confidence: float = 0.95,
+    resamples: int = 1000,
+    min_samples: int = 10,
+    seed: int = 0
+) -> List[MetricComparison]:
+    """
+    Compare latency percentiles and throughput of two sample sets
+
+    A metric is a regression when its bootstrap confidence interval of the
+    relative change excludes zero and the point change exceeds
+    ``threshold`` (e.g. 0.05 = 5% slower). Latency metrics also carry
+    the Mann-Whitney p-value for the whole distribution. Throughput is
+    compared over per-run values and needs at least two runs per side.
+    """
+    results: List[MetricComparison] = []
+    enough = len(baseline) >= min_samples and len(candidate) >= min_samples
+    p_value = mann_whitney_u(baseline, candidate) if enough else None
+
+    for metric, q in LATENCY_METRICS:
+        base_value = percentile(baseline, q)
+        cand_value = percentile(candidate, q)
+        change = cand_value / base_value - 1 if base_value else 0.0
+        if not enough:
+            results.append(MetricComparison(metric, base_value, cand_value, change, 0.0, 0.0, None, INSUFFICIENT))
+            continue
+        ci_low, ci_high = bootstrap_ratio_ci(baseline, candidate, 'percentile', q, resamples, confidence, seed)
+        results.append(MetricComparison(
+            metric, base_value, cand_value, change, ci_low, ci_high, p_value,
+            _classify(change, ci_low, ci_high, threshold, higher_is_better=False)
+        ))
+
+    base_tp = [t for t in baseline_throughput if t is not None]
+    cand_tp = [t for t in candidate_throughput if t is not None]
+    if base_tp and cand_tp:
+        base_value = sum(base_tp) / len(base_tp)
+        cand_value = sum(cand_tp) / len(cand_tp)
+        change = cand_value / base_value - 1 if base_value else 0.0
+        if len(base_tp) < 2 or len(cand_tp) < 2:
+            results.append(MetricComparison('throughput', base_value, cand_value, change,
+                                            0.0, 0.0, None, INSUFFICIENT))
+        else:
+            ci_low, ci_high = bootstrap_ratio_ci(base_tp, cand_tp, 'mean', 0.5, resamples, confidence, seed)
+            results.append(MetricComparison(
+                'throughput', base_value, cand_value, change, ci_low, ci_high,
+                mann_whitney_u(base_tp, cand_tp),
+                _classify(change, ci_low, ci_high, threshold, higher_is_better=True)
+            ))
+    return results
+
+
+def compare_revisions(
+    history: BenchmarkHistory,
+    baseline_revision: str,
+    candidate_revision: str,
+    name: Optional[str] = None,
+    machine: Optional[str] = None,
+    **options
+) -> List[BenchmarkComparison]:
+    """Compare every benchmark (or ``name``) run on both revisions on the same machine"""
+    comparisons = []
+    names = [name] if name else history.benchmark_names()
+    for bench in names:
+        base_runs = history.runs(bench, baseline_revision, machine)
+        cand_runs = history.runs(bench, candidate_revision, machine)
+        shared = sorted({r.machine for r in base_runs} & {r.machine for r in cand_runs})
+        for fingerprint in shared:
+            base = [r for r in base_runs if r.machine == fingerprint]
+            cand = [r for r in cand_runs if r.machine == fingerprint]
+            base_samples = [s for r in base for s in r.samples]
+            cand_samples = [s for r in cand for s in r.samples]
+            comparisons.append(BenchmarkComparison(
+                name=bench,
+                machine=fingerprint,
+                baseline_revision=baseline_revision,
+                candidate_revision=candidate_revision,
+                baseline_samples=len(base_samples),
+                candidate_samples=len(cand_samples),
+                metrics=compare_samples(
+                    base_samples, cand_samples,
+                    [r.throughput for r in base], [r.throughput for r in cand],
+                    **options
+                )
+            ))
+    return comparisons
+
+
+def format_comparisons(comparisons: List[BenchmarkComparison]) -> str:
+    if not comparisons:
+        return "No benchmarks were run on both revisions on the same machine."
+    lines = []
+    for comparison in comparisons:
+        lines.append(f"{comparison.name} [{comparison.machine}] "
+                     f"{comparison.baseline_revision} ({comparison.baseline_samples} samples) -> "
+                     f"{comparison.candidate_revision} ({comparison.candidate_samples} samples)")
+        for m in comparison.metrics:
+            unit = "" if m.metric == 'throughput' else "ms"
+            scale = 1 if m.metric == 'throughput' else 1000
+            p = f" p={m.p_value:.3g}" if m.p_value is not None else ""
+            lines.append(
+                f"  {m.metric:<10} {m.baseline * scale:10.3f}{unit} -> {m.candidate * scale:10.3f}{unit} "
+                f"{m.change:+7.1%} [{m.ci_low:+.1%}, {m.ci_high:+.1%}]{p}  {m.status.upper()}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: python -m app.benchmarks.history"""
+    parser = argparse.ArgumentParser(description="Benchmark history and regression detection")
+    parser.add_argument('--db', type=Path, default=DEFAULT_HISTORY_PATH, help="history database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compare = commands.add_parser('compare', help="compare two revisions")
+    compare.add_argument('baseline')
+    compare.add_argument('candidate')
+    compare.add_argument('--name', help="only this benchmark")
+    compare.add_argument('--machine', help="only this machine fingerprint")
+    compare.add_argument('--threshold', type=float, default=0.05, help="relative change to flag (0.05 = 5%%)")
+    compare.add_argument('--confidence', type=float, default=0.95)
+    compare.add_argument('--resamples', type=int, default=1000)
+
+    listing = commands.add_parser('list', help="list recorded benchmarks and revisions")
+    listing.add_argument('--name')
+
+    args = parser.parse_args(argv)
+    with BenchmarkHistory(args.db) as history:
+        if args.command == 'list':
+            for bench in ([args.name] if args.name else history.benchmark_names()):
+                print(f"{bench}: {', '.join(history.revisions(bench))}")
+            return 0
+
+        comparisons = compare_revisions(
+            history, args.baseline, args.candidate, name=args.name, machine=args.machine,
+            threshold=args.threshold, confidence=args.confidence, resamples=args.resamples
+        )
+    print(format_comparisons(comparisons))
+    return 1 if any(c.regressions for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Open-Loop Load Generator for Provider Benchmarks
+Drives a provider at a fixed arrival rate, independent of response times
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .history import BenchmarkHistory
+from .mock_ollama import LatencyDistribution, MockOllamaConfig, MockOllamaServer
+from .provider_performance import BenchmarkResult, ProviderBenchmark
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadConfig:
+    """Configuration for an open-loop load run"""
+    rate_rps: float = 10.0
+    duration: float = 10.0
+    arrival: str = "poisson"  # poisson, uniform
+    stream: bool = False
+    model: str = "llama2:7b"
+    max_tokens: int = 32
+    temperature: float = 0.7
+    max_in_flight: int = 1000
+    timeout: float = 30.0
+    test_data_size: str = "small"
+    seed: int = 0
+
+
+@dataclass
+class LoadResult:
+    """Outcome of an open-loop load run; times are in seconds"""
+    config: LoadConfig
+    scheduled: int
+    completed: int
+    failed: int
+    dropped: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    service_times: List[float] = field(default_factory=list)
+    first_token_times: List[float] = field(default_factory=list)
+    schedule_lag: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+    server_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def offered_rps(self) -> float:
+        return self.scheduled / self.config.duration if self.config.duration > 0 else 0.0
+
+    @property
+    def achieved_rps(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.failed + self.dropped) / self.scheduled if self.scheduled else 0.0
+
+    @property
+    def client_overhead(self) -> Optional[float]:
+        """Mean time spent outside the server: pool, limiter, breaker, cache and parsing"""
+        server_mean = self.server_stats.get('service_time_mean')
+        if server_mean is None or not self.service_times:
+            return None
+        return sum(self.service_times) / len(self.service_times) - server_mean
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            'offered_rps': self.offered_rps,
+            'achieved_rps': self.achieved_rps,
+            'scheduled': self.scheduled,
+            'completed': self.completed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'error_rate': self.error_rate,
+            'errors': dict(self.errors),
+            'latency': percentiles(self.latencies),
+            'service_time': percentiles(self.service_times),
+            'schedule_lag_p99': percentiles(self.schedule_lag).get('p99', 0.0)
+        }
+        if self.first_token_times:
+            summary['first_token'] = percentiles(self.first_token_times)
+        if self.client_overhead is not None:
+            summary['client_overhead'] = self.client_overhead
+        return summary
+
+    def to_benchmark_result(self, provider_name: str) -> BenchmarkResult:
+        latency = percentiles(self.latencies)
+        return BenchmarkResult(
+            test_name=f"open_loop_{self.config.rate_rps:g}rps_{self.config.duration:g}s"
+                      f"{'_stream' if self.config.stream else ''}",
+            provider=provider_name,
+            total_requests=self.scheduled,
+            successful_requests=self.completed,
+            failed_requests=self.failed + self.dropped,
+            avg_response_time=latency.get('mean', 0.0),
+            min_response_time=latency.get('min', 0.0),
+            max_response_time=latency.get('max', 0.0),
+            p95_response_time=latency.get('p95', 0.0),
+            throughput_rps=self.achieved_rps,
+            error_rate=self.error_rate,
+            rate_limit_hits=sum(n for kind, n in self.errors.items() if 'rate limit' in kind.lower()),
+            circuit_breaker_opens=sum(n for kind, n in self.errors.items() if 'circuit' in kind.lower())
+        )
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank percentiles plus min, mean and max"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+
+    def rank(q: float) -> float:
+        return ordered[min(last, int(q * len(ordered)))]
+
+    return {
+        'min': ordered[0],
+        'mean': sum(ordered) / len(ordered),
+        'p50': rank(0.50),
+        'p90': rank(0.90),
+        'p95': rank(0.95),
+        'p99': rank(0.99),
+        'max': ordered[-1]
+    }
+
+
+def _error_kind(error: Exception) -> str:
+    """Short label grouping errors by their message prefix"""
+    return str(error).split(':')[0].strip()[:80] or type(error).__name__
+
+
+def arrival_offsets(config: LoadConfig) -> List[float]:
+    """Send times, in seconds from the start of the run"""
+    if config.rate_rps <= 0 or config.duration <= 0:
+        return []
+    if config.arrival == "uniform":
+        count = int(config.rate_rps * config.duration)
+        return [i / config.rate_rps for i in range(count)]
+
+    rng = random.Random(config.seed)
+    offsets = []
+    t = rng.expovariate(config.rate_rps)
+    while t < config.duration:
+        offsets.append(t)
+        t += rng.expovariate(config.rate_rps)
+    return offsets
+
+
+class OpenLoopLoadGenerator:
+    """
+    Sends requests on a precomputed arrival schedule (Poisson or uniform)
+
+    Requests are launched at their scheduled time whether or not earlier
+    ones have finished, so a slow client stack shows up as queueing
+    latency instead of silently lowering the offered rate. Latency is
+    measured from the scheduled send time; ``service_times`` are measured
+    from when the request actually started. With ``server`` set, the
+    server-side service time is subtracted to estimate client overhead.
+    """
+
+    def __init__(self, provider, config: Optional[LoadConfig] = None,
+                 server: Optional[MockOllamaServer] = None):
+        self.provider = provider
+        self.config = config or LoadConfig()
+        self.server = server
+        self._messages = ProviderBenchmark()._generate_test_messages(self.config.test_data_size)
+
+    def _request(self, index: int):
+        from ..llm_providers.base_provider import CompletionRequest
+        return CompletionRequest(
+            messages=self._messages[index % len(self._messages)],
+            model=self.config.model,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            stream=self.config.stream
+        )
+
+    async def run(self) -> LoadResult:
+        config = self.config
+        offsets = arrival_offsets(config)
+        result = LoadResult(config=config, scheduled=len(offsets), completed=0,
+                            failed=0, dropped=0, elapsed=0.0)
+        errors: Counter = Counter()
+        if self.server is not None:
+            self.server.reset_stats()
+
+        loop = asyncio.get_running_loop()
+        in_flight = 0
+        tasks = []
+
+        async def one(index: int, scheduled_at: float):
+            nonlocal in_flight
+            started = loop.time()
+            result.schedule_lag.append(started - scheduled_at)
+            try:
+                await asyncio.wait_for(self._send(index, started, result), config.timeout)
+                finished = loop.time()
+                result.latencies.append(finished - scheduled_at)
+                result.service_times.append(finished - started)
+                result.completed += 1
+            except Exception as e:
+                result.failed += 1
+                errors[_error_kind(e)] += 1
+            finally:
+                in_flight -= 1
+
+        run_start = loop.time()
+        for index, offset in enumerate(offsets):
+            scheduled_at = run_start + offset
+            delay = scheduled_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= config.max_in_flight:
+                result.dropped += 1
+                continue
+            in_flight += 1
+            tasks.append(asyncio.create_task(one(index, scheduled_at)))
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        result.elapsed = loop.time() - run_start
+        result.errors = dict(errors)
+        if self.server is not None:
+            result.server_stats = self.server.get_stats()
+        return result
+
+    async def _send(self, index: int, started: float, result: LoadResult):
+        request = self._request(index)
+        if not self.config.stream:
+            await self.provider.complete(request)
+            return
+        first = None
+        async for _ in self.provider.stream_complete(request):
+            if first is None:
+                first = asyncio.get_running_loop().time() - started
+        if first is not None:
+            result.first_token_times.append(first)
+
+
+async def run_mock_benchmark(
+    load_config: Optional[LoadConfig] = None,
+    server_config: Optional[MockOllamaConfig] = None,
+    provider_config: Optional[Dict[str, Any]] = None
+) -> LoadResult:
+    """Run the Ollama provider stack against a private mock server"""
+    from ..llm_providers.enhanced_ollama_provider import EnhancedOllamaProvider
+    from ..resilience import initialize_global_pool, shutdown_global_pool
+
+    async with MockOllamaServer(server_config) as server:
+        await initialize_global_pool()
+        try:
+            provider = EnhancedOllamaProvider(dict(provider_config or {}, base_url=server.url))
+            await provider.initialize()
+            return await OpenLoopLoadGenerator(provider, load_config, server).run()
+        finally:
+            await shutdown_global_pool()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point: python -m app.benchmarks.load_generator"""
+    parser = argparse.ArgumentParser(description="Open-loop load test against a mock Ollama server")
+    parser.add_argument('--rate', type=float, default=20.0, help="arrivals per second")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds of arrivals")
+    parser.add_argument('--arrival', choices=['poisson', 'uniform'], default='poisson')
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--tokens-per-second', type=float, default=500.0)
+    parser.add_argument('--latency', type=float, default=0.02, help="median first-token latency (s)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="lognormal sigma")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--reset-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', type=Path, help="record latencies in this benchmark history database")
+    args = parser.parse_args(argv)
+
+    load_config = LoadConfig(rate_rps=args.rate, duration=args.duration, arrival=args.arrival,
+                             stream=args.stream, seed=args.seed)
+    server_config = MockOllamaConfig(
+        seed=args.seed,
+        tokens_per_second=args.tokens_per_second,
+        first_token_latency=LatencyDistribution('lognormal', args.latency, args.latency_sigma),
+        error_rate=args.error_rate,
+        reset_rate=args.reset_rate
+    )
+    result = asyncio.run(run_mock_benchmark(load_config, server_config))
+
+    benchmark = ProviderBenchmark()
+    benchmark.results.append(result.to_benchmark_result('EnhancedOllamaProvider'))
+    print(benchmark.generate_report())
+    overhead = result.client_overhead
+    if overhead is not None:
+        print(f"Client overhead: {overhead * 1000:.2f} ms/request (mean)")
+    if args.history:
+        with BenchmarkHistory(args.history) as history:
+            run = history.record(benchmark.results[0].test_name, result.latencies,
+                                 throughput=result.achieved_rps, metadata=result.summary())
+        print(f"Recorded {len(run.samples)} samples for {run.revision} on {run.machine}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
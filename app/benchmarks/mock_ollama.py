@@ -0,0 +1,263 @@
+"""
+Deterministic Mock Ollama Server
+Serves the Ollama HTTP API with a configurable token rate, latency
+distribution, error injection and connection resets for benchmarking
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY = [
+    "the", "model", "returns", "a", "short", "answer", "about", "local", "agents",
+    "and", "their", "tools", "with", "tokens", "streamed", "over", "http", "quickly"
+]
+
+DEFAULT_MODELS = ["llama2:7b", "codellama:13b", "mistral:7b"]
+
+
+@dataclass
+class LatencyDistribution:
+    """Latency in seconds drawn from a named distribution"""
+    kind: str = "constant"  # constant, uniform, normal, exponential, lognormal
+    mean: float = 0.0
+    spread: float = 0.0     # half-width for uniform, stddev for normal, sigma for lognormal
+    minimum: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "normal":
+            value = rng.gauss(self.mean, self.spread)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / self.mean) if self.mean > 0 else 0.0
+        elif self.kind == "lognormal":
+            # mean is the median, spread the sigma of the underlying normal
+            value = self.mean * rng.lognormvariate(0.0, self.spread) if self.mean > 0 else 0.0
+        else:
+            value = self.mean
+        return max(self.minimum, value)
+
+
+@dataclass
+class MockOllamaConfig:
+    """Behaviour of the mock server"""
+    seed: int = 0
+    models: List[str] = field(default_factory=lambda: list(DEFAULT_MODELS))
+    tokens_per_second: float = 500.0                # 0 disables generation delay
+    response_tokens: int = 32                       # used when the request sets no num_predict
+    chunk_tokens: int = 1                           # tokens per streamed NDJSON line
+    first_token_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0                         # fraction of requests answered with error_status
+    error_status: int = 500
+    reset_rate: float = 0.0                         # fraction of requests whose connection is dropped
+    max_recorded: int = 10000                       # service times kept for statistics
+
+
+class MockOllamaServer:
+    """
+    Mock Ollama API (``/api/tags``, ``/api/chat``, ``/api/generate``)
+
+    Every request draws its behaviour from a random stream seeded by
+    ``config.seed`` and the request's sequence number, and response text is
+    derived from the prompt, so runs with the same arrival order are
+    repeatable. Generation takes ``first_token_latency`` plus one token
+    interval per token; streamed responses are NDJSON with
+    ``chunk_tokens`` tokens per line. Injected resets close the connection
+    (mid-stream for streaming requests).
+    """
+
+    def __init__(self, config: Optional[MockOllamaConfig] = None):
+        self.config = config or MockOllamaConfig()
+        self.app = web.Application()
+        self.app.router.add_get('/api/tags', self.list_models)
+        self.app.router.add_get('/api/version', self.version)
+        self.app.router.add_post('/api/chat', self.chat)
+        self.app.router.add_post('/api/generate', self.generate)
+
+        self._runner: Optional[web.AppRunner] = None
+        self._site: Optional[web.TCPSite] = None
+        self.host = '127.0.0.1'
+        self.port: Optional[int] = None
+        self._sequence = 0
+        self.service_times: Deque[float] = deque(maxlen=self.config.max_recorded)
+        self.stats = {
+            'requests': 0,
+            'completed': 0,
+            'streamed': 0,
+            'injected_errors': 0,
+            'resets': 0,
+            'tokens_generated': 0
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving; port 0 picks a free port. Returns the base URL."""
+        self.host = host
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, host, port)
+        await self._site.start()
+        self.port = self._site._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock Ollama server listening on {self.url}")
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockOllamaServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def reset_stats(self):
+        self.service_times.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    # Request handling
+
+    def _next_rng(self) -> random.Random:
+        self._sequence += 1
+        return random.Random(f"{self.config.seed}:{self._sequence}")
+
+    @staticmethod
+    def _token_interval(config: MockOllamaConfig) -> float:
+        return 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+    def _tokens(self, prompt: str, count: int) -> List[str]:
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        return [VOCABULARY[(digest[i % len(digest)] + i) % len(VOCABULARY)] + " " for i in range(count)]
+
+    async def list_models(self, request: web.Request) -> web.Response:
+        return web.json_response({'models': [
+            {'name': name, 'size': 4_000_000_000, 'digest': f"sha256:{name}",
+             'modified_at': "2024-01-01T00:00:00Z"}
+            for name in self.config.models
+        ]})
+
+    async def version(self, request: web.Request) -> web.Response:
+        return web.json_response({'version': 'mock'})
+
+    async def chat(self, request: web.Request) -> web.StreamResponse:
+        data = await request.json()
+        messages = data.get('messages') or []
+        prompt = "\n".join(str(m.get('content', '')) for m in messages)
+        return await self._respond(request, data, prompt, chat=True)
+
+    async def generate(self, request: web.Request) -> web.StreamResponse:
+        data = await request.json()
+        return await self._respond(request, data, str(data.get('prompt', '')), chat=False)
+
+    def _chunk(self, model: str, text: str, chat: bool, done: bool) -> Dict[str, Any]:
+        chunk = {'model': model, 'created_at': "2024-01-01T00:00:00Z", 'done': done}
+        if chat:
+            chunk['message'] = {'role': 'assistant', 'content': text}
+        else:
+            chunk['response'] = text
+        return chunk
+
+    def _final(self, model: str, text: str, chat: bool, prompt: str,
+               tokens: int, started: float) -> Dict[str, Any]:
+        elapsed_ns = int((time.perf_counter() - started) * 1e9)
+        final = self._chunk(model, text, chat, done=True)
+        final.update({
+            'done_reason': 'stop',
+            'total_duration': elapsed_ns,
+            'load_duration': 0,
+            'prompt_eval_count': len(prompt.split()),
+            'eval_count': tokens,
+            'eval_duration': elapsed_ns
+        })
+        return final
+
+    async def _respond(self, request: web.Request, data: Dict[str, Any],
+                       prompt: str, chat: bool) -> web.StreamResponse:
+        started = time.perf_counter()
+        config = self.config
+        rng = self._next_rng()
+        self.stats['requests'] += 1
+
+        model = data.get('model', '')
+        if model not in config.models:
+            return web.json_response({'error': f"model '{model}' not found"}, status=404)
+
+        # Draw every random decision up front so behaviour depends only on the sequence number
+        first_token = config.first_token_latency.sample(rng)
+        inject_error = rng.random() < config.error_rate
+        inject_reset = not inject_error and rng.random() < config.reset_rate
+
+        options = data.get('options') or {}
+        count = max(1, int(options.get('num_predict') or config.response_tokens))
+        tokens = self._tokens(prompt, count)
+        interval = self._token_interval(config)
+
+        await asyncio.sleep(first_token)
+        if inject_error:
+            self.stats['injected_errors'] += 1
+            return web.json_response({'error': 'injected failure'}, status=config.error_status)
+
+        if not data.get('stream', True):
+            if inject_reset:
+                return self._reset(request)
+            await asyncio.sleep(interval * count)
+            self.stats['tokens_generated'] += count
+            self._record(started)
+            text = "".join(tokens)
+            body = self._final(model, text, chat, prompt, count, started)
+            if not chat:
+                body['context'] = [1, 2, 3]
+            return web.json_response(body)
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+        step = max(1, config.chunk_tokens)
+        reset_at = count // 2 if inject_reset else None
+        for start in range(0, count, step):
+            if reset_at is not None and start >= reset_at:
+                return self._reset(request)
+            if interval:
+                await asyncio.sleep(interval * min(step, count - start))
+            text = "".join(tokens[start:start + step])
+            await response.write((json.dumps(self._chunk(model, text, chat, done=False)) + "\n").encode())
+        await response.write((json.dumps(self._final(model, "", chat, prompt, count, started)) + "\n").encode())
+        await response.write_eof()
+        self.stats['tokens_generated'] += count
+        self.stats['streamed'] += 1
+        self._record(started)
+        return response
+
+    def _reset(self, request: web.Request) -> web.Response:
+        self.stats['resets'] += 1
+        if request.transport is not None:
+            request.transport.abort()
+        return web.Response(status=500)
+
+    def _record(self, started: float):
+        self.stats['completed'] += 1
+        self.service_times.append(time.perf_counter() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        times = sorted(self.service_times)
+        stats = dict(self.stats)
+        if times:
+            stats['service_time_mean'] = sum(times) / len(times)
+            stats['service_time_p50'] = times[len(times) // 2]
+        return stats
@@ -292,6 +292,15 @@ class ProviderBenchmark:
         self.results.append(result)
         return result
     
+    async def run_open_loop(self, provider, load_config=None, server=None) -> BenchmarkResult:
+        """Drive a provider at a fixed arrival rate, optionally against a mock server"""
+        from .load_generator import OpenLoopLoadGenerator
+        
+        load = await OpenLoopLoadGenerator(provider, load_config, server).run()
+        result = load.to_benchmark_result(provider.__class__.__name__)
+        self.results.append(result)
+        return result
+    
     async def test_circuit_breaker(self, provider) -> Dict[str, Any]:
         """Test circuit breaker behavior under failure conditions"""
         # This would require a way to simulate failures
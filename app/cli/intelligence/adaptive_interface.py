@@ -19,6 +19,7 @@ import json
 # Import behavior tracking and ML models
 from .behavior_tracker import BehaviorTracker, UserBehaviorAnalyzer, UserInteraction
 from .ml_models import TensorFlowJSModelManager, AdaptiveUIModel, TrainingData
+from .task_scheduler import get_intelligence_scheduler
 
 # Import UI components
 try:
@@ -115,8 +116,11 @@ class AdaptiveInterfaceManager:
             # Initialize ML model for UI adaptation
             await self._initialize_ui_adaptation_model()
             
-            # Start background adaptation monitoring
-            asyncio.create_task(self._adaptation_monitoring_loop())
+            # Re-analyze once enough new interactions arrive, at most every 5 minutes
+            get_intelligence_scheduler().register(
+                'ui_adaptation', self.analyze_and_adapt,
+                triggers=('interactions',), min_events=10, max_delay=300, min_interval=300
+            )
             
             self.logger.info("Adaptive interface system initialized")
             
@@ -516,26 +520,6 @@ class AdaptiveInterfaceManager:
         
         return False
     
-    async def _adaptation_monitoring_loop(self):
-        """Background loop for monitoring and applying adaptations"""
-        while True:
-            try:
-                # Wait for 5 minutes between adaptation checks
-                await asyncio.sleep(300)
-                
-                # Only analyze if there's been recent user activity
-                if self.behavior_tracker.current_session:
-                    recent_interactions = len(self.behavior_tracker.current_session.interactions)
-                    if recent_interactions > 0:
-                        # Run analysis in background
-                        asyncio.create_task(self.analyze_and_adapt())
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Adaptation monitoring error: {e}")
-                await asyncio.sleep(60)  # Back off on error
-    
     def _record_adaptations(self, adaptations: List[Dict[str, Any]], context: Dict[str, Any]):
         """Record adaptation history for learning"""
         record = {
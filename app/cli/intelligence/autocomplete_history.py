@@ -18,6 +18,8 @@ from datetime import datetime, timedelta
 import re
 import logging
 
+from ..ui.memory_optimizer import intern_category, slotted
+
 # Security imports
 try:
     from cryptography.fernet import Fernet
@@ -28,6 +30,7 @@ try:
 except ImportError:
     ENCRYPTION_AVAILABLE = False
 
+@slotted
 @dataclass
 class CommandHistoryEntry:
     """Single command history entry with metadata"""
@@ -40,6 +43,12 @@ class CommandHistoryEntry:
     arguments: List[str] = field(default_factory=list)
     frequency_score: float = 1.0
     
+    def __post_init__(self):
+        # Commands, providers and directories repeat; share one copy of each
+        self.command = intern_category(self.command)
+        self.provider = intern_category(self.provider)
+        self.working_directory = intern_category(self.working_directory)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return asdict(self)
@@ -17,6 +17,10 @@ from collections import defaultdict, deque
 import hashlib
 import logging
 
+from .interaction_store import InteractionRingBuffer, append_segment, read_segments
+from .task_scheduler import get_intelligence_scheduler
+from ..ui.memory_optimizer import intern_category, slotted
+
 # Import MCP for persistent storage
 try:
     from ..mcp_integration import get_mcp_client
@@ -24,6 +28,12 @@ try:
 except ImportError:
     MCP_AVAILABLE = False
 
+# Context values that repeat across interactions and are shared between records
+CATEGORICAL_CONTEXT_KEYS = (
+    'provider', 'model', 'element_type', 'action', 'workflow_type', 'phase', 'agent_type'
+)
+
+@slotted
 @dataclass
 class UserInteraction:
     """Single user interaction event"""
@@ -37,6 +47,14 @@ class UserInteraction:
     ui_state: Dict[str, Any] = field(default_factory=dict)
     session_id: Optional[str] = None
     
+    def __post_init__(self):
+        self.interaction_type = intern_category(self.interaction_type)
+        self.command = intern_category(self.command)
+        self.session_id = intern_category(self.session_id)
+        for key in CATEGORICAL_CONTEXT_KEYS:
+            if key in self.context:
+                self.context[key] = intern_category(self.context[key])
+    
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
     
@@ -57,6 +75,8 @@ class UserSession:
     completion_rate: float = 0.0
     average_response_time: float = 0.0
     workflow_patterns: List[str] = field(default_factory=list)
+    response_time_total: float = 0.0
+    timed_interactions: int = 0
     
     def add_interaction(self, interaction: UserInteraction):
         """Add interaction and update session metrics"""
@@ -81,18 +101,19 @@ class UserSession:
         self._update_metrics()
     
     def _update_metrics(self):
-        """Update session-level metrics"""
+        """Update session-level metrics from the latest interaction"""
         if not self.interactions:
             return
         
         # Completion rate
-        successful = sum(1 for i in self.interactions if i.success)
-        self.completion_rate = successful / len(self.interactions)
+        self.completion_rate = 1.0 - self.error_count / len(self.interactions)
         
         # Average response time
-        response_times = [i.response_time for i in self.interactions if i.response_time > 0]
-        if response_times:
-            self.average_response_time = sum(response_times) / len(response_times)
+        latest = self.interactions[-1]
+        if latest.response_time > 0:
+            self.response_time_total += latest.response_time
+            self.timed_interactions += 1
+            self.average_response_time = self.response_time_total / self.timed_interactions
 
 class BehaviorTracker:
     """
@@ -100,7 +121,7 @@ class BehaviorTracker:
     and provides data for ML-powered adaptations
     """
     
-    def __init__(self, config_dir: Optional[Path] = None):
+    def __init__(self, config_dir: Optional[Path] = None, buffer_capacity: int = 10000):
         self.config_dir = config_dir or Path.home() / ".localagent"
         self.behavior_dir = self.config_dir / "behavior_data"
         self.behavior_dir.mkdir(parents=True, exist_ok=True)
@@ -111,8 +132,13 @@ class BehaviorTracker:
         self.current_session: Optional[UserSession] = None
         self.session_start_time = time.time()
         
-        # Interaction buffer (for real-time processing)
-        self.interaction_buffer = deque(maxlen=1000)
+        # Columnar ring buffer of recent interactions (for real-time processing)
+        self.interaction_buffer = InteractionRingBuffer(buffer_capacity)
+        
+        # Interactions already written to each session's segment file; flushes are
+        # serialized so overlapping ones never append the same rows twice
+        self._persisted_counts: Dict[str, int] = {}
+        self._flush_lock = asyncio.Lock()
         
         # Privacy settings
         self.anonymize_data = True
@@ -201,6 +227,11 @@ class BehaviorTracker:
         # Add to buffer for real-time processing
         self.interaction_buffer.append(interaction)
         
+        # Wake background work that learns from interactions, once the user pauses
+        scheduler = get_intelligence_scheduler()
+        scheduler.note_foreground()
+        scheduler.notify('interactions')
+        
         # Track processing performance
         processing_time = time.time() - start_time
         self.processing_times.append(processing_time)
@@ -305,77 +336,19 @@ class BehaviorTracker:
         hours: int = 24,
         interaction_types: Optional[List[str]] = None
     ) -> List[UserInteraction]:
-        """Get recent interaction patterns for analysis"""
+        """Get recent interaction patterns for analysis, oldest first"""
         cutoff_time = time.time() - (hours * 3600)
-        
-        recent_interactions = []
-        
-        # From current session
-        if self.current_session:
-            for interaction in self.current_session.interactions:
-                if interaction.timestamp >= cutoff_time:
-                    if not interaction_types or interaction.interaction_type in interaction_types:
-                        recent_interactions.append(interaction)
-        
-        # From buffer
-        for interaction in self.interaction_buffer:
-            if interaction.timestamp >= cutoff_time:
-                if not interaction_types or interaction.interaction_type in interaction_types:
-                    recent_interactions.append(interaction)
-        
-        # Sort by timestamp
-        recent_interactions.sort(key=lambda x: x.timestamp)
-        
-        return recent_interactions
+        return self.interaction_buffer.interactions(cutoff_time, interaction_types)
     
     async def get_command_frequency(self, hours: int = 168) -> Dict[str, int]:
         """Get command usage frequency over time period"""
-        recent_interactions = await self.get_recent_patterns(hours, ['command_execution'])
-        
-        frequency = defaultdict(int)
-        for interaction in recent_interactions:
-            if interaction.command:
-                frequency[interaction.command] += 1
-        
-        return dict(frequency)
+        cutoff_time = time.time() - (hours * 3600)
+        return self.interaction_buffer.command_counts(cutoff_time, ['command_execution'])
     
     async def get_provider_preferences(self, hours: int = 168) -> Dict[str, Dict[str, Any]]:
         """Get provider usage preferences and performance"""
-        provider_interactions = await self.get_recent_patterns(hours, ['provider_usage'])
-        
-        preferences = defaultdict(lambda: {
-            'usage_count': 0,
-            'success_rate': 0.0,
-            'avg_response_time': 0.0,
-            'models_used': set()
-        })
-        
-        for interaction in provider_interactions:
-            provider = interaction.context.get('provider')
-            if not provider:
-                continue
-            
-            prefs = preferences[provider]
-            prefs['usage_count'] += 1
-            
-            if interaction.success:
-                prefs['success_rate'] += 1
-            
-            if interaction.response_time > 0:
-                prefs['avg_response_time'] += interaction.response_time
-            
-            model = interaction.context.get('model')
-            if model:
-                prefs['models_used'].add(model)
-        
-        # Calculate averages
-        for provider, data in preferences.items():
-            if data['usage_count'] > 0:
-                data['success_rate'] /= data['usage_count']
-                data['avg_response_time'] /= data['usage_count']
-                data['models_used'] = list(data['models_used'])
-        
-        return dict(preferences)
+        cutoff_time = time.time() - (hours * 3600)
+        return self.interaction_buffer.provider_stats(cutoff_time, ['provider_usage'])
     
     async def get_performance_metrics(self) -> Dict[str, Any]:
         """Get behavior tracking performance metrics"""
@@ -414,17 +387,57 @@ class BehaviorTracker:
         
         return sanitized
     
+    def _segment_file(self, session_id: str) -> Path:
+        return self.behavior_dir / f"{session_id}.jsonl.gz"
+    
+    async def flush_interactions(self, session: Optional[UserSession] = None) -> int:
+        """Append interactions not yet persisted to the session's compressed segment file
+        
+        Returns the number of interactions written. The write runs in a
+        worker thread so periodic flushing does not stall the CLI.
+        """
+        session = session or self.current_session
+        if not session:
+            return 0
+        
+        async with self._flush_lock:
+            return await self._write_pending(session)
+    
+    async def _write_pending(self, session: UserSession) -> int:
+        """Append a session's unpersisted interactions; caller holds ``_flush_lock``"""
+        offset = self._persisted_counts.get(session.session_id, 0)
+        pending = session.interactions[offset:]
+        if not pending:
+            return 0
+        
+        rows = [i.to_dict() for i in pending]
+        await asyncio.to_thread(append_segment, self._segment_file(session.session_id), rows)
+        self._persisted_counts[session.session_id] = offset + len(rows)
+        return len(rows)
+    
+    def load_session_interactions(self, session_id: str) -> List[UserInteraction]:
+        """Read a session's persisted interactions back from its segment file"""
+        segment_file = self._segment_file(session_id)
+        if not segment_file.exists():
+            return []
+        return [UserInteraction.from_dict(row) for row in read_segments(segment_file)]
+    
     async def _save_session_data(self, session: UserSession):
         """Save session data to storage"""
         try:
-            # Save to local file
+            # Interactions go to the append-only segment file; the summary stays small
+            async with self._flush_lock:
+                await self._write_pending(session)
+                self._persisted_counts.pop(session.session_id, None)
+            
             session_file = self.behavior_dir / f"{session.session_id}.json"
             
             session_data = {
                 'session_id': session.session_id,
                 'start_time': session.start_time,
                 'end_time': session.end_time,
-                'interactions': [i.to_dict() for i in session.interactions],
+                'interaction_count': len(session.interactions),
+                'interactions_file': self._segment_file(session.session_id).name,
                 'provider_usage': session.provider_usage,
                 'command_frequency': session.command_frequency,
                 'error_count': session.error_count,
@@ -460,7 +473,8 @@ class BehaviorTracker:
         cutoff_time = time.time() - (self.max_storage_days * 24 * 3600)
         
         # Clean local files
-        for session_file in self.behavior_dir.glob("session_*.json"):
+        for session_file in [*self.behavior_dir.glob("session_*.json"),
+                             *self.behavior_dir.glob("session_*.jsonl.gz")]:
             try:
                 stat = session_file.stat()
                 if stat.st_mtime < cutoff_time:
@@ -9,7 +9,6 @@ Uses behavior patterns and TensorFlow.js models to improve CLI productivity.
 import asyncio
 import time
 import logging
-import difflib
 import os
 from typing import Dict, Any, List, Optional, Tuple, Set, Union
 from dataclasses import dataclass, field
@@ -22,6 +21,8 @@ import re
 from .behavior_tracker import BehaviorTracker, UserInteraction
 from .ml_models import TensorFlowJSModelManager, AdaptiveUIModel, TrainingData
 from .autocomplete_history import AutocompleteHistoryManager, AutocompleteConfig, CommandHistoryEntry
+from .suggestion_index import NextCommandModel, PrefixIndex, TrigramIndex
+from .task_scheduler import get_intelligence_scheduler
 
 # Import MCP integration for intelligent pattern selection
 try:
@@ -89,11 +90,9 @@ class CommandIntelligenceEngine:
         )
         
         # Command knowledge base
-        self.command_vocabulary: Set[str] = set()
-        self.command_frequency: Dict[str, int] = defaultdict(int)
-        self.command_patterns: Dict[str, List[str]] = defaultdict(list)  # command -> frequent next commands
         self.command_success_rates: Dict[str, float] = defaultdict(float)
         self.command_descriptions: Dict[str, str] = {}
+        self._reset_command_indexes()
         
         # ML models
         self.command_completion_model: Optional[AdaptiveUIModel] = None
@@ -259,8 +258,8 @@ class CommandIntelligenceEngine:
             # Convert predictions to command suggestions
             # This is a simplified approach - in practice, you'd use a vocabulary mapping
             for i, prob in enumerate(predictions):
-                if prob > 0.3 and i < len(self.command_vocabulary):  # Confidence threshold
-                    command = list(self.command_vocabulary)[i] if self.command_vocabulary else f"cmd_{i}"
+                if prob > 0.3 and i < len(self.vocabulary_order):  # Confidence threshold
+                    command = self.vocabulary_order[i]
                     
                     suggestions.append(CommandSuggestion(
                         command=command,
@@ -279,19 +278,12 @@ class CommandIntelligenceEngine:
         """Get frequency-based suggestions from command usage history"""
         suggestions = []
         
-        # Get commands that start with the partial input
-        matching_commands = [
-            cmd for cmd in self.command_frequency.keys()
-            if cmd.lower().startswith(partial_command.lower())
-        ]
-        
-        # Sort by frequency
-        matching_commands.sort(key=lambda x: self.command_frequency[x], reverse=True)
+        # Most used commands starting with the partial input, kept per prefix
+        matching_commands = self.prefix_index.lookup(partial_command, limit=20)
         
-        total_usage = sum(self.command_frequency.values()) or 1
+        total_usage = self.total_command_count or 1
         
-        for command in matching_commands[:20]:  # Top 20 by frequency
-            usage_count = self.command_frequency[command]
+        for command, usage_count in matching_commands:  # Top 20 by frequency
             confidence = min(0.9, usage_count / (total_usage * 0.1))  # Normalize confidence
             
             suggestions.append(CommandSuggestion(
@@ -312,33 +304,16 @@ class CommandIntelligenceEngine:
         if len(partial_command) < 2:  # Too short for meaningful similarity
             return suggestions
         
-        # Find similar commands using difflib
-        similar_commands = difflib.get_close_matches(
-            partial_command.lower(),
-            [cmd.lower() for cmd in self.command_vocabulary],
-            n=10,
-            cutoff=0.6
-        )
+        # Find similar commands among trigram-index candidates
+        similar_commands = self.trigram_index.close_matches(partial_command, n=10, cutoff=0.6)
         
-        for similar_cmd in similar_commands:
-            # Find the original case command
-            original_command = None
-            for cmd in self.command_vocabulary:
-                if cmd.lower() == similar_cmd:
-                    original_command = cmd
-                    break
-            
-            if original_command:
-                similarity_ratio = difflib.SequenceMatcher(
-                    None, partial_command.lower(), similar_cmd
-                ).ratio()
-                
-                suggestions.append(CommandSuggestion(
-                    command=original_command,
-                    confidence=similarity_ratio * 0.7,  # Lower confidence for similarity
-                    source='similarity',
-                    description=f"Similar to '{partial_command}'"
-                ))
+        for original_command, similarity_ratio in similar_commands:
+            suggestions.append(CommandSuggestion(
+                command=original_command,
+                confidence=similarity_ratio * 0.7,  # Lower confidence for similarity
+                source='similarity',
+                description=f"Similar to '{partial_command}'"
+            ))
         
         return suggestions
     
@@ -350,11 +325,10 @@ class CommandIntelligenceEngine:
         if context.recent_commands:
             last_command = context.recent_commands[-1] if context.recent_commands else ""
             
-            # Look for commands that frequently follow the last command
-            if last_command in self.command_patterns:
-                next_commands = self.command_patterns[last_command]
-                
-                for next_cmd in next_commands[:5]:  # Top 5 following commands
+            # Look for commands that frequently follow the last command(s)
+            next_commands = self.next_command_model.predict(context.recent_commands, limit=5)
+            if next_commands:
+                for next_cmd, _, _ in next_commands:  # Top 5 following commands
                     if next_cmd.lower().startswith(partial_command.lower()) or not partial_command:
                         confidence = 0.6  # Context-based confidence
                         
@@ -454,27 +428,9 @@ class CommandIntelligenceEngine:
                 arguments=arguments or []
             )
             
-            # Update internal frequency tracking
-            self.command_frequency[command] += 1
-            
-            # Update success rate
-            if command in self.command_success_rates:
-                current_rate = self.command_success_rates[command]
-                new_rate = (current_rate * 0.9 + (1.0 if success else 0.0) * 0.1)  # Exponential moving average
-                self.command_success_rates[command] = new_rate
-            else:
-                self.command_success_rates[command] = 1.0 if success else 0.0
-            
-            # Add to vocabulary
-            self.command_vocabulary.add(command)
-            
-            # Update command patterns (for sequential predictions)
-            if hasattr(self, '_last_command') and self._last_command:
-                if self._last_command not in self.command_patterns:
-                    self.command_patterns[self._last_command] = []
-                self.command_patterns[self._last_command].append(command)
-            
-            self._last_command = command
+            # Exponential moving average of success
+            self._learn_command(command, success, success_weight=0.1)
+            get_intelligence_scheduler().notify('commands_learned')
             
             # Clear cache as we have new data
             self.cache.clear()
@@ -482,6 +438,47 @@ class CommandIntelligenceEngine:
         except Exception as e:
             self.logger.error(f"Failed to record command execution: {e}")
     
+    def _reset_command_indexes(self):
+        """Empty vocabulary, frequencies and the incrementally maintained suggestion indexes"""
+        self.command_vocabulary: Set[str] = set()
+        self.vocabulary_order: List[str] = []  # Insertion order, for model output indices
+        self.command_frequency: Dict[str, int] = defaultdict(int)
+        self.total_command_count = 0
+        self.prefix_index = PrefixIndex()
+        self.trigram_index = TrigramIndex()
+        self.next_command_model = NextCommandModel()
+        self.recent_commands: deque = deque(maxlen=2)
+    
+    def _learn_command(self, command: str, success: bool, success_weight: float):
+        """Update frequency, success rate and every suggestion index in O(1)"""
+        if command not in self.command_vocabulary:
+            self.command_vocabulary.add(command)
+            self.vocabulary_order.append(command)
+            self.trigram_index.add(command)
+        
+        self.command_frequency[command] += 1
+        self.total_command_count += 1
+        self.prefix_index.add(command)
+        
+        if command in self.command_success_rates:
+            current_rate = self.command_success_rates[command]
+            self.command_success_rates[command] = \
+                current_rate * (1 - success_weight) + (1.0 if success else 0.0) * success_weight
+        else:
+            self.command_success_rates[command] = 1.0 if success else 0.0
+        
+        # Sequential patterns keyed by the previous one or two commands
+        self.next_command_model.record(self.recent_commands, command)
+        self.recent_commands.append(command)
+    
+    @property
+    def command_patterns(self) -> Dict[str, List[str]]:
+        """Command -> commands seen after it, most frequent first"""
+        return {
+            command: self.next_command_model.followers(command)
+            for command in self.next_command_model.first_order_contexts()
+        }
+    
     def _get_provider_suggestions(self, partial_command: str, available_providers: List[str]) -> List[CommandSuggestion]:
         """Get provider-specific command suggestions"""
         suggestions = []
@@ -619,27 +616,21 @@ class CommandIntelligenceEngine:
             if not context.recent_commands:
                 return None
             
-            last_command = context.recent_commands[-1]
-            
-            # Look for common patterns
-            if last_command in self.command_patterns:
-                next_commands = self.command_patterns[last_command]
-                if next_commands:
-                    most_likely = next_commands[0]  # Most frequent next command
-                    
-                    # Calculate probability based on frequency
-                    total_following = len(self.command_patterns[last_command])
-                    frequency = self.command_patterns[last_command].count(most_likely)
-                    probability = frequency / total_following
-                    
-                    return CommandPrediction(
-                        predicted_command=most_likely,
-                        probability=probability,
-                        reasoning=[
-                            f"Frequently follows '{last_command}'",
-                            f"Occurs {frequency}/{total_following} times after this command"
-                        ]
-                    )
+            # Look for common patterns after the last one or two commands
+            next_commands = self.next_command_model.predict(context.recent_commands, limit=1)
+            if next_commands:
+                most_likely, frequency, total_following = next_commands[0]
+                sequence = self.next_command_model.context_for(context.recent_commands)
+                following = "' then '".join(sequence)
+                
+                return CommandPrediction(
+                    predicted_command=most_likely,
+                    probability=frequency / total_following,
+                    reasoning=[
+                        f"Frequently follows '{following}'",
+                        f"Occurs {frequency}/{total_following} times after this command"
+                    ]
+                )
             
             # ML-based prediction if available
             if self.command_completion_model:
@@ -650,8 +641,8 @@ class CommandIntelligenceEngine:
                 
                 if predictions:
                     max_prob_index = predictions.index(max(predictions))
-                    if max_prob_index < len(self.command_vocabulary):
-                        predicted_cmd = list(self.command_vocabulary)[max_prob_index]
+                    if max_prob_index < len(self.vocabulary_order):
+                        predicted_cmd = self.vocabulary_order[max_prob_index]
                         
                         return CommandPrediction(
                             predicted_command=predicted_cmd,
@@ -674,37 +665,10 @@ class CommandIntelligenceEngine:
                 interaction_types=['command_execution']
             )
             
-            # Build vocabulary and patterns
-            command_sequence = []
-            
+            # Build vocabulary, indexes and sequence patterns
             for interaction in recent_interactions:
                 if interaction.command:
-                    command = interaction.command.strip()
-                    
-                    # Add to vocabulary
-                    self.command_vocabulary.add(command)
-                    
-                    # Update frequency
-                    self.command_frequency[command] += 1
-                    
-                    # Update success rate
-                    if command in self.command_success_rates:
-                        current_rate = self.command_success_rates[command]
-                        new_rate = (current_rate + (1.0 if interaction.success else 0.0)) / 2
-                        self.command_success_rates[command] = new_rate
-                    else:
-                        self.command_success_rates[command] = 1.0 if interaction.success else 0.0
-                    
-                    # Build command sequences for pattern detection
-                    if command_sequence and len(command_sequence) > 0:
-                        prev_command = command_sequence[-1]
-                        self.command_patterns[prev_command].append(command)
-                    
-                    command_sequence.append(command)
-            
-            # Keep only most recent commands in sequence (limit memory)
-            if len(command_sequence) > 1000:
-                command_sequence = command_sequence[-1000:]
+                    self._learn_command(interaction.command.strip(), interaction.success, success_weight=0.5)
             
             self.logger.info(f"Built vocabulary: {len(self.command_vocabulary)} commands")
             
@@ -779,13 +743,26 @@ class CommandIntelligenceEngine:
                     knowledge_data = json.load(f)
                 
                 self.command_descriptions = knowledge_data.get('descriptions', {})
-                self.command_frequency = defaultdict(int, knowledge_data.get('frequency', {}))
                 self.command_success_rates = defaultdict(float, knowledge_data.get('success_rates', {}))
                 
-                # Load command patterns
-                patterns_data = knowledge_data.get('patterns', {})
-                for cmd, next_cmds in patterns_data.items():
-                    self.command_patterns[cmd] = next_cmds
+                # Seed the suggestion indexes with stored frequencies
+                self._reset_command_indexes()
+                for cmd, count in knowledge_data.get('frequency', {}).items():
+                    if cmd not in self.command_vocabulary:
+                        self.command_vocabulary.add(cmd)
+                        self.vocabulary_order.append(cmd)
+                        self.trigram_index.add(cmd)
+                    self.command_frequency[cmd] += count
+                    self.total_command_count += count
+                    self.prefix_index.add(cmd, count)
+                
+                # Load command patterns; older files only list the followers of each command
+                if 'transitions' in knowledge_data:
+                    self.next_command_model.restore(knowledge_data['transitions'])
+                else:
+                    for cmd, next_cmds in knowledge_data.get('patterns', {}).items():
+                        for next_cmd in next_cmds:
+                            self.next_command_model.record([cmd], next_cmd)
                 
                 self.logger.info("Command knowledge loaded from storage")
                 
@@ -801,7 +778,8 @@ class CommandIntelligenceEngine:
                 'descriptions': self.command_descriptions,
                 'frequency': dict(self.command_frequency),
                 'success_rates': dict(self.command_success_rates),
-                'patterns': {cmd: list(set(next_cmds)) for cmd, next_cmds in self.command_patterns.items()},
+                'patterns': self.command_patterns,
+                'transitions': self.next_command_model.snapshot(),
                 'vocabulary': list(self.command_vocabulary),
                 'last_updated': time.time()
             }
@@ -821,7 +799,7 @@ class CommandIntelligenceEngine:
         
         return {
             'vocabulary_size': len(self.command_vocabulary),
-            'command_patterns': len(self.command_patterns),
+            'command_patterns': sum(1 for _ in self.next_command_model.first_order_contexts()),
             'avg_suggestion_time_ms': avg_suggestion_time,
             'fps_compliant': all(t <= 16.0 for t in self.suggestion_times),
             'cache_size': len(self.cache),
@@ -843,8 +821,11 @@ class IntelligentCommandProcessor:
         self.engine = CommandIntelligenceEngine(behavior_tracker, model_manager, config_dir)
         self.logger = logging.getLogger("IntelligentCommandProcessor")
         
-        # Auto-save knowledge periodically
-        asyncio.create_task(self._periodic_knowledge_save())
+        # Save knowledge after new commands are learned, at most every 10 minutes
+        get_intelligence_scheduler().register(
+            'command_knowledge_save', self.engine.save_command_knowledge,
+            triggers=('commands_learned',), min_interval=600
+        )
     
     async def get_completions(self, 
                             partial_command: str,
@@ -886,17 +867,6 @@ class IntelligentCommandProcessor:
         """Learn from executed command for better future suggestions"""
         # This is handled automatically by the behavior tracker
         pass
-    
-    async def _periodic_knowledge_save(self):
-        """Periodically save command knowledge"""
-        while True:
-            try:
-                await asyncio.sleep(600)  # Save every 10 minutes
-                await self.engine.save_command_knowledge()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Periodic knowledge save failed: {e}")
 
 
 # Convenience functions
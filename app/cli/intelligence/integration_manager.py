@@ -22,6 +22,8 @@ from .command_intelligence import IntelligentCommandProcessor, create_intelligen
 from .nlp_processor import NaturalLanguageProcessor, create_nlp_processor
 from .personalization import PersonalizationEngine, create_personalization_engine, generate_user_id
 from .performance_predictor import PerformancePredictionModel, create_performance_predictor
+from .task_scheduler import get_intelligence_scheduler
+from ..ui.memory_optimizer import get_memory_optimizer
 
 # Import MCP integrations
 try:
@@ -54,6 +56,7 @@ class IntelligenceConfig:
     memory_limit_mb: int = 500
     learning_enabled: bool = True
     user_privacy_mode: bool = True
+    background_cpu_budget: float = 0.02  # Fraction of one core for background intelligence work
 
 @dataclass
 class SystemStatus:
@@ -96,6 +99,7 @@ class IntelligenceIntegrationManager:
         self.current_user_id: Optional[str] = None
         self.system_status = SystemStatus()
         self.integration_tasks: List[asyncio.Task] = []
+        self.scheduler = get_intelligence_scheduler()
         
         # Performance monitoring
         self.performance_metrics = {
@@ -163,6 +167,9 @@ class IntelligenceIntegrationManager:
         """Initialize behavior tracking system"""
         try:
             self.behavior_tracker = get_behavior_tracker(self.config_dir)
+            get_memory_optimizer().register_record_source(
+                'user_interactions', self.behavior_tracker.interaction_buffer.interactions
+            )
             
             # Start user session
             session_id = self.behavior_tracker.start_session({
@@ -380,21 +387,35 @@ class IntelligenceIntegrationManager:
             self.logger.warning(f"CLI integration setup failed: {e}")
     
     async def _start_background_services(self):
-        """Start background intelligence services"""
+        """Register background intelligence work with the event-driven scheduler"""
         try:
-            # Performance monitoring task
-            monitoring_task = asyncio.create_task(self._performance_monitoring_loop())
-            self.integration_tasks.append(monitoring_task)
+            self.scheduler.cpu_budget = self.config.background_cpu_budget
+            
+            # Status checks follow request traffic, at most every 5 seconds
+            self.scheduler.register(
+                'system_status', self._check_system_health,
+                triggers=('requests',), min_interval=5
+            )
+            
+            # Personalization updates once the user has done something new
+            self.scheduler.register(
+                'user_analysis', self._update_user_analysis,
+                triggers=('interactions',), min_interval=300
+            )
             
-            # Periodic intelligence updates
-            intelligence_task = asyncio.create_task(self._intelligence_update_loop())
-            self.integration_tasks.append(intelligence_task)
+            # Expire cached suggestions and translations while they are being produced
+            self.scheduler.register(
+                'cache_maintenance', self._expire_caches,
+                triggers=('requests',), min_interval=60
+            )
             
-            # Memory management task
-            memory_task = asyncio.create_task(self._memory_management_loop())
-            self.integration_tasks.append(memory_task)
+            # Persist interactions in batches, or a minute after the first unsaved one
+            self.scheduler.register(
+                'interaction_flush', self._flush_interactions,
+                triggers=('interactions',), min_events=200, max_delay=60
+            )
             
-            self.logger.info("Background services started")
+            self.logger.info("Background services registered")
             
         except Exception as e:
             self.logger.error(f"Failed to start background services: {e}")
@@ -599,86 +620,46 @@ class IntelligenceIntegrationManager:
     
     # Background service methods
     
-    async def _performance_monitoring_loop(self):
-        """Monitor system performance continuously"""
-        while True:
-            try:
-                await asyncio.sleep(5)  # Check every 5 seconds
-                
-                await self._update_system_status()
-                
-                # Check for performance violations
-                if self.system_status.avg_response_time_ms > 16.0:
-                    self.performance_metrics['fps_violations'] += 1
-                    self.logger.warning(f"Performance violation: {self.system_status.avg_response_time_ms:.1f}ms")
-                
-                # Check memory usage
-                if self.system_status.total_memory_usage_mb > self.config.memory_limit_mb:
-                    self.logger.warning(f"Memory usage high: {self.system_status.total_memory_usage_mb:.1f}MB")
-                    await self._trigger_memory_cleanup()
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Performance monitoring error: {e}")
-    
-    async def _intelligence_update_loop(self):
-        """Periodically update intelligence components"""
-        while True:
-            try:
-                await asyncio.sleep(300)  # Every 5 minutes
-                
-                # Update adaptive interface if user is active
-                if (self.adaptive_interface and 
-                    self.behavior_tracker and 
-                    self.behavior_tracker.current_session):
-                    
-                    recent_interactions = len(self.behavior_tracker.current_session.interactions)
-                    if recent_interactions > 0:
-                        await self.adaptive_interface.analyze_and_adapt()
-                
-                # Update personalization
-                if self.personalization_engine and self.current_user_id:
-                    await self.personalization_engine.analyze_user_patterns(self.current_user_id)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Intelligence update error: {e}")
+    async def _check_system_health(self):
+        """Check response times and memory usage against the configured limits"""
+        await self._update_system_status()
+        
+        # Check for performance violations
+        if self.system_status.avg_response_time_ms > 16.0:
+            self.performance_metrics['fps_violations'] += 1
+            self.logger.warning(f"Performance violation: {self.system_status.avg_response_time_ms:.1f}ms")
+        
+        # Check memory usage
+        if self.system_status.total_memory_usage_mb > self.config.memory_limit_mb:
+            self.logger.warning(f"Memory usage high: {self.system_status.total_memory_usage_mb:.1f}MB")
+            await self._trigger_memory_cleanup()
+    
+    async def _update_user_analysis(self):
+        """Refresh personalization for the current user"""
+        if self.personalization_engine and self.current_user_id:
+            await self.personalization_engine.analyze_user_patterns(self.current_user_id)
+    
+    def _expire_caches(self):
+        """Drop cached suggestions and translations older than 5 minutes"""
+        current_time = time.time()
+        caches = []
+        if self.command_intelligence:
+            caches.append(self.command_intelligence.engine.cache)
+        if self.nlp_processor:
+            caches.append(self.nlp_processor.translation_cache)
+        
+        for cache in caches:
+            old_keys = [
+                key for key, (_, timestamp) in cache.items()
+                if current_time - timestamp > 300  # 5 minutes old
+            ]
+            for key in old_keys:
+                del cache[key]
     
-    async def _memory_management_loop(self):
-        """Manage memory usage of intelligence components"""
-        while True:
-            try:
-                await asyncio.sleep(60)  # Every minute
-                
-                # Clear caches in components
-                if self.command_intelligence:
-                    # Clear old cache entries
-                    current_time = time.time()
-                    cache = self.command_intelligence.engine.cache
-                    old_keys = [
-                        key for key, (_, timestamp) in cache.items()
-                        if current_time - timestamp > 300  # 5 minutes old
-                    ]
-                    for key in old_keys:
-                        del cache[key]
-                
-                if self.nlp_processor:
-                    # Clear old NLP cache
-                    current_time = time.time()
-                    cache = self.nlp_processor.translation_cache
-                    old_keys = [
-                        key for key, (_, timestamp) in cache.items()
-                        if current_time - timestamp > 300
-                    ]
-                    for key in old_keys:
-                        del cache[key]
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Memory management error: {e}")
+    async def _flush_interactions(self):
+        """Persist new interactions as a compressed segment (written off the event loop)"""
+        if self.behavior_tracker:
+            await self.behavior_tracker.flush_interactions()
     
     async def _update_system_status(self):
         """Update system status metrics"""
@@ -708,6 +689,8 @@ class IntelligenceIntegrationManager:
     def _track_request_performance(self, response_time_ms: float):
         """Track performance of individual requests"""
         self.performance_metrics['requests_processed'] += 1
+        self.scheduler.note_foreground()
+        self.scheduler.notify('requests')
         
         # Keep recent response times for averaging
         if not hasattr(self, '_recent_response_times'):
@@ -733,10 +716,11 @@ class IntelligenceIntegrationManager:
                     # Trigger model optimization
                     await self.model_manager.optimize_model(model_id)
             
-            # Clear behavior tracker buffer
+            # Shrink behavior tracker buffer, keeping the most recent interactions
             if self.behavior_tracker:
-                # Reduce buffer size temporarily
-                self.behavior_tracker.interaction_buffer.maxlen = 500
+                buffer = self.behavior_tracker.interaction_buffer
+                if buffer.capacity > 500:
+                    buffer.resize(500)
                 
             self.logger.info("Memory cleanup completed")
             
@@ -765,7 +749,7 @@ class IntelligenceIntegrationManager:
                 metrics = state_change.get('performance_metrics', {})
                 
                 if workflow_id and metrics:
-                    from .performance_predictor import MetricType
+                    from .performance_predictor import MetricType, PerformanceContext
                     
                     # Convert metrics to MetricType format
                     metric_dict = {}
@@ -776,8 +760,10 @@ class IntelligenceIntegrationManager:
                         except ValueError:
                             continue
                     
+                    workflow_type = state_change.get('workflow_type')
+                    context = PerformanceContext(workflow_type=workflow_type) if workflow_type else None
                     await self.performance_predictor.record_actual_performance(
-                        workflow_id, metric_dict
+                        workflow_id, metric_dict, context
                     )
                 
         except Exception as e:
@@ -801,7 +787,8 @@ class IntelligenceIntegrationManager:
             'fps_compliant': self.system_status.fps_compliant,
             'current_user_id': self.current_user_id,
             'requests_processed': self.performance_metrics['requests_processed'],
-            'fps_violations': self.performance_metrics['fps_violations']
+            'fps_violations': self.performance_metrics['fps_violations'],
+            'background_tasks': self.scheduler.get_stats()
         }
     
     async def shutdown(self):
@@ -816,6 +803,7 @@ class IntelligenceIntegrationManager:
                     await task
                 except asyncio.CancelledError:
                     pass
+            await self.scheduler.stop()
             
             # End behavior tracking session
             if self.behavior_tracker:
@@ -0,0 +1,175 @@
+"""
+Columnar Interaction Ring Buffer
+================================
+
+Fixed-capacity store of user interactions. Numeric fields live in a NumPy
+structured array so window queries and pattern statistics are vectorized;
+strings are interned to integer ids.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+INTERACTION_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('type_id', 'i4'),
+    ('command_id', 'i4'),
+    ('provider_id', 'i4'),
+    ('model_id', 'i4'),
+    ('response_time', 'f4'),
+    ('success', '?'),
+])
+
+
+class StringInterner:
+    """Maps strings to dense integer ids; None maps to -1"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def lookup(self, names: Iterable[str]) -> List[int]:
+        return [self.ids[name] for name in names if name in self.ids]
+
+
+class InteractionRingBuffer:
+    """
+    Keeps the most recent ``capacity`` interactions
+
+    Appends are O(1): one row written into the structured array and the
+    interaction object kept in a parallel slot list for callers that need
+    the full record. Queries mask the whole buffer at once instead of
+    walking Python objects.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=INTERACTION_DTYPE)
+        self.objects: List[Any] = [None] * capacity
+        self.appended = 0
+        self.types = StringInterner()
+        self.commands = StringInterner()
+        self.providers = StringInterner()
+        self.models = StringInterner()
+
+    def __len__(self) -> int:
+        return min(self.appended, self.capacity)
+
+    @property
+    def maxlen(self) -> int:
+        return self.capacity
+
+    def append(self, interaction):
+        slot = self.appended % self.capacity
+        context = interaction.context or {}
+        self.records[slot] = (
+            interaction.timestamp,
+            self.types.intern(interaction.interaction_type),
+            self.commands.intern(interaction.command),
+            self.providers.intern(context.get('provider')),
+            self.models.intern(context.get('model')),
+            interaction.response_time,
+            interaction.success
+        )
+        self.objects[slot] = interaction
+        self.appended += 1
+
+    def _ordered_slots(self) -> np.ndarray:
+        count = len(self)
+        start = (self.appended - count) % self.capacity
+        return (np.arange(count) + start) % self.capacity
+
+    def window(self, since: float = 0.0, interaction_types: Optional[List[str]] = None) -> np.ndarray:
+        """Slots of interactions at or after ``since``, oldest first"""
+        slots = self._ordered_slots()
+        records = self.records[slots]
+        mask = records['timestamp'] >= since
+        if interaction_types:
+            mask &= np.isin(records['type_id'], self.types.lookup(interaction_types))
+        return slots[mask]
+
+    def interactions(self, since: float = 0.0, interaction_types: Optional[List[str]] = None) -> List[Any]:
+        return [self.objects[slot] for slot in self.window(since, interaction_types)]
+
+    def command_counts(self, since: float = 0.0,
+                       interaction_types: Optional[List[str]] = None) -> Dict[str, int]:
+        ids = self.records[self.window(since, interaction_types)]['command_id']
+        ids = ids[ids >= 0]
+        if not ids.size:
+            return {}
+        counts = np.bincount(ids)
+        return {self.commands.names[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def provider_stats(self, since: float = 0.0,
+                       interaction_types: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Usage count, success rate, mean response time and models per provider"""
+        records = self.records[self.window(since, interaction_types)]
+        records = records[records['provider_id'] >= 0]
+        if not records.size:
+            return {}
+
+        ids = records['provider_id']
+        size = len(self.providers.names)
+        usage = np.bincount(ids, minlength=size)
+        successes = np.bincount(ids, weights=records['success'], minlength=size)
+        response = records['response_time'].astype('f8')
+        response_total = np.bincount(ids, weights=np.where(response > 0, response, 0.0), minlength=size)
+
+        with_model = records[records['model_id'] >= 0]
+        pairs = np.unique(with_model['provider_id'].astype('i8') << 32 | with_model['model_id'])
+        models: Dict[int, List[str]] = {}
+        for pair in pairs.tolist():
+            models.setdefault(pair >> 32, []).append(self.models.names[pair & 0xFFFFFFFF])
+
+        return {
+            self.providers.names[i]: {
+                'usage_count': int(usage[i]),
+                'success_rate': float(successes[i] / usage[i]),
+                'avg_response_time': float(response_total[i] / usage[i]),
+                'models_used': models.get(int(i), [])
+            }
+            for i in np.flatnonzero(usage)
+        }
+
+    def resize(self, capacity: int):
+        """Change capacity, keeping the most recent interactions"""
+        slots = self._ordered_slots()[-capacity:]
+        records = np.zeros(capacity, dtype=INTERACTION_DTYPE)
+        records[:len(slots)] = self.records[slots]
+        objects = [self.objects[slot] for slot in slots] + [None] * (capacity - len(slots))
+        self.records, self.objects = records, objects
+        self.capacity = capacity
+        self.appended = len(slots)
+
+
+def append_segment(path: Path, rows: List[Dict[str, Any]]) -> int:
+    """Append rows as one gzip member of JSON lines; returns compressed bytes written
+
+    Concatenated gzip members form a valid gzip stream, so earlier segments
+    are never rewritten and the file reads back with ``read_segments``.
+    """
+    if not rows:
+        return 0
+    payload = "".join(json.dumps(row, default=str) + "\n" for row in rows).encode('utf-8')
+    compressed = gzip.compress(payload)
+    with open(path, 'ab') as f:
+        f.write(compressed)
+    return len(compressed)
+
+
+def read_segments(path: Path) -> List[Dict[str, Any]]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -7,6 +7,7 @@ command prediction, and interface adaptation. Optimized for 60+ FPS performance.
 """
 
 import asyncio
+import functools
 import json
 import time
 import logging
@@ -20,6 +21,9 @@ from collections import defaultdict, deque
 import subprocess
 import tempfile
 import os
+import shutil
+
+from .task_scheduler import get_intelligence_scheduler
 
 @dataclass
 class ModelConfig:
@@ -497,7 +501,7 @@ class AdaptiveUIModel:
             model.dispose();
             """
             
-            result = await self.tfjs_env.execute_script(training_script)
+            result = await self.tfjs_env.execute_script(training_script, low_priority=True)
             
             # Parse training history
             history = json.loads(result.split('\n')[-2])
@@ -622,22 +626,28 @@ class TensorFlowJSEnvironment:
             self.logger.error(f"Environment setup error: {e}")
             raise
     
-    async def execute_script(self, script_content: str, timeout: int = 30) -> str:
-        """Execute JavaScript with TensorFlow.js"""
+    async def execute_script(self, script_content: str, timeout: int = 30,
+                             low_priority: bool = False) -> str:
+        """Execute JavaScript with TensorFlow.js; low_priority runs Node under nice (training)"""
         # Create temporary script file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
             f.write(script_content)
             script_path = f.name
         
+        command = ["node", script_path]
+        if low_priority and shutil.which("nice"):
+            command = ["nice", "-n", "19"] + command
+        
+        run = functools.partial(
+            subprocess.run, command, cwd=self.working_dir, capture_output=True, text=True, timeout=timeout
+        )
         try:
-            # Execute with Node.js
-            result = subprocess.run(
-                ["node", script_path],
-                cwd=self.working_dir,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            # Execute with Node.js off the event loop so input stays responsive; background
+            # runs go through the scheduler's worker so Node's CPU counts against its budget
+            if low_priority:
+                result = await get_intelligence_scheduler().run_in_worker(run)
+            else:
+                result = await asyncio.to_thread(run)
             
             if result.returncode != 0:
                 self.logger.error(f"Script execution failed: {result.stderr}")
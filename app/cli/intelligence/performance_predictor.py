@@ -9,7 +9,6 @@ resource usage, and success rates to optimize user experience.
 import asyncio
 import time
 import logging
-import statistics
 from typing import Dict, Any, List, Optional, Tuple, NamedTuple
 from dataclasses import dataclass, field
 from enum import Enum
@@ -21,6 +20,8 @@ import math
 # Import behavior tracking and ML models
 from .behavior_tracker import BehaviorTracker, UserInteraction
 from .ml_models import TensorFlowJSModelManager, AdaptiveUIModel, TrainingData
+from .streaming_stats import MetricSketch
+from .task_scheduler import get_intelligence_scheduler
 
 class MetricType(Enum):
     """Types of performance metrics to predict"""
@@ -68,12 +69,19 @@ class PerformanceContext:
     complexity_factors: Dict[str, Any] = field(default_factory=dict)
 
 class PerformanceHistoryTracker:
-    """Tracks historical performance data for learning"""
+    """
+    Tracks historical performance data for learning
+
+    Raw records are kept (bounded) for model training; statistics used by
+    predictions come from one streaming sketch per workflow type and metric,
+    updated in O(1) as executions are recorded.
+    """
     
     def __init__(self, max_history_size: int = 1000):
         self.max_history_size = max_history_size
         self.execution_history: deque = deque(maxlen=max_history_size)
         self.performance_baselines: Dict[str, Dict[MetricType, float]] = defaultdict(dict)
+        self.sketches: Dict[str, Dict[MetricType, MetricSketch]] = defaultdict(dict)
         
     def record_execution(self, workflow_type: str, metrics: Dict[MetricType, float], 
                         context: PerformanceContext):
@@ -91,19 +99,48 @@ class PerformanceHistoryTracker:
         }
         
         self.execution_history.append(record)
-        self._update_baselines(workflow_type, metrics)
+        self._update_baselines(workflow_type, metrics, record['timestamp'])
     
-    def _update_baselines(self, workflow_type: str, metrics: Dict[MetricType, float]):
+    def _update_baselines(self, workflow_type: str, metrics: Dict[MetricType, float],
+                          timestamp: float):
         """Update performance baselines"""
+        sketches = self.sketches[workflow_type]
         for metric_type, value in metrics.items():
-            current_values = [
-                record['metrics'].get(metric_type.value, 0)
-                for record in self.execution_history
-                if record['workflow_type'] == workflow_type
-            ]
-            
-            if current_values:
-                self.performance_baselines[workflow_type][metric_type] = statistics.mean(current_values)
+            sketch = sketches.get(metric_type)
+            if sketch is None:
+                sketch = sketches[metric_type] = MetricSketch()
+            sketch.add(float(value), timestamp)
+            self.performance_baselines[workflow_type][metric_type] = sketch.stats.mean
+    
+    def get_sketch(self, workflow_type: str, metric_type: MetricType) -> Optional[MetricSketch]:
+        """Streaming statistics for workflow and metric, if any were recorded"""
+        return self.sketches.get(workflow_type, {}).get(metric_type)
+    
+    def snapshot_sketches(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            workflow_type: {metric_type.value: sketch.snapshot() for metric_type, sketch in metrics.items()}
+            for workflow_type, metrics in self.sketches.items()
+        }
+    
+    def restore_sketches(self, data: Dict[str, Dict[str, Any]]):
+        for workflow_type, metrics in data.items():
+            for metric_name, snapshot in metrics.items():
+                metric_type = MetricType(metric_name)
+                sketch = MetricSketch.restore(snapshot)
+                self.sketches[workflow_type][metric_type] = sketch
+                self.performance_baselines[workflow_type][metric_type] = sketch.stats.mean
+    
+    def rebuild_sketches(self):
+        """Replay stored records into fresh sketches (history saved without them)"""
+        self.sketches.clear()
+        for record in self.execution_history:
+            for metric_name, value in record['metrics'].items():
+                metric_type = MetricType(metric_name)
+                sketch = self.sketches[record['workflow_type']].get(metric_type)
+                if sketch is None:
+                    sketch = self.sketches[record['workflow_type']][metric_type] = MetricSketch()
+                sketch.add(float(value), record['timestamp'])
+                self.performance_baselines[record['workflow_type']][metric_type] = sketch.stats.mean
     
     def get_baseline(self, workflow_type: str, metric_type: MetricType) -> Optional[float]:
         """Get performance baseline for workflow and metric"""
@@ -169,8 +206,11 @@ class PerformancePredictionModel:
             # Build statistical models
             await self._build_statistical_models()
             
-            # Start background learning
-            asyncio.create_task(self._continuous_learning_loop())
+            # Relearn once new executions are recorded, at most every 30 minutes
+            get_intelligence_scheduler().register(
+                'performance_learning', self._run_learning_cycle,
+                triggers=('performance_recorded',), min_interval=1800
+            )
             
             self.logger.info("Performance prediction system initialized")
             
@@ -308,18 +348,17 @@ class PerformancePredictionModel:
                                             context: PerformanceContext) -> PerformancePrediction:
         """Predict using statistical model"""
         
-        # Get historical data
-        recent_values = self.history_tracker.get_recent_performance(
-            workflow_type, metric_type, hours=168  # Last week
-        )
+        # Streaming statistics, constant time regardless of history length
+        sketch = self.history_tracker.get_sketch(workflow_type, metric_type)
         
-        if not recent_values:
+        if not sketch or not sketch.count:
             # No historical data, use defaults
             return self._create_default_prediction(metric_type, workflow_type)
         
-        # Calculate base prediction
-        base_value = statistics.mean(recent_values)
-        std_dev = statistics.stdev(recent_values) if len(recent_values) > 1 else base_value * 0.1
+        # Calculate base prediction from the decayed trend, which favours recent runs
+        mean_value = sketch.stats.mean
+        base_value = max(0.0, sketch.trend.forecast())
+        std_dev = sketch.stats.std if sketch.count > 1 else mean_value * 0.1
         
         # Apply context adjustments
         adjusted_value = self._apply_context_adjustments(
@@ -327,7 +366,7 @@ class PerformancePredictionModel:
         )
         
         # Calculate confidence based on data consistency
-        confidence = self._calculate_statistical_confidence(recent_values)
+        confidence = self._calculate_statistical_confidence(sketch)
         
         # Confidence interval
         margin = 1.96 * std_dev
@@ -345,9 +384,9 @@ class PerformancePredictionModel:
             confidence=confidence,
             confidence_interval=confidence_interval,
             factors=factors,
-            historical_average=base_value,
+            historical_average=mean_value,
             improvement_potential=self._calculate_improvement_potential(
-                adjusted_value, base_value, recent_values
+                adjusted_value, mean_value, sketch.stats.max
             )
         )
     
@@ -409,13 +448,13 @@ class PerformancePredictionModel:
         
         return max(0.0, adjusted_value)
     
-    def _calculate_statistical_confidence(self, values: List[float]) -> float:
+    def _calculate_statistical_confidence(self, sketch: MetricSketch) -> float:
         """Calculate confidence based on data consistency"""
-        if len(values) < 2:
+        if sketch.count < 2:
             return 0.5  # Low confidence with little data
         
-        mean_val = statistics.mean(values)
-        std_dev = statistics.stdev(values)
+        mean_val = sketch.stats.mean
+        std_dev = sketch.stats.std
         
         # Coefficient of variation (lower is more consistent)
         cv = std_dev / mean_val if mean_val > 0 else 1.0
@@ -424,7 +463,7 @@ class PerformancePredictionModel:
         confidence = 1.0 / (1.0 + cv)
         
         # Adjust for sample size
-        size_factor = min(1.0, len(values) / 20.0)  # Full confidence with 20+ samples
+        size_factor = min(1.0, sketch.count / 20.0)  # Full confidence with 20+ samples
         
         return confidence * size_factor
     
@@ -451,14 +490,11 @@ class PerformancePredictionModel:
         return factors
     
     def _calculate_improvement_potential(self, predicted: float, baseline: float, 
-                                       recent_values: List[float]) -> float:
+                                       best_recent: float) -> float:
         """Calculate potential for performance improvement"""
-        if not recent_values or baseline == 0:
+        if baseline == 0 or best_recent <= 0:
             return 0.0
         
-        # Find best recent performance
-        best_recent = max(recent_values) if recent_values else baseline
-        
         # Calculate improvement potential as % of difference from best
         if predicted < best_recent:
             return ((best_recent - predicted) / best_recent) * 100
@@ -711,24 +747,29 @@ class PerformancePredictionModel:
     
     def _get_historical_std(self, workflow_type: str, metric_type: MetricType) -> float:
         """Get historical standard deviation for metric"""
-        recent_values = self.history_tracker.get_recent_performance(
-            workflow_type, metric_type, hours=168
-        )
+        sketch = self.history_tracker.get_sketch(workflow_type, metric_type)
         
-        if len(recent_values) > 1:
-            return statistics.stdev(recent_values)
+        if sketch and sketch.count > 1:
+            return sketch.stats.std
         else:
             # Default standard deviation as percentage of mean
             baseline = self.history_tracker.get_baseline(workflow_type, metric_type)
             return (baseline * 0.2) if baseline else 1.0
     
     async def record_actual_performance(self, workflow_id: str, 
-                                      actual_metrics: Dict[MetricType, float]):
+                                      actual_metrics: Dict[MetricType, float],
+                                      context: Optional[PerformanceContext] = None):
         """Record actual performance for learning"""
         try:
             # This would be called after workflow execution
             # to improve future predictions
             
+            # Feed the streaming statistics; without a context the workflow type is
+            # unknown and the run cannot be attributed to a baseline
+            if context is not None:
+                self.history_tracker.record_execution(context.workflow_type, actual_metrics, context)
+                get_intelligence_scheduler().notify('performance_recorded')
+            
             # Find the original prediction
             # In a real implementation, you'd store predictions and match them
             
@@ -777,73 +818,29 @@ class PerformancePredictionModel:
     async def _build_statistical_models(self):
         """Build statistical models from historical data"""
         try:
-            # Group historical data by workflow type
-            workflow_data = defaultdict(lambda: defaultdict(list))
-            
-            for record in self.history_tracker.execution_history:
-                workflow_type = record['workflow_type']
-                for metric_name, value in record['metrics'].items():
-                    metric_type = MetricType(metric_name)
-                    workflow_data[workflow_type][metric_type].append(value)
-            
-            # Build simple regression models for each workflow-metric combination
-            for workflow_type, metrics in workflow_data.items():
-                for metric_type, values in metrics.items():
-                    if len(values) > 3:
-                        # Simple statistical model (mean, std dev, trend)
-                        self.statistical_models[workflow_type][metric_type] = {
-                            'mean': statistics.mean(values),
-                            'std': statistics.stdev(values) if len(values) > 1 else 0,
-                            'trend': self._calculate_trend(values),
-                            'sample_size': len(values)
-                        }
+            # Summaries are read from the streaming sketches, not recomputed from records
+            for workflow_type, metrics in self.history_tracker.sketches.items():
+                for metric_type, sketch in metrics.items():
+                    if sketch.count > 3:
+                        # Simple statistical model (mean, std dev, trend, quantiles)
+                        self.statistical_models[workflow_type][metric_type] = sketch.summary()
             
             self.logger.info("Built statistical models from historical data")
             
         except Exception as e:
             self.logger.warning(f"Failed to build statistical models: {e}")
     
-    def _calculate_trend(self, values: List[float]) -> float:
-        """Calculate trend in values (simple linear regression slope)"""
-        if len(values) < 2:
-            return 0.0
+    async def _run_learning_cycle(self):
+        """Learn from the performance data recorded since the last cycle"""
+        # Rebuild statistical models with new data
+        await self._build_statistical_models()
         
-        n = len(values)
-        x_values = list(range(n))
+        # Train ML models if enough new data
+        if self.model_manager:
+            await self._train_ml_models_if_needed()
         
-        # Calculate slope using least squares
-        sum_x = sum(x_values)
-        sum_y = sum(values)
-        sum_xy = sum(x * y for x, y in zip(x_values, values))
-        sum_x_squared = sum(x * x for x in x_values)
-        
-        denominator = n * sum_x_squared - sum_x * sum_x
-        if denominator == 0:
-            return 0.0
-        
-        slope = (n * sum_xy - sum_x * sum_y) / denominator
-        return slope
-    
-    async def _continuous_learning_loop(self):
-        """Continuous learning from new performance data"""
-        while True:
-            try:
-                await asyncio.sleep(1800)  # Every 30 minutes
-                
-                # Rebuild statistical models with new data
-                await self._build_statistical_models()
-                
-                # Train ML models if enough new data
-                if self.model_manager:
-                    await self._train_ml_models_if_needed()
-                
-                # Save performance history
-                await self._save_performance_history()
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Continuous learning error: {e}")
+        # Save performance history
+        await self._save_performance_history()
     
     async def _train_ml_models_if_needed(self):
         """Train ML models if sufficient new data is available"""
@@ -857,12 +854,17 @@ class PerformancePredictionModel:
             if recent_data_count < 10:  # Not enough new data
                 return
             
-            # Prepare training data for each model
+            # Prepare training data for each model in the low-priority worker,
+            # from a snapshot so recording can continue meanwhile
+            scheduler = get_intelligence_scheduler()
+            records = list(self.history_tracker.execution_history)
             for metric_type, model in self.prediction_models.items():
                 if not model:
                     continue
                 
-                training_features, training_labels = self._prepare_training_data(metric_type)
+                training_features, training_labels = await scheduler.run_in_worker(
+                    self._prepare_training_data, metric_type, records
+                )
                 
                 if len(training_features) > 20:  # Minimum training set
                     training_data = TrainingData(
@@ -879,12 +881,16 @@ class PerformancePredictionModel:
         except Exception as e:
             self.logger.error(f"ML model training failed: {e}")
     
-    def _prepare_training_data(self, metric_type: MetricType) -> Tuple[List[List[float]], List[float]]:
+    def _prepare_training_data(self, metric_type: MetricType,
+                               records: Optional[List[Dict[str, Any]]] = None) -> Tuple[List[List[float]], List[float]]:
         """Prepare training data for ML model"""
         features = []
         labels = []
         
-        for record in self.history_tracker.execution_history:
+        if records is None:
+            records = list(self.history_tracker.execution_history)
+        
+        for record in records:
             if metric_type.value not in record['metrics']:
                 continue
             
@@ -924,6 +930,13 @@ class PerformancePredictionModel:
                         metric_type = MetricType(metric_name)
                         self.history_tracker.performance_baselines[workflow_type][metric_type] = value
                 
+                # Sketches carry statistics beyond the bounded record history
+                sketches = history_data.get('sketches')
+                if sketches is not None:
+                    self.history_tracker.restore_sketches(sketches)
+                else:
+                    self.history_tracker.rebuild_sketches()
+                
                 self.logger.info(f"Loaded {len(self.history_tracker.execution_history)} historical records")
                 
         except Exception as e:
@@ -942,7 +955,8 @@ class PerformancePredictionModel:
                         for metric_type, value in metrics.items()
                     }
                     for workflow_type, metrics in self.history_tracker.performance_baselines.items()
-                }
+                },
+                'sketches': self.history_tracker.snapshot_sketches()
             }
             
             with open(history_file, 'w') as f:
@@ -20,6 +20,7 @@ import hashlib
 # Import behavior tracking and ML models
 from .behavior_tracker import BehaviorTracker, UserBehaviorAnalyzer
 from .ml_models import TensorFlowJSModelManager
+from .task_scheduler import get_intelligence_scheduler
 
 class PersonalizationLevel(Enum):
     """Levels of personalization intensity"""
@@ -119,8 +120,11 @@ class PersonalizationEngine:
             # Load personalization insights
             await self._load_personalization_insights()
             
-            # Start background learning process
-            asyncio.create_task(self._continuous_learning_loop())
+            # Learn from new interactions, at most once an hour
+            get_intelligence_scheduler().register(
+                'personalization_learning', self._run_learning_cycle,
+                triggers=('interactions',), min_interval=3600
+            )
             
             self.logger.info("Personalization engine initialized")
             
@@ -692,37 +696,28 @@ class PersonalizationEngine:
             self.logger.error(f"Failed to apply personalization: {e}")
             return False
     
-    async def _continuous_learning_loop(self):
-        """Continuous learning process that runs in the background"""
-        while True:
+    async def _run_learning_cycle(self):
+        """Update every profile, drop stale insights and persist the results"""
+        if not self.learning_enabled:
+            return
+        
+        # Update all user profiles
+        for user_id in list(self.user_profiles.keys()):
             try:
-                await asyncio.sleep(3600)  # Run every hour
-                
-                if not self.learning_enabled:
-                    continue
-                
-                # Update all user profiles
-                for user_id in self.user_profiles.keys():
-                    try:
-                        await self.analyze_user_patterns(user_id)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to update profile for {user_id}: {e}")
-                
-                # Cleanup old insights
-                cutoff_time = time.time() - (7 * 24 * 3600)  # 7 days
-                self.personalization_insights = [
-                    insight for insight in self.personalization_insights
-                    if hasattr(insight, 'created_at') and insight.created_at > cutoff_time
-                ]
-                
-                # Save updated data
-                await self._save_user_profiles()
-                await self._save_personalization_insights()
-                
-            except asyncio.CancelledError:
-                break
+                await self.analyze_user_patterns(user_id)
             except Exception as e:
-                self.logger.error(f"Continuous learning error: {e}")
+                self.logger.warning(f"Failed to update profile for {user_id}: {e}")
+        
+        # Cleanup old insights
+        cutoff_time = time.time() - (7 * 24 * 3600)  # 7 days
+        self.personalization_insights = [
+            insight for insight in self.personalization_insights
+            if hasattr(insight, 'created_at') and insight.created_at > cutoff_time
+        ]
+        
+        # Save updated data
+        await self._save_user_profiles()
+        await self._save_personalization_insights()
     
     async def _load_user_profiles(self):
         """Load user profiles from storage"""
@@ -0,0 +1,243 @@
+"""
+Streaming Statistics
+====================
+
+Constant-memory estimators updated one observation at a time, used by the
+performance predictor so that predictions never rescan stored history.
+Every estimator can be snapshotted to plain JSON data and restored.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+class RunningStats:
+    """Count, mean, variance, min and max via Welford's algorithm"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance; 0 with fewer than two observations"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> 'RunningStats':
+        stats = cls()
+        stats.count = int(data.get('count', 0))
+        stats.mean = float(data.get('mean', 0.0))
+        stats.m2 = float(data.get('m2', 0.0))
+        if stats.count:
+            stats.min = float(data['min'])
+            stats.max = float(data['max'])
+        return stats
+
+
+class DecayedTrend:
+    """
+    Exponentially decayed level and slope (Holt's linear smoothing)
+
+    The slope is measured per observation, like a least-squares fit over
+    sample indices, but older observations decay instead of weighing
+    equally forever.
+    """
+
+    def __init__(self, alpha: float = 0.3, beta: float = 0.1):
+        self.alpha = alpha
+        self.beta = beta
+        self.level: Optional[float] = None
+        self.slope = 0.0
+
+    def add(self, value: float):
+        if self.level is None:
+            self.level = value
+            return
+        previous = self.level
+        self.level = self.alpha * value + (1 - self.alpha) * (self.level + self.slope)
+        self.slope = self.beta * (self.level - previous) + (1 - self.beta) * self.slope
+
+    def forecast(self, steps: int = 1) -> Optional[float]:
+        if self.level is None:
+            return None
+        return self.level + steps * self.slope
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'alpha': self.alpha, 'beta': self.beta, 'level': self.level, 'slope': self.slope}
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> 'DecayedTrend':
+        trend = cls(data.get('alpha', 0.3), data.get('beta', 0.1))
+        trend.level = data.get('level')
+        trend.slope = float(data.get('slope', 0.0))
+        return trend
+
+
+class P2Quantile:
+    """
+    Single quantile estimate with five markers (Jain & Chlamtac's P² algorithm)
+
+    Exact for the first five observations; afterwards the middle marker
+    tracks the quantile in O(1) time and memory.
+    """
+
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantile must be in (0, 1), got {p}")
+        self.p = p
+        self.heights: list = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, value: float):
+        heights = self.heights
+        if len(heights) < 5:
+            bisect.insort(heights, value)
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect.bisect_right(heights, value) - 1
+
+        for i in range(cell + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - self.positions[i]
+            if ((offset >= 1 and self.positions[i + 1] - self.positions[i] > 1) or
+                    (offset <= -1 and self.positions[i - 1] - self.positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                self.positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def value(self) -> Optional[float]:
+        heights = self.heights
+        if not heights:
+            return None
+        if self.positions[4] == 5:
+            # Still exact: interpolate between the sorted observations
+            rank = self.p * (len(heights) - 1)
+            lower = int(rank)
+            upper = min(lower + 1, len(heights) - 1)
+            return heights[lower] + (heights[upper] - heights[lower]) * (rank - lower)
+        return heights[2]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'p': self.p,
+            'heights': list(self.heights),
+            'positions': list(self.positions),
+            'desired': list(self.desired)
+        }
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> 'P2Quantile':
+        quantile = cls(data['p'])
+        quantile.heights = [float(h) for h in data.get('heights', [])]
+        quantile.positions = [int(n) for n in data.get('positions', quantile.positions)]
+        quantile.desired = [float(d) for d in data.get('desired', quantile.desired)]
+        return quantile
+
+
+class MetricSketch:
+    """Running moments, decayed trend and quantiles for one metric stream"""
+
+    QUANTILES = (0.5, 0.9, 0.95)
+
+    def __init__(self, quantiles: Iterable[float] = QUANTILES):
+        self.stats = RunningStats()
+        self.trend = DecayedTrend()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.last_updated = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def add(self, value: float, timestamp: float = 0.0):
+        self.stats.add(value)
+        self.trend.add(value)
+        for quantile in self.quantiles.values():
+            quantile.add(value)
+        self.last_updated = max(self.last_updated, timestamp)
+
+    def quantile(self, p: float) -> Optional[float]:
+        estimator = self.quantiles.get(p)
+        return estimator.value() if estimator else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'mean': self.stats.mean,
+            'std': self.stats.std,
+            'trend': self.trend.slope,
+            'level': self.trend.level,
+            'sample_size': self.stats.count,
+            **{f'p{int(p * 100)}': q.value() for p, q in self.quantiles.items()}
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'stats': self.stats.snapshot(),
+            'trend': self.trend.snapshot(),
+            'quantiles': [q.snapshot() for q in self.quantiles.values()],
+            'last_updated': self.last_updated
+        }
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> 'MetricSketch':
+        sketch = cls(quantiles=())
+        sketch.stats = RunningStats.restore(data.get('stats', {}))
+        sketch.trend = DecayedTrend.restore(data.get('trend', {}))
+        for entry in data.get('quantiles', []):
+            quantile = P2Quantile.restore(entry)
+            sketch.quantiles[quantile.p] = quantile
+        sketch.last_updated = float(data.get('last_updated', 0.0))
+        return sketch
@@ -0,0 +1,232 @@
+"""
+Incremental Command Suggestion Index
+====================================
+
+Structures behind command completion that are updated as each command is
+recorded, so that lookups cost the same with ten commands or ten thousand:
+
+- ``PrefixIndex``: most used commands per typed prefix
+- ``TrigramIndex``: fuzzy candidates from shared character trigrams
+- ``NextCommandModel``: Markov model of the next command given the
+  previous one or two
+"""
+
+import difflib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class TopK:
+    """
+    The ``k`` keys with the highest counts, kept in descending order
+
+    Counts only ever grow, so a key outside the top ``k`` can only enter by
+    overtaking the current minimum; updates cost O(k) regardless of how many
+    keys exist.
+    """
+
+    __slots__ = ('k', 'items')
+
+    def __init__(self, k: int = 20):
+        self.k = k
+        self.items: List[List] = []  # [count, key], highest count first
+
+    def update(self, key: str, count: int):
+        items = self.items
+        for index, item in enumerate(items):
+            if item[1] == key:
+                item[0] = count
+                break
+        else:
+            if len(items) < self.k:
+                items.append([count, key])
+                index = len(items) - 1
+            elif count > items[-1][0]:
+                items[-1] = [count, key]
+                index = len(items) - 1
+            else:
+                return
+        # Bubble the updated entry up to its place
+        while index > 0 and items[index - 1][0] < items[index][0]:
+            items[index - 1], items[index] = items[index], items[index - 1]
+            index -= 1
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return [(key, count) for count, key in self.items[:limit]]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class PrefixIndex:
+    """
+    Top-K most frequent commands for every lowercase prefix
+
+    Prefixes are indexed up to ``max_prefix`` characters; longer queries
+    filter the commands sharing the capped prefix, which are few.
+    """
+
+    def __init__(self, k: int = 20, max_prefix: int = 16):
+        self.k = k
+        self.max_prefix = max_prefix
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.prefixes: Dict[str, TopK] = {}
+        self.long_tails: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, command: str, count: int = 1):
+        self.counts[command] += count
+        total = self.counts[command]
+        lowered = command.lower()
+        for length in range(min(len(lowered), self.max_prefix) + 1):
+            prefix = lowered[:length]
+            top = self.prefixes.get(prefix)
+            if top is None:
+                top = self.prefixes[prefix] = TopK(self.k)
+            top.update(command, total)
+        if len(lowered) > self.max_prefix:
+            self.long_tails[lowered[:self.max_prefix]].add(command)
+
+    def lookup(self, prefix: str, limit: int = 20) -> List[Tuple[str, int]]:
+        """(command, count) pairs starting with ``prefix``, most used first"""
+        lowered = prefix.lower()
+        if len(lowered) <= self.max_prefix:
+            top = self.prefixes.get(lowered)
+            return top.top(limit) if top else []
+
+        matches = [
+            (command, self.counts[command])
+            for command in self.long_tails.get(lowered[:self.max_prefix], ())
+            if command.lower().startswith(lowered)
+        ]
+        matches.sort(key=lambda item: item[1], reverse=True)
+        return matches[:limit]
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to commands
+
+    A query visits the postings of its own trigrams, rarest first, and stops
+    after ``max_postings`` entries; candidates are then scored with the same
+    ratio ``difflib.get_close_matches`` uses.
+    """
+
+    def __init__(self, max_postings: int = 2000, max_candidates: int = 50):
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self.postings: Dict[str, List[str]] = defaultdict(list)
+        self.commands: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def add(self, command: str):
+        if command in self.commands:
+            return
+        self.commands.add(command)
+        for gram in trigrams(command):
+            self.postings[gram].append(command)
+
+    def candidates(self, query: str) -> List[str]:
+        """Commands sharing the most trigrams with ``query``"""
+        shared: Dict[str, int] = defaultdict(int)
+        visited = 0
+        grams = sorted(trigrams(query), key=lambda gram: len(self.postings.get(gram, ())))
+        for gram in grams:
+            for command in self.postings.get(gram, ()):
+                shared[command] += 1
+                visited += 1
+                if visited >= self.max_postings:
+                    break
+            if visited >= self.max_postings:
+                break
+        ranked = sorted(shared.items(), key=lambda item: item[1], reverse=True)
+        return [command for command, _ in ranked[:self.max_candidates]]
+
+    def close_matches(self, query: str, n: int = 10, cutoff: float = 0.6) -> List[Tuple[str, float]]:
+        """(command, similarity ratio) like ``difflib.get_close_matches``, best first"""
+        lowered = query.lower()
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(lowered)
+        scored = []
+        for command in self.candidates(query):
+            matcher.set_seq1(command.lower())
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    scored.append((command, ratio))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:n]
+
+
+class NextCommandModel:
+    """
+    Markov model of the next command keyed by the previous one or two
+
+    Each context keeps full transition counts plus a top-K of its most
+    likely successors. Predictions use the two-command context when it has
+    been seen ``min_support`` times and back off to the previous command.
+    """
+
+    def __init__(self, k: int = 10, min_support: int = 2):
+        self.k = k
+        self.min_support = min_support
+        self.transitions: Dict[Tuple[str, ...], Dict[str, int]] = {}
+        self.totals: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self.top: Dict[Tuple[str, ...], TopK] = {}
+
+    def _observe(self, context: Tuple[str, ...], command: str, count: int):
+        counts = self.transitions.get(context)
+        if counts is None:
+            counts = self.transitions[context] = defaultdict(int)
+            self.top[context] = TopK(self.k)
+        counts[command] += count
+        self.totals[context] += count
+        self.top[context].update(command, counts[command])
+
+    def record(self, previous: Sequence[str], command: str, count: int = 1):
+        """Record ``command`` following the commands in ``previous`` (oldest first)"""
+        if not previous:
+            return
+        self._observe((previous[-1],), command, count)
+        if len(previous) >= 2:
+            self._observe((previous[-2], previous[-1]), command, count)
+
+    def context_for(self, recent: Sequence[str]) -> Optional[Tuple[str, ...]]:
+        """Most specific context with enough observations"""
+        if len(recent) >= 2:
+            context = (recent[-2], recent[-1])
+            if self.totals.get(context, 0) >= self.min_support:
+                return context
+        if recent and (recent[-1],) in self.transitions:
+            return (recent[-1],)
+        return None
+
+    def predict(self, recent: Sequence[str], limit: int = 5) -> List[Tuple[str, int, int]]:
+        """(command, count, context total) for the likeliest next commands"""
+        context = self.context_for(recent)
+        if context is None:
+            return []
+        total = self.totals[context]
+        return [(command, count, total) for command, count in self.top[context].top(limit)]
+
+    def followers(self, command: str) -> List[str]:
+        """Commands seen after ``command``, most frequent first"""
+        top = self.top.get((command,))
+        return [key for key, _ in top.top()] if top else []
+
+    def first_order_contexts(self) -> Iterable[str]:
+        return (context[0] for context in self.transitions if len(context) == 1)
+
+    def snapshot(self) -> List[List]:
+        return [[list(context), dict(counts)] for context, counts in self.transitions.items()]
+
+    def restore(self, data: List[List]):
+        for context, counts in data:
+            for command, count in counts.items():
+                self._observe(tuple(context), command, count)
@@ -0,0 +1,368 @@
+"""
+Intelligence Task Scheduler
+===========================
+
+Single scheduler for background intelligence work such as retraining,
+persistence and pattern analysis. Tasks run when events they subscribe to
+have arrived, not on fixed timers, so an idle session does no background
+work at all. Runs are coalesced, held back while the user is typing, and
+limited by a global CPU budget. CPU-heavy work goes to a low-priority
+worker thread.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Not available on Windows
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _children_cpu_time() -> float:
+    """CPU seconds used by reaped child processes of this process"""
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _lower_thread_priority(niceness: int):
+    """Raise the niceness of the calling thread (Linux applies it per thread)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
+    except (AttributeError, OSError):
+        pass
+
+
+@dataclass
+class TaskStats:
+    """Time spent by one scheduled task"""
+    runs: int = 0
+    events_processed: int = 0
+    cpu_time: float = 0.0  # Seconds, including worker-thread and child-process time
+    wall_time: float = 0.0
+    budget_deferrals: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'events_processed': self.events_processed,
+            'cpu_ms': self.cpu_time * 1000,
+            'avg_cpu_ms': self.cpu_time * 1000 / self.runs if self.runs else 0.0,
+            'wall_ms': self.wall_time * 1000,
+            'budget_deferrals': self.budget_deferrals,
+            'errors': self.errors
+        }
+
+
+@dataclass
+class ScheduledTask:
+    """
+    Background work triggered by events
+
+    The task is due once ``min_events`` events are pending, or ``max_delay``
+    seconds after the first pending event when fewer arrive, and never
+    sooner than ``min_interval`` after its previous run.
+    """
+    name: str
+    callback: Callable[[], Any]
+    triggers: Tuple[str, ...]
+    min_events: int = 1
+    max_delay: Optional[float] = None
+    min_interval: float = 0.0
+    pending: int = 0
+    first_pending_at: Optional[float] = None
+    last_run: float = -math.inf
+    running: bool = False
+    stats: TaskStats = field(default_factory=TaskStats)
+
+    def due_at(self) -> Optional[float]:
+        """Clock time the task becomes due, or None while nothing is pending"""
+        if not self.pending or self.running:
+            return None
+        earliest = self.last_run + self.min_interval
+        if self.pending >= self.min_events:
+            return earliest
+        if self.max_delay is not None:
+            return max(earliest, self.first_pending_at + self.max_delay)
+        return None
+
+
+class IntelligenceScheduler:
+    """
+    Event-driven scheduler with a global CPU budget
+
+    ``notify(topic)`` adds pending events to every task subscribed to the
+    topic (each task is also subscribed to its own name). Due tasks run one
+    at a time on the event loop, only after ``idle_delay`` seconds without
+    foreground activity and while the CPU used by background work over the
+    last ``budget_window`` seconds stays under ``cpu_budget`` of one core.
+
+    Synchronous callbacks are charged their loop-thread time. Coroutine
+    callbacks are charged only for what they hand to ``run_in_worker``
+    (worker-thread time plus child processes reaped there), since loop-thread
+    time across their awaits belongs mostly to foreground work.
+    """
+
+    def __init__(self, cpu_budget: float = 0.02, budget_window: float = 60.0,
+                 idle_delay: float = 0.25, worker_niceness: int = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        self.cpu_budget = cpu_budget
+        self.budget_window = budget_window
+        self.idle_delay = idle_delay
+        self.worker_niceness = worker_niceness
+        self.clock = clock
+
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.subscriptions: Dict[str, List[str]] = {}
+        self._usage: Deque[Tuple[float, float]] = deque()  # (time, cpu seconds)
+        self._last_foreground = -math.inf
+        self._current: Optional[ScheduledTask] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # Registration and events
+
+    def register(self, name: str, callback: Callable[[], Any], triggers: Tuple[str, ...] = (),
+                 min_events: int = 1, max_delay: Optional[float] = None,
+                 min_interval: float = 0.0) -> ScheduledTask:
+        """Register (or replace) a task; ``callback`` may be a coroutine function"""
+        self.unregister(name)
+        task = ScheduledTask(
+            name=name, callback=callback, triggers=(name,) + tuple(triggers),
+            min_events=min_events, max_delay=max_delay, min_interval=min_interval
+        )
+        self.tasks[name] = task
+        for topic in task.triggers:
+            self.subscriptions.setdefault(topic, []).append(name)
+        self.start()
+        return task
+
+    def unregister(self, name: str):
+        task = self.tasks.pop(name, None)
+        if task:
+            for topic in task.triggers:
+                names = self.subscriptions.get(topic, [])
+                if name in names:
+                    names.remove(name)
+
+    def notify(self, topic: str, count: int = 1):
+        """Record ``count`` new events for the tasks subscribed to ``topic``"""
+        names = self.subscriptions.get(topic)
+        if not names:
+            return
+        now = self.clock()
+        for name in names:
+            task = self.tasks[name]
+            if not task.pending:
+                task.first_pending_at = now
+            task.pending += count
+        self._wake()
+
+    def note_foreground(self):
+        """Foreground activity (input, suggestions) holds background runs back briefly"""
+        self._last_foreground = self.clock()
+
+    # Budget
+
+    def budget_used(self, now: Optional[float] = None) -> float:
+        """Fraction of one core used by background work over the budget window"""
+        now = self.clock() if now is None else now
+        while self._usage and self._usage[0][0] <= now - self.budget_window:
+            self._usage.popleft()
+        return sum(cpu for _, cpu in self._usage) / self.budget_window
+
+    def _charge(self, cpu: float):
+        self._usage.append((self.clock(), cpu))
+        if self._current is not None:
+            self._current.stats.cpu_time += cpu
+
+    def _blocked_until(self, now: float) -> Optional[float]:
+        """Earliest time background work may run again, None if it may run now"""
+        idle_at = self._last_foreground + self.idle_delay
+        if now < idle_at:
+            return idle_at
+        if self.budget_used(now) >= self.cpu_budget:
+            return self._usage[0][0] + self.budget_window
+        return None
+
+    # Execution
+
+    def next_wakeup(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until something may run; None when only new events can make work due"""
+        now = self.clock() if now is None else now
+        due = [t for t in (task.due_at() for task in self.tasks.values()) if t is not None]
+        if not due:
+            return None
+        at = min(due)
+        blocked = self._blocked_until(now)
+        if blocked is not None:
+            at = max(at, blocked)
+        return max(0.0, at - now)
+
+    async def run_due(self) -> List[str]:
+        """Run every task that is due and allowed by the idle and budget gates"""
+        ran = []
+        for task in list(self.tasks.values()):
+            now = self.clock()
+            due_at = task.due_at()
+            if due_at is None or due_at > now:
+                continue
+            if self._blocked_until(now) is not None:
+                if now >= self._last_foreground + self.idle_delay:
+                    task.stats.budget_deferrals += 1
+                break
+            await self._execute(task)
+            ran.append(task.name)
+        return ran
+
+    async def _execute(self, task: ScheduledTask):
+        events = task.pending
+        task.pending = 0
+        task.first_pending_at = None
+        task.running = True
+        self._current = task
+        started_wall = time.perf_counter()
+        started_cpu = time.thread_time()
+        started_children = _children_cpu_time()
+        awaited = False
+        try:
+            result = task.callback()
+            if inspect.isawaitable(result):
+                awaited = True
+                await result
+        except Exception as e:
+            task.stats.errors += 1
+            logger.error(f"Background task {task.name} failed: {e}")
+        finally:
+            if not awaited:
+                self._charge(time.thread_time() - started_cpu + _children_cpu_time() - started_children)
+            self._current = None
+            task.running = False
+            task.last_run = self.clock()
+            task.stats.runs += 1
+            task.stats.events_processed += events
+            task.stats.wall_time += time.perf_counter() - started_wall
+
+    async def run_in_worker(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run CPU-heavy ``func`` in the low-priority worker thread
+
+        Charges the worker thread's CPU time plus that of child processes
+        ``func`` runs to completion (e.g. through ``subprocess.run``).
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="intelligence-worker",
+                initializer=_lower_thread_priority, initargs=(self.worker_niceness,)
+            )
+        current = self._current
+
+        def timed():
+            started = time.thread_time()
+            started_children = _children_cpu_time()
+            try:
+                return func(*args)
+            finally:
+                timings.append(time.thread_time() - started + _children_cpu_time() - started_children)
+
+        timings: List[float] = []
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._current = current
+            if timings:
+                self._charge(timings[0])
+
+    # Lifecycle
+
+    def start(self):
+        """Start the scheduling loop on the running event loop, if there is one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Started by the first notify/register made inside a loop
+        if self._loop is loop and self._runner and not self._runner.done():
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._runner = loop.create_task(self._run_loop())
+
+    def _wake(self):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and running is not self._loop:
+            self.start()
+        if self._wakeup is None or self._loop is None or self._loop.is_closed():
+            return
+        if running is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run_loop(self):
+        while True:
+            delay = self.next_wakeup()
+            try:
+                if delay is None:
+                    await self._wakeup.wait()
+                elif delay > 0:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.run_due()
+
+    async def stop(self):
+        if self._runner and not self._runner.done():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._runner = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-task time spent and pending work, plus global budget usage"""
+        return {
+            'cpu_budget': self.cpu_budget,
+            'budget_used': self.budget_used(),
+            'tasks': {
+                name: dict(task.stats.to_dict(), pending_events=task.pending)
+                for name, task in self.tasks.items()
+            }
+        }
+
+
+# Global scheduler instance
+_global_scheduler: Optional[IntelligenceScheduler] = None
+
+
+def get_intelligence_scheduler() -> IntelligenceScheduler:
+    """Get the scheduler shared by all intelligence components"""
+    global _global_scheduler
+    if _global_scheduler is None:
+        _global_scheduler = IntelligenceScheduler()
+    return _global_scheduler
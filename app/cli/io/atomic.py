@@ -26,6 +26,9 @@ try:
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
 
+from .execution_plan import DirectorySyncBatch, WaveExecutor, plan_waves
+from ...security.audit_writer import DURABILITY_BATCH, shared_file_writer
+
 # Configure logging
 logger = logging.getLogger(__name__)
 console = Console()
@@ -129,19 +132,21 @@ class AtomicWriter:
     
     def __init__(self, target_path: Union[str, Path], backup: bool = True,
                  show_progress: bool = True, verify_integrity: bool = True,
-                 schema: Optional[Dict[str, Any]] = None):
+                 schema: Optional[Dict[str, Any]] = None,
+                 sync_batch: Optional[DirectorySyncBatch] = None):
         self.target_path = Path(target_path)
         self.backup = backup
         self.show_progress = show_progress
         self.verify_integrity = verify_integrity
         self.schema = schema
+        self.sync_batch = sync_batch
         self.temp_path: Optional[Path] = None
         self.backup_path: Optional[Path] = None
         self._file_handle = None
         self._progress: Optional[Progress] = None
         self._task_id: Optional[TaskID] = None
         self._recovery_manager = RecoveryManager()
-        self._original_checksum: Optional[str] = None
+        self._content_checksum: Optional[str] = None
         self._operation_metadata = {
             'start_time': None,
             'end_time': None,
@@ -174,10 +179,6 @@ class AtomicWriter:
             # Create target directory if needed
             self.target_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Store original file checksum for integrity verification
-            if self.verify_integrity and self.target_path.exists():
-                self._original_checksum = await self._calculate_checksum(self.target_path)
-            
             # Create temporary file in same directory as target
             temp_fd, temp_path = tempfile.mkstemp(
                 dir=self.target_path.parent,
@@ -269,9 +270,10 @@ class AtomicWriter:
             )
         
         try:
-            # Verify integrity of temporary file if requested
+            # Verify integrity of temporary file if requested; content hashed
+            # while writing does not need to be read back
             if self.verify_integrity:
-                temp_checksum = await self._calculate_checksum(self.temp_path)
+                temp_checksum = self._content_checksum or await self._calculate_checksum(self.temp_path)
                 if not temp_checksum:
                     raise IntegrityError(
                         "Failed to calculate checksum for temporary file",
@@ -297,6 +299,8 @@ class AtomicWriter:
             # Atomic rename from temp to target
             os.rename(self.temp_path, self.target_path)
             self.temp_path = None  # Prevent cleanup
+            if self.sync_batch is not None:
+                self.sync_batch.add(self.target_path)
             
             # Verify final file integrity
             if self.verify_integrity:
@@ -360,6 +364,9 @@ class AtomicWriter:
                 # Write content in chunks for large files with progress updates
                 content_bytes = content.encode(encoding)
                 self._operation_metadata['bytes_written'] = len(content_bytes)
+                # Text mode only writes these exact bytes without newline translation
+                if self.verify_integrity and (os.linesep == '\n' or '\n' not in content):
+                    self._content_checksum = hashlib.sha256(content_bytes).hexdigest()
                 
                 if len(content_bytes) > 1024 * 1024:  # 1MB chunks for large files
                     chunk_size = 1024 * 1024
@@ -396,6 +403,9 @@ class AtomicWriter:
             await f.write(content)
             await f.flush()
             await asyncio.to_thread(os.fsync, f.fileno())
+        
+        if self.verify_integrity:
+            self._content_checksum = hashlib.sha256(content).hexdigest()
     
     async def write_json(self, data: Any, indent: int = 2, ensure_ascii: bool = False) -> None:
         """Write JSON data to file with optional schema validation"""
@@ -555,7 +565,8 @@ class AtomicFileManager:
     
     @staticmethod
     async def safe_copy(source_path: Union[str, Path], 
-                       dest_path: Union[str, Path], backup: bool = True) -> None:
+                       dest_path: Union[str, Path], backup: bool = True,
+                       sync_batch: Optional[DirectorySyncBatch] = None) -> None:
         """Copy file atomically"""
         source = Path(source_path)
         if not source.exists():
@@ -564,7 +575,7 @@ class AtomicFileManager:
         # Read source file
         if source.stat().st_size > 100 * 1024 * 1024:  # 100MB
             # Large file - read in chunks
-            async with AtomicWriter(dest_path, backup=backup) as writer:
+            async with AtomicWriter(dest_path, backup=backup, sync_batch=sync_batch) as writer:
                 async with aiofiles.open(source, 'rb') as src:
                     chunk_size = 64 * 1024  # 64KB chunks
                     async with aiofiles.open(writer.temp_path, 'wb') as dst:
@@ -580,12 +591,13 @@ class AtomicFileManager:
             async with aiofiles.open(source, 'rb') as f:
                 content = await f.read()
             
-            async with AtomicWriter(dest_path, backup=backup) as writer:
+            async with AtomicWriter(dest_path, backup=backup, sync_batch=sync_batch) as writer:
                 await writer.write_bytes(content)
     
     @staticmethod
     async def safe_move(source_path: Union[str, Path], 
-                       dest_path: Union[str, Path], backup: bool = True) -> None:
+                       dest_path: Union[str, Path], backup: bool = True,
+                       sync_batch: Optional[DirectorySyncBatch] = None) -> None:
         """Move file atomically with fallback to copy+delete"""
         source = Path(source_path)
         dest = Path(dest_path)
@@ -605,20 +617,29 @@ class AtomicFileManager:
             
         except OSError:
             # Cross-filesystem move - use copy then delete
-            await AtomicFileManager.safe_copy(source, dest, backup=backup)
+            await AtomicFileManager.safe_copy(source, dest, backup=backup, sync_batch=sync_batch)
             source.unlink()  # Delete source after successful copy
+        
+        if sync_batch is not None:
+            sync_batch.add(source)
+            sync_batch.add(dest)
 
 class FileTransaction:
     """
     Transaction-like interface for multiple file operations with Rich progress display
     Allows rollback of multiple file changes with comprehensive error recovery
+    
+    Operations touching independent paths are committed concurrently in
+    planned waves; directory entries are fsynced once per directory per wave.
     """
     
     def __init__(self, show_progress: bool = True, 
-                 transaction_id: Optional[str] = None):
+                 transaction_id: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         self.operations: List[Dict[str, Any]] = []
         self.completed_operations: List[Dict[str, Any]] = []
         self.show_progress = show_progress
+        self.max_workers = max_workers
         self.transaction_id = transaction_id or f"tx_{int(time.time() * 1000)}"
         self._progress: Optional[Progress] = None
         self._recovery_manager = RecoveryManager()
@@ -699,26 +720,51 @@ class FileTransaction:
                 total=len(self.operations)
             )
         
+        executor = WaveExecutor(self.max_workers)
+        sync_batch = DirectorySyncBatch()
+        
         try:
             logger.info(f"Starting transaction {self.transaction_id} with {len(self.operations)} operations")
             
-            for i, operation in enumerate(self.operations):
+            waves = plan_waves(
+                enumerate(self.operations),
+                lambda item: self._operation_paths(item[1])
+            )
+            done = 0
+            
+            for wave in waves:
                 if self._progress:
                     self._progress.update(
                         task_id,
-                        completed=i,
-                        description=f"Executing {operation['type']} on {operation['file_path'].name}"
+                        completed=done,
+                        description=f"Executing {len(wave)} operation(s)"
                     )
                 
-                await self._execute_operation(operation)
-                self.completed_operations.append(operation)
-                
-                # Add recovery point for each completed operation
-                self._recovery_manager.add_recovery_point(
-                    operation['type'],
-                    operation['file_path'],
-                    metadata={'transaction_id': self.transaction_id, 'operation_index': i}
+                outcomes = await executor.run_wave(
+                    wave,
+                    lambda item: self._execute_operation(item[1], sync_batch)
                 )
+                
+                failure = None
+                for (i, operation), outcome in zip(wave, outcomes):
+                    if isinstance(outcome, BaseException):
+                        failure = failure or outcome
+                        continue
+                    self.completed_operations.append(operation)
+                    
+                    # Add recovery point for each completed operation
+                    self._recovery_manager.add_recovery_point(
+                        operation['type'],
+                        operation.get('file_path') or operation['dest_path'],
+                        metadata={'transaction_id': self.transaction_id, 'operation_index': i}
+                    )
+                
+                # One fsync per touched directory instead of one per file
+                await executor.run_blocking(sync_batch.sync)
+                done += len(wave)
+                
+                if failure is not None:
+                    raise failure
             
             if self._progress:
                 self._progress.update(
@@ -742,11 +788,10 @@ class FileTransaction:
                     description=f"✗ Transaction {self.transaction_id[:8]} failed - rolling back"
                 )
             
-            # Attempt recovery first
-            recovery_success = await self._recovery_manager.attempt_recovery(e)
-            if not recovery_success:
-                # Fallback to manual rollback
-                await self._rollback()
+            # Recovery points carry no backups for transaction operations,
+            # so completed operations are always undone explicitly as well
+            await self._recovery_manager.attempt_recovery(e)
+            await self._rollback()
             
             raise AtomicWriteError(
                 f"Transaction {self.transaction_id} failed: {e}",
@@ -755,11 +800,25 @@ class FileTransaction:
             ) from e
             
         finally:
+            executor.shutdown()
             if self._progress:
                 await asyncio.sleep(0.5)  # Brief pause to show final status
                 self._progress.stop()
     
-    async def _execute_operation(self, operation: Dict[str, Any]):
+    def _operation_paths(self, operation: Dict[str, Any]) -> List[Path]:
+        """Paths an operation reads or writes, including its backup files"""
+        op_type = operation['type']
+        if op_type == 'write':
+            file_path = operation['file_path']
+            return [file_path, file_path.with_suffix(file_path.suffix + '.backup')]
+        if op_type == 'delete':
+            file_path = operation['file_path']
+            return [file_path, file_path.with_suffix(file_path.suffix + '.deleted_backup')]
+        dest_path = operation['dest_path']
+        return [operation['source_path'], dest_path, dest_path.with_suffix(dest_path.suffix + '.backup')]
+    
+    async def _execute_operation(self, operation: Dict[str, Any],
+                                 sync_batch: Optional[DirectorySyncBatch] = None):
         """Execute a single operation with enhanced error handling"""
         op_type = operation['type']
         operation_id = operation.get('operation_id', f"{op_type}_{time.time()}")
@@ -778,7 +837,8 @@ class FileTransaction:
                     backup=True,
                     show_progress=False,  # Transaction handles progress
                     verify_integrity=verify_integrity,
-                    schema=schema
+                    schema=schema,
+                    sync_batch=sync_batch
                 ) as writer:
                     if content_type == 'json':
                         await writer.write_json(operation['content'])
@@ -793,12 +853,12 @@ class FileTransaction:
                 
             elif op_type == 'copy':
                 await AtomicFileManager.safe_copy(
-                    operation['source_path'], operation['dest_path']
+                    operation['source_path'], operation['dest_path'], sync_batch=sync_batch
                 )
                 
             elif op_type == 'move':
                 await AtomicFileManager.safe_move(
-                    operation['source_path'], operation['dest_path']
+                    operation['source_path'], operation['dest_path'], sync_batch=sync_batch
                 )
                 
             elif op_type == 'delete':
@@ -806,10 +866,12 @@ class FileTransaction:
                 if file_path.exists():
                     # Create backup before deletion
                     backup_path = file_path.with_suffix(file_path.suffix + '.deleted_backup')
-                    await AtomicFileManager.safe_copy(file_path, backup_path)
+                    await AtomicFileManager.safe_copy(file_path, backup_path, sync_batch=sync_batch)
                     operation['backup_path'] = backup_path  # Store for potential rollback
                     
                     file_path.unlink()
+                    if sync_batch is not None:
+                        sync_batch.add(file_path)
                     logger.debug(f"Deleted {file_path} with backup at {backup_path}")
             
             else:
@@ -838,6 +900,8 @@ class FileTransaction:
             except Exception as e:
                 # Best effort rollback - log but continue
                 print(f"Warning: Failed to rollback operation {operation}: {e}")
+        # Undone operations must not be rolled back again by __aexit__
+        self.completed_operations.clear()
     
     async def _rollback_operation(self, operation: Dict[str, Any]):
         """Rollback a single operation"""
@@ -874,12 +938,21 @@ class FileTransaction:
                 logger.info(f"Restored deleted file {operation['file_path']} from backup")
 
 class AuditTrail:
-    """Comprehensive audit trail for atomic file operations"""
+    """
+    Comprehensive audit trail for atomic file operations
     
-    def __init__(self, audit_file: Optional[Union[str, Path]] = None):
+    Entries for an audit file go through a group-commit writer shared by
+    every trail on that file: one open handle, batched appends and one
+    fsync per batch (``durability`` "buffered" skips the fsync, "sync"
+    makes log_operation wait for it).
+    """
+    
+    def __init__(self, audit_file: Optional[Union[str, Path]] = None,
+                 durability: str = DURABILITY_BATCH):
         self.audit_file = Path(audit_file) if audit_file else None
         self.audit_entries: List[Dict[str, Any]] = []
         self.session_id = f"session_{int(time.time() * 1000)}"
+        self._writer = shared_file_writer(self.audit_file, durability=durability) if self.audit_file else None
     
     def log_operation(self, operation: str, file_path: Path, 
                      metadata: Optional[Dict[str, Any]] = None,
@@ -898,25 +971,13 @@ class AuditTrail:
         self.audit_entries.append(entry)
         logger.info(f"Audit: {operation} {file_path} - {status}")
         
-        # Write to audit file if specified
-        if self.audit_file:
-            asyncio.create_task(self._write_audit_entry(entry))
+        # Queue for the shared audit file writer
+        if self._writer:
+            self._writer.submit(entry)
     
-    async def _write_audit_entry(self, entry: Dict[str, Any]):
-        """Write audit entry to file"""
-        try:
-            audit_line = json.dumps(entry) + "\n"
-            
-            # Ensure audit directory exists
-            self.audit_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Append to audit file (no need for atomic write here as we're appending)
-            async with aiofiles.open(self.audit_file, 'a', encoding='utf-8') as f:
-                await f.write(audit_line)
-                await f.flush()
-                
-        except Exception as e:
-            logger.error(f"Failed to write audit entry: {e}")
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until logged entries have been committed to the audit file"""
+        return self._writer.flush(timeout) if self._writer else True
     
     def get_operations_summary(self) -> Dict[str, Any]:
         """Get summary of operations in this session"""
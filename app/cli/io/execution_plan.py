@@ -0,0 +1,161 @@
+"""
+Dependency-Aware Execution Planning
+Groups file operations touching independent paths into waves that run
+concurrently on a bounded worker pool
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _ancestors(path: str) -> Iterator[str]:
+    """Yield the parent directories of an absolute path, nearest first"""
+    parent = os.path.dirname(path)
+    while parent != path:
+        yield parent
+        path, parent = parent, os.path.dirname(parent)
+
+
+def plan_waves(
+    items: Iterable[T],
+    paths_of: Callable[[T], Optional[Iterable[Union[str, Path]]]]
+) -> List[List[T]]:
+    """
+    Split ``items`` into ordered waves of mutually independent operations
+
+    Two operations conflict when a path of one equals, or is an ancestor of,
+    a path of the other. A conflicting operation lands in a later wave than
+    every earlier operation it conflicts with, so submission order is kept
+    wherever it matters. ``paths_of`` returning ``None`` marks an operation
+    as a barrier that runs alone after everything submitted before it.
+    """
+    waves: List[List[T]] = []
+    exact: Dict[str, int] = {}    # path -> last wave touching exactly it
+    subtree: Dict[str, int] = {}  # path -> last wave touching it or anything below it
+    floor = 0
+
+    for item in items:
+        paths = paths_of(item)
+        if paths is None:
+            waves.append([item])
+            floor = len(waves)
+            continue
+
+        keys = {os.path.abspath(os.fspath(p)) for p in paths}
+        wave = floor
+        for key in keys:
+            if key in subtree:
+                wave = max(wave, subtree[key] + 1)
+            for ancestor in _ancestors(key):
+                if ancestor in exact:
+                    wave = max(wave, exact[ancestor] + 1)
+
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(item)
+
+        for key in keys:
+            exact[key] = max(exact.get(key, -1), wave)
+            subtree[key] = max(subtree.get(key, -1), wave)
+            for ancestor in _ancestors(key):
+                subtree[ancestor] = max(subtree.get(ancestor, -1), wave)
+
+    return waves
+
+
+def fsync_directory(directory: Union[str, Path]) -> bool:
+    """Flush a directory's entries to disk; returns False where unsupported"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return False  # Directories cannot be opened on some platforms
+    try:
+        os.fsync(fd)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+class DirectorySyncBatch:
+    """Collects directories whose entries changed and fsyncs each one once"""
+
+    def __init__(self):
+        self._directories: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._directories)
+
+    def add(self, path: Union[str, Path]):
+        """Register the directory containing ``path``"""
+        self._directories.add(os.path.dirname(os.path.abspath(os.fspath(path))))
+
+    def sync(self) -> int:
+        """Fsync every registered directory; returns how many were synced"""
+        directories, self._directories = self._directories, set()
+        synced = 0
+        for directory in directories:
+            if fsync_directory(directory):
+                synced += 1
+        logger.debug(f"Synced {synced} of {len(directories)} directories")
+        return synced
+
+
+class WaveExecutor:
+    """Runs planned waves with bounded concurrency and a bounded thread pool"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    async def run_blocking(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call on the executor's thread pool"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="file-ops"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+
+    async def run_wave(self, items: List[T], handler: Callable[[T], Awaitable[Any]]) -> List[Any]:
+        """
+        Run ``handler`` for every item of one wave
+
+        Results come back in item order; an exception raised by a handler is
+        returned in place of its result so the rest of the wave can finish.
+        """
+        if len(items) == 1 or self.max_workers == 1:
+            outcomes = []
+            for item in items:
+                try:
+                    outcomes.append(await handler(item))
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(item: T) -> Any:
+            async with semaphore:
+                return await handler(item)
+
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+    def shutdown(self):
+        """Release the thread pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
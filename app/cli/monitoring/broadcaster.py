@@ -0,0 +1,180 @@
+"""
+Non-blocking Event Broadcaster
+Fans serialized events out to subscribers through bounded per-client queues
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies for a subscriber whose queue is full
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class Subscriber:
+    """
+    One client with its own bounded queue and writer task
+
+    Pending messages are kept in insertion order. A message published with a
+    coalescing key replaces the pending message with the same key, so a slow
+    client receives only the latest value (for example an agent's current
+    status) instead of every intermediate one.
+    """
+
+    def __init__(self, client, max_queue: int = 256, policy: str = DROP_OLDEST,
+                 send_timeout: float = 5.0):
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.client = client
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.pending: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._ready = asyncio.Event()
+        self._sequence = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, on_close) -> "Subscriber":
+        self._task = asyncio.create_task(self._writer(on_close))
+        return self
+
+    def offer(self, message: str, coalesce_key: Optional[Hashable] = None) -> bool:
+        """Queue a message without waiting; returns False if it was not queued"""
+        if self.closed:
+            return False
+        if coalesce_key is not None and coalesce_key in self.pending:
+            self.pending[coalesce_key] = message
+            self.coalesced += 1
+            return True
+
+        if len(self.pending) >= self.max_queue:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return False
+            self.pending.popitem(last=False)
+
+        key = coalesce_key if coalesce_key is not None else ('_seq', next(self._sequence))
+        self.pending[key] = message
+        self._ready.set()
+        return True
+
+    async def _writer(self, on_close):
+        try:
+            while True:
+                await self._ready.wait()
+                while self.pending:
+                    _, message = self.pending.popitem(last=False)
+                    await asyncio.wait_for(self.client.send(message), self.send_timeout)
+                    self.sent += 1
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Dropping notification client after send failure: {e}")
+        finally:
+            self.closed = True
+            self.pending.clear()
+        on_close(self)
+
+    async def close(self):
+        self.closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': len(self.pending),
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced
+        }
+
+
+class EventBroadcaster:
+    """
+    Serializes each event once and hands it to every subscriber's queue
+
+    ``publish`` never awaits a client: slow subscribers lose their oldest
+    (or newest, per ``policy``) pending messages, and a client whose send
+    fails or exceeds ``send_timeout`` is unsubscribed. The cost of a
+    publish is therefore independent of how fast the clients read.
+    """
+
+    def __init__(self, max_queue: int = 256, policy: str = DROP_OLDEST,
+                 send_timeout: float = 5.0):
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.subscribers: Dict[int, Subscriber] = {}
+        self.stats = {
+            'published': 0,
+            'subscribed': 0,
+            'disconnected': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    def subscribe(self, client, max_queue: Optional[int] = None,
+                  policy: Optional[str] = None) -> Subscriber:
+        """Register a client with a ``send`` coroutine; must be called from the event loop"""
+        existing = self.subscribers.get(id(client))
+        if existing is not None and not existing.closed:
+            return existing
+        subscriber = Subscriber(
+            client,
+            max_queue=max_queue or self.max_queue,
+            policy=policy or self.policy,
+            send_timeout=self.send_timeout
+        ).start(self._closed)
+        self.subscribers[id(client)] = subscriber
+        self.stats['subscribed'] += 1
+        return subscriber
+
+    async def unsubscribe(self, client):
+        subscriber = self.subscribers.pop(id(client), None)
+        if subscriber is not None:
+            await subscriber.close()
+
+    def _closed(self, subscriber: Subscriber):
+        if self.subscribers.get(id(subscriber.client)) is subscriber:
+            del self.subscribers[id(subscriber.client)]
+            self.stats['disconnected'] += 1
+
+    def publish(self, event: Dict[str, Any], coalesce_key: Optional[Hashable] = None) -> str:
+        """Serialize ``event`` once and queue it for every subscriber"""
+        message = json.dumps(event, default=str)
+        self.stats['published'] += 1
+        for subscriber in list(self.subscribers.values()):
+            subscriber.offer(message, coalesce_key)
+        return message
+
+    async def close(self):
+        subscribers = list(self.subscribers.values())
+        self.subscribers.clear()
+        for subscriber in subscribers:
+            await subscriber.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        per_client = [s.get_stats() for s in self.subscribers.values()]
+        return dict(
+            self.stats,
+            clients=len(per_client),
+            queued=sum(s['queued'] for s in per_client),
+            dropped=sum(s['dropped'] for s in per_client),
+            coalesced=sum(s['coalesced'] for s in per_client)
+        )
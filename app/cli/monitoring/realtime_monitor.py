@@ -5,10 +5,9 @@ Provides live workflow execution tracking and progress displays
 
 import asyncio
 import json
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Hashable
 from datetime import datetime
 from rich.console import Console
-from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.layout import Layout
@@ -17,6 +16,9 @@ from rich.text import Text
 import websockets
 import redis.asyncio as redis
 
+from .broadcaster import EventBroadcaster
+from ..ui.diff_renderer import DiffRenderer
+
 console = Console()
 
 class WorkflowMonitor:
@@ -31,6 +33,7 @@ class WorkflowMonitor:
         self.redis_client = None
         self.websocket = None
         self.monitoring_task = None
+        self.state_version = 0  # Bumped on every handled event so dashboards can skip unchanged frames
         
     async def initialize(self, workflow_id: str):
         """Initialize monitoring for a workflow"""
@@ -140,13 +143,15 @@ class WorkflowMonitor:
         
         return table
     
-    def generate_header(self) -> Panel:
-        """Generate header panel with workflow info"""
+    def _elapsed_display(self) -> str:
         if self.start_time:
             elapsed = (datetime.now() - self.start_time).total_seconds()
-            elapsed_str = f"{int(elapsed // 60)}m {int(elapsed % 60)}s"
-        else:
-            elapsed_str = "0s"
+            return f"{int(elapsed // 60)}m {int(elapsed % 60)}s"
+        return "0s"
+    
+    def generate_header(self) -> Panel:
+        """Generate header panel with workflow info"""
+        elapsed_str = self._elapsed_display()
         
         header_text = Text()
         header_text.append("Workflow ID: ", style="bold")
@@ -174,14 +179,20 @@ class WorkflowMonitor:
         """Display live updating dashboard"""
         layout = self.create_dashboard_layout()
         
-        with Live(layout, refresh_per_second=2, screen=True) as live:
+        renderer = DiffRenderer(console)
+        
+        def build() -> Layout:
+            layout["header"].update(self.generate_header())
+            layout["phases"].update(self.generate_phases_table())
+            layout["agents"].update(self.generate_agents_table())
+            layout["footer"].update(self.generate_footer())
+            return layout
+        
+        with console.screen(hide_cursor=True):
             while True:
-                # Update layout components
-                layout["header"].update(self.generate_header())
-                layout["phases"].update(self.generate_phases_table())
-                layout["agents"].update(self.generate_agents_table())
-                layout["footer"].update(self.generate_footer())
-                
+                # Only rebuild when an event arrived or the elapsed-time display changed,
+                # and only write the cells that differ from the last frame
+                renderer.render(build, inputs=(self.state_version, self._elapsed_display()))
                 await asyncio.sleep(0.5)
     
     async def _monitor_loop(self):
@@ -211,6 +222,7 @@ class WorkflowMonitor:
         """Handle orchestration events"""
         try:
             event_data = json.loads(data)
+            self.state_version += 1
             
             if channel == 'orchestration:phase:start':
                 phase = event_data.get('phase', 0)
@@ -299,18 +311,23 @@ class ProgressTracker:
 class RealtimeNotifier:
     """Send real-time notifications for workflow events"""
     
-    def __init__(self):
-        self.websocket_clients = []
-        self.event_queue = asyncio.Queue()
+    def __init__(self, max_client_queue: int = 256, max_event_queue: int = 1000,
+                 send_timeout: float = 5.0):
+        self.broadcaster = EventBroadcaster(max_queue=max_client_queue, send_timeout=send_timeout)
+        self.event_queue = asyncio.Queue(maxsize=max_event_queue)
+        self.dropped_events = 0
+        
+    @property
+    def websocket_clients(self) -> List[Any]:
+        return [subscriber.client for subscriber in self.broadcaster.subscribers.values()]
         
     async def connect_client(self, websocket):
         """Connect a WebSocket client for notifications"""
-        self.websocket_clients.append(websocket)
+        self.broadcaster.subscribe(websocket)
         
     async def disconnect_client(self, websocket):
         """Disconnect a WebSocket client"""
-        if websocket in self.websocket_clients:
-            self.websocket_clients.remove(websocket)
+        await self.broadcaster.unsubscribe(websocket)
     
     async def notify_phase_start(self, phase: int, description: str):
         """Notify phase start"""
@@ -334,7 +351,7 @@ class RealtimeNotifier:
         await self.broadcast_event(event)
     
     async def notify_agent_status(self, agent: str, status: str, details: Any = None):
-        """Notify agent status change"""
+        """Notify agent status change; slow clients only receive the latest status per agent"""
         event = {
             'type': 'agent_status',
             'agent': agent,
@@ -342,27 +359,27 @@ class RealtimeNotifier:
             'details': details,
             'timestamp': datetime.now().isoformat()
         }
-        await self.broadcast_event(event)
+        await self.broadcast_event(event, coalesce_key=('agent_status', agent))
     
-    async def broadcast_event(self, event: Dict[str, Any]):
-        """Broadcast event to all connected clients"""
-        message = json.dumps(event)
-        
-        # Send to WebSocket clients
-        disconnected = []
-        for client in self.websocket_clients:
-            try:
-                await client.send(message)
-            except:
-                disconnected.append(client)
-        
-        # Remove disconnected clients
-        for client in disconnected:
-            await self.disconnect_client(client)
+    async def broadcast_event(self, event: Dict[str, Any], coalesce_key: Optional[Hashable] = None):
+        """Broadcast event to all connected clients without waiting for them"""
+        self.broadcaster.publish(event, coalesce_key)
         
-        # Add to event queue for other consumers
-        await self.event_queue.put(event)
+        # Keep the most recent events for other consumers
+        if self.event_queue.full():
+            self.event_queue.get_nowait()
+            self.dropped_events += 1
+        self.event_queue.put_nowait(event)
     
     async def get_next_event(self) -> Dict[str, Any]:
         """Get next event from queue"""
-        return await self.event_queue.get()
\ No newline at end of file
+        return await self.event_queue.get()
+    
+    async def close(self):
+        """Stop all client writers"""
+        await self.broadcaster.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.broadcaster.get_stats(),
+                    event_queue=self.event_queue.qsize(),
+                    dropped_events=self.dropped_events)
@@ -8,9 +8,9 @@ import subprocess
 import shlex
 import os
 import json
-import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -24,6 +24,8 @@ from rich.prompt import Prompt, Confirm
 from rich.text import Text
 
 from ..framework import CLIPlugin, CommandPlugin
+from ...security.rule_engine import PatternSet, VerdictCache
+from ...ui.memory_optimizer import intern_category
 
 
 console = Console()
@@ -51,6 +53,15 @@ class CommandPolicy:
     sandbox_mode: bool = False
 
 
+@lru_cache(maxsize=8)
+def compile_forbidden_patterns(patterns: Tuple[str, ...]) -> PatternSet:
+    """One matcher equivalent to ``any(re.match(p, command) for p in patterns)``"""
+    if all(pattern.startswith('.*') for pattern in patterns):
+        # Factor out the shared leading wildcard so the line is walked once, not per pattern
+        return PatternSet([pattern[2:] for pattern in patterns], prefix='.*')
+    return PatternSet(patterns)
+
+
 class CommandValidator:
     """Validates commands against security policies"""
     
@@ -136,14 +147,21 @@ class CommandValidator:
     
     def __init__(self, policy: CommandPolicy):
         self.policy = policy
+        self.forbidden = compile_forbidden_patterns(tuple(self.FORBIDDEN_PATTERNS))
+        self.verdicts = VerdictCache(max_size=1024)
     
     def assess_risk(self, command: str) -> CommandRisk:
         """Assess the risk level of a command"""
-        
+        policy = self.policy
+        return self.verdicts.verdict(
+            command, lambda: self._assess_risk(command),
+            policy.allow_sudo, policy.allow_pipes, policy.allow_redirects
+        )
+    
+    def _assess_risk(self, command: str) -> CommandRisk:
         # Check for forbidden patterns
-        for pattern in self.FORBIDDEN_PATTERNS:
-            if re.match(pattern, command):
-                return CommandRisk.FORBIDDEN
+        if self.forbidden.match(command) is not None:
+            return CommandRisk.FORBIDDEN
         
         # Parse command
         try:
@@ -196,11 +214,17 @@ class CommandValidator:
             return True, f"Command requires confirmation (risk: {risk.value})"
         
         return True, "Command validated"
+    
+    def validate_many(self, commands: Iterable[str]) -> List[Tuple[bool, str]]:
+        """Validate a batch of commands, in order"""
+        return [self.validate_command(command) for command in commands]
 
 
 class CommandHistory:
     """Manages command history"""
     
+    max_entries = 1000  # Kept in memory and on disk
+    
     def __init__(self, history_file: Path = None):
         self.history_file = history_file or Path.home() / '.localagent' / 'shell_history.json'
         self.history: List[Dict[str, Any]] = []
@@ -211,7 +235,7 @@ class CommandHistory:
         if self.history_file.exists():
             try:
                 with open(self.history_file, 'r') as f:
-                    self.history = json.load(f)
+                    self.history = [self._compact(entry) for entry in json.load(f)[-self.max_entries:]]
             except Exception:
                 self.history = []
     
@@ -219,15 +243,27 @@ class CommandHistory:
         """Save command history to file"""
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.history_file, 'w') as f:
-            json.dump(self.history[-1000:], f, indent=2)  # Keep last 1000 commands
+            json.dump(self.history[-self.max_entries:], f, indent=2)
+    
+    @staticmethod
+    def _compact(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Share repeated command and directory strings between entries"""
+        entry['command'] = intern_category(entry.get('command'))
+        result = entry.get('result')
+        if isinstance(result, dict):
+            for key in ('command', 'working_directory'):
+                if key in result:
+                    result[key] = intern_category(result[key])
+        return entry
     
     def add_command(self, command: str, result: Dict[str, Any]):
         """Add command to history"""
-        self.history.append({
+        self.history.append(self._compact({
             'command': command,
             'timestamp': datetime.now().isoformat(),
             'result': result
-        })
+        }))
+        del self.history[:-self.max_entries]
         self.save_history()
     
     def get_recent(self, count: int = 10) -> List[Dict[str, Any]]:
@@ -13,6 +13,8 @@ from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass
 
+from .rule_engine import PatternSet, VerdictCache
+
 # Import existing security components for audit logging
 try:
     import sys
@@ -22,6 +24,60 @@ except ImportError:
     AuditLogger = None
 
 
+# Pattern rules, each set compiled into one expression and applied in a single scan
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PROVIDER_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+API_KEY_INVALID_CHARS = re.compile(r'[\x00-\x1f\x7f-\x9f\s]')
+
+API_KEY_PLACEHOLDER_RULES = PatternSet({
+    'placeholder_prefix': r'^(your|test|demo|example|placeholder)',
+    'placeholder_suffix': r'(key|token|secret)$',
+    'trivial_prefix': r'^(abc|123|xxx)',
+})
+
+DANGEROUS_COMMAND_RULES = PatternSet({
+    'chained_rm': r';.*rm\s+',  # Command chaining with rm
+    'and_rm': r'&&.*rm\s+',  # Command chaining with rm
+    'or_rm': r'\|\|.*rm\s+',  # Command chaining with rm
+    'backticks': r'`.*`',  # Command substitution
+    'command_substitution': r'\$\(',  # Command substitution
+    'variable_substitution': r'\${',  # Variable substitution
+    'device_write': r'>\s*/dev/',  # Redirecting to devices
+    'device_read': r'<\s*/dev/',  # Reading from devices
+    'etc_write': r'>\s*/etc/',  # Redirecting to system configs
+    'curl_pipe': r'curl.*\|',  # Curl piping
+    'wget_pipe': r'wget.*\|',  # Wget piping
+    'netcat': r'nc\s+',  # Netcat
+    'ncat': r'ncat\s+',  # Ncat
+})
+
+SQL_INJECTION_RULES = PatternSet({
+    'single_quotes': r"'.*'",  # Single quotes
+    'double_quotes': r'".*"',  # Double quotes
+    'union_select': r'union\s+select',  # UNION SELECT
+    'drop_table': r'drop\s+table',  # DROP TABLE
+    'delete_from': r'delete\s+from',  # DELETE FROM
+    'insert_into': r'insert\s+into',  # INSERT INTO
+    'update_set': r'update\s+.*set',  # UPDATE SET
+    'line_comment': r'--',  # SQL comments
+    'block_comment': r'/\*.*\*/',  # SQL block comments
+    'extended_procedure': r'xp_',  # Extended stored procedures
+    'stored_procedure': r'sp_',  # Stored procedures
+})
+
+XSS_RULES = PatternSet({
+    'script_tag': r'<script',  # Script tags
+    'javascript_protocol': r'javascript:',  # JavaScript protocol
+    'event_handler': r'on\w+\s*=',  # Event handlers
+    'iframe_tag': r'<iframe',  # Iframe tags
+    'object_tag': r'<object',  # Object tags
+    'embed_tag': r'<embed',  # Embed tags
+    'link_tag': r'<link',  # Link tags
+    'meta_tag': r'<meta',  # Meta tags
+    'style_tag': r'<style',  # Style tags
+})
+
+
 class ValidationLevel(Enum):
     """Validation strictness levels"""
     STRICT = "strict"
@@ -127,6 +183,9 @@ class InputValidator:
         # Custom rules registry
         self.custom_rules: Dict[str, ValidationRule] = {}
         
+        # Memoized verdicts of built-in rules for repeated inputs
+        self.verdict_cache = VerdictCache()
+        
         # Validation statistics
         self.stats = {
             'validations_performed': 0,
@@ -147,8 +206,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_pattern, value) is not None
+        return EMAIL_PATTERN.match(value) is not None
     
     def _sanitize_email(self, value: str) -> str:
         """Sanitize email address"""
@@ -194,22 +252,11 @@ class InputValidator:
             return False
         
         # Should not contain control characters or spaces
-        if re.search(r'[\x00-\x1f\x7f-\x9f\s]', value):
+        if API_KEY_INVALID_CHARS.search(value):
             return False
         
         # Should not be a common placeholder
-        placeholder_patterns = [
-            r'^(your|test|demo|example|placeholder)',
-            r'(key|token|secret)$',
-            r'^(abc|123|xxx)',
-        ]
-        
-        value_lower = value.lower()
-        for pattern in placeholder_patterns:
-            if re.search(pattern, value_lower):
-                return False
-        
-        return True
+        return API_KEY_PLACEHOLDER_RULES.search(value.lower()) is None
     
     def _sanitize_api_key(self, value: str) -> str:
         """Sanitize API key (minimal processing to preserve validity)"""
@@ -229,7 +276,7 @@ class InputValidator:
             return False
         
         # Character set: alphanumeric, hyphens, underscores
-        if not re.match(r'^[a-zA-Z0-9_-]+$', value):
+        if not PROVIDER_NAME_PATTERN.match(value):
             return False
         
         return True
@@ -322,29 +369,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
         
-        # Dangerous command patterns
-        dangerous_patterns = [
-            r';.*rm\s+',  # Command chaining with rm
-            r'&&.*rm\s+',  # Command chaining with rm
-            r'\|\|.*rm\s+',  # Command chaining with rm
-            r'`.*`',  # Command substitution
-            r'\$\(',  # Command substitution
-            r'\${',  # Variable substitution
-            r'>\s*/dev/',  # Redirecting to devices
-            r'<\s*/dev/',  # Reading from devices
-            r'>\s*/etc/',  # Redirecting to system configs
-            r'curl.*\|',  # Curl piping
-            r'wget.*\|',  # Wget piping
-            r'nc\s+',  # Netcat
-            r'ncat\s+',  # Ncat
-        ]
-        
-        value_lower = value.lower()
-        for pattern in dangerous_patterns:
-            if re.search(pattern, value_lower):
-                return False
-        
-        return True
+        return DANGEROUS_COMMAND_RULES.search(value.lower()) is None
     
     def _sanitize_command(self, value: str) -> str:
         """Sanitize command (very restrictive)"""
@@ -367,27 +392,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
         
-        # SQL injection patterns
-        sql_patterns = [
-            r"'.*'",  # Single quotes
-            r'".*"',  # Double quotes
-            r'union\s+select',  # UNION SELECT
-            r'drop\s+table',  # DROP TABLE
-            r'delete\s+from',  # DELETE FROM
-            r'insert\s+into',  # INSERT INTO
-            r'update\s+.*set',  # UPDATE SET
-            r'--',  # SQL comments
-            r'/\*.*\*/',  # SQL block comments
-            r'xp_',  # Extended stored procedures
-            r'sp_',  # Stored procedures
-        ]
-        
-        value_lower = value.lower()
-        for pattern in sql_patterns:
-            if re.search(pattern, value_lower):
-                return False
-        
-        return True
+        return SQL_INJECTION_RULES.search(value.lower()) is None
     
     def _sanitize_sql(self, value: str) -> str:
         """Sanitize string to prevent SQL injection"""
@@ -408,25 +413,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
         
-        # XSS patterns
-        xss_patterns = [
-            r'<script',  # Script tags
-            r'javascript:',  # JavaScript protocol
-            r'on\w+\s*=',  # Event handlers
-            r'<iframe',  # Iframe tags
-            r'<object',  # Object tags
-            r'<embed',  # Embed tags
-            r'<link',  # Link tags
-            r'<meta',  # Meta tags
-            r'<style',  # Style tags
-        ]
-        
-        value_lower = value.lower()
-        for pattern in xss_patterns:
-            if re.search(pattern, value_lower):
-                return False
-        
-        return True
+        return XSS_RULES.search(value.lower()) is None
     
     def _sanitize_html(self, value: str) -> str:
         """Sanitize HTML to prevent XSS"""
@@ -492,7 +479,7 @@ class InputValidator:
                 
                 # Apply validation
                 try:
-                    is_valid = rule.validator(value)
+                    is_valid = self._check_rule(rule_name, rule, value)
                     
                     if not is_valid:
                         result['valid'] = False
@@ -550,6 +537,31 @@ class InputValidator:
                 'field_name': field_name
             }
     
+    def _check_rule(self, rule_name: str, rule: ValidationRule, value: Any) -> bool:
+        """Run a rule's validator, reusing cached verdicts of built-in rules"""
+        if self.built_in_rules.get(rule_name) is not rule:
+            return rule.validator(value)
+        return self.verdict_cache.verdict(value, lambda: rule.validator(value), rule_name, self.level)
+    
+    def validate_many(self,
+                      values: List[Any],
+                      rules: List[str],
+                      field_name: str = None,
+                      sanitize: bool = True) -> List[Dict[str, Any]]:
+        """
+        Validate a batch of values against the same rules
+        
+        Args:
+            values: Values to validate
+            rules: List of rule names to apply to every value
+            field_name: Name of the field being validated
+            sanitize: Whether to sanitize the values
+        
+        Returns:
+            One validation result per value, in order
+        """
+        return [self.validate(value, rules, field_name, sanitize) for value in values]
+    
     def validate_dict(self, 
                      data: Dict[str, Any],
                      schema: Dict[str, List[str]],
@@ -614,6 +626,7 @@ class InputValidator:
             'validation_level': self.level.value,
             'built_in_rules_count': len(self.built_in_rules),
             'custom_rules_count': len(self.custom_rules),
+            'verdict_cache': self.verdict_cache.get_stats(),
             'success_rate': (
                 (self.stats['validations_performed'] - self.stats['validations_failed']) /
                 max(self.stats['validations_performed'], 1)
@@ -0,0 +1,104 @@
+"""
+Compiled Validation Rules
+Pattern rules combined into one regular expression per rule set, so each input
+is scanned in a single pass, plus a bounded LRU of verdicts for inputs that are
+validated again and again (the same command, the same config value on every load)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, TypeVar, Union
+
+T = TypeVar('T')
+
+
+class PatternSet:
+    """
+    Named patterns compiled into a single alternation
+
+    Every pattern becomes a named group of one regular expression, so finding
+    whether any of them applies costs one call instead of one per pattern, and
+    the group that matched names the rule. ``prefix`` is compiled once in front
+    of the alternation (e.g. a leading ``.*`` shared by all patterns).
+    Patterns must not use numbered backreferences.
+    """
+
+    def __init__(self, patterns: Union[Sequence[str], Dict[str, str]], flags: int = 0, prefix: str = ''):
+        if not isinstance(patterns, dict):
+            patterns = {f"pattern_{index}": pattern for index, pattern in enumerate(patterns)}
+        self.patterns = dict(patterns)
+        self.names = list(self.patterns)
+        alternation = '|'.join(
+            f'(?P<_{index}>{pattern})' for index, pattern in enumerate(self.patterns.values())
+        )
+        self.regex = re.compile(f'{prefix}(?:{alternation})', flags)
+
+    def _rule(self, match: Optional[re.Match]) -> Optional[str]:
+        return self.names[int(match.lastgroup[1:])] if match else None
+
+    def search(self, value: str) -> Optional[str]:
+        """Name of a pattern found anywhere in ``value``, None if there is none"""
+        return self._rule(self.regex.search(value))
+
+    def match(self, value: str) -> Optional[str]:
+        """Name of a pattern matching at the start of ``value``, None if there is none"""
+        return self._rule(self.regex.match(value))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+class VerdictCache:
+    """
+    Bounded LRU of validation verdicts
+
+    Only string inputs up to ``max_input_length`` characters are cached; any
+    ``context`` the verdict depends on (rule name, validation level, policy
+    flags) is part of the key.
+    """
+
+    def __init__(self, max_size: int = 4096, max_input_length: int = 4096):
+        self.max_size = max_size
+        self.max_input_length = max_input_length
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def verdict(self, value: Any, compute: Callable[[], T], *context: Hashable) -> T:
+        """Cached verdict for ``value`` under ``context``, computed on a miss"""
+        if not isinstance(value, str) or len(value) > self.max_input_length:
+            return compute()
+
+        key = (value,) + context
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,300 @@
+"""
+Persistent Incremental File Index
+On-disk path index with background builds and directory-mtime refresh for
+interactive fuzzy file matching
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Set, Tuple, Callable
+from dataclasses import dataclass
+
+
+INDEX_VERSION = 1
+DEFAULT_CACHE_DIR = Path.home() / ".localagent" / "cache" / "file_index"
+
+# VCS metadata, dependency trees and build/cache output nobody searches for by name
+DEFAULT_IGNORE_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".tox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".idea", ".vscode",
+    "build", "dist", ".eggs"
+})
+
+
+def _char_mask(text: str) -> int:
+    """64-bit presence mask of the characters in ``text``"""
+    mask = 0
+    for char in text:
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+@dataclass
+class IndexedFile:
+    """One file known to the index"""
+    rel_path: str
+    name_lower: str
+    name_mask: int
+    mtime: float
+    size: int
+
+
+class FileIndex:
+    """
+    Persistent index of every file below a root directory
+
+    The first build walks the tree once with ``os.scandir`` (in a background
+    thread when started through ``start_background_build``) and persists the
+    path list, file mtimes/sizes and directory mtimes. Later refreshes only
+    rescan directories whose mtime changed, which is how file additions,
+    removals and renames become visible. Each entry keeps its lowercase file
+    name and a character mask so queries can reject hopeless candidates
+    before scoring them.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        cache_dir: Optional[Path] = None,
+        ignore_dirs: Optional[Set[str]] = None,
+        refresh_interval: float = 2.0
+    ):
+        self.root = Path(root)
+        self.abs_root = self.root.resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.ignore_dirs = set(DEFAULT_IGNORE_DIRS if ignore_dirs is None else ignore_dirs)
+        self.refresh_interval = refresh_interval
+
+        root_key = hashlib.sha1(str(self.abs_root).encode()).hexdigest()[:16]
+        self.index_file = self.cache_dir / f"{root_key}.json"
+
+        self._files: Dict[str, IndexedFile] = {}
+        self._dirs: Dict[str, int] = {}  # relative dir -> st_mtime_ns
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._builder: Optional[threading.Thread] = None
+        self._last_refresh = 0.0
+        self._dirty = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def start_background_build(self) -> threading.Thread:
+        """Load or build the index in a daemon thread"""
+        with self._lock:
+            if self._builder is None or not self._builder.is_alive():
+                self._builder = threading.Thread(
+                    target=self.ensure_current,
+                    name=f"file-index-{self.abs_root.name}",
+                    daemon=True
+                )
+                self._builder.start()
+            return self._builder
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first load or build has finished"""
+        if not self.ready:
+            self.start_background_build()
+        return self._ready.wait(timeout)
+
+    def ensure_current(self):
+        """Load the persisted index (or build it) and apply pending changes"""
+        with self._lock:
+            if not self.ready:
+                if not self._load():
+                    self._build()
+                else:
+                    self._refresh()
+                self._ready.set()
+                self._save_if_dirty()
+            elif time.monotonic() - self._last_refresh >= self.refresh_interval:
+                self._refresh()
+                self._save_if_dirty()
+
+    def refresh(self):
+        """Rescan directories whose mtime changed since the last scan"""
+        with self._lock:
+            self._refresh()
+            self._save_if_dirty()
+
+    def files(self) -> List[IndexedFile]:
+        """Snapshot of the indexed files"""
+        with self._lock:
+            return list(self._files.values())
+
+    def query(
+        self,
+        score: Callable[[str, str], float],
+        query: str,
+        min_score: float,
+        limit: int,
+        path_filter: Optional[Callable[[IndexedFile], bool]] = None
+    ) -> List[Tuple[float, IndexedFile]]:
+        """
+        Score file names against ``query`` and return the best ``limit``
+
+        ``score(query_lower, name_lower)`` is only called for names that
+        contain enough of the query's characters to possibly reach
+        ``min_score``.
+        """
+        query_lower = query.lower()
+        if not query_lower:
+            return []
+        query_bits = [1 << (ord(char) & 63) for char in query_lower]
+        query_len = len(query_bits)
+        # Scores are bounded by the share of query characters present in the name
+        required = min_score * query_len
+
+        scored = []
+        for entry in self.files():
+            mask = entry.name_mask
+            present = 0
+            for bit in query_bits:
+                if mask & bit:
+                    present += 1
+            if present < required:
+                continue
+            if path_filter is not None and not path_filter(entry):
+                continue
+            confidence = score(query_lower, entry.name_lower)
+            if confidence >= min_score:
+                scored.append((confidence, entry))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:limit]
+
+    def _build(self):
+        self._files = {}
+        self._dirs = {}
+        self._scan_tree('')
+        self._last_refresh = time.monotonic()
+        self._dirty = True
+
+    def _scan_tree(self, rel_dir: str):
+        """Recursively index ``rel_dir`` and everything below it"""
+        pending = [rel_dir]
+        while pending:
+            current = pending.pop()
+            pending.extend(self._scan_dir(current))
+
+    def _scan_dir(self, rel_dir: str) -> List[str]:
+        """Index the direct children of one directory; returns its subdirectories"""
+        abs_dir = self.abs_root / rel_dir if rel_dir else self.abs_root
+        subdirs = []
+        try:
+            self._dirs[rel_dir] = os.stat(abs_dir).st_mtime_ns
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignore_dirs:
+                                subdirs.append(rel)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            name_lower = entry.name.lower()
+                            self._files[rel] = IndexedFile(
+                                rel_path=rel,
+                                name_lower=name_lower,
+                                name_mask=_char_mask(name_lower),
+                                mtime=st.st_mtime,
+                                size=st.st_size
+                            )
+                    except OSError:
+                        continue
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            self._dirs.pop(rel_dir, None)
+        return subdirs
+
+    def _refresh(self):
+        """Rescan changed directories, dropping vanished subtrees"""
+        changed = []
+        for rel_dir, mtime_ns in list(self._dirs.items()):
+            abs_dir = self.abs_root / rel_dir if rel_dir else self.abs_root
+            try:
+                current = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                self._drop_subtree(rel_dir)
+                self._dirty = True
+                continue
+            if current != mtime_ns:
+                changed.append(rel_dir)
+
+        if changed:
+            self._dirty = True
+            changed_set = set(changed)
+            # Forget the direct children of changed directories, then rescan them
+            for rel in [r for r in self._files if self._parent(r) in changed_set]:
+                del self._files[rel]
+            known_subdirs: Dict[str, Set[str]] = {rel_dir: set() for rel_dir in changed}
+            for d in self._dirs:
+                if d and self._parent(d) in changed_set:
+                    known_subdirs[self._parent(d)].add(d)
+
+            for rel_dir in changed:
+                if rel_dir not in self._dirs:
+                    continue  # Removed along with a parent
+                found_subdirs = set(self._scan_dir(rel_dir))
+                for gone in known_subdirs[rel_dir] - found_subdirs:
+                    self._drop_subtree(gone)
+                for new in found_subdirs - known_subdirs[rel_dir]:
+                    self._scan_tree(new)
+
+        self._last_refresh = time.monotonic()
+
+    @staticmethod
+    def _parent(rel: str) -> str:
+        return rel.rsplit('/', 1)[0] if '/' in rel else ''
+
+    def _drop_subtree(self, rel_dir: str):
+        prefix = f"{rel_dir}/"
+        for rel in [r for r in self._files if r.startswith(prefix)]:
+            del self._files[rel]
+        for d in [d for d in self._dirs if d == rel_dir or d.startswith(prefix)]:
+            del self._dirs[d]
+
+    def _load(self) -> bool:
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if data.get('version') != INDEX_VERSION or data.get('root') != str(self.abs_root):
+            return False
+        if sorted(data.get('ignore_dirs', [])) != sorted(self.ignore_dirs):
+            return False
+
+        self._files = {}
+        for rel, mtime, size in data.get('files', []):
+            name_lower = rel.rsplit('/', 1)[-1].lower()
+            self._files[rel] = IndexedFile(rel, name_lower, _char_mask(name_lower), mtime, size)
+        self._dirs = {d: int(m) for d, m in data.get('dirs', {}).items()}
+        return True
+
+    def _save_if_dirty(self):
+        if not self._dirty:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'root': str(self.abs_root),
+            'ignore_dirs': sorted(self.ignore_dirs),
+            'files': [[f.rel_path, f.mtime, f.size] for f in self._files.values()],
+            'dirs': self._dirs
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except OSError:
+            pass  # The in-memory index still works without persistence
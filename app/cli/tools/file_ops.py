@@ -37,6 +37,8 @@ from rich.prompt import Confirm, Prompt
 from rich.prompt import Prompt, Confirm
 # from inquirerpy.base.control import Choice
 
+from ..io.execution_plan import WaveExecutor, plan_waves
+
 
 class FileOperation(Enum):
     """Supported file operations"""
@@ -100,9 +102,10 @@ class OperationContext:
 class FileProcessor:
     """Core file processing engine"""
     
-    def __init__(self, console: Optional[Console] = None):
+    def __init__(self, console: Optional[Console] = None, max_workers: Optional[int] = None):
         self.console = console or Console()
         self.operation_history: List[FileOperationResult] = []
+        self.executor = WaveExecutor(max_workers)
     
     async def process_files(
         self, 
@@ -206,7 +209,14 @@ class FileProcessor:
     ) -> List[FileOperationResult]:
         """Execute the file operations with progress tracking"""
         
-        results = []
+        results: List[Optional[FileOperationResult]] = [None] * len(files)
+        completed = 0
+        
+        # Operations on independent paths run concurrently, wave by wave
+        waves = plan_waves(
+            enumerate(files),
+            lambda item: self._planned_paths(context, item[1])
+        )
         
         with Progress(
             TextColumn("[progress.description]{task.description}"),
@@ -223,25 +233,32 @@ class FileProcessor:
                 total=len(files)
             )
             
-            for i, file_path in enumerate(files):
+            async def run(item: Tuple[int, Path]):
+                nonlocal completed
+                index, file_path = item
                 try:
                     result = await self._execute_single_operation(context, file_path, progress)
-                    results.append(result)
-                    
-                    if progress_callback:
-                        progress_callback(i + 1, len(files))
-                    
-                    progress.update(main_task, advance=1)
-                    
                 except Exception as e:
-                    error_result = FileOperationResult(
+                    result = FileOperationResult(
                         source_path=file_path,
                         operation=context.operation,
                         success=False,
                         error=str(e)
                     )
-                    results.append(error_result)
-                    progress.update(main_task, advance=1)
+                results[index] = result
+                completed += 1
+                
+                if progress_callback:
+                    progress_callback(completed, len(files))
+                
+                progress.update(main_task, advance=1)
+            
+            try:
+                for wave in waves:
+                    await self.executor.run_wave(wave, run)
+            finally:
+                # The pool is recreated on demand; don't keep idle threads between runs
+                self.executor.shutdown()
         
         # Display summary
         self._display_operation_summary(results, context)
@@ -251,6 +268,34 @@ class FileProcessor:
         
         return results
     
+    def _planned_paths(self, context: OperationContext, file_path: Path) -> Optional[List[Path]]:
+        """
+        Paths an operation will touch, for execution planning
+        
+        ``None`` makes the operation a barrier that runs on its own.
+        """
+        operation = context.operation
+        try:
+            if operation in (FileOperation.COPY, FileOperation.MOVE):
+                destination = self._get_destination_path(context, file_path)
+                if context.options.get('auto_rename', False) and not context.overwrite:
+                    # Unique names are chosen by probing the destination directory
+                    return [file_path, destination.parent]
+                return [file_path, destination]
+            elif operation == FileOperation.RENAME:
+                return [file_path, file_path.parent / context.options.get('new_name', '')]
+            elif operation == FileOperation.DELETE:
+                return [file_path]
+            elif operation == FileOperation.ORGANIZE:
+                return [file_path, self._organize_destination_dir(context, file_path) / file_path.name]
+            elif operation == FileOperation.COMPRESS and context.options.get('format', 'zip') == 'zip':
+                return [file_path, file_path.with_suffix('.zip')]
+        except (OSError, ValueError):
+            return [file_path]  # The operation itself will report the error
+        
+        # Batch renames depend on a shared counter and stay in submission order
+        return None
+    
     async def _execute_single_operation(
         self, 
         context: OperationContext, 
@@ -304,19 +349,14 @@ class FileProcessor:
                 raise FileExistsError(f"Destination exists: {destination}")
             destination = self._get_unique_path(destination)
         
-        # Perform copy with progress tracking
+        # Perform copy on the worker pool
         start_time = datetime.now()
-        bytes_processed = 0
-        
-        async with aiofiles.open(file_path, 'rb') as src:
-            async with aiofiles.open(destination, 'wb') as dst:
-                while chunk := await src.read(8192):  # 8KB chunks
-                    await dst.write(chunk)
-                    bytes_processed += len(chunk)
+        await self.executor.run_blocking(shutil.copyfile, file_path, destination)
+        bytes_processed = destination.stat().st_size
         
         # Preserve permissions if requested
         if context.preserve_permissions:
-            shutil.copystat(file_path, destination)
+            await self.executor.run_blocking(shutil.copystat, file_path, destination)
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -346,7 +386,7 @@ class FileProcessor:
         bytes_processed = file_path.stat().st_size
         
         # Perform move
-        shutil.move(str(file_path), str(destination))
+        await self.executor.run_blocking(shutil.move, str(file_path), str(destination))
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -368,7 +408,7 @@ class FileProcessor:
         destination = file_path.parent / new_name
         
         start_time = datetime.now()
-        file_path.rename(destination)
+        await self.executor.run_blocking(file_path.rename, destination)
         duration = (datetime.now() - start_time).total_seconds()
         
         return FileOperationResult(
@@ -387,9 +427,9 @@ class FileProcessor:
         if context.backup:
             # Create backup before deletion
             backup_path = Path(f"{file_path}.backup.{int(start_time.timestamp())}")
-            shutil.copy2(file_path, backup_path)
+            await self.executor.run_blocking(shutil.copy2, file_path, backup_path)
         
-        file_path.unlink()
+        await self.executor.run_blocking(file_path.unlink)
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -437,6 +477,20 @@ class FileProcessor:
     
     async def _organize_file(self, context: OperationContext, file_path: Path) -> FileOperationResult:
         """Organize file according to strategy"""
+        destination_dir = self._organize_destination_dir(context, file_path)
+        
+        # Create a new context for the move operation
+        move_context = OperationContext(
+            operation=FileOperation.MOVE,
+            destination=destination_dir,
+            overwrite=context.overwrite,
+            preserve_permissions=context.preserve_permissions
+        )
+        
+        return await self._move_file(move_context, file_path)
+    
+    def _organize_destination_dir(self, context: OperationContext, file_path: Path) -> Path:
+        """Get the directory a file is organized into"""
         strategy = OrganizeStrategy(context.options.get('strategy', 'extension'))
         base_path = context.destination or Path('organized')
         
@@ -465,15 +519,7 @@ class FileProcessor:
         else:
             raise ValueError(f"Unsupported organize strategy: {strategy}")
         
-        # Create a new context for the move operation
-        move_context = OperationContext(
-            operation=FileOperation.MOVE,
-            destination=destination_dir,
-            overwrite=context.overwrite,
-            preserve_permissions=context.preserve_permissions
-        )
-        
-        return await self._move_file(move_context, file_path)
+        return destination_dir
     
     async def _batch_rename_file(self, context: OperationContext, file_path: Path) -> FileOperationResult:
         """Batch rename file according to pattern"""
@@ -4,6 +4,8 @@ Modern search interface with ripgrep integration and fzf-like features
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import re
 import shutil
@@ -19,6 +21,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.tree import Tree
+from rich.text import Text
 # TODO: Re-enable inquirerpy when properly installed
 # from inquirerpy import prompt
 # from inquirerpy.base.control import Choice
@@ -26,6 +29,8 @@ from rich.tree import Tree
 
 from rich.prompt import Prompt, Confirm
 
+from .file_index import FileIndex, IndexedFile
+
 
 class SearchType(Enum):
     """Search operation types"""
@@ -78,6 +83,9 @@ class SearchContext:
 class RipgrepIntegrator:
     """High-performance ripgrep integration"""
     
+    # Upper bound for a single ``rg --json`` record (long minified lines)
+    STREAM_LINE_LIMIT = 8 * 1024 * 1024
+    
     def __init__(self):
         self.rg_available = shutil.which('rg') is not None
         if not self.rg_available:
@@ -85,24 +93,101 @@ class RipgrepIntegrator:
     
     async def search_content(self, context: SearchContext) -> List[SearchResult]:
         """Search file contents using ripgrep"""
+        results = [result async for result in self.stream_content(context)]
+        return sorted(results, key=lambda x: x.confidence_score, reverse=True)
+    
+    async def stream_content(
+        self,
+        context: SearchContext,
+        limit: Optional[int] = -1
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Stream matches as ripgrep reports them
+        
+        ``rg --json`` output is parsed one record at a time, so the first
+        result is available as soon as ripgrep finds it. Once ``limit``
+        results (``context.max_results`` by default, ``None`` for no limit)
+        have been yielded the ripgrep process is terminated.
+        """
+        if limit == -1:
+            limit = context.max_results
         cmd = self._build_ripgrep_command(context)
         
         try:
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                limit=self.STREAM_LINE_LIMIT
             )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0 and process.returncode != 1:  # 1 is "no matches"
-                raise RuntimeError(f"ripgrep error: {stderr.decode()}")
-            
-            return self._parse_ripgrep_output(stdout.decode(), context)
-            
         except Exception as e:
             raise RuntimeError(f"Failed to execute ripgrep search: {e}")
+        
+        # Drain stderr concurrently so a chatty ripgrep can never block on it
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        stat_cache: Dict[Path, Optional[Any]] = {}
+        yielded = 0
+        exhausted = False
+        
+        try:
+            while limit is None or yielded < limit:
+                try:
+                    line = await process.stdout.readline()
+                except ValueError:
+                    # Record larger than the stream limit; skip it
+                    continue
+                if not line:
+                    exhausted = True
+                    break
+                
+                result = self._parse_ripgrep_record(line, context, stat_cache)
+                if result is None:
+                    continue
+                
+                yielded += 1
+                yield result
+        finally:
+            if not exhausted and process.returncode is None:
+                # Enough results (or the consumer stopped): stop searching
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+            if not exhausted:
+                stderr_task.cancel()
+        
+        if not exhausted:
+            return
+        
+        stderr = await stderr_task
+        if process.returncode not in (0, 1):  # 1 is "no matches"
+            raise RuntimeError(f"ripgrep error: {stderr.decode(errors='replace')}")
+    
+    async def search_content_top_k(
+        self,
+        context: SearchContext,
+        k: Optional[int] = None
+    ) -> List[SearchResult]:
+        """
+        Rank all matches and keep only the ``k`` most confident
+        
+        Memory stays bounded by ``k`` regardless of how many matches ripgrep
+        reports, since results are kept in a size-``k`` min-heap.
+        """
+        k = k or context.max_results
+        heap: List[Tuple[float, int, SearchResult]] = []
+        counter = itertools.count()
+        
+        async for result in self.stream_content(context, limit=None):
+            # Negated counter keeps earlier matches ahead on equal scores
+            entry = (result.confidence_score, -next(counter), result)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        
+        return [entry[2] for entry in sorted(heap, reverse=True)]
     
     def _build_ripgrep_command(self, context: SearchContext) -> List[str]:
         """Build optimized ripgrep command"""
@@ -160,54 +245,58 @@ class RipgrepIntegrator:
         
         return ''.join(fuzzy_chars).rstrip('.*?')
     
-    def _parse_ripgrep_output(self, output: str, context: SearchContext) -> List[SearchResult]:
-        """Parse ripgrep JSON output into SearchResult objects"""
-        results = []
+    def _parse_ripgrep_record(
+        self,
+        line,
+        context: SearchContext,
+        stat_cache: Dict[Path, Optional[Any]]
+    ) -> Optional[SearchResult]:
+        """Parse one ``rg --json`` record; returns None for non-matches"""
+        if not line or not line.strip():
+            return None
         
-        for line in output.strip().split('\n'):
-            if not line:
-                continue
-            
-            try:
-                data = json.loads(line)
-                if data.get('type') != 'match':
-                    continue
-                
-                match_data = data['data']
-                path = Path(match_data['path']['text'])
-                
-                result = SearchResult(
-                    path=path,
-                    match_type="ripgrep",
-                    line_number=match_data['line_number'],
-                    matched_text=match_data['lines']['text'].strip(),
-                    confidence_score=self._calculate_confidence(
-                        context.query, 
-                        match_data['lines']['text'],
-                        context.match_type
-                    )
-                )
-                
-                # Add file metadata
-                if path.exists():
-                    stat = path.stat()
-                    result.file_size = stat.st_size
-                    result.file_modified = stat.st_mtime
-                    result.file_type = path.suffix.lower()
-                
-                # Filter by confidence if using fuzzy matching
-                if context.match_type == MatchType.FUZZY and result.confidence_score < context.min_confidence:
-                    continue
-                
-                results.append(result)
-                
-                if len(results) >= context.max_results:
-                    break
-                    
-            except json.JSONDecodeError:
-                continue
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        if data.get('type') != 'match':
+            return None
         
-        return sorted(results, key=lambda x: x.confidence_score, reverse=True)
+        match_data = data['data']
+        path_data = match_data.get('path', {})
+        lines_data = match_data.get('lines', {})
+        if 'text' not in path_data or 'text' not in lines_data:
+            return None  # Non-UTF-8 path or line reported as bytes
+        
+        path = Path(path_data['text'])
+        text = lines_data['text']
+        confidence = self._calculate_confidence(context.query, text, context.match_type)
+        
+        # Filter by confidence if using fuzzy matching
+        if context.match_type == MatchType.FUZZY and confidence < context.min_confidence:
+            return None
+        
+        result = SearchResult(
+            path=path,
+            match_type="ripgrep",
+            line_number=match_data['line_number'],
+            matched_text=text.strip(),
+            confidence_score=confidence
+        )
+        
+        # Add file metadata (one stat per file, not per match)
+        if path not in stat_cache:
+            try:
+                stat_cache[path] = path.stat()
+            except OSError:
+                stat_cache[path] = None
+        stat = stat_cache[path]
+        if stat is not None:
+            result.file_size = stat.st_size
+            result.file_modified = stat.st_mtime
+            result.file_type = path.suffix.lower()
+        
+        return result
     
     def _calculate_confidence(self, query: str, text: str, match_type: MatchType) -> float:
         """Calculate match confidence score"""
@@ -238,45 +327,108 @@ class RipgrepIntegrator:
 class FuzzyFileMatcher:
     """Fuzzy file name matching with advanced algorithms"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
         self.cache: Dict[str, List[Path]] = {}
+        self.cache_dir = cache_dir
+        self.indexes: Dict[Path, FileIndex] = {}
+    
+    def get_index(self, root_path: Path) -> FileIndex:
+        """Get (and start building) the persistent file index for a root"""
+        key = root_path.resolve()
+        index = self.indexes.get(key)
+        if index is None:
+            index = FileIndex(root_path, cache_dir=self.cache_dir)
+            self.indexes[key] = index
+            index.start_background_build()
+        return index
+    
+    def warm(self, root_paths: Optional[List[Path]] = None):
+        """Start indexing roots in the background ahead of the first query"""
+        for root_path in root_paths or [Path('.')]:
+            if root_path.is_dir():
+                self.get_index(root_path)
     
     async def find_files(self, context: SearchContext) -> List[SearchResult]:
         """Find files using fuzzy name matching"""
-        all_files = []
+        scored: List[Tuple[float, Path, Optional[IndexedFile]]] = []
         
-        # Collect files from all root paths
         for root_path in context.root_paths or [Path('.')]:
             if root_path.is_file():
-                all_files.append(root_path)
-            else:
-                async for file_path in self._scan_directory(root_path, context):
-                    all_files.append(file_path)
+                confidence = self._calculate_file_name_confidence(context.query, root_path.name)
+                if confidence >= context.min_confidence:
+                    scored.append((confidence, root_path, None))
+                continue
+            
+            # Query the persistent index off the event loop
+            index = self.get_index(root_path)
+            matches = await asyncio.to_thread(
+                self._query_index, index, root_path, context
+            )
+            scored.extend(
+                (confidence, root_path / entry.rel_path, entry)
+                for confidence, entry in matches
+            )
+        
+        # Sort by confidence and limit results
+        scored.sort(key=lambda item: item[0], reverse=True)
         
-        # Apply fuzzy matching
         results = []
-        for file_path in all_files:
-            confidence = self._calculate_file_name_confidence(context.query, file_path.name)
+        for confidence, file_path, entry in scored[:context.max_results]:
+            result = SearchResult(
+                path=file_path,
+                match_type="fuzzy_file",
+                confidence_score=confidence,
+                file_type=file_path.suffix.lower()
+            )
             
-            if confidence >= context.min_confidence:
-                result = SearchResult(
-                    path=file_path,
-                    match_type="fuzzy_file",
-                    confidence_score=confidence,
-                    file_type=file_path.suffix.lower()
-                )
-                
-                # Add file metadata
-                if file_path.exists():
-                    stat = file_path.stat()
-                    result.file_size = stat.st_size
-                    result.file_modified = stat.st_mtime
-                
-                results.append(result)
+            # Add file metadata
+            if entry is not None:
+                result.file_size = entry.size
+                result.file_modified = entry.mtime
+            elif file_path.exists():
+                stat = file_path.stat()
+                result.file_size = stat.st_size
+                result.file_modified = stat.st_mtime
+            
+            results.append(result)
         
-        # Sort by confidence and limit results
-        results.sort(key=lambda x: x.confidence_score, reverse=True)
-        return results[:context.max_results]
+        return results
+    
+    def _query_index(
+        self,
+        index: FileIndex,
+        root_path: Path,
+        context: SearchContext
+    ) -> List[Tuple[float, IndexedFile]]:
+        """Bring the index up to date and score its file names"""
+        index.wait_ready()
+        index.ensure_current()
+        
+        path_filter = None
+        if context.exclude_patterns or context.include_patterns or context.file_types:
+            def path_filter(entry: IndexedFile) -> bool:
+                return self._passes_filters(root_path / entry.rel_path, context)
+        
+        return index.query(
+            self._calculate_file_name_confidence,
+            context.query,
+            context.min_confidence,
+            context.max_results,
+            path_filter
+        )
+    
+    def _passes_filters(self, item: Path, context: SearchContext) -> bool:
+        """Apply include/exclude patterns and file type filters"""
+        if context.exclude_patterns and any(item.match(pattern) for pattern in context.exclude_patterns):
+            return False
+        
+        if context.include_patterns and not any(item.match(pattern) for pattern in context.include_patterns):
+            return False
+        
+        if context.file_types and item.suffix.lower().lstrip('.') not in context.file_types:
+            return False
+        
+        return True
     
     async def _scan_directory(self, root_path: Path, context: SearchContext) -> AsyncGenerator[Path, None]:
         """Asynchronously scan directory with filters"""
@@ -285,15 +437,7 @@ class FuzzyFileMatcher:
                 if not item.is_file():
                     continue
                 
-                # Apply include/exclude patterns
-                if context.exclude_patterns and any(item.match(pattern) for pattern in context.exclude_patterns):
-                    continue
-                
-                if context.include_patterns and not any(item.match(pattern) for pattern in context.include_patterns):
-                    continue
-                
-                # Apply file type filters
-                if context.file_types and item.suffix.lower().lstrip('.') not in context.file_types:
+                if not self._passes_filters(item, context):
                     continue
                 
                 yield item
@@ -361,6 +505,9 @@ class SearchManager:
         self.console.print("[bold blue]🔍 LocalAgent Advanced Search[/bold blue]")
         self.console.print()
         
+        # Index the working tree while the user is still typing the query
+        self.fuzzy_matcher.warm()
+        
         # Get search parameters through interactive prompts
         context = await self._get_search_context()
         if not context:
@@ -456,8 +603,10 @@ class SearchManager:
         )
     
     async def execute_search(self, context: SearchContext) -> List[SearchResult]:
-        """Execute search with progress display"""
-        self.search_history.append(context)
+        """Execute search with progress display; content matches are shown as they arrive"""
+        streamed = context.search_type == SearchType.TEXT_CONTENT
+        if not streamed:
+            self.search_history.append(context)
         
         with Progress(
             SpinnerColumn(),
@@ -468,13 +617,16 @@ class SearchManager:
             task = progress.add_task("Searching...", total=None)
             
             try:
-                if context.search_type == SearchType.TEXT_CONTENT:
-                    if self.ripgrep:
-                        progress.update(task, description="Searching content with ripgrep...")
-                        results = await self.ripgrep.search_content(context)
-                    else:
-                        progress.update(task, description="Searching content (fallback)...")
-                        results = await self._fallback_content_search(context)
+                if streamed:
+                    description = "Searching content with ripgrep" if self.ripgrep else "Searching content (fallback)"
+                    progress.update(task, description=f"{description}...")
+                    results = []
+                    async for result in self.stream_search(context):
+                        results.append(result)
+                        # Printed above the spinner while the search continues
+                        progress.console.print(self._format_result_line(result))
+                        progress.update(task, description=f"{description}... {len(results)} matches")
+                    results.sort(key=lambda x: x.confidence_score, reverse=True)
                 
                 elif context.search_type == SearchType.FILE_NAMES:
                     progress.update(task, description="Searching file names...")
@@ -503,13 +655,37 @@ class SearchManager:
                 raise
         
         # Display results
-        self._display_results(results, context)
+        if streamed:
+            self._display_summary(results, context)
+        else:
+            self._display_results(results, context)
         
         return results
     
+    async def stream_search(self, context: SearchContext) -> AsyncGenerator[SearchResult, None]:
+        """
+        Yield content matches as soon as they are found
+        
+        Interactive views can render the first hits immediately instead of
+        waiting for the whole search to finish.
+        """
+        self.search_history.append(context)
+        
+        if self.ripgrep:
+            async for result in self.ripgrep.stream_content(context):
+                yield result
+        else:
+            async for result in self._stream_fallback_content(context):
+                yield result
+    
     async def _fallback_content_search(self, context: SearchContext) -> List[SearchResult]:
         """Fallback content search when ripgrep is not available"""
-        results = []
+        results = [result async for result in self._stream_fallback_content(context)]
+        return sorted(results, key=lambda x: x.confidence_score, reverse=True)
+    
+    async def _stream_fallback_content(self, context: SearchContext) -> AsyncGenerator[SearchResult, None]:
+        """Scan files line by line, yielding matches as they are found"""
+        found = 0
         
         for root_path in context.root_paths or [Path('.')]:
             async for file_path in self.fuzzy_matcher._scan_directory(root_path, context):
@@ -537,15 +713,14 @@ class SearchManager:
                             file_type=file_path.suffix.lower()
                         )
                         
-                        results.append(result)
+                        found += 1
+                        yield result
                         
-                        if len(results) >= context.max_results:
-                            return results
+                        if found >= context.max_results:
+                            return
                 
                 except (UnicodeDecodeError, PermissionError):
                     continue
-        
-        return sorted(results, key=lambda x: x.confidence_score, reverse=True)
     
     def _calculate_line_confidence(self, query: str, line: str) -> float:
         """Calculate confidence for fallback search"""
@@ -568,6 +743,28 @@ class SearchManager:
         overlap = len(query_chars & line_chars) / len(query_chars)
         return overlap
     
+    @staticmethod
+    def _format_result_line(result: SearchResult) -> Text:
+        """One match as ``path:line  text`` for live output"""
+        line = f":{result.line_number}" if result.line_number else ""
+        return Text.assemble(
+            (str(result.path), "bold cyan"),
+            (line, "dim"),
+            "  ",
+            ((result.matched_text or "")[:80], "yellow")  # Truncate long lines
+        )
+    
+    def _display_summary(self, results: List[SearchResult], context: SearchContext):
+        """Summarize a search whose matches were already shown as they arrived"""
+        if not results:
+            self.console.print("[yellow]No matches found.[/yellow]")
+            return
+        
+        files = len({result.path for result in results})
+        self.console.print(
+            f"\n[bold green]Found {len(results)} matches in {files} files for '{context.query}'[/bold green]"
+        )
+    
     def _display_results(self, results: List[SearchResult], context: SearchContext):
         """Display search results with rich formatting"""
         if not results:
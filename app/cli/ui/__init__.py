@@ -22,7 +22,7 @@ try:
     )
     
     from .memory_optimizer import (
-        get_memory_optimizer, intern_string, cache_styled_text,
+        get_memory_optimizer, intern_string, intern_category, cache_styled_text,
         optimized_text, optimized_console, optimize_memory, MemoryStats
     )
     
@@ -227,7 +227,7 @@ if PERFORMANCE_OPTIMIZATION_AVAILABLE:
         'get_rendering_optimizer', 'PerformanceMetrics', 'TerminalCapabilities',
         
         # Memory Optimization
-        'get_memory_optimizer', 'intern_string', 'cache_styled_text',
+        'get_memory_optimizer', 'intern_string', 'intern_category', 'cache_styled_text',
         'optimized_text', 'optimized_console', 'optimize_memory', 'MemoryStats',
         
         # Animation System
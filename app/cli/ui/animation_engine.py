@@ -320,6 +320,8 @@ class VirtualScrollView:
         # Rendering cache for performance
         self.render_cache: Dict[int, RenderableType] = {}
         self.cache_size_limit = config.buffer_size * 2
+        self._visible_key: Optional[tuple] = None
+        self._visible_items: List[RenderableType] = []
         
         # Scroll animation
         self.smooth_scroll_target = 0
@@ -373,7 +375,11 @@ class VirtualScrollView:
         )
     
     def get_visible_items(self) -> List[RenderableType]:
-        """Get currently visible items as renderables"""
+        """Get currently visible items as renderables; reuses the last list while the viewport is unchanged"""
+        key = (self.viewport_start, self.viewport_end, len(self.items))
+        if key == self._visible_key:
+            return self._visible_items
+        
         visible_items = []
         
         # Include buffer items for smooth scrolling
@@ -401,8 +407,19 @@ class VirtualScrollView:
             
             visible_items.append(rendered)
         
+        if self.config.lazy_render:
+            self._visible_key = key
+            self._visible_items = visible_items
         return visible_items
     
+    def invalidate(self, index: Optional[int] = None):
+        """Drop cached renders after items change (one item, or all when index is None)"""
+        if index is None:
+            self.render_cache.clear()
+        else:
+            self.render_cache.pop(index, None)
+        self._visible_key = None
+    
     def _item_needs_refresh(self, index: int) -> bool:
         """Check if cached item needs refresh"""
         # Simple heuristic - could be enhanced with change detection
@@ -425,7 +442,7 @@ class VirtualScrollView:
     def update_items(self, new_items: List[Any]):
         """Update the item list and refresh cache"""
         self.items = new_items
-        self.render_cache.clear()  # Clear cache on data change
+        self.invalidate()  # Clear cached renders on data change
         self._update_viewport()
     
     def render_viewport(self) -> RenderableType:
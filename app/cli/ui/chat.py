@@ -4,7 +4,9 @@ Rich-based chat interface for direct LLM interaction
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
+import json
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -23,6 +25,7 @@ from rich.live import Live
 
 from ..core.config import LocalAgentConfig
 from .display import DisplayManager
+from .chat_context import ContextWindow, TurnLog, make_token_counter
 
 
 class ChatMessage:
@@ -34,6 +37,7 @@ class ChatMessage:
         self.content = content
         self.timestamp = timestamp or datetime.now()
         self.metadata = metadata or {}
+        self.token_count: Optional[int] = None  # Cached by ContextWindow
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary for serialization"""
@@ -83,17 +87,22 @@ class ChatSession:
         """Clear message history"""
         self.messages.clear()
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert session to dictionary for serialization"""
+    def header(self) -> Dict[str, Any]:
+        """Session fields without the messages"""
         return {
             'session_name': self.session_name,
             'provider': self.provider,
             'model': self.model,
             'created_at': self.created_at.isoformat(),
-            'metadata': self.metadata,
-            'messages': [msg.to_dict() for msg in self.messages]
+            'metadata': self.metadata
         }
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert session to dictionary for serialization"""
+        data = self.header()
+        data['messages'] = [msg.to_dict() for msg in self.messages]
+        return data
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChatSession':
         """Create session from dictionary"""
@@ -112,11 +121,19 @@ class InteractiveChatSession:
     """
     Interactive chat interface with Rich formatting
     Provides a conversational interface to LLM providers
+    
+    Responses are streamed into a live panel when the provider supports
+    it. Each turn sends only a token-budgeted ContextWindow (pinned system
+    prompt, summary of older turns, recent turns verbatim) and appends the
+    new messages to the session's TurnLog instead of rewriting it.
     """
     
     def __init__(self, config: LocalAgentConfig, provider: Optional[str] = None,
                  model: Optional[str] = None, session_name: Optional[str] = None,
-                 display_manager: Optional[DisplayManager] = None):
+                 display_manager: Optional[DisplayManager] = None,
+                 system_prompt: Optional[str] = None,
+                 context_tokens: int = 8192,
+                 reserve_tokens: int = 1024):
         self.config = config
         self.console = Console()
         self.display_manager = display_manager or DisplayManager(self.console)
@@ -130,11 +147,19 @@ class InteractiveChatSession:
         self.session = ChatSession(self.session_name, self.provider, self.model)
         self.is_running = False
         self.provider_instance = None
+        self.context_window = ContextWindow(
+            max_tokens=context_tokens,
+            reserve_tokens=reserve_tokens,
+            system_prompt=system_prompt,
+            count_tokens=make_token_counter(self.provider, self.model)
+        )
+        self._persisted_count = 0
         
         # UI settings
         self.show_timestamps = True
         self.show_metadata = False
         self.auto_save = True
+        self.stream_responses = True
         self.max_display_messages = 10
     
     async def start(self) -> None:
@@ -221,7 +246,7 @@ Start chatting by typing your message!
                     continue
                 
                 # Add user message
-                self.session.add_message('user', user_input)
+                self._add_message('user', user_input)
                 
                 # Get AI response
                 await self._get_ai_response(user_input)
@@ -250,27 +275,61 @@ Start chatting by typing your message!
             self.is_running = False
             return ""
     
+    def _add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> ChatMessage:
+        """Add a message to the session and the context window"""
+        message = self.session.add_message(role, content, metadata)
+        self.context_window.add(message)
+        return message
+    
     async def _get_ai_response(self, user_input: str) -> None:
-        """Get response from AI provider"""
-        # Show typing indicator
-        with self.display_manager.create_simple_progress("🤖 Thinking..."):
-            try:
-                # Get response from provider
-                response = await self.provider_instance.generate_response(
-                    user_input, 
-                    self.session.get_history()
-                )
-                
-                # Add AI response
-                ai_message = self.session.add_message('assistant', response['content'], response.get('metadata'))
-                
-                # Display response
-                self._display_ai_message(ai_message)
-                
-            except Exception as e:
-                self.display_manager.print_error(f"Failed to get AI response: {e}")
-                # Add error message to session
-                self.session.add_message('system', f"Error: {e}")
+        """Get response from AI provider, streaming it when supported"""
+        messages = self.context_window.build_messages()
+        
+        try:
+            if self.stream_responses and hasattr(self.provider_instance, 'stream_response'):
+                content, metadata = await self._stream_ai_response(messages)
+            else:
+                # Show typing indicator
+                with self.display_manager.create_simple_progress("🤖 Thinking..."):
+                    response = await self.provider_instance.generate_response(user_input, messages)
+                content, metadata = response['content'], response.get('metadata')
+            
+            # Add AI response
+            ai_message = self._add_message('assistant', content, metadata)
+            
+            # Display response
+            self._display_ai_message(ai_message)
+            
+        except Exception as e:
+            self.display_manager.print_error(f"Failed to get AI response: {e}")
+            # Add error message to session
+            self._add_message('system', f"Error: {e}")
+    
+    async def _stream_ai_response(self, messages: List[Dict[str, str]]) -> Tuple[str, Dict[str, Any]]:
+        """Render chunks into a live panel as they arrive"""
+        started = time.perf_counter()
+        first_chunk_at = None
+        chunks: List[str] = []
+        text = Text()
+        panel = Panel(text, title="[bold blue]Assistant[/bold blue]", border_style="blue", padding=(1, 2))
+        
+        # Live redraws on its own timer, so appending to the Text is all a chunk costs
+        with Live(panel, console=self.console, refresh_per_second=12, transient=True):
+            async for chunk in self.provider_instance.stream_response(messages):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter() - started
+                chunks.append(chunk)
+                text.append(chunk)
+        
+        elapsed = time.perf_counter() - started
+        return "".join(chunks), {
+            'provider': self.provider,
+            'model': self.model,
+            'streamed': True,
+            'time_to_first_token': round(first_chunk_at if first_chunk_at is not None else elapsed, 3),
+            'response_time': round(elapsed, 3),
+            'context_tokens': self.context_window.used_tokens
+        }
     
     def _display_ai_message(self, message: ChatMessage) -> None:
         """Display AI response message"""
@@ -401,6 +460,11 @@ Start chatting by typing your message!
         confirm = Prompt.ask("Clear conversation history? [y/N]", default="n")
         if confirm.lower() == 'y':
             self.session.clear_history()
+            self.context_window.reset()
+            log = self._session_log()
+            if log.exists():
+                log.append_clear()
+            self._persisted_count = 0
             self.display_manager.print_success("Conversation history cleared")
         else:
             self.display_manager.print_info("Clear cancelled")
@@ -445,6 +509,9 @@ Start chatting by typing your message!
         settings_table.add_row("show_timestamps", "✓" if self.show_timestamps else "✗", "Show message timestamps")
         settings_table.add_row("show_metadata", "✓" if self.show_metadata else "✗", "Show response metadata")
         settings_table.add_row("auto_save", "✓" if self.auto_save else "✗", "Auto-save session")
+        settings_table.add_row("stream_responses", "✓" if self.stream_responses else "✗", "Stream responses as they arrive")
+        window = self.context_window.stats()
+        settings_table.add_row("context_tokens", f"{window['used_tokens']}/{window['budget']}", "Tokens sent per turn / budget")
         settings_table.add_row("max_display_messages", str(self.max_display_messages), "Max messages to display")
         
         self.console.print(settings_table)
@@ -530,45 +597,63 @@ Start chatting by typing your message!
         from ..io.atomic import AtomicFileManager
         await AtomicFileManager.write_text(filepath, content)
     
+    def _session_log(self, session_name: Optional[str] = None) -> TurnLog:
+        """Append-only turn log for a session"""
+        return TurnLog(self.config.config_dir / "chat_sessions" / f"{session_name or self.session_name}.jsonl")
+    
     async def _save_session(self) -> None:
-        """Save session to file"""
-        session_file = self.config.config_dir / "chat_sessions" / f"{self.session_name}.json"
-        session_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        from ..io.atomic import AtomicFileManager
-        await AtomicFileManager.write_json(session_file, self.session.to_dict())
+        """Append messages added since the last save to the turn log"""
+        log = self._session_log()
+        log.write_header(self.session.header())
+        log.append_messages([msg.to_dict() for msg in self.session.messages[self._persisted_count:]])
+        self._persisted_count = len(self.session.messages)
+    
+    def _read_session(self, session_name: str) -> Optional[Tuple[ChatSession, int]]:
+        """Read a saved session and how many of its messages are already in the turn log"""
+        log = self._session_log(session_name)
+        if log.exists():
+            header, messages = log.replay()
+            defaults = {
+                'session_name': session_name,
+                'provider': self.provider,
+                'created_at': datetime.now().isoformat()
+            }
+            session = ChatSession.from_dict({**defaults, **header, 'messages': messages})
+            return session, len(session.messages)
+        
+        # Sessions saved before the turn log were single JSON documents
+        legacy_file = self.config.config_dir / "chat_sessions" / f"{session_name}.json"
+        if legacy_file.exists():
+            with open(legacy_file, 'r') as f:
+                return ChatSession.from_dict(json.load(f)), 0
+        return None
+    
+    def _use_session(self, session: ChatSession, persisted_count: int) -> None:
+        self.session = session
+        self._persisted_count = persisted_count
+        self.context_window.reset()
+        self.context_window.extend(session.messages)
     
     async def _load_session_history(self) -> None:
         """Load existing session history if available"""
-        session_file = self.config.config_dir / "chat_sessions" / f"{self.session_name}.json"
-        
-        if session_file.exists():
-            try:
-                import json
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                loaded_session = ChatSession.from_dict(session_data)
-                self.session = loaded_session
+        try:
+            loaded = self._read_session(self.session_name)
+            if loaded:
+                self._use_session(*loaded)
                 
                 if self.session.messages:
                     self.display_manager.print_info(f"Loaded {len(self.session.messages)} previous messages")
-            
-            except Exception as e:
-                self.display_manager.print_warning(f"Could not load session history: {e}")
+        
+        except Exception as e:
+            self.display_manager.print_warning(f"Could not load session history: {e}")
     
     async def _load_session(self, session_name: str) -> None:
         """Load a specific saved session"""
-        session_file = self.config.config_dir / "chat_sessions" / f"{session_name}.json"
-        
-        if not session_file.exists():
+        loaded = self._read_session(session_name)
+        if not loaded:
             raise FileNotFoundError(f"Session '{session_name}' not found")
         
-        import json
-        with open(session_file, 'r') as f:
-            session_data = json.load(f)
-        
-        self.session = ChatSession.from_dict(session_data)
+        self._use_session(*loaded)
         self.session_name = session_name
     
     async def _list_saved_sessions(self) -> List[str]:
@@ -578,9 +663,10 @@ Start chatting by typing your message!
         if not sessions_dir.exists():
             return []
         
-        sessions = []
-        for session_file in sessions_dir.glob("*.json"):
-            sessions.append(session_file.stem)
+        sessions = set()
+        for pattern in ("*.jsonl", "*.json"):
+            for session_file in sessions_dir.glob(pattern):
+                sessions.add(session_file.stem)
         
         return sorted(sessions)
     
@@ -602,12 +688,8 @@ class MockProviderInterface:
         self.provider = provider
         self.model = model
     
-    async def generate_response(self, user_input: str, history: List[ChatMessage]) -> Dict[str, Any]:
-        """Generate a mock response"""
-        # Simulate processing time
-        await asyncio.sleep(1)
-        
-        # Mock response based on provider
+    def _response_text(self, user_input: str) -> str:
+        """Mock response based on provider"""
         responses = {
             'ollama': f"[Ollama/{self.model or 'default'}] This is a simulated response to: {user_input}",
             'openai': f"[OpenAI/{self.model or 'gpt-4'}] This is a simulated response to: {user_input}",
@@ -615,7 +697,14 @@ class MockProviderInterface:
             'perplexity': f"[Perplexity/{self.model or 'default'}] This is a simulated response to: {user_input}"
         }
         
-        response_text = responses.get(self.provider, f"[{self.provider}] Simulated response: {user_input}")
+        return responses.get(self.provider, f"[{self.provider}] Simulated response: {user_input}")
+    
+    async def generate_response(self, user_input: str, history: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Generate a mock response"""
+        # Simulate processing time
+        await asyncio.sleep(1)
+        
+        response_text = self._response_text(user_input)
         
         return {
             'content': response_text,
@@ -625,4 +714,12 @@ class MockProviderInterface:
                 'tokens_used': len(user_input.split()) * 2,
                 'response_time': 1.0
             }
-        }
\ No newline at end of file
+        }
+    
+    async def stream_response(self, messages: List[Dict[str, str]],
+                              chunk_delay: float = 0.03) -> AsyncIterator[str]:
+        """Stream a mock response word by word"""
+        user_input = next((m['content'] for m in reversed(messages) if m['role'] == 'user'), "")
+        for i, word in enumerate(self._response_text(user_input).split(" ")):
+            await asyncio.sleep(chunk_delay)
+            yield word if i == 0 else " " + word
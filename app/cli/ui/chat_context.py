@@ -0,0 +1,209 @@
+"""
+Chat Context Window and Turn Log
+Token-budgeted conversation window and append-only session persistence
+"""
+
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap fallback estimate of roughly four characters per token"""
+    return len(text) // 4 + 1 if text else 0
+
+
+def make_token_counter(provider: str, model: Optional[str] = None) -> Callable[[str], int]:
+    """Token counter for a provider, using the provider-specific estimators when available"""
+    try:
+        from ...llm_providers.token_counter import get_global_token_manager
+        counter = get_global_token_manager().get_counter(provider)
+    except ImportError:
+        return estimate_tokens
+    return lambda text: counter.count_tokens(text, model)
+
+
+class ContextWindow:
+    """
+    Rolling, token-budgeted view of a conversation
+
+    The system prompt is always sent. Of the remaining ``max_tokens -
+    reserve_tokens``, ``summary_tokens`` are set aside for a short
+    extractive summary of evicted messages (oldest lines dropped first)
+    and recent messages are kept verbatim in the rest. Token counts are
+    computed once per message and cached, and the window only moves
+    forward, so each turn costs time proportional to the new messages
+    rather than the length of the conversation.
+    """
+
+    def __init__(self,
+                 max_tokens: int = 8192,
+                 reserve_tokens: int = 1024,
+                 summary_tokens: int = 512,
+                 min_recent_messages: int = 2,
+                 system_prompt: Optional[str] = None,
+                 count_tokens: Callable[[str], int] = estimate_tokens):
+        self.max_tokens = max_tokens
+        self.reserve_tokens = reserve_tokens
+        self.summary_tokens = summary_tokens
+        self.min_recent_messages = min_recent_messages
+        self.count_tokens = count_tokens
+
+        self.system_prompt = system_prompt
+        self.system_tokens = self._message_tokens(system_prompt) if system_prompt else 0
+
+        self._recent: Deque[Tuple[Any, int]] = deque()
+        self._recent_tokens = 0
+        self._summary: Deque[Tuple[str, int]] = deque()
+        self._summary_tokens = 0
+        self.dropped_messages = 0
+
+    def _message_tokens(self, content: str) -> int:
+        return self.count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def _tokens_for(self, message: Any) -> int:
+        if message.token_count is None:
+            message.token_count = self._message_tokens(message.content)
+        return message.token_count
+
+    @property
+    def budget(self) -> int:
+        """Tokens available to the system prompt, summary and recent messages"""
+        return self.max_tokens - self.reserve_tokens
+
+    @property
+    def recent_budget(self) -> int:
+        """Tokens available to verbatim messages"""
+        summary = self.summary_tokens + MESSAGE_OVERHEAD_TOKENS if self.summary_tokens > 0 else 0
+        return self.budget - self.system_tokens - summary
+
+    @property
+    def used_tokens(self) -> int:
+        summary = self._summary_tokens + MESSAGE_OVERHEAD_TOKENS if self._summary else 0
+        return self.system_tokens + summary + self._recent_tokens
+
+    def add(self, message: Any) -> None:
+        """Append a message and evict the oldest ones that no longer fit"""
+        if message.role not in ('user', 'assistant'):
+            return
+        tokens = self._tokens_for(message)
+        self._recent.append((message, tokens))
+        self._recent_tokens += tokens
+
+        while len(self._recent) > self.min_recent_messages and self._recent_tokens > self.recent_budget:
+            evicted, evicted_tokens = self._recent.popleft()
+            self._recent_tokens -= evicted_tokens
+            self._summarize(evicted)
+
+    def extend(self, messages: List[Any]) -> None:
+        for message in messages:
+            self.add(message)
+
+    def _summarize(self, message: Any) -> None:
+        if self.summary_tokens <= 0:
+            self.dropped_messages += 1
+            return
+
+        text = " ".join(message.content.split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+        line = f"{message.role}: {text}"
+        tokens = self.count_tokens(line)
+        self._summary.append((line, tokens))
+        self._summary_tokens += tokens
+
+        while self._summary and self._summary_tokens > self.summary_tokens:
+            _, line_tokens = self._summary.popleft()
+            self._summary_tokens -= line_tokens
+            self.dropped_messages += 1
+
+    def reset(self) -> None:
+        self._recent.clear()
+        self._recent_tokens = 0
+        self._summary.clear()
+        self._summary_tokens = 0
+        self.dropped_messages = 0
+
+    def build_messages(self) -> List[Dict[str, str]]:
+        """Messages to send to the provider for the next turn"""
+        messages: List[Dict[str, str]] = []
+        if self.system_prompt:
+            messages.append({'role': 'system', 'content': self.system_prompt})
+        if self._summary:
+            summary = "\n".join(line for line, _ in self._summary)
+            messages.append({'role': 'system', 'content': f"Summary of earlier conversation:\n{summary}"})
+        messages.extend({'role': m.role, 'content': m.content} for m, _ in self._recent)
+        return messages
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'used_tokens': self.used_tokens,
+            'budget': self.budget,
+            'recent_messages': len(self._recent),
+            'summary_lines': len(self._summary),
+            'dropped_messages': self.dropped_messages
+        }
+
+
+class TurnLog:
+    """
+    Append-only JSON-lines log of a chat session
+
+    The first record holds the session header; each message is appended
+    as its own record and ``/clear`` is recorded as a marker, so saving a
+    turn costs one small append regardless of conversation length.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+            f.flush()
+
+    def write_header(self, header: Dict[str, Any]) -> None:
+        if not self.exists():
+            self._append([dict(header, type='session')])
+
+    def append_messages(self, messages: List[Dict[str, Any]]) -> None:
+        if messages:
+            self._append([dict(message, type='message') for message in messages])
+
+    def append_clear(self) -> None:
+        self._append([{'type': 'clear', 'timestamp': datetime.now().isoformat()}])
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Records in order, skipping a torn final line"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable record in {self.path}")
+
+    def replay(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Session header and the messages since the last clear"""
+        header: Dict[str, Any] = {}
+        messages: List[Dict[str, Any]] = []
+        for record in self.records():
+            kind = record.pop('type', None)
+            if kind == 'session':
+                header = record
+            elif kind == 'message':
+                messages.append(record)
+            elif kind == 'clear':
+                messages.clear()
+        return header, messages
@@ -0,0 +1,206 @@
+"""
+Dirty-Region Diff Renderer
+Keeps the previous frame's cells and emits only changed regions as ANSI
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from rich.cells import cell_len
+from rich.console import Console, RenderableType
+from rich.segment import Segment
+from rich.style import Style
+
+from .performance_monitor import FrameRateMonitor
+
+Cell = Tuple[str, Optional[Style]]
+Line = Tuple[Segment, ...]
+
+_UNSET = object()
+
+
+def line_cells(line: Line) -> List[Cell]:
+    """Explode a rendered line into one (text, style) entry per terminal column
+
+    The second column of a wide character is an empty placeholder and
+    zero-width characters are attached to the preceding cell.
+    """
+    cells: List[Cell] = []
+    for segment in line:
+        if segment.control:
+            continue
+        style = segment.style
+        for char in segment.text:
+            width = cell_len(char)
+            if width == 0:
+                if cells:
+                    cells[-1] = (cells[-1][0] + char, cells[-1][1])
+                continue
+            cells.append((char, style))
+            if width == 2:
+                cells.append(('', style))
+    return cells
+
+
+def changed_span(old: List[Cell], new: List[Cell]) -> Optional[Tuple[int, int]]:
+    """First and last differing column (inclusive), widened to whole characters"""
+    if len(old) < len(new):
+        old = old + [(' ', None)] * (len(new) - len(old))
+    start = 0
+    limit = len(new)
+    while start < limit and old[start] == new[start]:
+        start += 1
+    if start == limit:
+        return None
+    end = limit - 1
+    while end > start and old[end] == new[end]:
+        end -= 1
+    if start > 0 and new[start][0] == '':
+        start -= 1
+    if end + 1 < limit and new[end + 1][0] == '':
+        end += 1
+    return start, end
+
+
+class DiffRenderer:
+    """
+    Renders full frames but writes only the cells that changed
+
+    Each frame is rendered to lines with Rich and compared line by line
+    (segment tuples first, cells only for lines that differ) against the
+    previous frame; changed spans are written with a cursor move and one
+    SGR sequence per style run. A frame whose ``inputs`` equal the previous
+    frame's is skipped without building the renderable, and emission is
+    limited to ``frame_monitor.target_fps`` (deferred frames are kept and
+    written by ``flush``).
+    """
+
+    def __init__(self, console: Console, frame_monitor: Optional[FrameRateMonitor] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.console = console
+        self.frame_monitor = frame_monitor
+        self.clock = clock
+        self._lines: Optional[List[Line]] = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._inputs: Any = _UNSET
+        self._last_emit = float('-inf')
+        self._pending: Optional[Tuple[Any, Any]] = None
+        self.stats = {
+            'frames_rendered': 0,
+            'frames_unchanged': 0,
+            'frames_deferred': 0,
+            'full_redraws': 0,
+            'lines_changed': 0,
+            'cells_emitted': 0,
+            'bytes_emitted': 0
+        }
+
+    @property
+    def min_interval(self) -> float:
+        if self.frame_monitor is None or self.frame_monitor.target_fps <= 0:
+            return 0.0
+        return 1.0 / self.frame_monitor.target_fps
+
+    def invalidate(self):
+        """Force a full redraw on the next frame"""
+        self._lines = None
+        self._inputs = _UNSET
+
+    def render(self, content: Union[RenderableType, Callable[[], RenderableType]],
+               inputs: Any = _UNSET, force: bool = False) -> Optional[str]:
+        """Draw a frame; returns the ANSI written, or None if the frame was skipped
+
+        ``content`` may be a callable so the renderable is only built when
+        ``inputs`` changed since the last frame.
+        """
+        if inputs is not _UNSET and inputs == self._inputs and self._pending is None:
+            self.stats['frames_unchanged'] += 1
+            return None
+
+        now = self.clock()
+        if not force and now - self._last_emit < self.min_interval:
+            self._pending = (content, inputs)
+            self.stats['frames_deferred'] += 1
+            return None
+        return self._emit(content, inputs, now)
+
+    def flush(self) -> Optional[str]:
+        """Write a deferred frame, if any"""
+        if self._pending is None:
+            return None
+        content, inputs = self._pending
+        return self._emit(content, inputs, self.clock())
+
+    def _emit(self, content, inputs, now: float) -> str:
+        self._pending = None
+        frame_start = self.frame_monitor.start_frame() if self.frame_monitor else None
+        if callable(content):
+            content = content()
+
+        width, height = self.console.size
+        options = self.console.options.update(width=width, height=height)
+        lines = [tuple(line) for line in self.console.render_lines(content, options, pad=True)][:height]
+
+        output = self._diff(lines, (width, height))
+        if output:
+            self.console.file.write(output)
+            self.console.file.flush()
+
+        self._lines = lines
+        self._size = (width, height)
+        self._inputs = inputs
+        self._last_emit = now
+        self.stats['frames_rendered'] += 1
+        self.stats['bytes_emitted'] += len(output.encode('utf-8'))
+        if frame_start is not None:
+            self.frame_monitor.end_frame(frame_start)
+        return output
+
+    def _diff(self, lines: List[Line], size: Tuple[int, int]) -> str:
+        parts: List[str] = []
+        previous = self._lines
+        if previous is None or size != self._size:
+            self.stats['full_redraws'] += 1
+            parts.append('\x1b[H\x1b[2J')
+            previous = []
+
+        for row, line in enumerate(lines):
+            old = previous[row] if row < len(previous) else ()
+            if old == line:
+                continue
+            new_cells = line_cells(line)
+            span = changed_span(line_cells(old), new_cells)
+            if span is None:
+                continue
+            self.stats['lines_changed'] += 1
+            start, end = span
+            parts.append(f'\x1b[{row + 1};{start + 1}H')
+            parts.append(self._styled(new_cells[start:end + 1]))
+            self.stats['cells_emitted'] += end - start + 1
+
+        for row in range(len(lines), len(previous)):
+            parts.append(f'\x1b[{row + 1};1H\x1b[2K')
+            self.stats['lines_changed'] += 1
+        return ''.join(parts)
+
+    def _styled(self, cells: List[Cell]) -> str:
+        color_system = getattr(self.console, '_color_system', None)
+        parts = []
+        run_style = cells[0][1]
+        run: List[str] = []
+        for text, style in cells:
+            if style != run_style:
+                parts.append(self._run(''.join(run), run_style, color_system))
+                run, run_style = [], style
+            run.append(text)
+        parts.append(self._run(''.join(run), run_style, color_system))
+        return ''.join(parts)
+
+    @staticmethod
+    def _run(text: str, style: Optional[Style], color_system) -> str:
+        if style is None or not style or color_system is None:
+            return text
+        return style.render(text, color_system=color_system)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, pending=self._pending is not None)
@@ -3,11 +3,13 @@ Memory Management and Buffer Optimization
 Object pooling, efficient string operations, and memory leak prevention
 """
 
+import dataclasses
 import gc
 import sys
 import time
+import types
 import weakref
-from typing import Dict, Any, List, Optional, TypeVar, Generic, Callable, Set, Tuple
+from typing import Dict, Any, List, Optional, TypeVar, Generic, Callable, Set, Tuple, Iterable, Sequence
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 from contextlib import contextmanager
@@ -112,12 +114,62 @@ class ObjectPool(Generic[T]):
             self._in_use.clear()
 
 
+class InternTable:
+    """
+    Canonical copies of repeated categorical strings
+    
+    Command names, agent names, providers and interaction types repeat across
+    hundreds of thousands of records; storing one shared copy of each turns a
+    per-record string into a pointer. Entries are never evicted, since records
+    keep referencing the canonical copy; once ``max_size`` distinct values are
+    held, new values are returned unchanged.
+    """
+    
+    def __init__(self, max_size: int = 50000, max_length: int = 1000):
+        self.max_size = max_size
+        self.max_length = max_length
+        self._table: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._table)
+    
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """Return the shared copy of ``value``; non-strings pass through"""
+        if type(value) is not str:
+            return value
+        
+        # Lock-free: a racing insert at worst stores the same value twice
+        canonical = self._table.get(value)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+        
+        self.misses += 1
+        if len(self._table) < self.max_size and len(value) <= self.max_length:
+            self._table[value] = value
+        return value
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+
 class StringPool:
     """Optimized string pooling and escape sequence caching"""
     
     def __init__(self, max_cache_size: int = 10000):
         self.max_cache_size = max_cache_size
         
+        # Categorical strings shared by long-lived records (never evicted)
+        self.categories = InternTable()
+        
         # String interning caches
         self._string_cache: Dict[str, str] = {}
         self._escape_cache: Dict[str, str] = {}
@@ -172,6 +224,10 @@ class StringPool:
             self._access_times[s] = time.time()
             return interned
     
+    def intern_category(self, value: Optional[str]) -> Optional[str]:
+        """Intern a repeated categorical value stored in records"""
+        return self.categories.intern(value)
+    
     def cache_escape_sequence(self, content: str, style: str) -> str:
         """Cache styled content with escape sequences"""
         cache_key = f"{content}:{style}"
@@ -245,6 +301,7 @@ class StringPool:
                 'string_cache_size': len(self._string_cache),
                 'escape_cache_size': len(self._escape_cache),
                 'format_cache_size': len(self._format_cache),
+                'category_table_size': len(self.categories),
                 'total_cached': len(self._string_cache) + len(self._escape_cache) + len(self._format_cache)
             }
     
@@ -258,6 +315,128 @@ class StringPool:
             self._populate_common_strings()
 
 
+def slotted(cls):
+    """
+    Rebuild a dataclass with ``__slots__`` and no per-instance ``__dict__``
+    
+    Equivalent to ``@dataclass(slots=True)``, which needs Python 3.10. Apply
+    above ``@dataclass``. Slotted records cannot take attributes that are not
+    fields, and methods must not use zero-argument ``super()``.
+    """
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)  # Defaults live in the generated __init__
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names
+    rebuilt = type(cls)(cls.__name__, cls.__bases__, namespace)
+    rebuilt.__qualname__ = cls.__qualname__
+    return rebuilt
+
+
+_ATOMIC_TYPES = (str, bytes, int, float, bool, type(None), type, types.ModuleType,
+                 types.FunctionType, types.BuiltinFunctionType)
+
+
+def _slot_names(obj_type: type) -> List[str]:
+    names = []
+    for klass in obj_type.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return names
+
+
+def record_footprint(records: Iterable[Any]) -> Tuple[int, int]:
+    """(total bytes, record count) reachable from ``records``
+    
+    Every distinct object is counted once, so strings shared through an
+    ``InternTable`` are paid for once rather than per record.
+    """
+    records = list(records)
+    seen: Set[int] = set()
+    stack: List[Any] = list(records)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            instance_dict = getattr(obj, '__dict__', None)
+            if instance_dict is not None:
+                stack.append(instance_dict)
+            for name in _slot_names(type(obj)):
+                if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return total, len(records)
+
+
+class _LegacyRecord:
+    """Plain object with a per-instance __dict__, as records were stored before"""
+
+
+def _unshared(value: Any) -> Any:
+    if type(value) is str:
+        return value.encode('utf-8').decode('utf-8')
+    if isinstance(value, dict):
+        return {_unshared(k): _unshared(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unshared(v) for v in value]
+    return value
+
+
+def legacy_copy(record: Any) -> Any:
+    """Copy of ``record`` with a __dict__ and private copies of its strings"""
+    if dataclasses.is_dataclass(record):
+        names = [f.name for f in dataclasses.fields(record)]
+    elif isinstance(record, dict):
+        return _unshared(record)
+    else:
+        names = list(getattr(record, '__dict__', {})) + _slot_names(type(record))
+    copy = _LegacyRecord()
+    for name in names:
+        if name not in ('__dict__', '__weakref__') and hasattr(record, name):
+            setattr(copy, name, _unshared(getattr(record, name)))
+    return copy
+
+
+@dataclass
+class RecordMemoryReport:
+    """Bytes per record for the current layout against the dict-based layout"""
+    record_type: str
+    records: int
+    legacy_bytes_per_record: float
+    compact_bytes_per_record: float
+    
+    @property
+    def saving(self) -> float:
+        """Fraction of memory saved per record"""
+        if not self.legacy_bytes_per_record:
+            return 0.0
+        return 1.0 - self.compact_bytes_per_record / self.legacy_bytes_per_record
+
+
+def compare_record_layouts(record_type: str, records: Sequence[Any]) -> RecordMemoryReport:
+    """Measure ``records`` against legacy copies of the same data"""
+    compact_bytes, count = record_footprint(records)
+    legacy_bytes, _ = record_footprint([legacy_copy(r) for r in records])
+    return RecordMemoryReport(
+        record_type=record_type,
+        records=count,
+        legacy_bytes_per_record=legacy_bytes / count if count else 0.0,
+        compact_bytes_per_record=compact_bytes / count if count else 0.0
+    )
+
+
 class MemoryLeakDetector:
     """Detect and track potential memory leaks"""
     
@@ -499,6 +678,9 @@ class MemoryOptimizer:
             'leak_warnings': 0
         }
         
+        # Long-lived record collections included in the record memory report
+        self.record_sources: Dict[str, Callable[[], Iterable[Any]]] = {}
+        
         self.start_time = time.time()
         self._monitoring_active = False
     
@@ -539,10 +721,30 @@ class MemoryOptimizer:
         """Use cached string formatting"""
         return self.string_pool.format_cached(template, *args, **kwargs)
     
+    def intern_category(self, value: Optional[str]) -> Optional[str]:
+        """Intern a repeated categorical string held by records"""
+        return self.string_pool.intern_category(value)
+    
     def track_object(self, obj: Any):
         """Track object for memory leak detection"""
         self.leak_detector.track_object(obj)
     
+    def register_record_source(self, record_type: str, source: Callable[[], Iterable[Any]]):
+        """Register a callable returning a collection of records to report on"""
+        self.record_sources[record_type] = source
+    
+    def record_memory_report(self, sample_size: int = 1000) -> List[RecordMemoryReport]:
+        """Bytes per record, before and after compaction, for each registered source"""
+        reports = []
+        for record_type, source in list(self.record_sources.items()):
+            try:
+                records = list(source())[-sample_size:]
+            except Exception:
+                continue
+            if records:
+                reports.append(compare_record_layouts(record_type, records))
+        return reports
+    
     def add_message_to_buffer(self, message: str, metadata: Optional[Dict[str, Any]] = None):
         """Add message to efficient buffer"""
         self.buffer_manager.add_text(message, metadata)
@@ -635,6 +837,24 @@ class MemoryOptimizer:
             pools_table.add_row(pool_name.replace('_', ' ').title(), str(size), f"{stats.pool_efficiency:.1%}")
         
         console.print(pools_table)
+        
+        reports = self.record_memory_report()
+        if reports:
+            records_table = Table(title="Record Memory")
+            records_table.add_column("Records", style="cyan")
+            records_table.add_column("Sampled", style="white")
+            records_table.add_column("Before", style="yellow")
+            records_table.add_column("After", style="green")
+            records_table.add_column("Saved", style="green")
+            
+            for report in reports:
+                records_table.add_row(
+                    report.record_type, f"{report.records:,}",
+                    f"{report.legacy_bytes_per_record:,.0f} B", f"{report.compact_bytes_per_record:,.0f} B",
+                    f"{report.saving:.0%}"
+                )
+            
+            console.print(records_table)
 
 
 # Global memory optimizer instance
@@ -651,6 +871,10 @@ def intern_string(s: str) -> str:
     """Convenient function to intern strings"""
     return get_memory_optimizer().intern_string(s)
 
+def intern_category(value: Optional[str]) -> Optional[str]:
+    """Convenient function to share repeated categorical strings between records"""
+    return get_memory_optimizer().intern_category(value)
+
 def cache_styled_text(content: str, style: str = "") -> str:
     """Convenient function to cache styled text"""
     return get_memory_optimizer().cache_styled_text(content, style)
@@ -21,6 +21,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.live import Live
 from rich.text import Text
 
+from .terminal_profile import get_terminal_profiler
+
+# Terminal output throughput treated as a render speed factor of 1.0
+REFERENCE_THROUGHPUT_KBPS = 2048.0
+
 
 class PerformanceMetrics(NamedTuple):
     """Performance metrics snapshot"""
@@ -166,7 +171,11 @@ class TerminalDetector:
         ]
     
     def _measure_terminal_latency(self) -> float:
-        """Measure terminal rendering latency"""
+        """Terminal round-trip latency, measured once per environment by the shared profiler"""
+        measurement = get_terminal_profiler().get_profile()
+        if measurement.measured:
+            return measurement.round_trip_ms
+        
         if self._is_ssh_connection():
             return 50.0  # Assume higher latency for SSH
         
@@ -181,14 +190,17 @@ class TerminalDetector:
             'screen': 25.0
         }
         
-        if self.capabilities:
-            return terminal_latencies.get(self.capabilities.terminal_type, 16.0)
-        return 16.0
+        return terminal_latencies.get(self._detect_terminal_type(), 16.0)
     
     def _calculate_render_speed_factor(self, caps: TerminalCapabilities) -> float:
         """Calculate relative rendering speed factor"""
         factor = 1.0
         
+        measurement = get_terminal_profiler().get_profile()
+        if measurement.write_throughput_kbps:
+            # Measured throughput already reflects SSH and multiplexer overhead
+            return max(0.3, min(2.0, measurement.write_throughput_kbps / REFERENCE_THROUGHPUT_KBPS))
+        
         # SSH connection penalty
         if caps.ssh_connection:
             factor *= 0.6
@@ -24,6 +24,7 @@ from .performance_monitor import get_rendering_optimizer, PerformanceMetrics
 from .memory_optimizer import get_memory_optimizer, MemoryStats
 from .animation_engine import get_animation_manager, AnimationManager
 from .terminal_optimizer import get_terminal_optimizer, TerminalOptimizer
+from .diff_renderer import DiffRenderer
 
 
 logger = logging.getLogger(__name__)
@@ -246,6 +247,26 @@ class RenderingSystem:
             
             yield live
     
+    def create_diff_renderer(self, console: Optional[Console] = None) -> DiffRenderer:
+        """Create a renderer that writes only changed cells, paced by the frame monitor"""
+        if console is None:
+            console = self.create_optimized_console()
+        return DiffRenderer(console, frame_monitor=self.perf_optimizer.frame_monitor)
+    
+    @contextmanager
+    def diff_rendering_context(self, console: Optional[Console] = None):
+        """Full-screen context for dashboards drawn through a DiffRenderer
+        
+        Unlike Live, redrawing an unchanged or partly changed dashboard
+        only writes the cells that differ from the previous frame.
+        """
+        renderer = self.create_diff_renderer(console)
+        with renderer.console.screen(hide_cursor=True):
+            try:
+                yield renderer
+            finally:
+                renderer.flush()
+    
     def create_optimized_progress(self, *args, **kwargs) -> Progress:
         """Create an optimized Progress instance"""
         console = self.create_optimized_console()
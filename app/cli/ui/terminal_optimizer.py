@@ -20,6 +20,8 @@ from rich.text import Text
 from rich.panel import Panel
 from rich.table import Table
 
+from .terminal_profile import get_terminal_profiler
+
 
 class TerminalType(Enum):
     """Supported terminal types with optimization profiles"""
@@ -319,22 +321,16 @@ class TerminalDetector:
         ]
     
     def _measure_performance_metrics(self, profile: TerminalProfile):
-        """Measure actual terminal performance"""
-        try:
-            # Simple render timing test
-            console = Console(file=sys.stdout, force_terminal=True)
-            
-            start_time = time.time()
-            for _ in range(10):
-                console.print(".", end="", style="dim")
-            console.print()  # Flush
-            
-            render_time = (time.time() - start_time) / 10
-            profile.render_overhead_ms = render_time * 1000
-            
-        except Exception:
-            # If measurement fails, use defaults
-            pass
+        """Apply measured latency and throughput from the shared terminal profiler"""
+        measurement = get_terminal_profiler().get_profile()
+        if not measurement.measured:
+            return  # Keep the per-terminal estimates
+        
+        profile.estimated_latency_ms = measurement.round_trip_ms
+        if measurement.render_overhead_ms is not None:
+            profile.render_overhead_ms = measurement.render_overhead_ms
+        # Do not refresh faster than the terminal can answer
+        profile.max_fps = min(profile.max_fps, max(10, int(1000 / max(measurement.round_trip_ms, 1.0))))
 
 
 class TerminalOptimizer:
@@ -541,6 +537,7 @@ class TerminalOptimizer:
             'max_fps': self.profile.max_fps,
             'avg_render_time_ms': avg_render_time * 1000,
             'estimated_latency_ms': self.profile.estimated_latency_ms,
+            'latency_source': get_terminal_profiler().get_profile().source,
             'supports_true_color': self.profile.supports_true_color,
             'supports_unicode': self.profile.supports_unicode,
             'optimization_active': self.optimization_active,
@@ -0,0 +1,235 @@
+"""
+Terminal Profiling Service
+Measures terminal round-trip latency and write throughput once and caches
+the result per TERM / terminal program / SSH state
+"""
+
+import json
+import logging
+import os
+import re
+import select
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+try:
+    import termios
+    import tty
+    TERMIOS_AVAILABLE = True
+except ImportError:  # Windows
+    TERMIOS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DSR_QUERY = b'\x1b[6n'
+DSR_REPLY = re.compile(rb'\x1b\[\d+;\d+R')
+PROFILE_VERSION = 1
+
+
+@dataclass
+class TerminalMeasurement:
+    """Measured terminal characteristics; None when they could not be measured"""
+    key: str
+    round_trip_ms: Optional[float] = None
+    write_throughput_kbps: Optional[float] = None  # KiB/s the terminal consumed
+    measured_at: float = 0.0
+    source: str = "estimated"  # measured, cached, estimated
+    failed: bool = False  # The terminal did not answer; estimates are used until max_age
+
+    @property
+    def measured(self) -> bool:
+        return self.round_trip_ms is not None
+
+    @property
+    def render_overhead_ms(self) -> Optional[float]:
+        """Time for the terminal to consume one KiB of output"""
+        if not self.write_throughput_kbps:
+            return None
+        return 1000.0 / self.write_throughput_kbps
+
+
+def is_ssh_session(environ: Mapping[str, str]) -> bool:
+    return bool(environ.get('SSH_CONNECTION') or environ.get('SSH_CLIENT') or environ.get('SSH_TTY'))
+
+
+def profile_key(environ: Mapping[str, str]) -> str:
+    """Cache key: terminals with the same TERM, program and SSH state behave alike"""
+    return "|".join([
+        environ.get('TERM', ''),
+        environ.get('TERM_PROGRAM', ''),
+        'ssh' if is_ssh_session(environ) else 'local'
+    ])
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _await_reply(fd_in: int, deadline: float) -> bool:
+    """Read input until a cursor position report arrives or the deadline passes"""
+    buffer = b''
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        readable, _, _ = select.select([fd_in], [], [], remaining)
+        if not readable:
+            return False
+        chunk = os.read(fd_in, 64)
+        if not chunk:
+            return False
+        buffer += chunk
+        if DSR_REPLY.search(buffer):
+            return True
+
+
+def measure_terminal(fd_in: int, fd_out: int, payload_bytes: int = 32768,
+                     timeout: float = 0.5, samples: int = 3) -> Optional[Tuple[float, float]]:
+    """Measure (round-trip ms, throughput KiB/s) with cursor position queries
+
+    The terminal answers a DSR query only after it has processed everything
+    written before it, so the time from writing a payload to the reply,
+    minus one round trip, is the time the terminal spent consuming it. The
+    payload overwrites one line with spaces and restores the cursor.
+    """
+    if not TERMIOS_AVAILABLE:
+        return None
+    try:
+        saved = termios.tcgetattr(fd_in)
+    except termios.error:
+        return None
+    try:
+        tty.setcbreak(fd_in)
+        round_trips = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            _write_all(fd_out, DSR_QUERY)
+            if not _await_reply(fd_in, started + timeout):
+                return None
+            round_trips.append(time.perf_counter() - started)
+        round_trip = min(round_trips)
+
+        line = b' ' * 63 + b'\r'
+        payload = b'\x1b7' + line * max(1, payload_bytes // len(line)) + b'\x1b[2K\x1b8'
+        started = time.perf_counter()
+        _write_all(fd_out, payload + DSR_QUERY)
+        if not _await_reply(fd_in, started + timeout * 4):
+            return None
+        consumed = max(time.perf_counter() - started - round_trip, 1e-6)
+        return round_trip * 1000, len(payload) / 1024 / consumed
+    except OSError:
+        return None
+    finally:
+        termios.tcsetattr(fd_in, termios.TCSADRAIN, saved)
+
+
+class TerminalProfiler:
+    """
+    One terminal profile per process, measured at most once per environment
+
+    Measurements are persisted in ``cache_path`` keyed by ``profile_key``
+    and reused until ``max_age`` seconds old. A terminal that does not
+    answer is remembered as failed for the same period, so callers use
+    their per-terminal estimates without re-measuring on every start. When
+    stdin/stdout are not a terminal nothing is measured or cached.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, max_age: float = 7 * 86400,
+                 environ: Optional[Mapping[str, str]] = None,
+                 fds: Optional[Tuple[int, int]] = None):
+        self.cache_path = cache_path or Path.home() / ".localagent" / "ui" / "terminal_profile.json"
+        self.max_age = max_age
+        self.environ = environ if environ is not None else os.environ
+        self.fds = fds
+        self._profile: Optional[TerminalMeasurement] = None
+
+    @property
+    def key(self) -> str:
+        return profile_key(self.environ)
+
+    def _terminal_fds(self) -> Optional[Tuple[int, int]]:
+        if self.fds is not None:
+            return self.fds
+        try:
+            if sys.stdin.isatty() and sys.stdout.isatty():
+                return sys.stdin.fileno(), sys.stdout.fileno()
+        except (AttributeError, ValueError):
+            pass
+        return None
+
+    def get_profile(self, refresh: bool = False) -> TerminalMeasurement:
+        """Cached profile for this environment, measuring it if necessary"""
+        if self._profile is not None and not refresh:
+            return self._profile
+
+        key = self.key
+        if not refresh:
+            cached = self._load().get(key)
+            if cached and time.time() - cached.get('measured_at', 0) < self.max_age:
+                self._profile = TerminalMeasurement(
+                    key=key,
+                    round_trip_ms=cached.get('round_trip_ms'),
+                    write_throughput_kbps=cached.get('write_throughput_kbps'),
+                    measured_at=cached.get('measured_at', 0.0),
+                    source="estimated" if cached.get('failed') else "cached",
+                    failed=bool(cached.get('failed'))
+                )
+                return self._profile
+
+        profile = TerminalMeasurement(key=key)
+        fds = self._terminal_fds()
+        if fds:
+            result = measure_terminal(*fds)
+            profile.measured_at = time.time()
+            if result is not None:
+                profile.round_trip_ms, profile.write_throughput_kbps = result
+                profile.source = "measured"
+                logger.info(f"Measured terminal {key}: {profile.round_trip_ms:.1f}ms round trip, "
+                            f"{profile.write_throughput_kbps:.0f} KiB/s")
+            else:
+                profile.failed = True
+                logger.info(f"Terminal {key} did not answer; using estimates")
+            self._store(profile)
+        self._profile = profile
+        return profile
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != PROFILE_VERSION:
+            return {}
+        return data.get('profiles', {})
+
+    def _store(self, profile: TerminalMeasurement):
+        profiles = self._load()
+        entry = asdict(profile)
+        entry.pop('key')
+        entry.pop('source')
+        profiles[profile.key] = entry
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'version': PROFILE_VERSION, 'profiles': profiles}, indent=2))
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not save terminal profile: {e}")
+
+
+# Global profiler instance
+_global_profiler: Optional[TerminalProfiler] = None
+
+
+def get_terminal_profiler() -> TerminalProfiler:
+    """Get the global terminal profiler shared by the rendering optimizers"""
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = TerminalProfiler()
+    return _global_profiler
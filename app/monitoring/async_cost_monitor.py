@@ -13,12 +13,24 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 import weakref
+from itertools import islice
+
+from app.cli.ui.memory_optimizer import intern_category
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 @dataclass
 class AsyncCallMetric:
     """Metrics for individual async calls"""
+    __slots__ = ('timestamp', 'function_name', 'duration', 'session_reused',
+                 'parallel_execution', 'error_count', 'memory_usage', 'cost_estimate')
+    
     timestamp: float
     function_name: str
     duration: float
@@ -39,14 +51,124 @@ class AntiPatternAlert:
     recommendation: str
     timestamp: float
 
+class SlidingWindowCounter:
+    """Event count over the last ``window`` seconds, kept in a ring of time buckets"""
+    
+    __slots__ = ('width', 'buckets', 'counts', 'total', '_head')
+    
+    def __init__(self, window: float = 60.0, buckets: int = 12):
+        self.buckets = buckets
+        self.width = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self._head: Optional[int] = None
+    
+    def _advance(self, now: float) -> int:
+        slot = int(now // self.width)
+        if self._head is None:
+            self._head = slot
+        elif slot > self._head:
+            # Expire at most one full ring of buckets, so each call is O(buckets)
+            for step in range(1, min(slot - self._head, self.buckets) + 1):
+                index = (self._head + step) % self.buckets
+                self.total -= self.counts[index]
+                self.counts[index] = 0
+            self._head = slot
+        return slot
+    
+    def add(self, now: float, amount: int = 1):
+        slot = self._advance(now)
+        if slot > self._head - self.buckets:
+            self.counts[slot % self.buckets] += amount
+            self.total += amount
+    
+    def count(self, now: float) -> int:
+        self._advance(now)
+        return self.total
+    
+    def span(self, now: float) -> float:
+        """Seconds from the start of the oldest non-empty bucket to ``now``"""
+        self._advance(now)
+        for age in range(self.buckets - 1, -1, -1):
+            if self.counts[(self._head - age) % self.buckets]:
+                return now - (self._head - age) * self.width
+        return 0.0
+
+
+class CountMinSketch:
+    """Approximate per-key counts in fixed memory; estimates never undercount"""
+    
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+    
+    def _indexes(self, key) -> List[int]:
+        return [hash((row, key)) % self.width for row in range(self.depth)]
+    
+    def add(self, key, amount: int = 1) -> int:
+        """Add ``amount`` to ``key`` and return the new estimate"""
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += amount
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+        return estimate
+    
+    def estimate(self, key) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+    
+    def clear(self):
+        for row in self.rows:
+            row[:] = [0] * self.width
+
+
+class EWMA:
+    """Exponentially weighted moving average"""
+    
+    __slots__ = ('alpha', 'value', 'samples')
+    
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value = 0.0
+        self.samples = 0
+    
+    def update(self, sample: float) -> float:
+        self.value = sample if self.samples == 0 else self.value + self.alpha * (sample - self.value)
+        self.samples += 1
+        return self.value
+
+
+class FunctionWindow:
+    """Sliding-window counters for one tracked function"""
+    
+    __slots__ = ('calls', 'reused', 'duplicates', 'cacheable')
+    
+    def __init__(self, window: float, caching_window: float):
+        self.calls = SlidingWindowCounter(window)
+        self.reused = SlidingWindowCounter(window)
+        self.duplicates = SlidingWindowCounter(window)
+        self.cacheable = SlidingWindowCounter(caching_window, buckets=30)
+
+
 class AsyncCostMonitor:
-    """🚀 Monitors and optimizes async patterns to reduce LLM costs by up to 90%"""
+    """🚀 Monitors and optimizes async patterns to reduce LLM costs by up to 90%
+    
+    Anti-patterns are detected incrementally as each call is tracked:
+    per-function sliding-window counters cover session reuse, duplicate
+    calls and caching opportunities, a rotating count-min sketch spots
+    repeated calls within ``duplicate_interval``, and fast/slow EWMAs of
+    process memory flag sustained growth. Tracking a call is O(1) and an
+    alert for a given pattern and function is raised at most once per
+    ``alert_cooldown`` seconds.
+    """
     
-    def __init__(self):
+    def __init__(self, window: float = 60.0, caching_window: float = 300.0,
+                 duplicate_interval: float = 0.1, alert_cooldown: float = 60.0,
+                 memory_sample_interval: float = 1.0, max_alerts: int = 1000):
         self.metrics: deque = deque(maxlen=10000)  # Keep last 10K metrics
         self.session_registry: Dict[str, aiohttp.ClientSession] = {}
-        self.call_patterns: Dict[str, List[float]] = defaultdict(list)
-        self.alerts: List[AntiPatternAlert] = []
+        self.call_patterns: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.alerts: deque = deque(maxlen=max_alerts)
         self.total_cost_saved: float = 0.0
         self.monitoring_active = True
         
@@ -58,6 +180,31 @@ class AsyncCostMonitor:
             'missing_caching': 2.5,      # 2.5x repeated work
             'memory_leaks': 1.5          # 1.5x resource waste
         }
+        
+        # Incremental detector state
+        self.window = window
+        self.caching_window = caching_window
+        self.duplicate_interval = duplicate_interval
+        self.alert_cooldown = alert_cooldown
+        self.memory_sample_interval = memory_sample_interval
+        self._functions: Dict[str, FunctionWindow] = {}
+        self._recent_calls = CountMinSketch()
+        self._previous_calls = CountMinSketch()
+        self._sketch_generation: Optional[int] = None
+        self._second: Optional[int] = None
+        self._second_calls = 0
+        self._second_parallel = 0
+        self._memory_fast = EWMA(alpha=0.2)
+        self._memory_slow = EWMA(alpha=0.02)
+        self._memory_sampled_at = 0.0
+        self._memory_value = 0.0
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self._last_alert: Dict[tuple, float] = {}
+        self.detector_stats = {
+            'tracked_calls': 0,
+            'alerts_raised': 0,
+            'alerts_suppressed': 0
+        }
     
     async def start_monitoring(self):
         """Start the async cost monitoring system"""
@@ -65,10 +212,9 @@ class AsyncCostMonitor:
         asyncio.create_task(self._monitoring_loop())
     
     async def _monitoring_loop(self):
-        """Main monitoring loop"""
+        """Periodic bookkeeping; detection itself happens in track_async_call"""
         while self.monitoring_active:
             try:
-                await self._detect_anti_patterns()
                 await self._calculate_cost_savings()
                 await self._cleanup_old_metrics()
                 await asyncio.sleep(5)  # Check every 5 seconds
@@ -78,21 +224,44 @@ class AsyncCostMonitor:
     
     def track_async_call(self, func_name: str, start_time: float, end_time: float, 
                         session_reused: bool = False, parallel: bool = False,
-                        error_count: int = 0):
-        """Track individual async call metrics"""
+                        error_count: int = 0, call_key: Any = None):
+        """Track individual async call metrics and run the streaming detectors
+        
+        ``call_key`` identifies the request (for example a hash of its
+        arguments) for duplicate detection; calls without one are compared
+        by function name only.
+        """
+        duration = end_time - start_time
+        func_name = intern_category(func_name)
         metric = AsyncCallMetric(
             timestamp=start_time,
             function_name=func_name,
-            duration=end_time - start_time,
+            duration=duration,
             session_reused=session_reused,
             parallel_execution=parallel,
             error_count=error_count,
-            memory_usage=self._estimate_memory_usage(),
-            cost_estimate=self._estimate_call_cost(func_name, end_time - start_time)
+            memory_usage=self._estimate_memory_usage(end_time),
+            cost_estimate=self._estimate_call_cost(func_name, duration)
         )
         
         self.metrics.append(metric)
         self.call_patterns[func_name].append(start_time)
+        self.detector_stats['tracked_calls'] += 1
+        
+        state = self._functions.get(func_name)
+        if state is None:
+            state = self._functions[func_name] = FunctionWindow(self.window, self.caching_window)
+        state.calls.add(start_time)
+        state.cacheable.add(start_time)
+        if session_reused:
+            state.reused.add(start_time)
+        
+        if 'provider' in func_name.lower():
+            self._check_session_reuse(func_name, state, start_time)
+        self._check_duplicate(func_name, call_key, state, start_time)
+        self._check_sequential(metric)
+        self._check_caching(func_name, state, start_time)
+        self._check_memory(metric.memory_usage, start_time)
     
     def register_session(self, provider: str, session: aiohttp.ClientSession):
         """Register a reusable session to detect session recreation patterns"""
@@ -105,215 +274,180 @@ class AsyncCostMonitor:
         
         weakref.finalize(session, cleanup_callback)
     
-    async def _detect_anti_patterns(self):
-        """Detect cost-multiplying async anti-patterns"""
-        if len(self.metrics) < 10:
+    def _raise_alert(self, pattern_type: str, key: Any, severity: str, message: str,
+                     evidence: Dict[str, Any], cost_impact: float, recommendation: str,
+                     now: float, log_level: int = logging.WARNING):
+        """Record an alert unless the same pattern and key fired within the cooldown"""
+        last = self._last_alert.get((pattern_type, key))
+        if last is not None and now - last < self.alert_cooldown:
+            self.detector_stats['alerts_suppressed'] += 1
             return
-            
-        recent_metrics = list(self.metrics)[-100:]  # Last 100 calls
-        
-        # 1. Detect session recreation anti-pattern
-        await self._detect_session_recreation(recent_metrics)
-        
-        # 2. Detect sequential execution when parallel is possible
-        await self._detect_sequential_execution(recent_metrics)
+        self._last_alert[(pattern_type, key)] = now
         
-        # 3. Detect race conditions (duplicate calls)
-        await self._detect_race_conditions(recent_metrics)
-        
-        # 4. Detect missing caching opportunities
-        await self._detect_missing_caching(recent_metrics)
-        
-        # 5. Detect memory leaks
-        await self._detect_memory_leaks(recent_metrics)
+        alert = AntiPatternAlert(
+            pattern_type=pattern_type,
+            severity=severity,
+            message=message,
+            evidence=evidence,
+            estimated_cost_impact=cost_impact,
+            recommendation=recommendation,
+            timestamp=now
+        )
+        self.alerts.append(alert)
+        self.detector_stats['alerts_raised'] += 1
+        if log_level >= logging.WARNING:
+            logger.warning(f"🚨 {alert.message} - Cost impact: ${cost_impact:.2f}")
+        else:
+            logger.info(f"💡 {alert.message} - Potential savings: ${cost_impact:.2f}")
     
-    async def _detect_session_recreation(self, metrics: List[AsyncCallMetric]):
+    def _check_session_reuse(self, func_name: str, state: FunctionWindow, now: float):
         """Detect HTTP session recreation anti-pattern"""
-        provider_calls = defaultdict(int)
-        session_reuse_count = defaultdict(int)
-        
-        for metric in metrics:
-            if 'provider' in metric.function_name.lower():
-                provider_calls[metric.function_name] += 1
-                if metric.session_reused:
-                    session_reuse_count[metric.function_name] += 1
-        
-        for func_name, total_calls in provider_calls.items():
-            if total_calls > 5:  # Only alert if significant usage
-                reuse_rate = session_reuse_count[func_name] / total_calls
-                
-                if reuse_rate < 0.8:  # Less than 80% session reuse
-                    cost_impact = total_calls * self.cost_multipliers['session_recreation'] * 0.001
-                    
-                    alert = AntiPatternAlert(
-                        pattern_type='session_recreation',
-                        severity='critical' if reuse_rate < 0.3 else 'high',
-                        message=f"Session recreation detected in {func_name}: {reuse_rate:.1%} reuse rate",
-                        evidence={
-                            'total_calls': total_calls,
-                            'session_reuse_rate': reuse_rate,
-                            'function': func_name
-                        },
-                        estimated_cost_impact=cost_impact,
-                        recommendation="Implement connection pooling with persistent sessions",
-                        timestamp=time.time()
-                    )
-                    
-                    self.alerts.append(alert)
-                    logger.warning(f"🚨 {alert.message} - Cost impact: ${cost_impact:.2f}")
-    
-    async def _detect_sequential_execution(self, metrics: List[AsyncCallMetric]):
-        """Detect sequential execution that could be parallelized"""
-        time_windows = defaultdict(list)
-        
-        # Group calls by 1-second windows
-        for metric in metrics:
-            window = int(metric.timestamp)
-            time_windows[window].append(metric)
-        
-        for window, window_metrics in time_windows.items():
-            if len(window_metrics) > 3:  # Multiple calls in same window
-                parallel_count = sum(1 for m in window_metrics if m.parallel_execution)
-                sequential_rate = 1 - (parallel_count / len(window_metrics))
-                
-                if sequential_rate > 0.7 and len(window_metrics) > 5:
-                    cost_impact = len(window_metrics) * self.cost_multipliers['sequential_execution'] * 0.001
-                    
-                    alert = AntiPatternAlert(
-                        pattern_type='sequential_execution',
-                        severity='high',
-                        message=f"Sequential execution detected: {len(window_metrics)} calls, {sequential_rate:.1%} sequential",
-                        evidence={
-                            'total_calls': len(window_metrics),
-                            'sequential_rate': sequential_rate,
-                            'window': window,
-                            'functions': [m.function_name for m in window_metrics]
-                        },
-                        estimated_cost_impact=cost_impact,
-                        recommendation="Use Promise.all() or asyncio.gather() for parallel execution",
-                        timestamp=time.time()
-                    )
-                    
-                    self.alerts.append(alert)
-                    logger.warning(f"🚨 {alert.message} - Cost impact: ${cost_impact:.2f}")
-    
-    async def _detect_race_conditions(self, metrics: List[AsyncCallMetric]):
+        total_calls = state.calls.count(now)
+        if total_calls <= 5:  # Only alert if significant usage
+            return
+        reuse_rate = state.reused.count(now) / total_calls
+        if reuse_rate < 0.8:  # Less than 80% session reuse
+            self._raise_alert(
+                'session_recreation', func_name,
+                severity='critical' if reuse_rate < 0.3 else 'high',
+                message=f"Session recreation detected in {func_name}: {reuse_rate:.1%} reuse rate",
+                evidence={
+                    'total_calls': total_calls,
+                    'session_reuse_rate': reuse_rate,
+                    'function': func_name
+                },
+                cost_impact=total_calls * self.cost_multipliers['session_recreation'] * 0.001,
+                recommendation="Implement connection pooling with persistent sessions",
+                now=now
+            )
+    
+    def _check_duplicate(self, func_name: str, call_key: Any, state: FunctionWindow, now: float):
         """Detect race conditions causing duplicate API calls"""
-        recent_calls = defaultdict(list)
-        
-        # Group calls by function and check for rapid duplicates
-        for metric in metrics:
-            recent_calls[metric.function_name].append(metric.timestamp)
+        # Rotate sketches so stale counts age out without per-key bookkeeping; late
+        # events (an older start time) are counted in the current generation
+        generation = int(now // self.window)
+        if self._sketch_generation is None or generation > self._sketch_generation:
+            self._previous_calls, self._recent_calls = self._recent_calls, self._previous_calls
+            self._recent_calls.clear()
+            if self._sketch_generation is not None and generation - self._sketch_generation > 1:
+                self._previous_calls.clear()
+            self._sketch_generation = generation
         
-        for func_name, timestamps in recent_calls.items():
-            if len(timestamps) < 3:
-                continue
-                
-            # Check for calls within 100ms of each other (likely duplicates)
-            duplicates = 0
-            for i in range(1, len(timestamps)):
-                if timestamps[i] - timestamps[i-1] < 0.1:  # Within 100ms
-                    duplicates += 1
-            
-            if duplicates > len(timestamps) * 0.3:  # More than 30% are duplicates
-                cost_impact = duplicates * self.cost_multipliers['race_conditions'] * 0.001
-                
-                alert = AntiPatternAlert(
-                    pattern_type='race_conditions',
-                    severity='high',
-                    message=f"Race conditions detected in {func_name}: {duplicates} duplicate calls",
-                    evidence={
-                        'function': func_name,
-                        'total_calls': len(timestamps),
-                        'duplicate_calls': duplicates,
-                        'duplicate_rate': duplicates / len(timestamps)
-                    },
-                    estimated_cost_impact=cost_impact,
-                    recommendation="Implement request deduplication and proper dependency management",
-                    timestamp=time.time()
-                )
-                
-                self.alerts.append(alert)
-                logger.warning(f"🚨 {alert.message} - Cost impact: ${cost_impact:.2f}")
-    
-    async def _detect_missing_caching(self, metrics: List[AsyncCallMetric]):
-        """Detect repeated identical calls that could be cached"""
-        function_calls = defaultdict(int)
+        slot = int(now // self.duplicate_interval)
+        key = (func_name, call_key)
+        seen = (self._recent_calls.estimate((key, slot)) + self._recent_calls.estimate((key, slot - 1))
+                + self._previous_calls.estimate((key, slot)) + self._previous_calls.estimate((key, slot - 1)))
+        self._recent_calls.add((key, slot))
+        if not seen:
+            return
         
-        for metric in metrics:
-            # Look for frequent calls to same function (potential caching opportunity)
-            function_calls[metric.function_name] += 1
+        state.duplicates.add(now)
+        total_calls = state.calls.count(now)
+        duplicates = state.duplicates.count(now)
+        if total_calls >= 3 and duplicates > total_calls * 0.3:  # More than 30% are duplicates
+            self._raise_alert(
+                'race_conditions', func_name,
+                severity='high',
+                message=f"Race conditions detected in {func_name}: {duplicates} duplicate calls",
+                evidence={
+                    'function': func_name,
+                    'total_calls': total_calls,
+                    'duplicate_calls': duplicates,
+                    'duplicate_rate': duplicates / total_calls
+                },
+                cost_impact=duplicates * self.cost_multipliers['race_conditions'] * 0.001,
+                recommendation="Implement request deduplication and proper dependency management",
+                now=now
+            )
+    
+    def _check_sequential(self, metric: AsyncCallMetric):
+        """Detect sequential execution that could be parallelized"""
+        # Late events (an older start time) are counted in the current second
+        window = int(metric.timestamp)
+        if self._second is None or window > self._second:
+            self._second = window
+            self._second_calls = 0
+            self._second_parallel = 0
+        window = self._second
+        self._second_calls += 1
+        if metric.parallel_execution:
+            self._second_parallel += 1
         
-        for func_name, call_count in function_calls.items():
-            if call_count > 10:  # More than 10 calls to same function
-                # Check if calls are spread over time (cacheable pattern)
-                timestamps = [m.timestamp for m in metrics if m.function_name == func_name]
-                time_span = max(timestamps) - min(timestamps)
-                
-                if time_span > 30:  # Calls spread over 30+ seconds
-                    cost_impact = call_count * self.cost_multipliers['missing_caching'] * 0.001
-                    
-                    alert = AntiPatternAlert(
-                        pattern_type='missing_caching',
-                        severity='medium',
-                        message=f"Caching opportunity detected: {func_name} called {call_count} times",
-                        evidence={
-                            'function': func_name,
-                            'call_count': call_count,
-                            'time_span': time_span,
-                            'calls_per_minute': call_count / (time_span / 60)
-                        },
-                        estimated_cost_impact=cost_impact,
-                        recommendation="Implement response caching with appropriate TTL",
-                        timestamp=time.time()
-                    )
-                    
-                    self.alerts.append(alert)
-                    logger.info(f"💡 {alert.message} - Potential savings: ${cost_impact:.2f}")
-    
-    async def _detect_memory_leaks(self, metrics: List[AsyncCallMetric]):
-        """Detect memory leak patterns"""
-        if len(metrics) < 50:
+        calls = self._second_calls
+        sequential_rate = 1 - (self._second_parallel / calls)
+        if calls > 5 and sequential_rate > 0.7:
+            self._raise_alert(
+                'sequential_execution', None,
+                severity='high',
+                message=f"Sequential execution detected: {calls} calls, {sequential_rate:.1%} sequential",
+                evidence={
+                    'total_calls': calls,
+                    'sequential_rate': sequential_rate,
+                    'window': window
+                },
+                cost_impact=calls * self.cost_multipliers['sequential_execution'] * 0.001,
+                recommendation="Use Promise.all() or asyncio.gather() for parallel execution",
+                now=metric.timestamp
+            )
+    
+    def _check_caching(self, func_name: str, state: FunctionWindow, now: float):
+        """Detect repeated calls spread over time that could be cached"""
+        call_count = state.cacheable.count(now)
+        if call_count <= 10:  # More than 10 calls to same function
+            return
+        time_span = state.cacheable.span(now)
+        if time_span > 30:  # Calls spread over 30+ seconds
+            self._raise_alert(
+                'missing_caching', func_name,
+                severity='medium',
+                message=f"Caching opportunity detected: {func_name} called {call_count} times",
+                evidence={
+                    'function': func_name,
+                    'call_count': call_count,
+                    'time_span': time_span,
+                    'calls_per_minute': call_count / (time_span / 60)
+                },
+                cost_impact=call_count * self.cost_multipliers['missing_caching'] * 0.001,
+                recommendation="Implement response caching with appropriate TTL",
+                now=now,
+                log_level=logging.INFO
+            )
+    
+    def _check_memory(self, memory_usage: float, now: float):
+        """Detect sustained memory growth: the fast EWMA pulling away from the slow baseline"""
+        if memory_usage <= 0:
+            return
+        recent_avg = self._memory_fast.update(memory_usage)
+        baseline = self._memory_slow.update(memory_usage)
+        if self._memory_slow.samples < 50 or baseline <= 0:
             return
         
-        # Check for increasing memory usage trend
-        recent_memory = [m.memory_usage for m in metrics[-20:]]
-        older_memory = [m.memory_usage for m in metrics[-50:-30]]
-        
-        if recent_memory and older_memory:
-            recent_avg = sum(recent_memory) / len(recent_memory)
-            older_avg = sum(older_memory) / len(older_memory)
-            
-            growth_rate = (recent_avg - older_avg) / older_avg if older_avg > 0 else 0
-            
-            if growth_rate > 0.2:  # 20% memory growth
-                cost_impact = growth_rate * self.cost_multipliers['memory_leaks'] * 0.01
-                
-                alert = AntiPatternAlert(
-                    pattern_type='memory_leaks',
-                    severity='medium' if growth_rate < 0.5 else 'high',
-                    message=f"Memory leak detected: {growth_rate:.1%} increase",
-                    evidence={
-                        'recent_avg_memory': recent_avg,
-                        'older_avg_memory': older_avg,
-                        'growth_rate': growth_rate
-                    },
-                    estimated_cost_impact=cost_impact,
-                    recommendation="Check for unclosed connections, timers, and event listeners",
-                    timestamp=time.time()
-                )
-                
-                self.alerts.append(alert)
-                logger.warning(f"🚨 {alert.message} - Cost impact: ${cost_impact:.2f}")
-    
-    def _estimate_memory_usage(self) -> float:
-        """Estimate current memory usage (MB)"""
-        try:
-            import psutil
-            process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024
-        except ImportError:
+        growth_rate = (recent_avg - baseline) / baseline
+        if growth_rate > 0.2:  # 20% memory growth
+            self._raise_alert(
+                'memory_leaks', None,
+                severity='medium' if growth_rate < 0.5 else 'high',
+                message=f"Memory leak detected: {growth_rate:.1%} increase",
+                evidence={
+                    'recent_avg_memory': recent_avg,
+                    'older_avg_memory': baseline,
+                    'growth_rate': growth_rate
+                },
+                cost_impact=growth_rate * self.cost_multipliers['memory_leaks'] * 0.01,
+                recommendation="Check for unclosed connections, timers, and event listeners",
+                now=now
+            )
+    
+    def _estimate_memory_usage(self, now: Optional[float] = None) -> float:
+        """Estimate current memory usage (MB), sampled at most once per interval"""
+        if self._process is None:
             return 0.0
+        now = time.time() if now is None else now
+        if self._memory_value and now - self._memory_sampled_at < self.memory_sample_interval:
+            return self._memory_value
+        self._memory_sampled_at = now
+        self._memory_value = self._process.memory_info().rss / 1024 / 1024
+        return self._memory_value
     
     def _estimate_call_cost(self, func_name: str, duration: float) -> float:
         """Estimate cost of individual call"""
@@ -343,14 +477,15 @@ class AsyncCostMonitor:
         """Clean up old alerts and metrics"""
         # Remove alerts older than 24 hours
         cutoff_time = time.time() - 86400
-        self.alerts = [a for a in self.alerts if a.timestamp > cutoff_time]
+        self.alerts = deque((a for a in self.alerts if a.timestamp > cutoff_time), maxlen=self.alerts.maxlen)
+        self._last_alert = {k: t for k, t in self._last_alert.items() if t > cutoff_time}
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get monitoring dashboard data"""
         if not self.metrics:
             return {"error": "No metrics available"}
         
-        recent_metrics = list(self.metrics)[-100:]
+        recent_metrics = list(islice(reversed(self.metrics), 100))
         recent_alerts = [a for a in self.alerts if time.time() - a.timestamp < 3600]
         
         return {
@@ -12,6 +12,8 @@ from pathlib import Path
 import yaml
 import time
 
+from app.cli.ui.memory_optimizer import intern_category
+
 @dataclass
 class AgentRequest:
     """Standardized agent request format"""
@@ -36,6 +38,10 @@ class AgentResponse:
     token_usage: Dict[str, int]
     provider_used: str
     error: Optional[str] = None
+    
+    def __post_init__(self):
+        # Provider names repeat across every response in a session
+        self.provider_used = intern_category(self.provider_used)
 
 class AgentProviderAdapter:
     """
@@ -4,11 +4,14 @@ Manages context packages, token compression, and cross-session continuity
 """
 
 import asyncio
+import hashlib
+import heapq
 import json
 import logging
 import time
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 import re
 
@@ -54,144 +57,265 @@ class TokenCounter:
         """Count tokens in dictionary content"""
         return TokenCounter.count_tokens(json.dumps(data, separators=(',', ':')))
 
+# Per package type: section -> (priority, item limit of its compressed form)
+SECTION_RULES: Dict[str, Dict[str, Tuple[float, Optional[int]]]] = {
+    'strategic_context': {
+        'architecture_overview': (1.0, None),
+        'key_decisions': (0.9, 3),
+        'success_criteria': (0.8, 3),
+        'integration_points': (0.7, 5),
+        'constraints': (0.6, 3)
+    },
+    'technical_context': {
+        'key_components': (1.0, 5),
+        'critical_files': (0.9, 8),
+        'api_endpoints': (0.8, 10),
+        'implementation_patterns': (0.7, 3),
+        'dependencies': (0.6, 10),
+        'configuration': (0.5, None)
+    },
+    'frontend_context': {
+        'ui_components': (1.0, 8),
+        'state_management': (0.8, None),
+        'styling_approach': (0.7, None),
+        'key_interactions': (0.7, 5),
+        'routing_config': (0.5, None)
+    },
+    'security_context': {
+        'critical_vulnerabilities': (1.0, 5),
+        'mitigation_strategies': (0.9, 5),
+        'auth_patterns': (0.8, 3),
+        'input_validation': (0.7, 5),
+        'security_headers': (0.5, None)
+    },
+    'performance_context': {
+        'bottlenecks': (1.0, 5),
+        'optimization_opportunities': (0.9, 5),
+        'performance_metrics': (0.7, 5),
+        'resource_usage': (0.5, None)
+    },
+    'database_context': {
+        'key_tables': (1.0, 10),
+        'relationships': (0.9, 8),
+        'query_patterns': (0.7, 5),
+        'indexes': (0.6, 5),
+        'migrations': (0.4, 3)
+    }
+}
+
+GENERIC_RULES: Dict[str, Tuple[float, Optional[int]]] = {
+    'summary': (1.0, None),
+    'status': (1.0, None),
+    'key_points': (0.9, 5),
+    'findings': (0.9, 5),
+    'recommendations': (0.8, 5)
+}
+
+COMPRESSION_NOTES = {
+    'strategic_context': 'Strategic context compressed - detailed implementation available in technical context',
+    'technical_context': 'Technical details compressed - full codebase analysis available',
+    'frontend_context': 'UI details compressed - component library available',
+    'security_context': 'Security analysis compressed - full audit available',
+    'performance_context': 'Performance data compressed - detailed metrics available',
+    'database_context': 'Database schema compressed - full DDL available'
+}
+
+UNLISTED_SECTION_RULE = (0.2, 5)
+MAX_STRING_CHARS = 500
+IMPORTANT_CONFIG_KEYS = {'host', 'port', 'database', 'timeout', 'max_connections', 'auth_type'}
+
+# Section levels, in the order the compressor degrades them
+FULL, COMPRESSED, DROPPED = 0, 1, 2
+
+@dataclass
+class SectionEntry:
+    """Cached measurement and compressed forms of one package section"""
+    tokens: int
+    # Item limit -> (compressed value, its token count); package types use different limits
+    compressed: Dict[Optional[int], Tuple[Any, int]] = field(default_factory=dict)
+
 class ContextCompressor:
-    """Intelligent context compression while preserving essential information"""
+    """
+    Incremental context compression while preserving essential information
+
+    A package is treated as a set of top-level sections. Each section is
+    measured once per distinct content (keyed by a hash of its serialized
+    value) and its compressed form for each item limit is cached alongside,
+    so recompressing a package that changed in one section only re-measures
+    that section. To meet a budget, sections are degraded full -> compressed
+    -> dropped,
+    always taking the step that loses the least priority per token saved.
+    The section cache is a bounded LRU, so the cost of preparing a package
+    does not grow with how often it has been rebuilt.
+    """
     
-    def __init__(self):
-        self.compression_strategies = {
-            'strategic_context': self._compress_strategic,
-            'technical_context': self._compress_technical,
-            'frontend_context': self._compress_frontend,
-            'security_context': self._compress_security,
-            'performance_context': self._compress_performance,
-            'database_context': self._compress_database
-        }
+    def __init__(self, max_cached_sections: int = 4096):
+        self.max_cached_sections = max_cached_sections
+        self._sections: "OrderedDict[Tuple[str, str], SectionEntry]" = OrderedDict()
+        self._note_tokens: Dict[str, int] = {}
+        self.stats = {'sections_measured': 0, 'section_cache_hits': 0, 'sections_compressed': 0}
+    
+    @staticmethod
+    def _section_key(key: str, value: Any) -> Tuple[str, str]:
+        serialized = json.dumps(value, separators=(',', ':'), sort_keys=True, default=str)
+        return key, hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _count_section(key: str, value: Any) -> int:
+        return TokenCounter.count_dict_tokens({key: value})
+    
+    def _entry(self, key: str, value: Any) -> SectionEntry:
+        cache_key = self._section_key(key, value)
+        entry = self._sections.get(cache_key)
+        if entry is not None:
+            self._sections.move_to_end(cache_key)
+            self.stats['section_cache_hits'] += 1
+            return entry
+        
+        entry = SectionEntry(tokens=self._count_section(key, value))
+        self.stats['sections_measured'] += 1
+        self._sections[cache_key] = entry
+        while len(self._sections) > self.max_cached_sections:
+            self._sections.popitem(last=False)
+        return entry
+    
+    def measure(self, content: Dict[str, Any]) -> int:
+        """Token count of content as the sum of its (cached) section counts"""
+        return sum(self._entry(key, value).tokens for key, value in content.items())
+    
+    def _compressed(self, key: str, value: Any, entry: SectionEntry, limit: Optional[int]) -> Tuple[Any, int]:
+        """Compressed form of a section under ``limit`` and its token count"""
+        compressed = entry.compressed.get(limit)
+        if compressed is None:
+            compressed_value = self._compress_value(value, limit)
+            compressed = entry.compressed[limit] = (compressed_value, self._count_section(key, compressed_value))
+            self.stats['sections_compressed'] += 1
+        return compressed
     
     def compress_package(self, package: ContextPackage, target_tokens: int) -> ContextPackage:
         """Compress context package to target token count"""
         if package.token_count <= target_tokens:
             return package
-            
-        # Select compression strategy based on package type
-        strategy = self.compression_strategies.get(
-            package.package_type, 
-            self._compress_generic
-        )
         
-        compressed_content = strategy(package.content, target_tokens)
-        compressed_package = ContextPackage(
+        rules = SECTION_RULES.get(package.package_type, GENERIC_RULES)
+        note = COMPRESSION_NOTES.get(package.package_type, 'Generic compression applied')
+        if note not in self._note_tokens:
+            self._note_tokens[note] = self._count_section('_compression_note', note)
+        
+        measured_before = self.stats['sections_measured'] + self.stats['sections_compressed']
+        entries = {key: self._entry(key, value) for key, value in package.content.items()}
+        levels = self._plan(package.content, entries, rules, target_tokens - self._note_tokens[note])
+        
+        compressed_content: Dict[str, Any] = {}
+        dropped: List[str] = []
+        token_count = self._note_tokens[note]
+        for key, value in package.content.items():
+            level = levels[key]
+            if level == FULL:
+                compressed_content[key] = value
+                token_count += entries[key].tokens
+            elif level == COMPRESSED:
+                limit = rules.get(key, UNLISTED_SECTION_RULE)[1]
+                compressed_content[key], tokens = entries[key].compressed[limit]
+                token_count += tokens
+            else:
+                dropped.append(key)
+        
+        compressed_content['_compression_note'] = note
+        if dropped:
+            compressed_content['_dropped_sections'] = dropped
+            token_count += self._count_section('_dropped_sections', dropped)
+        
+        return ContextPackage(
             package_id=package.package_id,
             package_type=package.package_type,
             content=compressed_content,
             metadata={
                 **package.metadata,
                 'original_tokens': package.token_count,
-                'compression_ratio': target_tokens / package.token_count
+                'compression_ratio': token_count / package.token_count,
+                'recompressed_sections': (self.stats['sections_measured']
+                                          + self.stats['sections_compressed'] - measured_before)
             },
-            token_count=TokenCounter.count_dict_tokens(compressed_content),
+            token_count=token_count,
             created_at=package.created_at,
             expires_at=package.expires_at,
             compressed=True
         )
-        
-        return compressed_package
-    
-    def _compress_strategic(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress strategic context - preserve high-level architecture"""
-        return {
-            'architecture_overview': content.get('architecture_overview', '')[:500],
-            'key_decisions': content.get('key_decisions', [])[:3],
-            'integration_points': content.get('integration_points', [])[:5],
-            'success_criteria': content.get('success_criteria', [])[:3],
-            'constraints': content.get('constraints', [])[:3],
-            '_compression_note': 'Strategic context compressed - detailed implementation available in technical context'
-        }
-    
-    def _compress_technical(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress technical context - preserve implementation details"""
-        return {
-            'key_components': content.get('key_components', [])[:5],
-            'implementation_patterns': content.get('implementation_patterns', [])[:3],
-            'dependencies': content.get('dependencies', [])[:10],
-            'critical_files': content.get('critical_files', [])[:8],
-            'api_endpoints': content.get('api_endpoints', [])[:10],
-            'configuration': self._compress_config(content.get('configuration', {})),
-            '_compression_note': 'Technical details compressed - full codebase analysis available'
-        }
     
-    def _compress_frontend(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress frontend context - preserve UI patterns"""
-        return {
-            'ui_components': content.get('ui_components', [])[:8],
-            'styling_approach': content.get('styling_approach', ''),
-            'state_management': content.get('state_management', ''),
-            'routing_config': content.get('routing_config', {}),
-            'key_interactions': content.get('key_interactions', [])[:5],
-            '_compression_note': 'UI details compressed - component library available'
-        }
-    
-    def _compress_security(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress security context - preserve critical vulnerabilities"""
-        return {
-            'critical_vulnerabilities': content.get('critical_vulnerabilities', [])[:5],
-            'auth_patterns': content.get('auth_patterns', [])[:3],
-            'security_headers': content.get('security_headers', {}),
-            'input_validation': content.get('input_validation', [])[:5],
-            'mitigation_strategies': content.get('mitigation_strategies', [])[:5],
-            '_compression_note': 'Security analysis compressed - full audit available'
-        }
+    def _plan(
+        self,
+        content: Dict[str, Any],
+        entries: Dict[str, SectionEntry],
+        rules: Dict[str, Tuple[float, Optional[int]]],
+        budget: int
+    ) -> Dict[str, int]:
+        """
+        Greedy priority-weighted knapsack: choose a level for every section
+
+        The ``_dropped_sections`` list naming dropped sections counts against
+        the budget like any other section.
+        """
+        levels = {key: FULL for key in content}
+        current = {key: entry.tokens for key, entry in entries.items()}
+        total = sum(current.values())
+        dropped: List[str] = []
+        dropped_tokens = 0
+        
+        def next_step(key: str) -> Optional[Tuple[float, int, str, int]]:
+            priority, limit = rules.get(key, UNLISTED_SECTION_RULE)
+            if levels[key] == FULL:
+                _, compressed_tokens = self._compressed(key, content[key], entries[key], limit)
+                saved = current[key] - compressed_tokens
+                if saved > 0:
+                    return (priority * 0.5) / saved, order[key], key, COMPRESSED
+            if levels[key] != DROPPED:
+                loss = priority * (0.5 if levels[key] == COMPRESSED else 1.0)
+                return loss / max(current[key], 1), order[key], key, DROPPED
+            return None
+        
+        order = {key: i for i, key in enumerate(content)}
+        heap = [step for step in (next_step(key) for key in content) if step]
+        heapq.heapify(heap)
+        
+        while total + dropped_tokens > budget and heap:
+            _, _, key, level = heapq.heappop(heap)
+            if level == COMPRESSED:
+                new_tokens = entries[key].compressed[rules.get(key, UNLISTED_SECTION_RULE)[1]][1]
+            else:
+                new_tokens = 0
+                dropped = sorted(dropped + [key], key=order.__getitem__)
+                dropped_tokens = self._count_section('_dropped_sections', dropped)
+            total -= current[key] - new_tokens
+            current[key] = new_tokens
+            levels[key] = level
+            step = next_step(key)
+            if step:
+                heapq.heappush(heap, step)
+        
+        return levels
     
-    def _compress_performance(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress performance context - preserve bottlenecks"""
-        return {
-            'bottlenecks': content.get('bottlenecks', [])[:5],
-            'performance_metrics': content.get('performance_metrics', {})[:5],
-            'optimization_opportunities': content.get('optimization_opportunities', [])[:5],
-            'resource_usage': content.get('resource_usage', {}),
-            '_compression_note': 'Performance data compressed - detailed metrics available'
-        }
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, cached_sections=len(self._sections))
     
-    def _compress_database(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Compress database context - preserve schema essentials"""
-        return {
-            'key_tables': content.get('key_tables', [])[:10],
-            'relationships': content.get('relationships', [])[:8],
-            'indexes': content.get('indexes', [])[:5],
-            'query_patterns': content.get('query_patterns', [])[:5],
-            'migrations': content.get('migrations', [])[:3],
-            '_compression_note': 'Database schema compressed - full DDL available'
-        }
-    
-    def _compress_generic(self, content: Dict[str, Any], target_tokens: int) -> Dict[str, Any]:
-        """Generic compression strategy"""
-        # Keep essential keys and truncate content
-        essential_keys = ['summary', 'key_points', 'findings', 'recommendations', 'status']
-        compressed = {}
-        
-        for key in essential_keys:
-            if key in content:
-                value = content[key]
-                if isinstance(value, list):
-                    compressed[key] = value[:5]
-                elif isinstance(value, str):
-                    compressed[key] = value[:500]
-                else:
-                    compressed[key] = value
-                    
-        # Add compression metadata
-        compressed['_compression_note'] = 'Generic compression applied'
-        compressed['_available_keys'] = list(content.keys())
-        
-        return compressed
+    def _compress_value(self, value: Any, limit: Optional[int]) -> Any:
+        """Compressed form of one section value"""
+        if isinstance(value, str):
+            return value[:MAX_STRING_CHARS]
+        if isinstance(value, list):
+            return value[:limit] if limit is not None else value
+        if isinstance(value, dict):
+            items = list(self._compress_config(value).items())
+            return dict(items[:limit] if limit is not None else items)
+        return value
     
     def _compress_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Compress configuration data"""
         # Keep only essential config keys
         essential_config = {}
-        important_keys = ['host', 'port', 'database', 'timeout', 'max_connections', 'auth_type']
         
         for key, value in config.items():
-            if key in important_keys or len(str(value)) < 50:
+            if key in IMPORTANT_CONFIG_KEYS or len(str(value)) < 50:
                 essential_config[key] = value
                 
         return essential_config
@@ -206,7 +330,9 @@ class ContextManager:
         self.config = config
         self.mcp_integration = mcp_integration
         self.packages: Dict[str, ContextPackage] = {}
-        self.compressor = ContextCompressor()
+        # Uncompressed content of each package, for delta updates
+        self.package_sources: Dict[str, Dict[str, Any]] = {}
+        self.compressor = ContextCompressor(config.get('max_cached_sections', 4096))
         self.logger = logging.getLogger(__name__)
         
         # Token limits from config
@@ -231,7 +357,7 @@ class ContextManager:
         """Create a new context package with automatic token management"""
         
         metadata = metadata or {}
-        token_count = TokenCounter.count_dict_tokens(content)
+        token_count = self.compressor.measure(content)
         
         # Determine token limit for this package type
         token_limit = self.token_limits.get(package_type, self.token_limits['default'])
@@ -254,6 +380,7 @@ class ContextManager:
         
         # Store locally
         self.packages[package_id] = package
+        self.package_sources[package_id] = content
         
         # Store in MCP if available
         if self.mcp_integration:
@@ -265,6 +392,35 @@ class ContextManager:
         
         return package
     
+    async def update_context_package(
+        self,
+        package_id: str,
+        updates: Dict[str, Any],
+        removed: Optional[List[str]] = None
+    ) -> Optional[ContextPackage]:
+        """
+        Apply changed sections to an existing package and recompress it
+        Unchanged sections are served from the compressor's section cache
+        """
+        package = await self.retrieve_context_package(package_id)
+        source = self.package_sources.get(package_id)
+        if package is None or source is None:
+            return None
+        
+        content = {key: value for key, value in source.items() if key not in (removed or ())}
+        content.update(updates)
+        
+        expires_in = package.expires_at - time.time() if package.expires_at else None
+        metadata = {k: v for k, v in package.metadata.items()
+                    if k not in ('original_tokens', 'compression_ratio', 'recompressed_sections')}
+        return await self.create_context_package(
+            package_id=package_id,
+            package_type=package.package_type,
+            content=content,
+            metadata=metadata,
+            expires_in=expires_in
+        )
+    
     async def retrieve_context_package(self, package_id: str) -> Optional[ContextPackage]:
         """Retrieve a context package by ID"""
         # Try local cache first
@@ -274,6 +430,7 @@ class ContextManager:
             # Check expiration
             if package.expires_at and time.time() > package.expires_at:
                 del self.packages[package_id]
+                self.package_sources.pop(package_id, None)
                 return None
                 
             return package
@@ -417,6 +574,7 @@ class ContextManager:
         
         for package_id in expired_ids:
             del self.packages[package_id]
+            self.package_sources.pop(package_id, None)
         
         if expired_ids:
             self.logger.info(f"Cleaned up {len(expired_ids)} expired context packages")
@@ -447,5 +605,6 @@ class ContextManager:
             'compressed_packages': compressed_count,
             'compression_rate': compressed_count / len(self.packages) if self.packages else 0,
             'package_types': package_types,
-            'token_limits': self.token_limits
+            'token_limits': self.token_limits,
+            'compressor': self.compressor.get_stats()
         }
\ No newline at end of file
@@ -3,18 +3,39 @@ Audit Logging System for LocalAgent Security Operations
 CVE-2024-LOCALAGENT-003 Mitigation: Comprehensive audit logging for all key operations
 """
 
+import atexit
 import logging
 import json
 import os
+import weakref
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 import threading
-from queue import Queue, Empty
 import time
 import hashlib
 import hmac
 
+from .audit_segments import AuditSegmentStore, index_name
+from .audit_writer import DURABILITY_BATCH, GroupCommitWriter, shared_writer
+
+
+class _StoreSink:
+    """Signs a batch of entries and appends it to the segment store in one write"""
+    
+    def __init__(self, store: AuditSegmentStore, signing: bool):
+        self.store = store
+        self.signing = signing
+    
+    def write_batch(self, entries: List[Dict[str, Any]]):
+        if self.signing:
+            for entry in entries:
+                entry["_signature"] = self.store.sign_entry(entry)
+        self.store.append(entries)
+    
+    def sync(self):
+        self.store.flush()
+
 
 class AuditLogger:
     """
@@ -23,10 +44,21 @@ class AuditLogger:
     Features:
     - Structured logging in JSON format
     - Tamper detection with HMAC signatures
-    - Async logging to prevent performance impact
+    - Async group-commit logging to prevent performance impact
     - Log rotation and retention policies
     - Configurable log levels and destinations
     - Thread-safe operations
+    
+    Entries are stored in sealed, indexed segments (see AuditSegmentStore),
+    so summaries merge segment footers, verification only re-reads segments
+    not verified before, and time/operation queries seek to the relevant
+    parts of each segment.
+    
+    Events are handed to a GroupCommitWriter shared by all loggers on the
+    same store, which signs and writes them in batches with one fsync per
+    batch. ``durability`` selects "buffered" (no fsync), "batch" or "sync"
+    (callers wait for their batch to be fsynced); the first logger created
+    for a directory decides the writer settings.
     """
     
     def __init__(self, 
@@ -34,7 +66,9 @@ class AuditLogger:
                  log_level: str = "INFO",
                  enable_signing: bool = True,
                  max_log_size: int = 10 * 1024 * 1024,  # 10MB
-                 max_backup_count: int = 5):
+                 max_backup_count: int = 5,
+                 durability: str = DURABILITY_BATCH,
+                 max_queue_size: int = 10000):
         
         self.log_dir = Path(log_dir or os.getenv('LOCALAGENT_AUDIT_LOG_DIR', '/tmp/localagent-audit'))
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -47,13 +81,26 @@ class AuditLogger:
         # Signing key for tamper detection
         self.signing_key = os.getenv('LOCALAGENT_AUDIT_KEY', 'default_audit_key').encode()
         
-        # Setup logger
+        # Setup logger and segment storage
         self.logger = self._setup_logger()
+        self.store = AuditSegmentStore.open(
+            self.log_dir,
+            signing_key=self.signing_key,
+            max_segment_size=self.max_log_size,
+            max_segments=self.max_backup_count
+        )
         
-        # Async logging setup
-        self.log_queue = Queue()
-        self.logging_thread = threading.Thread(target=self._log_worker, daemon=True)
-        self.logging_thread.start()
+        # Group-commit writer shared by every logger on this store
+        store, signing = self.store, self.enable_signing
+        self.writer = shared_writer(
+            ("audit-store", id(store), signing),
+            lambda: GroupCommitWriter(
+                _StoreSink(store, signing),
+                max_queue=max_queue_size,
+                durability=durability,
+                name="audit-logger"
+            )
+        )
         
         # Track session
         self.session_id = self._generate_session_id()
@@ -67,28 +114,18 @@ class AuditLogger:
         return hashlib.sha256(timestamp.encode()).hexdigest()[:16]
     
     def _setup_logger(self) -> logging.Logger:
-        """Setup the audit logger with proper handlers"""
-        logger = logging.getLogger(f"localagent_audit_{id(self)}")
+        """Setup the diagnostic logger (audit entries go to the segment store)"""
+        logger = logging.getLogger(__name__)
         logger.setLevel(self.log_level)
-        
-        # Clear any existing handlers
-        logger.handlers.clear()
-        
-        # File handler with rotation
-        log_file = self.log_dir / "audit.log"
-        handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=self.max_log_size,
-            backupCount=self.max_backup_count
-        )
-        
-        # JSON formatter
-        formatter = logging.Formatter('%(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
         return logger
     
+    def _write_direct(self, entry: Dict[str, Any]):
+        """Write an entry synchronously, bypassing the queue"""
+        try:
+            self.store.append([entry])
+        except Exception:
+            self.logger.error(json.dumps(entry))
+    
     def _sign_entry(self, entry: Dict[str, Any]) -> str:
         """Generate HMAC signature for log entry"""
         if not self.enable_signing:
@@ -106,40 +143,10 @@ class AuditLogger:
         
         return signature
     
-    def _log_worker(self):
-        """Background worker for async logging"""
-        while True:
-            try:
-                entry = self.log_queue.get(timeout=1.0)
-                if entry is None:  # Shutdown signal
-                    break
-                
-                # Add signature
-                signature = self._sign_entry(entry)
-                if signature:
-                    entry["_signature"] = signature
-                
-                # Log the entry
-                log_message = json.dumps(entry, ensure_ascii=False)
-                self.logger.info(log_message)
-                
-                self.log_queue.task_done()
-                
-            except Empty:
-                continue
-            except Exception as e:
-                # Fallback logging to prevent audit loss
-                try:
-                    error_entry = {
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "event_type": "audit_error",
-                        "session_id": self.session_id,
-                        "error": str(e),
-                        "severity": "ERROR"
-                    }
-                    self.logger.error(json.dumps(error_entry))
-                except:
-                    pass  # Last resort - don't let audit errors crash the system
+    def flush(self):
+        """Wait until queued entries are written"""
+        self.writer.flush()
+        self.store.flush()
     
     def _log_session_start(self):
         """Log audit session start"""
@@ -189,8 +196,8 @@ class AuditLogger:
                 "ppid": os.getppid() if hasattr(os, 'getppid') else None
             }
             
-            # Queue for async logging
-            self.log_queue.put(entry)
+            # Queue for group commit
+            self.writer.submit(entry)
             
         except Exception as e:
             # Fallback to synchronous logging
@@ -202,7 +209,7 @@ class AuditLogger:
                     "error": str(e),
                     "severity": "ERROR"
                 }
-                self.logger.error(json.dumps(fallback_entry))
+                self._write_direct(fallback_entry)
             except:
                 pass  # Last resort
     
@@ -284,40 +291,39 @@ class AuditLogger:
                 }
             }
             
-            # This is a simplified implementation
-            # In a real system, you'd parse the log files
-            log_file = self.log_dir / "audit.log"
+            cutoff_time = datetime.utcnow().timestamp() - (hours * 3600)
+            events = summary["events"]
+            summary["segments_merged"] = 0
+            summary["segments_scanned"] = 0
+            
+            def count(operation: str, severity: str, n: int = 1):
+                events["total"] += n
+                events["by_operation"][operation] = events["by_operation"].get(operation, 0) + n
+                events["by_severity"][severity] = events["by_severity"].get(severity, 0) + n
+                if severity in ["ERROR", "CRITICAL"]:
+                    events["errors"] += n
             
-            if log_file.exists():
-                cutoff_time = datetime.utcnow().timestamp() - (hours * 3600)
+            for path, index in self.store.segments():
+                if index.entry_count == 0 or index.last_timestamp is None:
+                    continue
+                if index.last_timestamp < cutoff_time:
+                    continue
                 
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
-                            
-                            if entry_time.timestamp() < cutoff_time:
-                                continue
-                            
-                            summary["events"]["total"] += 1
-                            
-                            # Count by operation
-                            operation = entry.get("operation", "unknown")
-                            summary["events"]["by_operation"][operation] = \
-                                summary["events"]["by_operation"].get(operation, 0) + 1
-                            
-                            # Count by severity
-                            severity = entry.get("severity", "UNKNOWN")
-                            summary["events"]["by_severity"][severity] = \
-                                summary["events"]["by_severity"].get(severity, 0) + 1
-                            
-                            # Count errors
-                            if severity in ["ERROR", "CRITICAL"]:
-                                summary["events"]["errors"] += 1
-                                
-                        except (json.JSONDecodeError, ValueError):
-                            continue
+                if index.first_timestamp >= cutoff_time:
+                    # Whole segment is inside the window - merge its footer counters
+                    for operation, n in index.by_operation.items():
+                        events["by_operation"][operation] = events["by_operation"].get(operation, 0) + n
+                    for severity, n in index.by_severity.items():
+                        events["by_severity"][severity] = events["by_severity"].get(severity, 0) + n
+                        if severity in ["ERROR", "CRITICAL"]:
+                            events["errors"] += n
+                    events["total"] += index.entry_count
+                    summary["segments_merged"] += 1
+                else:
+                    # Straddles the cutoff - read only the buckets after it
+                    for entry in self.store.segment_entries(path, index, since=cutoff_time):
+                        count(entry.get("operation", "unknown"), entry.get("severity", "UNKNOWN"))
+                    summary["segments_scanned"] += 1
             
             return summary
             
@@ -332,7 +338,8 @@ class AuditLogger:
         Verify the integrity of audit logs using HMAC signatures
         
         Args:
-            log_file: Specific log file to verify (default: current audit.log)
+            log_file: Specific log file to verify (default: all segments,
+                incrementally)
         
         Returns:
             Verification results
@@ -344,7 +351,17 @@ class AuditLogger:
                 "timestamp": datetime.utcnow().isoformat()
             }
         
-        log_path = Path(log_file) if log_file else (self.log_dir / "audit.log")
+        if log_file is None:
+            try:
+                return self.store.verify()
+            except Exception as e:
+                return {
+                    "verified": False,
+                    "error": str(e),
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+        
+        log_path = Path(log_file)
         
         try:
             results = {
@@ -366,6 +383,8 @@ class AuditLogger:
                 for line_num, line in enumerate(f, 1):
                     try:
                         entry = json.loads(line.strip())
+                        if "_footer" in entry:
+                            continue
                         results["total_entries"] += 1
                         
                         signature = entry.pop("_signature", None)
@@ -419,33 +438,16 @@ class AuditLogger:
             True if successful
         """
         try:
-            log_file = self.log_dir / "audit.log"
+            since = start_time.timestamp() if start_time else None
+            until = end_time.timestamp() if end_time else None
             
-            if not log_file.exists():
-                return False
-            
-            with open(log_file, 'r') as infile, open(output_file, 'w') as outfile:
-                for line in infile:
-                    try:
-                        entry = json.loads(line.strip())
-                        
-                        # Apply time filtering
-                        if start_time or end_time:
-                            entry_time = datetime.fromisoformat(entry.get("timestamp", ""))
-                            
-                            if start_time and entry_time < start_time:
-                                continue
-                            if end_time and entry_time > end_time:
-                                continue
-                        
-                        # Remove signature if requested
-                        if not include_signatures:
-                            entry.pop("_signature", None)
-                        
-                        outfile.write(json.dumps(entry) + '\n')
-                        
-                    except (json.JSONDecodeError, ValueError):
-                        continue
+            with open(output_file, 'w') as outfile:
+                for entry in self.store.query(since=since, until=until):
+                    # Remove signature if requested
+                    if not include_signatures:
+                        entry.pop("_signature", None)
+                    
+                    outfile.write(json.dumps(entry) + '\n')
             
             self.log_key_operation("audit_export", {
                 "output_file": output_file,
@@ -463,6 +465,27 @@ class AuditLogger:
             }, severity="ERROR")
             return False
     
+    def query_events(self,
+                     since: datetime = None,
+                     until: datetime = None,
+                     operations: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Query audit entries by time and operation using the segment indexes
+        
+        Args:
+            since: Only entries at or after this time (UTC)
+            until: Only entries at or before this time (UTC)
+            operations: Only entries with one of these operations
+        
+        Returns:
+            Matching entries, oldest first
+        """
+        return list(self.store.query(
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            operations=operations
+        ))
+    
     def cleanup_old_logs(self, days: int = 90) -> Dict[str, Any]:
         """
         Clean up audit logs older than specified days
@@ -478,7 +501,20 @@ class AuditLogger:
             cleaned_files = []
             total_size_freed = 0
             
-            # Find old log files
+            # Sealed segments whose newest entry is past retention
+            expired = [
+                index for index in self.store.sealed_indexes()
+                if index.last_timestamp is not None and
+                index.last_timestamp < datetime.utcnow().timestamp() - (days * 24 * 3600)
+            ]
+            for index in expired:
+                for path in (self.log_dir / index.name, self.log_dir / index_name(index.seq)):
+                    if path.exists():
+                        total_size_freed += path.stat().st_size
+                        cleaned_files.append(str(path))
+            self.store.remove_segments(index.seq for index in expired)
+            
+            # Find old log files from the rotating-handler layout
             for log_file in self.log_dir.glob("audit.log.*"):
                 try:
                     stat = log_file.stat()
@@ -514,18 +550,120 @@ class AuditLogger:
     def __del__(self):
         """Destructor to clean shutdown"""
         try:
-            # Signal shutdown to worker thread
-            self.log_queue.put(None)
-            
-            # Log session end
+            # Log session end; the shared writer outlives this logger
             self.log_key_operation("audit_session_end", {
                 "session_id": self.session_id,
                 "duration_seconds": (datetime.utcnow() - self.start_time).total_seconds()
             })
-            
-            # Wait for worker to finish
-            if hasattr(self, 'logging_thread'):
-                self.logging_thread.join(timeout=2.0)
                 
         except:
-            pass  # Don't raise exceptions in destructor
\ No newline at end of file
+            pass  # Don't raise exceptions in destructor
+
+class AuditAggregator:
+    """
+    Aggregates high-frequency audit events into periodic summary entries
+
+    Routine events such as key accesses are counted per operation and
+    dimensions and written as one entry per group when the flush interval
+    elapses or too many events are pending. A timer started by the first
+    pending event flushes even when no further events arrive, and ``close``
+    (also run at interpreter exit) writes whatever is left. Errors and other
+    rare events should still go straight to the AuditLogger.
+    """
+    
+    def __init__(self,
+                 audit_logger: AuditLogger,
+                 flush_interval: float = 60.0,
+                 max_pending: int = 1000):
+        self.audit_logger = audit_logger
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        
+        self._groups: Dict[tuple, Dict[str, Any]] = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+        _live_aggregators.add(self)
+    
+    def record(self, operation: str, dimensions: Dict[str, Any] = None, size: int = 0):
+        """
+        Count one occurrence of an audit event
+        
+        Args:
+            operation: Operation name used for the summary entry
+            dimensions: Non-sensitive fields the events are grouped by
+            size: Optional byte count summed per group
+        """
+        dimensions = dimensions or {}
+        key = (operation, tuple(sorted((k, str(v)) for k, v in dimensions.items())))
+        now = datetime.utcnow().isoformat()
+        
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = {
+                    "operation": operation,
+                    "dimensions": dict(dimensions),
+                    "count": 0,
+                    "total_bytes": 0,
+                    "first_seen": now
+                }
+            group["count"] += 1
+            group["total_bytes"] += size
+            group["last_seen"] = now
+            self._pending += 1
+            
+            due = (self._closed or self._pending >= self.max_pending or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        if due:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Write one summary entry per group; returns the number of entries"""
+        with self._lock:
+            groups, self._groups = self._groups, {}
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        
+        for group in groups.values():
+            self.audit_logger.log_key_operation(group["operation"], {
+                **group["dimensions"],
+                "aggregated": True,
+                "count": group["count"],
+                "total_bytes": group["total_bytes"],
+                "first_seen": group["first_seen"],
+                "last_seen": group["last_seen"]
+            })
+        return len(groups)
+    
+    def close(self) -> int:
+        """Write the pending summaries; later events are written as they arrive"""
+        self._closed = True
+        _live_aggregators.discard(self)
+        return self.flush()
+    
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+
+_live_aggregators: "weakref.WeakSet[AuditAggregator]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all_aggregators():
+    for aggregator in list(_live_aggregators):
+        try:
+            aggregator.close()
+        except Exception:
+            pass
@@ -0,0 +1,577 @@
+"""
+Segmented Audit Log Storage for LocalAgent
+Rotated, sealed audit segments with HMAC chain footers, sidecar indexes and
+incremental integrity verification
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+ACTIVE_SEGMENT = "audit.log"
+STATE_FILE = "audit-state.json"
+BUCKET_SECONDS = 60
+SEGMENT_PATTERN = re.compile(r"^audit-(\d{6})\.log$")
+
+
+def segment_name(seq: int) -> str:
+    return f"audit-{seq:06d}.log"
+
+
+def index_name(seq: int) -> str:
+    return f"audit-{seq:06d}.idx"
+
+
+def entry_epoch(entry: Dict[str, Any]) -> Optional[float]:
+    """Entry time as an epoch, using the same naive-UTC convention as AuditLogger"""
+    try:
+        return datetime.fromisoformat(entry.get("timestamp", "")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class SegmentIndex:
+    """
+    Footer counters and time/operation buckets for one segment
+
+    Buckets are ``[bucket_start, byte_offset, {operation: count}]`` with one
+    bucket per minute of entries, so readers can seek straight to the part
+    of a segment that can contain the events they want.
+    """
+
+    def __init__(self, seq: int, prev_chain_head: Optional[str] = None):
+        self.seq = seq
+        self.prev_chain_head = prev_chain_head
+        self.chain_head = prev_chain_head
+        self.entry_count = 0
+        self.signed_count = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.by_operation: Dict[str, int] = {}
+        self.by_severity: Dict[str, int] = {}
+        self.buckets: List[list] = []
+        self.data_size = 0
+        self.footer_signature = ""
+
+    @property
+    def name(self) -> str:
+        return segment_name(self.seq)
+
+    def add(self, entry: Dict[str, Any], offset: int, length: int, chain_head: Optional[str]):
+        """Account for one entry written at ``offset``"""
+        self.entry_count += 1
+        if entry.get("_signature"):
+            self.signed_count += 1
+        self.chain_head = chain_head
+
+        operation = entry.get("operation", "unknown")
+        severity = entry.get("severity", "UNKNOWN")
+        self.by_operation[operation] = self.by_operation.get(operation, 0) + 1
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + 1
+
+        epoch = entry_epoch(entry)
+        if epoch is not None:
+            if self.first_timestamp is None:
+                self.first_timestamp = epoch
+            self.last_timestamp = epoch
+            bucket_start = int(epoch // BUCKET_SECONDS) * BUCKET_SECONDS
+            if not self.buckets or self.buckets[-1][0] != bucket_start:
+                self.buckets.append([bucket_start, offset, {}])
+            counts = self.buckets[-1][2]
+            counts[operation] = counts.get(operation, 0) + 1
+
+        self.data_size = offset + length
+
+    def footer(self) -> Dict[str, Any]:
+        """Footer written at the end of a sealed segment"""
+        return {
+            "segment": self.seq,
+            "prev_chain_head": self.prev_chain_head,
+            "chain_head": self.chain_head,
+            "entry_count": self.entry_count,
+            "signed_count": self.signed_count,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "by_operation": self.by_operation,
+            "by_severity": self.by_severity,
+            "data_size": self.data_size
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "footer": self.footer(),
+            "footer_signature": self.footer_signature,
+            "buckets": self.buckets
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SegmentIndex':
+        footer = data["footer"]
+        index = cls(footer["segment"], footer.get("prev_chain_head"))
+        index.chain_head = footer.get("chain_head")
+        index.entry_count = footer.get("entry_count", 0)
+        index.signed_count = footer.get("signed_count", 0)
+        index.first_timestamp = footer.get("first_timestamp")
+        index.last_timestamp = footer.get("last_timestamp")
+        index.by_operation = footer.get("by_operation", {})
+        index.by_severity = footer.get("by_severity", {})
+        index.data_size = footer.get("data_size", 0)
+        index.footer_signature = data.get("footer_signature", "")
+        index.buckets = data.get("buckets", [])
+        return index
+
+    def snapshot(self) -> 'SegmentIndex':
+        """Copy that stays stable while the writer keeps appending"""
+        copy = SegmentIndex.from_dict(json.loads(json.dumps(self.to_dict())))
+        return copy
+
+    def ranges(self, since: Optional[float], until: Optional[float],
+               operations: Optional[set]) -> List[Tuple[int, int]]:
+        """Byte ranges of buckets that can hold matching entries"""
+        ranges: List[Tuple[int, int]] = []
+        for i, (bucket_start, offset, counts) in enumerate(self.buckets):
+            if since is not None and bucket_start + BUCKET_SECONDS <= since:
+                continue
+            if until is not None and bucket_start > until:
+                break
+            if operations is not None and not operations.intersection(counts):
+                continue
+            end = self.buckets[i + 1][1] if i + 1 < len(self.buckets) else self.data_size
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((offset, end))
+        return ranges
+
+
+class AuditSegmentStore:
+    """
+    Append-only audit storage split into sealed segments
+
+    ``audit.log`` is the active segment. Once it reaches ``max_segment_size``
+    it is sealed: a signed footer with the HMAC chain head, entry counts and
+    per-operation/severity counters is appended, the file is renamed to
+    ``audit-NNNNNN.log`` and a sidecar ``.idx`` with the footer and the
+    time/operation buckets is written next to it. Each entry extends the
+    chain ``head = HMAC(key, previous_head + entry_signature)``, and every
+    footer records the previous segment's head, so verification can check
+    sealed segments once and only re-read new ones.
+
+    One store is shared per log directory within a process; a directory
+    should have a single writing process.
+    """
+
+    _stores: Dict[str, 'AuditSegmentStore'] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self,
+                 log_dir: Path,
+                 signing_key: bytes,
+                 max_segment_size: int = 10 * 1024 * 1024,
+                 max_segments: int = 5,
+                 fsync: bool = False):
+        self.log_dir = Path(log_dir)
+        self.signing_key = signing_key
+        self.max_segment_size = max_segment_size
+        self.max_segments = max_segments
+        self.fsync = fsync
+
+        self.active_path = self.log_dir / ACTIVE_SEGMENT
+        self.state_path = self.log_dir / STATE_FILE
+        self._lock = threading.RLock()
+        self._handle = None
+        self._active: Optional[SegmentIndex] = None
+        self._recover()
+
+    @classmethod
+    def open(cls, log_dir: Path, **kwargs) -> 'AuditSegmentStore':
+        """Shared store for ``log_dir`` in this process"""
+        key = str(Path(log_dir).resolve())
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None or store._is_stale():
+                store = cls._stores[key] = cls(Path(log_dir), **kwargs)
+            return store
+
+    def _is_stale(self) -> bool:
+        """The active file was removed or replaced behind our back"""
+        try:
+            return os.stat(self.active_path).st_ino != os.fstat(self._handle.fileno()).st_ino
+        except (OSError, AttributeError, ValueError):
+            return True
+
+    # -- chain -------------------------------------------------------------
+
+    def _chain(self, head: Optional[str], signature: str) -> Optional[str]:
+        if not signature:
+            return head
+        return hmac.new(
+            self.signing_key,
+            ((head or "") + signature).encode(),
+            hashlib.sha256
+        ).hexdigest()
+
+    def sign_entry(self, entry: Dict[str, Any]) -> str:
+        """HMAC over the canonical JSON form of an entry or footer"""
+        canonical = json.dumps(entry, sort_keys=True, separators=(',', ':'))
+        return hmac.new(self.signing_key, canonical.encode(), hashlib.sha256).hexdigest()
+
+    def _sign_footer(self, footer: Dict[str, Any]) -> str:
+        return self.sign_entry(footer)
+
+    # -- state -------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"verified": {}, "anchor": None}
+
+    def _save_state(self, state: Dict[str, Any]):
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    # -- recovery ----------------------------------------------------------
+
+    def _sealed_sequences(self) -> List[int]:
+        sequences = []
+        for path in self.log_dir.glob("audit-*.log"):
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return sorted(sequences)
+
+    def _scan_segment(self, path: Path, seq: int, prev_chain_head: Optional[str]) -> Tuple[SegmentIndex, Optional[Dict[str, Any]], int]:
+        """
+        Rebuild a segment index by reading it
+
+        Returns the index, the footer line (if sealed) and the length of the
+        valid prefix of the file.
+        """
+        index = SegmentIndex(seq, prev_chain_head)
+        footer_line = None
+        offset = 0
+        with open(path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Torn tail from a crash
+                try:
+                    entry = json.loads(raw)
+                except json.JSONDecodeError:
+                    offset += len(raw)
+                    continue
+                if "_footer" in entry:
+                    footer_line = entry
+                    offset += len(raw)
+                    break
+                index.add(entry, offset, len(raw), self._chain(index.chain_head, entry.get("_signature", "")))
+                offset += len(raw)
+                index.data_size = offset
+            if footer_line is None:
+                index.data_size = offset
+        return index, footer_line, offset
+
+    def _write_index(self, index: SegmentIndex):
+        path = self.log_dir / index_name(index.seq)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _load_index(self, seq: int) -> Optional[SegmentIndex]:
+        try:
+            with open(self.log_dir / index_name(seq), 'r') as f:
+                return SegmentIndex.from_dict(json.load(f))
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def _recover(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+        prev_head = (state.get("anchor") or {}).get("chain_head")
+
+        for seq in self._sealed_sequences():
+            index = self._load_index(seq)
+            if index is None:
+                # Crashed between the rename and writing the sidecar
+                index, footer_line, _ = self._scan_segment(self.log_dir / segment_name(seq), seq, prev_head)
+                if footer_line is not None:
+                    index.footer_signature = footer_line.get("_signature", "")
+                self._write_index(index)
+            prev_head = index.chain_head
+
+        sequences = self._sealed_sequences()
+        next_seq = (sequences[-1] + 1) if sequences else 1
+
+        if self.active_path.exists():
+            index, footer_line, valid_size = self._scan_segment(self.active_path, next_seq, prev_head)
+            if footer_line is not None:
+                # Crashed after writing the footer but before the rename
+                index.footer_signature = footer_line.get("_signature", "")
+                os.replace(self.active_path, self.log_dir / segment_name(next_seq))
+                self._write_index(index)
+                prev_head = index.chain_head
+                next_seq += 1
+            else:
+                if valid_size != self.active_path.stat().st_size:
+                    with open(self.active_path, 'r+b') as f:
+                        f.truncate(valid_size)
+                self._active = index
+
+        if self._active is None:
+            self._active = SegmentIndex(next_seq, prev_head)
+        self._handle = open(self.active_path, 'ab')
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, entries: Iterable[Dict[str, Any]]):
+        """Append signed entries to the active segment with a single write"""
+        with self._lock:
+            offset = self._active.data_size
+            chunks = []
+            for entry in entries:
+                line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+                head = self._chain(self._active.chain_head, entry.get("_signature", ""))
+                self._active.add(entry, offset, len(line), head)
+                chunks.append(line)
+                offset += len(line)
+            if not chunks:
+                return
+            self._handle.write(b"".join(chunks))
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+            if self._active.data_size >= self.max_segment_size:
+                self.seal()
+
+    def seal(self) -> Optional[SegmentIndex]:
+        """Seal the active segment and start a new one"""
+        with self._lock:
+            index = self._active
+            if index.entry_count == 0:
+                return None
+
+            footer = index.footer()
+            index.footer_signature = self._sign_footer(footer)
+            footer_line = json.dumps({"_footer": footer, "_signature": index.footer_signature}) + "\n"
+            self._handle.write(footer_line.encode('utf-8'))
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.close()
+
+            os.replace(self.active_path, self.log_dir / index.name)
+            self._write_index(index)
+            self._prune()
+
+            self._active = SegmentIndex(index.seq + 1, index.chain_head)
+            self._handle = open(self.active_path, 'ab')
+            return index
+
+    def _prune(self):
+        """Drop the oldest sealed segments beyond ``max_segments``"""
+        sequences = self._sealed_sequences()
+        excess = len(sequences) - self.max_segments
+        if excess > 0:
+            self.remove_segments(sequences[:excess])
+
+    def remove_segments(self, sequences: Iterable[int]) -> List[str]:
+        """Delete sealed segments, anchoring the chain at the newest removed one"""
+        with self._lock:
+            state = self._load_state()
+            removed = []
+            for seq in sorted(sequences):
+                index = self._load_index(seq)
+                for path in (self.log_dir / segment_name(seq), self.log_dir / index_name(seq)):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                state.setdefault("verified", {}).pop(segment_name(seq), None)
+                if index is not None:
+                    state["anchor"] = {"segment": seq, "chain_head": index.chain_head}
+                removed.append(segment_name(seq))
+            self._save_state(state)
+            return removed
+
+    def flush(self):
+        with self._lock:
+            if self._handle:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._handle:
+                self._handle.close()
+                self._handle = None
+
+    # -- reading -----------------------------------------------------------
+
+    def sealed_indexes(self) -> List[SegmentIndex]:
+        """Sidecar indexes of all sealed segments, oldest first"""
+        indexes = []
+        for seq in self._sealed_sequences():
+            index = self._load_index(seq)
+            if index is not None:
+                indexes.append(index)
+        return indexes
+
+    def active_index(self) -> SegmentIndex:
+        """Snapshot of the active segment's index"""
+        with self._lock:
+            return self._active.snapshot()
+
+    def segments(self) -> List[Tuple[Path, SegmentIndex]]:
+        """All segments with their indexes, oldest first"""
+        segments = [(self.log_dir / index.name, index) for index in self.sealed_indexes()]
+        segments.append((self.active_path, self.active_index()))
+        return segments
+
+    @staticmethod
+    def read_ranges(path: Path, ranges: List[Tuple[int, int]]) -> Iterator[Dict[str, Any]]:
+        """Entries stored in the given byte ranges of a segment"""
+        try:
+            with open(path, 'rb') as f:
+                for start, end in ranges:
+                    f.seek(start)
+                    for raw in f.read(end - start).splitlines():
+                        try:
+                            entry = json.loads(raw)
+                        except json.JSONDecodeError:
+                            continue
+                        if "_footer" not in entry:
+                            yield entry
+        except FileNotFoundError:
+            return
+
+    def query(self,
+              since: Optional[float] = None,
+              until: Optional[float] = None,
+              operations: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Entries between two epochs, optionally limited to some operations
+
+        Segments outside the window are skipped using their footers and only
+        index buckets that can contain matches are read.
+        """
+        wanted = set(operations) if operations is not None else None
+        for path, index in self.segments():
+            if index.entry_count == 0:
+                continue
+            if since is not None and index.last_timestamp is not None and index.last_timestamp < since:
+                continue
+            if until is not None and index.first_timestamp is not None and index.first_timestamp > until:
+                continue
+            yield from self.segment_entries(path, index, since, until, wanted)
+
+    def segment_entries(self, path: Path, index: SegmentIndex,
+                        since: Optional[float] = None,
+                        until: Optional[float] = None,
+                        operations: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """Matching entries of one segment, reading only candidate buckets"""
+        for entry in self.read_ranges(path, index.ranges(since, until, operations)):
+            if operations is not None and entry.get("operation") not in operations:
+                continue
+            epoch = entry_epoch(entry)
+            if epoch is None:
+                continue
+            if since is not None and epoch < since:
+                continue
+            if until is not None and epoch > until:
+                continue
+            yield entry
+
+    # -- verification ------------------------------------------------------
+
+    def _verify_entries(self, path: Path, index: SegmentIndex, start_head: Optional[str],
+                        results: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+        """Re-check entry signatures and the chain of one segment"""
+        head = start_head
+        ok = True
+        for line_num, entry in enumerate(self.read_ranges(path, [(0, index.data_size)]), 1):
+            results["total_entries"] += 1
+            signature = entry.pop("_signature", None)
+            if signature is None:
+                results["unsigned_entries"] += 1
+                continue
+            if hmac.compare_digest(signature, self.sign_entry(entry)):
+                results["verified_entries"] += 1
+            else:
+                results["failed_entries"] += 1
+                results["errors"].append(f"{path.name} entry {line_num}: Signature mismatch")
+                ok = False
+            head = self._chain(head, signature)
+        return head, ok
+
+    def verify(self) -> Dict[str, Any]:
+        """
+        Verify sealed segments not verified before, then the active segment
+
+        Segments that verified once are only checked for chain linkage.
+        """
+        results = {
+            "verified": True,
+            "total_entries": 0,
+            "verified_entries": 0,
+            "failed_entries": 0,
+            "unsigned_entries": 0,
+            "segments_verified": 0,
+            "segments_skipped": 0,
+            "errors": [],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        state = self._load_state()
+        verified = state.setdefault("verified", {})
+        prev_head = (state.get("anchor") or {}).get("chain_head")
+        first = state.get("anchor") is None
+        state_changed = False
+
+        for index in self.sealed_indexes():
+            path = self.log_dir / index.name
+            if not first and index.prev_chain_head != prev_head:
+                results["errors"].append(f"{index.name}: Chain does not continue from previous segment")
+            first = False
+
+            if verified.get(index.name) == index.chain_head:
+                results["segments_skipped"] += 1
+                results["total_entries"] += index.entry_count
+                results["verified_entries"] += index.signed_count
+                results["unsigned_entries"] += index.entry_count - index.signed_count
+                prev_head = index.chain_head
+                continue
+
+            head, ok = self._verify_entries(path, index, index.prev_chain_head, results)
+            footer_ok = hmac.compare_digest(index.footer_signature or "", self._sign_footer(index.footer()))
+            if not footer_ok:
+                results["errors"].append(f"{index.name}: Footer signature mismatch")
+            if head != index.chain_head:
+                results["errors"].append(f"{index.name}: Chain head mismatch")
+            if ok and footer_ok and head == index.chain_head:
+                verified[index.name] = index.chain_head
+                state_changed = True
+            results["segments_verified"] += 1
+            prev_head = index.chain_head
+
+        active = self.active_index()
+        if not first and active.prev_chain_head != prev_head:
+            results["errors"].append(f"{ACTIVE_SEGMENT}: Chain does not continue from previous segment")
+        head, _ = self._verify_entries(self.active_path, active, active.prev_chain_head, results)
+        if head != active.chain_head:
+            results["errors"].append(f"{ACTIVE_SEGMENT}: Chain head mismatch")
+
+        if state_changed:
+            self._save_state(state)
+
+        if results["failed_entries"] > 0 or results["errors"]:
+            results["verified"] = False
+        return results
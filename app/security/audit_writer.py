@@ -0,0 +1,263 @@
+"""
+Group-Commit Audit Writer for LocalAgent
+Batches audit entries from many producers into single writes on one
+long-lived handle, with one fsync per batch
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from queue import Queue, Empty, Full
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Durability modes
+DURABILITY_BUFFERED = "buffered"   # written to the OS per batch, no fsync
+DURABILITY_BATCH = "batch"         # one fsync per batch, producers do not wait
+DURABILITY_SYNC = "sync"           # one fsync per batch, producers wait for it
+DURABILITY_MODES = (DURABILITY_BUFFERED, DURABILITY_BATCH, DURABILITY_SYNC)
+
+_STOP = object()
+_live_writers: "weakref.WeakSet[GroupCommitWriter]" = weakref.WeakSet()
+_shared_writers: Dict[Hashable, 'GroupCommitWriter'] = {}
+_shared_lock = threading.Lock()
+
+
+class AuditWriteError(IOError):
+    """Raised to producers waiting on entries whose batch could not be written"""
+
+
+class JsonLinesSink:
+    """Appends entries as JSON lines to a file kept open for the writer's lifetime"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, 'ab')
+
+    def write_batch(self, entries: List[Dict[str, Any]]):
+        self._handle.write(b"".join(
+            (json.dumps(entry, default=str) + "\n").encode('utf-8') for entry in entries
+        ))
+        self._handle.flush()
+
+    def sync(self):
+        os.fsync(self._handle.fileno())
+
+    def close(self):
+        self._handle.close()
+
+
+class GroupCommitWriter:
+    """
+    Background writer that commits queued entries in batches
+
+    Producers call ``submit`` which only enqueues. A single thread drains
+    the bounded queue into batches of up to ``max_batch`` entries, waiting
+    at most ``max_delay`` seconds for a batch to fill, and hands each batch
+    to the sink in one call followed by at most one ``sync``. When the
+    queue is full ``submit`` blocks, so producers are slowed down instead
+    of the backlog growing without bound.
+
+    The sink needs ``write_batch(entries)`` and may provide ``sync()`` and
+    ``close()``. A batch the sink fails to write is counted as lost, never
+    as committed, and waiters on its entries get ``AuditWriteError``.
+    """
+
+    def __init__(self,
+                 sink: Any,
+                 max_batch: int = 512,
+                 max_delay: float = 0.05,
+                 max_queue: int = 10000,
+                 durability: str = DURABILITY_BATCH,
+                 name: str = "audit-writer"):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.sink = sink
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.durability = durability
+
+        self._queue: Queue = Queue(maxsize=max_queue)
+        self._cond = threading.Condition()
+        self._submit_lock = threading.Lock()
+        self._submitted = 0
+        self._processed = 0  # Entries handed to the sink, written or not
+        self._committed = 0  # Entries actually written
+        self._flushed = 0
+        self._failures: deque = deque(maxlen=64)  # (first seq, last seq, error)
+        self._closed = False
+
+        self.stats = {
+            "entries": 0,
+            "batches": 0,
+            "syncs": 0,
+            "errors": 0,
+            "lost": 0,
+            "blocked": 0,
+            "max_batch_seen": 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _live_writers.add(self)
+
+    def submit(self, entry: Any, wait: Optional[bool] = None, timeout: Optional[float] = None) -> int:
+        """
+        Queue an entry and return its sequence number
+
+        Blocks while the queue is full. With ``wait`` (the default in
+        ``sync`` durability) also blocks until the entry's batch is committed.
+        """
+        if self._closed:
+            raise RuntimeError("Audit writer is closed")
+        # Producers enqueue under one lock so sequence numbers follow queue order
+        with self._submit_lock:
+            try:
+                self._queue.put_nowait(entry)
+            except Full:
+                self.stats["blocked"] += 1
+                self._queue.put(entry, timeout=timeout)
+            self._submitted += 1
+            seq = self._submitted
+        if wait if wait is not None else self.durability == DURABILITY_SYNC:
+            self.wait_for(seq, timeout)
+        return seq
+
+    def _raise_failure(self, first: int, last: int):
+        for failed_first, failed_last, error in self._failures:
+            if failed_first <= last and failed_last >= first:
+                raise AuditWriteError(
+                    f"Audit entries {failed_first}-{failed_last} were not written: {error}"
+                ) from error
+
+    def wait_for(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the entry ``seq`` has been committed
+
+        Returns False on timeout and raises ``AuditWriteError`` if the
+        entry's batch could not be written.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._processed >= seq, timeout):
+                return False
+            self._raise_failure(seq, seq)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything submitted so far has been committed
+
+        Raises ``AuditWriteError`` if any entry submitted since the previous
+        flush was lost.
+        """
+        target = self._submitted
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._processed >= target, timeout):
+                return False
+            first, self._flushed = self._flushed + 1, max(self._flushed, target)
+            self._raise_failure(first, target)
+        return True
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _next_batch(self) -> Tuple[List[Any], bool]:
+        batch: List[Any] = []
+        item = self._queue.get()
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, batch: List[Any]):
+        error = None
+        try:
+            self.sink.write_batch(batch)
+            if self.durability != DURABILITY_BUFFERED and hasattr(self.sink, 'sync'):
+                self.sink.sync()
+                self.stats["syncs"] += 1
+        except Exception as e:
+            error = e
+            self.stats["errors"] += 1
+            self.stats["lost"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}")
+        else:
+            self.stats["entries"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+        with self._cond:
+            first = self._processed + 1
+            self._processed += len(batch)
+            if error is None:
+                self._committed += len(batch)
+            else:
+                self._failures.append((first, self._processed, error))
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._commit(batch)
+            if stop:
+                break
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Commit queued entries, stop the thread and close the sink"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if hasattr(self.sink, 'close'):
+            try:
+                self.sink.close()
+            except Exception as e:
+                logger.error(f"Failed to close audit sink: {e}")
+
+
+def shared_writer(key: Hashable, factory: Callable[[], GroupCommitWriter]) -> GroupCommitWriter:
+    """Get the process-wide writer for ``key``, creating it on first use"""
+    with _shared_lock:
+        writer = _shared_writers.get(key)
+        if writer is None or writer._closed:
+            writer = factory()
+            _shared_writers[key] = writer
+        return writer
+
+
+def shared_file_writer(path: Union[str, Path], **kwargs) -> GroupCommitWriter:
+    """Shared JSON-lines writer for an audit file"""
+    path = Path(path).resolve()
+    return shared_writer(("jsonl", path), lambda: GroupCommitWriter(JsonLinesSink(path), **kwargs))
+
+
+@atexit.register
+def _close_all_writers():
+    for writer in list(_live_writers):
+        writer.close(timeout=2.0)
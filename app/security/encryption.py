@@ -7,15 +7,19 @@ import os
 import base64
 import secrets
 import logging
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Iterable, List
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.fernet import Fernet
 from datetime import datetime, timedelta
 import json
 
-from .audit import AuditLogger
+from .audit import AuditLogger, AuditAggregator
+from .key_cache import KeyCache
+
+ENVELOPE_SCHEME = "envelope-v1"
 
 
 class EncryptionService:
@@ -29,9 +33,14 @@ class EncryptionService:
     - Secure random nonce generation
     - Comprehensive audit logging
     - Memory protection for keys
+    
+    Envelope scheme: the master key is stretched with PBKDF2 once per
+    process unlock (per master salt). Per-purpose data keys are expanded
+    from it with HKDF and cached with a TTL; each message key is then
+    expanded from the data key and the message's own random salt.
     """
     
-    def __init__(self, master_password: Optional[str] = None):
+    def __init__(self, master_password: Optional[str] = None, data_key_ttl: float = 300.0):
         self.logger = logging.getLogger(__name__)
         self.audit_logger = AuditLogger()
         
@@ -51,6 +60,13 @@ class EncryptionService:
         self.key_version = 1
         self.last_rotation = datetime.utcnow()
         
+        # Envelope keys: master keys live until lock(), data keys expire
+        self.data_key_ttl = data_key_ttl
+        self.master_salt = secrets.token_bytes(self.salt_size)
+        self._master_keys = KeyCache(ttl_seconds=None, max_entries=16)
+        self._data_keys = KeyCache(ttl_seconds=data_key_ttl)
+        self._audit = AuditAggregator(self.audit_logger)
+        
         self.audit_logger.log_key_operation("encryption_service_initialized", {
             "kdf_iterations": self.kdf_iterations,
             "key_version": self.key_version
@@ -62,13 +78,15 @@ class EncryptionService:
         self.logger.warning("Generated temporary master password - consider setting LOCALAGENT_MASTER_KEY")
         return password
     
-    def _derive_key(self, salt: bytes, purpose: str = "default") -> bytes:
+    def _derive_key(self, salt: bytes, purpose: str = "default",
+                    iterations: Optional[int] = None) -> bytes:
         """
-        Derive encryption key using PBKDF2
+        Derive encryption key using PBKDF2 (legacy per-message scheme)
         
         Args:
             salt: Salt for key derivation
             purpose: Purpose identifier for key derivation
+            iterations: PBKDF2 iterations, defaults to kdf_iterations
         
         Returns:
             32-byte derived key
@@ -81,7 +99,7 @@ class EncryptionService:
                 algorithm=hashes.SHA256(),
                 length=32,
                 salt=salt,
-                iterations=self.kdf_iterations,
+                iterations=iterations or self.kdf_iterations,
             )
             
             return kdf.derive(password_with_purpose)
@@ -94,6 +112,92 @@ class EncryptionService:
             })
             raise
     
+    def _derive_master_key(self, master_salt: bytes, iterations: int) -> bytes:
+        """Stretch the master password with PBKDF2 (once per unlock)"""
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=master_salt,
+            iterations=iterations,
+        )
+        key = kdf.derive(self.master_password)
+        self.audit_logger.log_key_operation("master_key_unlocked", {
+            "kdf": "PBKDF2",
+            "iterations": iterations
+        })
+        return key
+    
+    def unlock(self, master_salt: Optional[bytes] = None, iterations: Optional[int] = None):
+        """Derive and cache the master key ahead of the first request"""
+        master_salt = master_salt or self.master_salt
+        iterations = iterations or self.kdf_iterations
+        self._master_keys.use(
+            (master_salt, iterations),
+            lambda: self._derive_master_key(master_salt, iterations),
+            lambda master_key: None
+        )
+    
+    def lock(self):
+        """Zeroize all cached master and data keys"""
+        self._data_keys.invalidate()
+        self._master_keys.invalidate()
+        self._audit.flush()
+    
+    def _envelope_key(self, salt: bytes, purpose: str, master_salt: bytes,
+                      iterations: int, key_version: int) -> bytes:
+        """Expand a message key from the cached per-purpose data key"""
+        def derive_data_key() -> bytes:
+            return self._master_keys.use(
+                (master_salt, iterations),
+                lambda: self._derive_master_key(master_salt, iterations),
+                lambda master_key: HKDF(
+                    algorithm=hashes.SHA256(),
+                    length=32,
+                    salt=master_salt,
+                    info=f"data_key:{purpose}:v{key_version}".encode(),
+                ).derive(master_key)
+            )
+        
+        return self._data_keys.use(
+            ("envelope", master_salt, iterations, purpose, key_version),
+            derive_data_key,
+            lambda data_key: HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                info=b"message_key",
+            ).derive(data_key)
+        )
+    
+    def _encryption_key(self, salt: bytes, purpose: str) -> bytes:
+        """Message key for new ciphertexts"""
+        return self._envelope_key(salt, purpose, self.master_salt, self.kdf_iterations, self.key_version)
+    
+    def _decryption_key(self, encrypted_data: Dict[str, Any], salt: bytes, purpose: str) -> bytes:
+        """Message key for a stored ciphertext, envelope or legacy PBKDF2"""
+        iterations = int(encrypted_data.get("iterations", self.kdf_iterations))
+        if encrypted_data.get("scheme") == ENVELOPE_SCHEME:
+            return self._envelope_key(
+                salt,
+                purpose,
+                base64.b64decode(encrypted_data["master_salt"]),
+                iterations,
+                encrypted_data.get("key_version", 1)
+            )
+        
+        # Legacy ciphertexts stretch per message; cache so re-reads are cheap
+        return self._data_keys.use(
+            ("legacy", salt, purpose, iterations),
+            lambda: self._derive_key(salt, purpose, iterations),
+            bytes
+        )
+    
+    def _envelope_fields(self) -> Dict[str, Any]:
+        return {
+            "scheme": ENVELOPE_SCHEME,
+            "master_salt": base64.b64encode(self.master_salt).decode()
+        }
+    
     def encrypt_aes_gcm(self, data: Union[str, bytes], purpose: str = "default") -> Dict[str, str]:
         """
         Encrypt data using AES-256-GCM
@@ -114,8 +218,8 @@ class EncryptionService:
             salt = secrets.token_bytes(self.salt_size)
             nonce = secrets.token_bytes(self.nonce_size)
             
-            # Derive key
-            key = self._derive_key(salt, purpose)
+            # Expand message key from the cached data key
+            key = self._encryption_key(salt, purpose)
             
             # Encrypt with AES-GCM
             aesgcm = AESGCM(key)
@@ -131,16 +235,16 @@ class EncryptionService:
                 "iterations": self.kdf_iterations,
                 "key_version": self.key_version,
                 "encrypted_at": datetime.utcnow().isoformat(),
-                "purpose": purpose
+                "purpose": purpose,
+                **self._envelope_fields()
             }
             
-            # Audit log (without sensitive data)
-            self.audit_logger.log_key_operation("data_encrypted_aes_gcm", {
+            # Audit log (without sensitive data), aggregated per purpose
+            self._audit.record("data_encrypted_aes_gcm", {
                 "purpose": purpose,
-                "data_length": len(data),
                 "algorithm": "AES-256-GCM",
                 "key_version": self.key_version
-            })
+            }, size=len(data))
             
             # Clear sensitive data from memory
             key = b"0" * len(key)
@@ -186,18 +290,17 @@ class EncryptionService:
                 raise ValueError(f"Data encrypted with newer key version: {key_version}")
             
             # Derive key
-            key = self._derive_key(salt, purpose)
+            key = self._decryption_key(encrypted_data, salt, purpose)
             
             # Decrypt
             aesgcm = AESGCM(key)
             plaintext = aesgcm.decrypt(nonce, ciphertext, None)
             
-            # Audit log
-            self.audit_logger.log_key_operation("data_decrypted_aes_gcm", {
+            # Audit log, aggregated per purpose
+            self._audit.record("data_decrypted_aes_gcm", {
                 "purpose": purpose,
-                "data_length": len(plaintext),
                 "key_version": key_version
-            })
+            }, size=len(plaintext))
             
             # Clear key from memory
             key = b"0" * len(key)
@@ -232,8 +335,8 @@ class EncryptionService:
             # Generate salt
             salt = secrets.token_bytes(self.salt_size)
             
-            # Derive key and create Fernet instance
-            derived_key = self._derive_key(salt, purpose)
+            # Expand message key and create Fernet instance
+            derived_key = self._encryption_key(salt, purpose)
             fernet_key = base64.urlsafe_b64encode(derived_key)
             fernet = Fernet(fernet_key)
             
@@ -248,14 +351,14 @@ class EncryptionService:
                 "iterations": self.kdf_iterations,
                 "key_version": self.key_version,
                 "encrypted_at": datetime.utcnow().isoformat(),
-                "purpose": purpose
+                "purpose": purpose,
+                **self._envelope_fields()
             }
             
-            self.audit_logger.log_key_operation("data_encrypted_fernet", {
+            self._audit.record("data_encrypted_fernet", {
                 "purpose": purpose,
-                "data_length": len(data),
                 "key_version": self.key_version
-            })
+            }, size=len(data))
             
             # Clear sensitive data
             derived_key = b"0" * len(derived_key)
@@ -295,17 +398,16 @@ class EncryptionService:
             purpose = encrypted_data["purpose"]
             
             # Derive key and create Fernet instance
-            derived_key = self._derive_key(salt, purpose)
+            derived_key = self._decryption_key(encrypted_data, salt, purpose)
             fernet_key = base64.urlsafe_b64encode(derived_key)
             fernet = Fernet(fernet_key)
             
             # Decrypt
             plaintext = fernet.decrypt(ciphertext)
             
-            self.audit_logger.log_key_operation("data_decrypted_fernet", {
-                "purpose": purpose,
-                "data_length": len(plaintext)
-            })
+            self._audit.record("data_decrypted_fernet", {
+                "purpose": purpose
+            }, size=len(plaintext))
             
             # Clear sensitive data
             derived_key = b"0" * len(derived_key)
@@ -322,6 +424,33 @@ class EncryptionService:
             })
             raise
     
+    def decrypt_many(self, records: Iterable[Dict[str, Any]],
+                     raise_on_error: bool = True) -> List[Optional[bytes]]:
+        """
+        Decrypt a batch of AES-GCM and Fernet records
+        
+        Records sharing a master salt and purpose reuse one cached data key.
+        
+        Args:
+            records: Encrypted records as returned by the encrypt methods
+            raise_on_error: Raise on the first failure instead of returning None
+        
+        Returns:
+            Plaintexts in record order
+        """
+        results = []
+        for record in records:
+            try:
+                if record.get("algorithm") == "Fernet":
+                    results.append(self.decrypt_fernet(record))
+                else:
+                    results.append(self.decrypt_aes_gcm(record))
+            except Exception:
+                if raise_on_error:
+                    raise
+                results.append(None)
+        return results
+    
     def rotate_key(self) -> bool:
         """
         Rotate the master key version
@@ -334,6 +463,9 @@ class EncryptionService:
             self.key_version += 1
             self.last_rotation = datetime.utcnow()
             
+            # Data keys are bound to a key version; drop the old ones
+            self._data_keys.invalidate()
+            
             self.audit_logger.log_key_operation("key_rotated", {
                 "old_version": old_version,
                 "new_version": self.key_version,
@@ -374,7 +506,10 @@ class EncryptionService:
             "kdf_iterations": self.kdf_iterations,
             "supported_algorithms": ["AES-256-GCM", "Fernet"],
             "key_age_days": (datetime.utcnow() - self.last_rotation).days,
-            "should_rotate": self.should_rotate_key()
+            "should_rotate": self.should_rotate_key(),
+            "key_scheme": ENVELOPE_SCHEME,
+            "data_key_ttl": self.data_key_ttl,
+            "data_key_cache": self._data_keys.stats()
         }
     
     def health_check(self) -> Dict[str, Any]:
@@ -426,6 +561,10 @@ class EncryptionService:
     def __del__(self):
         """Destructor to clear sensitive data"""
         try:
+            if hasattr(self, '_master_keys'):
+                self.lock()
+            if hasattr(self, '_audit'):
+                self._audit.close()
             if hasattr(self, 'master_password'):
                 self.master_password = b"0" * len(self.master_password)
         except:
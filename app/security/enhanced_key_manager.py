@@ -8,7 +8,7 @@ import os
 import logging
 import secrets
 import hashlib
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Iterable
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -22,7 +22,8 @@ from pathlib import Path
 import hmac
 import time
 
-from .audit import AuditLogger
+from .audit import AuditLogger, AuditAggregator
+from .key_cache import KeyCache
 
 
 class EnhancedSecureKeyManager:
@@ -38,12 +39,18 @@ class EnhancedSecureKeyManager:
     - Zero-knowledge key derivation patterns
     - Memory protection and secure deletion
     - Hardware Security Module (HSM) integration support
+    
+    Unwrapped per-provider data keys are cached with a TTL so repeated key
+    accesses skip the RSA unwrap, and access audit events are aggregated.
     """
     
-    def __init__(self, service_name: str = "localagent-enhanced", entropy_source: Optional[str] = None):
+    def __init__(self, service_name: str = "localagent-enhanced", entropy_source: Optional[str] = None,
+                 data_key_ttl: float = 300.0):
         self.service_name = service_name
         self.logger = logging.getLogger(__name__)
         self.audit_logger = AuditLogger()
+        self._audit = AuditAggregator(self.audit_logger)
+        self._data_keys = KeyCache(ttl_seconds=data_key_ttl)
         
         # Initialize entropy source (never hardcoded)
         self.entropy_source = entropy_source or self._generate_system_entropy()
@@ -224,20 +231,29 @@ class EnhancedSecureKeyManager:
             if salt is None:
                 salt = self.master_salt
             
-            # Use HKDF for key derivation with purpose separation
-            hkdf = HKDF(
-                algorithm=hashes.SHA256(),
-                length=self.key_size,
-                salt=salt,
-                info=f"{purpose}:v{self.key_version}".encode(),
-                backend=default_backend()
-            )
-            
-            # Use system entropy instead of hardcoded password
-            key_material = self.entropy_source.encode() + salt
-            derived_key = hkdf.derive(key_material)
+            def derive() -> bytes:
+                # Use HKDF for key derivation with purpose separation
+                hkdf = HKDF(
+                    algorithm=hashes.SHA256(),
+                    length=self.key_size,
+                    salt=salt,
+                    info=f"{purpose}:v{self.key_version}".encode(),
+                    backend=default_backend()
+                )
+                
+                # Use system entropy instead of hardcoded password
+                key_material = self.entropy_source.encode() + salt
+                return hkdf.derive(key_material)
+            
+            if salt == self.master_salt:
+                # Master-salt keys are stable per version and worth caching
+                derived_key = self._data_keys.use(
+                    ("derived", purpose, self.key_version), derive, bytes
+                )
+            else:
+                derived_key = derive()
             
-            self.audit_logger.log_key_operation("key_derived", {
+            self._audit.record("key_derived", {
                 "purpose": purpose,
                 "key_version": self.key_version,
                 "algorithm": "HKDF-SHA256"
@@ -290,9 +306,10 @@ class EnhancedSecureKeyManager:
                 "algorithm": "RSA-4096+AES-256+HKDF-SHA256"
             }
             
-            # Store envelope
+            # Store envelope and forget any data key cached for the old one
             keyring_key = f"api_envelope_{provider}"
             keyring.set_password(self.service_name, keyring_key, json.dumps(envelope))
+            self._data_keys.invalidate(lambda k: k[0] == "api_key" and k[1] == provider)
             
             # Store metadata if provided
             if metadata:
@@ -342,32 +359,31 @@ class EnhancedSecureKeyManager:
             
             envelope = json.loads(envelope_json)
             
-            # Decrypt AES key with RSA
+            # Unwrap the AES key with RSA once per envelope and TTL window
             encrypted_aes_key = base64.b64decode(envelope["encrypted_aes_key"])
-            aes_key = self.private_key.decrypt(
-                encrypted_aes_key,
-                padding.OAEP(
-                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                    algorithm=hashes.SHA256(),
-                    label=None
-                )
-            )
-            
-            # Decrypt API key with AES
-            fernet = Fernet(base64.urlsafe_b64encode(aes_key))
+            envelope_id = hashlib.sha256(encrypted_aes_key).hexdigest()
             encrypted_key = base64.b64decode(envelope["encrypted_key"])
-            decrypted_key = fernet.decrypt(encrypted_key).decode()
             
-            # Audit log
-            self.audit_logger.log_key_operation("api_key_retrieved_enhanced", {
+            decrypted_key = self._data_keys.use(
+                ("api_key", provider, envelope_id),
+                lambda: self.private_key.decrypt(
+                    encrypted_aes_key,
+                    padding.OAEP(
+                        mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                        algorithm=hashes.SHA256(),
+                        label=None
+                    )
+                ),
+                # Decrypt API key with AES
+                lambda aes_key: Fernet(base64.urlsafe_b64encode(aes_key)).decrypt(encrypted_key).decode()
+            )
+            
+            # Audit log, aggregated per provider
+            self._audit.record("api_key_retrieved_enhanced", {
                 "provider": provider,
-                "key_length": len(decrypted_key),
                 "key_version": envelope.get("key_version", "unknown")
             })
             
-            # Secure cleanup of intermediate keys
-            self._secure_delete(aes_key)
-            
             return decrypted_key
             
         except Exception as e:
@@ -378,6 +394,12 @@ class EnhancedSecureKeyManager:
             })
             return None
     
+    def retrieve_api_keys(self, providers: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieve several API keys in one call
+        """
+        return {provider: self.retrieve_api_key(provider) for provider in providers}
+    
     def _create_metadata_envelope(self, provider: str, metadata: Dict[str, Any], aes_key: bytes) -> Dict[str, str]:
         """Create encrypted metadata envelope"""
         metadata_with_timestamp = {
@@ -448,6 +470,7 @@ class EnhancedSecureKeyManager:
             # Update key version
             keyring.set_password(self.service_name, "key_version", str(new_version))
             self.key_version = new_version
+            self._data_keys.invalidate()
             
             # Generate new RSA keys
             self.private_key, self.public_key = self._get_or_create_rsa_keys()
@@ -550,6 +573,11 @@ class EnhancedSecureKeyManager:
             if hasattr(self, 'master_salt'):
                 self._secure_delete(self.master_salt)
             
+            if hasattr(self, '_data_keys'):
+                self._data_keys.invalidate()
+            if hasattr(self, '_audit'):
+                self._audit.flush()
+            
             self._active_keys.clear()
             
             self.logger.info("Enhanced memory cleanup completed")
@@ -561,5 +589,7 @@ class EnhancedSecureKeyManager:
         """Enhanced destructor"""
         try:
             self.cleanup_memory()
+            if hasattr(self, '_audit'):
+                self._audit.close()
         except:
             pass  # Don't raise exceptions in destructor
\ No newline at end of file
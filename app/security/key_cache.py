@@ -0,0 +1,178 @@
+"""
+Derived Key Cache for LocalAgent
+Keeps derived key material in zeroizable, best-effort memory-locked buffers
+with TTL expiry so key stretching stays off the request hot path
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+def _load_libc():
+    """Load libc for mlock/munlock where available"""
+    try:
+        name = ctypes.util.find_library('c')
+        if not name:
+            return None
+        libc = ctypes.CDLL(name, use_errno=True)
+        return libc if hasattr(libc, 'mlock') and hasattr(libc, 'munlock') else None
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+
+def _buffer_address(buffer: bytearray) -> int:
+    return ctypes.addressof((ctypes.c_char * len(buffer)).from_buffer(buffer))
+
+
+class SecureBuffer:
+    """
+    Mutable key buffer that is wiped in place
+
+    The pages backing the buffer are locked with ``mlock`` when the platform
+    and ``RLIMIT_MEMLOCK`` allow it, so the key is not written to swap.
+    """
+
+    __slots__ = ('_data', '_locked')
+
+    def __init__(self, material: bytes):
+        self._data = bytearray(material)
+        self._locked = self._mlock()
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def data(self) -> bytearray:
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _mlock(self) -> bool:
+        if _LIBC is None or not self._data:
+            return False
+        try:
+            return _LIBC.mlock(
+                ctypes.c_void_p(_buffer_address(self._data)),
+                ctypes.c_size_t(len(self._data))
+            ) == 0
+        except Exception:
+            return False
+
+    def zeroize(self):
+        """Overwrite the key material and release the page lock"""
+        length = len(self._data)
+        if not length:
+            return
+        ctypes.memset(_buffer_address(self._data), 0, length)
+        if self._locked:
+            try:
+                _LIBC.munlock(ctypes.c_void_p(_buffer_address(self._data)), ctypes.c_size_t(length))
+            except Exception:
+                pass
+            self._locked = False
+
+    def __del__(self):
+        try:
+            self.zeroize()
+        except Exception:
+            pass
+
+
+class KeyCache:
+    """
+    Thread-safe LRU cache of derived keys with TTL expiry
+
+    Keys never leave the cache as long-lived copies: callers pass a function
+    that uses the cached buffer while the cache lock is held. Expired,
+    evicted and invalidated entries are zeroized.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = 300.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[SecureBuffer, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def use(self, cache_key: Hashable, factory: Callable[[], bytes],
+            consumer: Callable[[bytearray], T]) -> T:
+        """
+        Run ``consumer`` on the key cached under ``cache_key``
+
+        ``factory`` derives the key on a miss or after expiry.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(cache_key)
+            if entry is not None and self.ttl_seconds is not None and entry[1] <= now:
+                self._drop(cache_key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                material = factory()
+                buffer = SecureBuffer(material)
+                expires = now + self.ttl_seconds if self.ttl_seconds is not None else float('inf')
+                self._entries[cache_key] = (buffer, expires)
+                while len(self._entries) > self.max_entries:
+                    self._drop(next(iter(self._entries)))
+            else:
+                self.hits += 1
+                buffer = entry[0]
+                self._entries.move_to_end(cache_key)
+
+            return consumer(buffer.data)
+
+    def contains(self, cache_key: Hashable) -> bool:
+        """Check for an unexpired entry"""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            return entry is not None and (self.ttl_seconds is None or entry[1] > time.monotonic())
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Zeroize and drop matching entries (all entries by default)"""
+        with self._lock:
+            doomed = [k for k in self._entries if predicate is None or predicate(k)]
+            for cache_key in doomed:
+                self._drop(cache_key)
+            return len(doomed)
+
+    def purge_expired(self) -> int:
+        """Zeroize and drop expired entries"""
+        if self.ttl_seconds is None:
+            return 0
+        now = time.monotonic()
+        return self.invalidate(lambda k: self._entries[k][1] <= now)
+
+    def _drop(self, cache_key: Hashable):
+        buffer, _ = self._entries.pop(cache_key)
+        buffer.zeroize()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics (no key material)"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+                "memory_locked": all(buffer.locked for buffer, _ in self._entries.values())
+            }
@@ -14,11 +14,18 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 import uuid
+import heapq
+import itertools
 from collections import defaultdict
 
-@dataclass
+try:
+    from mcp.journal import create_journal
+except ImportError:  # Loaded with the mcp directory itself on sys.path
+    from journal import create_journal
+
+@dataclass(frozen=True)
 class CoordinationMessage:
-    """Message for inter-agent communication"""
+    """Message for inter-agent communication (shared, so immutable)"""
     message_id: str
     sender_id: str
     recipient_id: Optional[str]  # None for broadcast
@@ -27,6 +34,7 @@ class CoordinationMessage:
     timestamp: datetime
     priority: int = 0  # Higher priority messages processed first
     metadata: Dict[str, Any] = field(default_factory=dict)
+    sequence: int = 0  # Global send order, breaks priority ties stably
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary"""
@@ -73,6 +81,74 @@ class WorkflowStream:
             data['completed_at'] = data['completed_at'].isoformat()
         return data
 
+class Mailbox:
+    """
+    Per-recipient priority mailbox
+    
+    Pending messages sit in a heap ordered by (-priority, sequence), so a send
+    is O(log n) and a read pops only what it returns. Messages pulled without
+    auto-acknowledgement stay in flight until acked or requeued.
+    """
+    
+    __slots__ = ('_heap', 'in_flight')
+    
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self.in_flight: Dict[str, CoordinationMessage] = {}
+    
+    def push(self, message: CoordinationMessage):
+        """Enqueue a message"""
+        heapq.heappush(self._heap, (-message.priority, message.sequence, message))
+    
+    def pull(
+        self,
+        limit: int,
+        message_type: Optional[str] = None,
+        auto_ack: bool = True
+    ) -> List[CoordinationMessage]:
+        """Remove and return up to ``limit`` of the highest priority messages"""
+        if message_type is None:
+            count = min(limit, len(self._heap))
+            result = [heapq.heappop(self._heap)[2] for _ in range(count)]
+        else:
+            matching = heapq.nsmallest(
+                limit,
+                (entry for entry in self._heap if entry[2].message_type == message_type)
+            )
+            if matching:
+                taken = {id(entry[2]) for entry in matching}
+                self._heap = [entry for entry in self._heap if id(entry[2]) not in taken]
+                heapq.heapify(self._heap)
+            result = [entry[2] for entry in matching]
+        
+        if not auto_ack:
+            for message in result:
+                self.in_flight[message.message_id] = message
+        return result
+    
+    def ack(self, message_ids: Optional[List[str]] = None) -> int:
+        """Acknowledge in-flight messages (all of them when ids are omitted)"""
+        if message_ids is None:
+            count = len(self.in_flight)
+            self.in_flight.clear()
+            return count
+        return sum(1 for mid in message_ids if self.in_flight.pop(mid, None) is not None)
+    
+    def requeue(self) -> int:
+        """Return unacknowledged in-flight messages to the pending heap"""
+        count = len(self.in_flight)
+        for message in self.in_flight.values():
+            self.push(message)
+        self.in_flight.clear()
+        return count
+    
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+    
+    def __len__(self) -> int:
+        return len(self._heap) + len(self.in_flight)
+
 class MessageType(str, Enum):
     """Types of coordination messages"""
     TASK_REQUEST = "task_request"
@@ -99,7 +175,8 @@ class CoordinationMCP:
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.agents: Dict[str, AgentRegistration] = {}
-        self.messages: Dict[str, List[CoordinationMessage]] = defaultdict(list)
+        self.messages: Dict[str, Mailbox] = defaultdict(Mailbox)
+        self._sequence = itertools.count(1)
         self.streams: Dict[str, WorkflowStream] = {}
         self.shared_scratch: Dict[str, Any] = {}  # Shared scratch pad
         self.locks: Dict[str, asyncio.Lock] = {}  # Resource locks
@@ -107,20 +184,22 @@ class CoordinationMCP:
         self.logger = logging.getLogger(__name__)
         self.state_file = Path(self.config.get('state_file', '.coordination_state.json'))
         self.heartbeat_timeout = timedelta(seconds=self.config.get('heartbeat_timeout', 60))
+        self.journal = create_journal(self.config, '.coordination_state.json')
         
     async def initialize(self):
         """Initialize the Coordination MCP server"""
         self.logger.info("Initializing Coordination MCP Server")
         
-        # Load saved state
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    self.shared_scratch = state.get('scratch', {})
-                    self.logger.info(f"Loaded coordination state")
-            except Exception as e:
-                self.logger.warning(f"Could not load state: {e}")
+        # Load snapshot and replay journaled mutations
+        try:
+            loaded = self.journal.load()
+            if loaded['snapshot'] is not None or loaded['records']:
+                self.shared_scratch = (loaded['snapshot'] or {}).get('scratch', {})
+                for record in loaded['records']:
+                    self._apply_record(record['op'], record['data'])
+                self.logger.info(f"Loaded coordination state")
+        except Exception as e:
+            self.logger.warning(f"Could not load state: {e}")
         
         # Start heartbeat monitor
         asyncio.create_task(self._monitor_heartbeats())
@@ -212,16 +291,12 @@ class CoordinationMCP:
             content=content,
             timestamp=datetime.now(),
             priority=priority,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            sequence=next(self._sequence)
         )
         
-        # Add to recipient's message queue
-        self.messages[recipient_id].append(message)
-        
-        # Sort by priority (higher first) and timestamp
-        self.messages[recipient_id].sort(
-            key=lambda m: (-m.priority, m.timestamp)
-        )
+        # Add to recipient's priority mailbox
+        self.messages[recipient_id].push(message)
         
         self.logger.debug(f"Message {message_id} sent from {sender_id} to {recipient_id}")
         return message_id
@@ -245,13 +320,14 @@ class CoordinationMCP:
             message_type=message_type,
             content=content,
             timestamp=datetime.now(),
-            metadata=metadata or {}
+            metadata=metadata or {},
+            sequence=next(self._sequence)
         )
         
-        # Send to all registered agents except excluded
+        # Every recipient's mailbox references the same immutable message
         for agent_id in self.agents:
             if agent_id not in exclude and agent_id != sender_id:
-                self.messages[agent_id].append(message)
+                self.messages[agent_id].push(message)
         
         self.logger.debug(f"Broadcast {message_id} from {sender_id}")
         return message_id
@@ -260,22 +336,38 @@ class CoordinationMCP:
         self,
         agent_id: str,
         limit: int = 10,
-        message_type: Optional[str] = None
+        message_type: Optional[str] = None,
+        auto_ack: bool = True
     ) -> List[CoordinationMessage]:
-        """Get messages for an agent"""
-        messages = self.messages.get(agent_id, [])
-        
-        # Filter by type if specified
-        if message_type:
-            messages = [m for m in messages if m.message_type == message_type]
-        
-        # Return limited number of messages
-        result = messages[:limit]
-        
-        # Remove retrieved messages from queue
-        self.messages[agent_id] = messages[limit:]
-        
-        return result
+        """
+        Get new messages for an agent in priority order
+        
+        Args:
+            agent_id: Recipient agent
+            limit: Maximum number of messages to return
+            message_type: Only return messages of this type; others stay queued
+            auto_ack: When False, returned messages stay in flight until
+                ``ack_messages`` is called or they are requeued
+        """
+        mailbox = self.messages.get(agent_id)
+        if mailbox is None:
+            return []
+        
+        return mailbox.pull(limit, message_type, auto_ack)
+    
+    async def ack_messages(
+        self,
+        agent_id: str,
+        message_ids: Optional[List[str]] = None
+    ) -> int:
+        """Acknowledge in-flight messages; returns how many were acknowledged"""
+        mailbox = self.messages.get(agent_id)
+        return mailbox.ack(message_ids) if mailbox else 0
+    
+    async def requeue_unacked(self, agent_id: str) -> int:
+        """Redeliver in-flight messages that were never acknowledged"""
+        mailbox = self.messages.get(agent_id)
+        return mailbox.requeue() if mailbox else 0
     
     async def update_agent_status(
         self,
@@ -415,9 +507,15 @@ class CoordinationMCP:
         
         return True
     
+    def _apply_record(self, op: str, data: Dict[str, Any]):
+        """Apply a journal record to in-memory state during replay"""
+        if op == 'scratch_set':
+            self.shared_scratch[data['key']] = data['value']
+    
     async def set_scratch_data(self, key: str, value: Any) -> bool:
         """Set data in shared scratch pad"""
         self.shared_scratch[key] = value
+        self.journal.append('scratch_set', {'key': key, 'value': value})
         self.logger.debug(f"Scratch data set: {key}")
         return True
     
@@ -472,15 +570,21 @@ class CoordinationMCP:
         subscribers = self.subscriptions.get(topic, set())
         count = 0
         
+        # One message shared by all subscribers
+        message = CoordinationMessage(
+            message_id=f"msg_{uuid.uuid4().hex[:8]}",
+            sender_id=sender_id,
+            recipient_id=None,
+            message_type=MessageType.BROADCAST,
+            content=content,
+            timestamp=datetime.now(),
+            metadata={'topic': topic, **(metadata or {})},
+            sequence=next(self._sequence)
+        )
+        
         for agent_id in subscribers:
             if agent_id != sender_id:  # Don't send to self
-                await self.send_message(
-                    sender_id=sender_id,
-                    recipient_id=agent_id,
-                    message_type=MessageType.BROADCAST,
-                    content=content,
-                    metadata={'topic': topic, **(metadata or {})}
-                )
+                self.messages[agent_id].push(message)
                 count += 1
         
         self.logger.debug(f"Published to {topic}, reached {count} agents")
@@ -523,18 +627,24 @@ class CoordinationMCP:
             'scratch_keys': len(self.shared_scratch)
         }
     
-    async def save_state(self):
-        """Save current state to disk"""
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Build the full state written to a snapshot"""
+        return {
+            'scratch': self.shared_scratch,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    async def save_state(self, force_snapshot: bool = False):
+        """
+        Persist state to disk
+        
+        Scratch pad writes are already journaled, so this commits the journal
+        and only writes a full snapshot once the journal has grown past its
+        interval.
+        """
         try:
-            state = {
-                'scratch': self.shared_scratch,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
-            
-            self.logger.info(f"Saved coordination state to {self.state_file}")
+            if self.journal.checkpoint(self._build_snapshot, force=force_snapshot):
+                self.logger.info(f"Saved coordination state snapshot to {self.state_file}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
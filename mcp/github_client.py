@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+GitHub API Client for the GitHub MCP Server
+Independent implementation for LocalAgent project
+Provides one persistent HTTP session, batched GraphQL reads,
+ETag-conditional REST requests and a rate-limit-aware scheduler
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+DEFAULT_API_URL = "https://api.github.com"
+
+RATE_LIMIT_FIELD = "rateLimit { limit remaining resetAt cost }"
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API rejects a request"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class GitHubRateLimitError(GitHubAPIError):
+    """Raised when the rate limit resets too far in the future to wait for"""
+
+
+class GraphQLEnum(str):
+    """String rendered as a bare GraphQL enum value instead of a quoted literal"""
+
+
+def graphql_literal(value: Any) -> str:
+    """Render a Python value as an inline GraphQL argument"""
+    if isinstance(value, GraphQLEnum):
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(graphql_literal(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k}: {graphql_literal(v)}" for k, v in value.items()) + "}"
+    # JSON string escapes are a subset of GraphQL's
+    return json.dumps(str(value))
+
+
+def graphql_field(name: str, args: Optional[Dict[str, Any]] = None, selection: str = "") -> str:
+    """Render ``name(args) { selection }`` with None-valued arguments omitted"""
+    rendered = ""
+    args = {k: v for k, v in (args or {}).items() if v is not None}
+    if args:
+        rendered = "(" + ", ".join(f"{k}: {graphql_literal(v)}" for k, v in args.items()) + ")"
+    body = f" {{ {selection} }}" if selection else ""
+    return f"{name}{rendered}{body}"
+
+
+class ResponseCache:
+    """
+    LRU cache of REST responses keyed by URL, holding each body with its ETag
+
+    Cached entries are revalidated with ``If-None-Match``; a ``304 Not
+    Modified`` reply reuses the stored body and does not count against
+    the primary rate limit. The cache can be persisted to a JSON file so
+    ETags survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 512, path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, etag: str, body: Any) -> None:
+        self._entries[key] = (etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                for key, etag, body in json.load(f):
+                    self.put(key, etag, body)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load GitHub response cache: {e}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp, 'w') as f:
+                json.dump([[k, etag, body] for k, (etag, body) in self._entries.items()], f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save GitHub response cache: {e}")
+
+
+class RateLimitScheduler:
+    """
+    Admission control for GitHub API requests
+
+    Limits in-flight requests, tracks the remaining budget of each rate-limit
+    resource (``core``, ``graphql``, ...) from response headers or the
+    GraphQL ``rateLimit`` field, and holds new requests once the budget
+    drops to ``reserve`` until the window resets. Secondary limits
+    (``Retry-After``) pause every resource.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        reserve: int = 10,
+        max_wait: float = 60.0,
+        clock=time.time,
+        sleep=asyncio.sleep
+    ):
+        self.max_concurrency = max_concurrency
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.limits: Dict[str, Dict[str, float]] = {}
+        self.paused_until = 0.0
+        self.stats = {'requests': 0, 'waits': 0, 'waited_seconds': 0.0}
+
+    def update(self, resource: str, remaining: int, reset_at: float, limit: Optional[int] = None) -> None:
+        self.limits[resource] = {'remaining': remaining, 'reset_at': reset_at, 'limit': limit}
+
+    def update_from_headers(self, headers: Any) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        limit = headers.get('X-RateLimit-Limit')
+        self.update(
+            headers.get('X-RateLimit-Resource', 'core'),
+            int(remaining),
+            float(reset),
+            int(limit) if limit is not None else None
+        )
+
+    def update_from_graphql(self, rate_limit: Optional[Dict[str, Any]]) -> None:
+        if not rate_limit:
+            return
+        reset_at = datetime.fromisoformat(rate_limit['resetAt'].replace('Z', '+00:00')).timestamp()
+        self.update('graphql', int(rate_limit['remaining']), reset_at, rate_limit.get('limit'))
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds`` (secondary rate limit)"""
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+    def delay_for(self, resource: str) -> float:
+        """Seconds a request against ``resource`` must wait before it is sent"""
+        now = self.clock()
+        delay = max(0.0, self.paused_until - now)
+        state = self.limits.get(resource)
+        if state and state['remaining'] <= self.reserve and state['reset_at'] > now:
+            delay = max(delay, state['reset_at'] - now)
+        return delay
+
+    async def acquire(self, resource: str) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._semaphore.acquire()
+        try:
+            delay = self.delay_for(resource)
+            if delay > self.max_wait:
+                raise GitHubRateLimitError(
+                    f"GitHub {resource} rate limit exhausted; resets in {delay:.0f}s", status=403
+                )
+            if delay > 0:
+                self.stats['waits'] += 1
+                self.stats['waited_seconds'] += delay
+                await self.sleep(delay)
+            state = self.limits.get(resource)
+            if state and state['remaining'] > 0:
+                # Reserve budget for requests already in flight
+                state['remaining'] -= 1
+            self.stats['requests'] += 1
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class GitHubClient:
+    """
+    Persistent GitHub API client
+
+    Reads are coalesced: fields queued within ``batch_window`` seconds of
+    each other (up to ``max_batch``) are sent as aliased top-level fields of
+    one GraphQL query, and identical fields share a single alias. REST GETs
+    are revalidated against the response cache with ETags. Every request
+    passes through the rate-limit scheduler.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: str = DEFAULT_API_URL,
+        graphql_url: Optional[str] = None,
+        max_concurrency: int = 4,
+        batch_window: float = 0.005,
+        max_batch: int = 25,
+        max_retries: int = 2,
+        cache_size: int = 512,
+        cache_file: Optional[Path] = None,
+        timeout: float = 30.0,
+        scheduler: Optional[RateLimitScheduler] = None
+    ):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is required for GitHub API access")
+
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.graphql_url = graphql_url or f"{self.base_url}/graphql"
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.scheduler = scheduler or RateLimitScheduler(max_concurrency=max_concurrency)
+        self.cache = ResponseCache(cache_size, cache_file)
+        self.cache.load()
+        self.logger = logging.getLogger(__name__)
+
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._pending: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self.stats = {
+            'http_requests': 0,
+            'graphql_queries': 0,
+            'batched_fields': 0,
+            'coalesced_fields': 0,
+            'not_modified': 0,
+            'retries': 0
+        }
+
+    # Session management
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+            'User-Agent': 'LocalAgent-GitHubMCP'
+        }
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        return headers
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Send queued reads, persist the response cache and close the session"""
+        await self.flush()
+        self.cache.save()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # Transport
+
+    async def _send(self, method: str, url: str, resource: str, **kwargs) -> Tuple[int, Any, Any]:
+        """Send one request through the scheduler, retrying secondary rate limits"""
+        session = await self._get_session()
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(resource)
+            try:
+                self.stats['http_requests'] += 1
+                async with session.request(method, url, **kwargs) as response:
+                    self.scheduler.update_from_headers(response.headers)
+                    body = None
+                    if response.status != 304:
+                        text = await response.text()
+                        body = json.loads(text) if text else None
+                    status, headers = response.status, response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise GitHubAPIError(f"{method} {url} failed: {e!r}") from e
+            finally:
+                self.scheduler.release()
+
+            retry_after = headers.get('Retry-After')
+            rate_limited = status == 429 or (
+                status == 403 and (retry_after is not None or headers.get('X-RateLimit-Remaining') == '0')
+            )
+            if rate_limited and attempt < self.max_retries:
+                self.stats['retries'] += 1
+                if retry_after is not None:
+                    self.scheduler.pause(float(retry_after))
+                self.logger.warning(f"GitHub rate limited ({status}), retrying {method} {url}")
+                continue
+            return status, body, headers
+
+    @staticmethod
+    def _error_message(body: Any, status: int) -> str:
+        if isinstance(body, dict) and body.get('message'):
+            return body['message']
+        return f"HTTP {status}"
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a REST endpoint, revalidating any cached copy with its ETag"""
+        url = path if path.startswith('http') else f"{self.base_url}/{path.lstrip('/')}"
+        key = url
+        if params:
+            key += "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+        headers = {}
+        cached = self.cache.get(key)
+        if cached:
+            headers['If-None-Match'] = cached[0]
+
+        status, body, response_headers = await self._send(
+            'GET', url, 'core', params=params, headers=headers
+        )
+        if status == 304 and cached:
+            self.stats['not_modified'] += 1
+            return cached[1]
+        if status >= 400:
+            raise GitHubAPIError(self._error_message(body, status), status=status)
+
+        etag = response_headers.get('ETag')
+        if etag:
+            self.cache.put(key, etag, body)
+        return body
+
+    async def request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        """Send an uncached REST request"""
+        if method.upper() == 'GET':
+            return await self.get(path, data)
+        url = path if path.startswith('http') else f"{self.base_url}/{path.lstrip('/')}"
+        status, body, _ = await self._send(method.upper(), url, 'core', json=data)
+        if status >= 400:
+            raise GitHubAPIError(self._error_message(body, status), status=status)
+        return body
+
+    async def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a GraphQL document and return its ``data`` and ``errors``"""
+        payload = {'query': query}
+        if variables:
+            payload['variables'] = variables
+        self.stats['graphql_queries'] += 1
+        status, body, _ = await self._send('POST', self.graphql_url, 'graphql', json=payload)
+        if status >= 400 or not isinstance(body, dict):
+            raise GitHubAPIError(self._error_message(body, status), status=status)
+        data = body.get('data') or {}
+        self.scheduler.update_from_graphql(data.get('rateLimit'))
+        return body
+
+    # Batched reads
+
+    async def query_field(self, field: str) -> Any:
+        """
+        Resolve one top-level GraphQL field, batched with concurrent callers
+
+        Returns the field's value; raises GitHubAPIError if the server reported
+        an error for it.
+        """
+        future = self._pending.get(field)
+        if future is not None:
+            self.stats['coalesced_fields'] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[field] = future
+        if len(self._pending) >= self.max_batch:
+            self._start_batch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._start_batch)
+        return await asyncio.shield(future)
+
+    def _start_batch(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, OrderedDict()
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """Send queued fields now and wait for in-flight batches"""
+        self._start_batch()
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    async def _run_batch(self, batch: "OrderedDict[str, asyncio.Future]") -> None:
+        aliases = {f"f{i}": field for i, field in enumerate(batch)}
+        lines = [f"  {alias}: {field}" for alias, field in aliases.items()]
+        query = "query {\n" + "\n".join(lines) + f"\n  {RATE_LIMIT_FIELD}\n}}"
+        self.stats['batched_fields'] += len(batch)
+
+        try:
+            body = await self.graphql(query)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        data = body.get('data') or {}
+        errors: Dict[str, str] = {}
+        for error in body.get('errors') or []:
+            path = error.get('path') or []
+            if path:
+                errors.setdefault(path[0], error.get('message', 'GraphQL error'))
+            else:
+                # A document-level error fails every field in the batch
+                errors.update({alias: error.get('message', 'GraphQL error') for alias in aliases})
+
+        for alias, field in aliases.items():
+            future = batch[field]
+            if future.done():
+                continue
+            if alias in errors:
+                future.set_exception(GitHubAPIError(errors[alias]))
+            else:
+                future.set_result(data.get(alias))
+
+    async def _paginate(self, owner: str, name: str, connection: str,
+                        args: Dict[str, Any], node_fields: str, limit: int) -> List[Dict[str, Any]]:
+        """Collect up to ``limit`` nodes of a repository connection, 100 per page"""
+        nodes: List[Dict[str, Any]] = []
+        cursor = None
+        while len(nodes) < limit:
+            page_args = dict(args, first=min(100, limit - len(nodes)), after=cursor)
+            inner = graphql_field(connection, page_args, f"nodes {{ {node_fields} }} pageInfo {{ hasNextPage endCursor }}")
+            repository = await self.query_field(graphql_field('repository', {'owner': owner, 'name': name}, inner))
+            if repository is None:
+                raise GitHubAPIError(f"Repository {owner}/{name} not found", status=404)
+            page = repository[connection]
+            nodes.extend(page['nodes'])
+            if not page['pageInfo']['hasNextPage']:
+                break
+            cursor = page['pageInfo']['endCursor']
+        return nodes[:limit]
+
+    # Typed reads, with field names matching ``gh --json`` output
+
+    REPOSITORY_FIELDS = (
+        "name nameWithOwner description isPrivate url sshUrl createdAt updatedAt "
+        "owner { login } defaultBranchRef { name }"
+    )
+    ISSUE_FIELDS = (
+        "number title state body createdAt updatedAt "
+        "labels(first: 20) { nodes { name } } assignees(first: 20) { nodes { login } }"
+    )
+    PULL_REQUEST_FIELDS = (
+        "number title state body baseRefName headRefName isDraft mergeable createdAt mergedAt"
+    )
+
+    @staticmethod
+    def split_repo(repo: str) -> Tuple[str, str]:
+        owner, _, name = repo.partition('/')
+        if not owner or not name:
+            raise ValueError(f"Expected owner/name, got {repo!r}")
+        return owner, name
+
+    @staticmethod
+    def _flatten(item: Dict[str, Any]) -> Dict[str, Any]:
+        for key in ('labels', 'assignees'):
+            if isinstance(item.get(key), dict):
+                item[key] = item[key]['nodes']
+        return item
+
+    async def repository(self, repo: str) -> Optional[Dict[str, Any]]:
+        owner, name = self.split_repo(repo)
+        return await self.query_field(
+            graphql_field('repository', {'owner': owner, 'name': name}, self.REPOSITORY_FIELDS)
+        )
+
+    async def repositories(self, repos: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch many repositories, normally in a single query"""
+        results = await asyncio.gather(*(self.repository(repo) for repo in repos), return_exceptions=True)
+        return [None if isinstance(r, Exception) else r for r in results]
+
+    async def viewer_repositories(self, limit: int = 30) -> List[Dict[str, Any]]:
+        nodes: List[Dict[str, Any]] = []
+        cursor = None
+        while len(nodes) < limit:
+            args = {'first': min(100, limit - len(nodes)), 'after': cursor,
+                    'orderBy': {'field': GraphQLEnum('UPDATED_AT'), 'direction': GraphQLEnum('DESC')}}
+            inner = graphql_field('repositories', args,
+                                  f"nodes {{ {self.REPOSITORY_FIELDS} }} pageInfo {{ hasNextPage endCursor }}")
+            page = (await self.query_field(graphql_field('viewer', None, inner)))['repositories']
+            nodes.extend(page['nodes'])
+            if not page['pageInfo']['hasNextPage']:
+                break
+            cursor = page['pageInfo']['endCursor']
+        return nodes[:limit]
+
+    async def viewer(self) -> Dict[str, Any]:
+        return await self.get('user')
+
+    @staticmethod
+    def _states(state: str, allowed: Tuple[str, ...]) -> Optional[List[GraphQLEnum]]:
+        state = (state or 'all').upper()
+        return [GraphQLEnum(state)] if state in allowed else None
+
+    async def issues(self, repo: str, state: str = "open", limit: int = 30,
+                     labels: Optional[List[str]] = None, assignee: Optional[str] = None) -> List[Dict[str, Any]]:
+        owner, name = self.split_repo(repo)
+        filter_by = {k: v for k, v in (
+            ('states', self._states(state, ('OPEN', 'CLOSED'))),
+            ('labels', labels or None),
+            ('assignee', assignee)
+        ) if v is not None}
+        args = {'filterBy': filter_by or None,
+                'orderBy': {'field': GraphQLEnum('CREATED_AT'), 'direction': GraphQLEnum('DESC')}}
+        nodes = await self._paginate(owner, name, 'issues', args, self.ISSUE_FIELDS, limit)
+        return [self._flatten(node) for node in nodes]
+
+    async def issue(self, repo: str, number: int) -> Optional[Dict[str, Any]]:
+        owner, name = self.split_repo(repo)
+        inner = graphql_field('issue', {'number': number}, self.ISSUE_FIELDS)
+        repository = await self.query_field(graphql_field('repository', {'owner': owner, 'name': name}, inner))
+        return self._flatten(repository['issue']) if repository and repository.get('issue') else None
+
+    async def pull_requests(self, repo: str, state: str = "open", limit: int = 30,
+                            base: Optional[str] = None) -> List[Dict[str, Any]]:
+        owner, name = self.split_repo(repo)
+        args = {'states': self._states(state, ('OPEN', 'CLOSED', 'MERGED')), 'baseRefName': base,
+                'orderBy': {'field': GraphQLEnum('CREATED_AT'), 'direction': GraphQLEnum('DESC')}}
+        return await self._paginate(owner, name, 'pullRequests', args, self.PULL_REQUEST_FIELDS, limit)
+
+    async def pull_request(self, repo: str, number: int) -> Optional[Dict[str, Any]]:
+        owner, name = self.split_repo(repo)
+        inner = graphql_field('pullRequest', {'number': number}, self.PULL_REQUEST_FIELDS)
+        repository = await self.query_field(graphql_field('repository', {'owner': owner, 'name': name}, inner))
+        return repository.get('pullRequest') if repository else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            cache_entries=len(self.cache),
+            rate_limits={k: dict(v) for k, v in self.scheduler.limits.items()},
+            scheduler=dict(self.scheduler.stats)
+        )
+
+
+def resolve_token(config: Dict[str, Any]) -> Optional[str]:
+    """Token from config or the environment variables gh itself honours"""
+    return config.get('token') or os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN')
@@ -15,6 +15,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 
+try:
+    from mcp.github_client import (
+        GitHubClient, GitHubAPIError, AIOHTTP_AVAILABLE, DEFAULT_API_URL, resolve_token
+    )
+except ImportError:
+    from github_client import (
+        GitHubClient, GitHubAPIError, AIOHTTP_AVAILABLE, DEFAULT_API_URL, resolve_token
+    )
+
 @dataclass
 class GitHubRepository:
     """GitHub repository information"""
@@ -98,6 +107,11 @@ class GitHubMCP:
     """
     GitHub MCP Server - Provides GitHub CLI access for agents
     Wraps gh CLI commands with safety checks and structured outputs
+
+    Reads (repositories, issues, pull requests, the current user) go through
+    a persistent API client when a token is available: concurrent reads are
+    batched into one GraphQL query and REST GETs are revalidated with ETags.
+    Writes and anything the client cannot serve still use the gh CLI.
     """
     
     def __init__(self, config: Dict[str, Any] = None):
@@ -116,16 +130,76 @@ class GitHubMCP:
         # CLI path (will be set during initialization)
         self.cli_path = self.config.get('cli_path', 'gh')
         
+        # API client settings (client is created on first use)
+        self.use_api = self.config.get('use_api', True) and AIOHTTP_AVAILABLE
+        self.api_token = resolve_token(self.config)
+        self.api_client: Optional[GitHubClient] = None
+        
+    def _api(self) -> Optional[GitHubClient]:
+        """Persistent API client, or None when reads must go through gh"""
+        if not self.use_api or not self.api_token:
+            return None
+        if self.api_client is None:
+            self.api_client = GitHubClient(
+                token=self.api_token,
+                base_url=self.config.get('api_url', DEFAULT_API_URL),
+                graphql_url=self.config.get('graphql_url'),
+                max_concurrency=self.config.get('api_max_concurrency', 4),
+                batch_window=self.config.get('api_batch_window', 0.005),
+                max_batch=self.config.get('api_max_batch', 25),
+                cache_size=self.config.get('api_cache_size', 512),
+                cache_file=self.config.get('api_cache_file',
+                                           self.state_file.with_name('.github_api_cache.json'))
+            )
+        return self.api_client
+    
+    def _api_repo(self, repo: Optional[str]) -> Optional[str]:
+        """owner/name for an API read, or None if only gh can resolve it"""
+        repo = repo or (self.current_repo.full_name if self.current_repo else None)
+        return repo if repo and '/' in repo else None
+    
+    async def _api_read(self, description: str, call):
+        """
+        Run a read through the API client
+        Returns: (handled, result); handled is False when gh should be used instead
+        """
+        client = self._api()
+        if client is None:
+            return False, None
+        self._record_command(f"api {description}")
+        try:
+            return True, await call(client)
+        except (GitHubAPIError, ValueError, asyncio.TimeoutError, OSError) as e:
+            self.logger.warning(f"GitHub API read failed ({description}), using gh: {e}")
+            return False, None
+    
+    async def close(self):
+        """Close the API client and persist its response cache"""
+        if self.api_client is not None:
+            await self.api_client.close()
+            self.api_client = None
+    
     async def initialize(self):
         """Initialize GitHub MCP server and check authentication"""
         self.logger.info("Initializing GitHub MCP Server")
         
         # Check if gh CLI is available
-        if not await self._check_gh_cli():
+        gh_available = await self._check_gh_cli()
+        if not gh_available and self._api() is None:
             raise RuntimeError("GitHub CLI (gh) not found. Please install: https://cli.github.com/")
         
+        # Reuse gh's token for the API client
+        if gh_available and self.use_api and not self.api_token:
+            success, stdout, _ = await self._run_command([self.cli_path, "auth", "token"])
+            if success and stdout.strip():
+                self.api_token = stdout.strip()
+        
         # Check authentication status
-        self.authenticated = await self._check_authentication()
+        if gh_available:
+            self.authenticated = await self._check_authentication()
+        else:
+            handled, user = await self._api_read("user", lambda client: client.viewer())
+            self.authenticated = handled and bool(user)
         if not self.authenticated:
             self.logger.warning("GitHub CLI not authenticated. Run: gh auth login")
         else:
@@ -352,6 +426,12 @@ class GitHubMCP:
     
     async def repo_list(self, limit: int = 30) -> List[Dict[str, Any]]:
         """List user's repositories"""
+        handled, repos = await self._api_read(
+            "repo list", lambda client: client.viewer_repositories(limit)
+        )
+        if handled:
+            return repos
+        
         cmd = [self.cli_path, "repo", "list", "--limit", str(limit), "--json", 
                "name,description,isPrivate,defaultBranchRef,createdAt,updatedAt"]
         
@@ -365,6 +445,42 @@ class GitHubMCP:
                 return []
         return []
     
+    @staticmethod
+    def _repo_from_data(data: Dict[str, Any]) -> GitHubRepository:
+        full_name = data.get('nameWithOwner') or data['name']
+        return GitHubRepository(
+            owner=(data.get('owner') or {}).get('login') or full_name.partition('/')[0],
+            name=data['name'],
+            full_name=full_name,
+            description=data.get('description'),
+            private=data.get('isPrivate', False),
+            default_branch=(data.get('defaultBranchRef') or {}).get('name', 'main'),
+            clone_url=data.get('url'),
+            ssh_url=data.get('sshUrl')
+        )
+    
+    async def repo_view(self, repo_name: str) -> Optional[GitHubRepository]:
+        """View a repository; concurrent calls share one API request"""
+        handled, data = await self._api_read(
+            f"repo view {repo_name}", lambda client: client.repository(repo_name)
+        )
+        if not handled:
+            cmd = [self.cli_path, "repo", "view", repo_name, "--json",
+                   "name,nameWithOwner,description,isPrivate,url,sshUrl,owner,defaultBranchRef"]
+            success, stdout, stderr = await self._run_command(cmd)
+            if not success:
+                self.logger.error(f"Failed to view repository: {stderr}")
+                return None
+            try:
+                data = json.loads(stdout)
+            except json.JSONDecodeError:
+                return None
+        return self._repo_from_data(data) if data else None
+    
+    async def repo_view_many(self, repo_names: List[str]) -> List[Optional[GitHubRepository]]:
+        """View several repositories, normally with a single GraphQL query"""
+        return await asyncio.gather(*(self.repo_view(name) for name in repo_names))
+    
     # Issue Operations
     
     async def issue_create(
@@ -421,6 +537,15 @@ class GitHubMCP:
         repo: Optional[str] = None
     ) -> List[GitHubIssue]:
         """List issues"""
+        api_repo = self._api_repo(repo)
+        if api_repo:
+            handled, issues_data = await self._api_read(
+                f"issue list {api_repo}",
+                lambda client: client.issues(api_repo, state, limit, labels, assignee)
+            )
+            if handled:
+                return [self._issue_from_data(data) for data in issues_data]
+        
         cmd = [self.cli_path, "issue", "list", "--state", state, "--limit", str(limit),
                "--json", "number,title,state,body,labels,assignees,createdAt,updatedAt"]
         
@@ -438,22 +563,48 @@ class GitHubMCP:
         if success:
             try:
                 issues_data = json.loads(stdout)
-                issues = []
-                for data in issues_data:
-                    issue = GitHubIssue(
-                        number=data['number'],
-                        title=data['title'],
-                        state=data['state'],
-                        body=data.get('body', ''),
-                        labels=[l['name'] for l in data.get('labels', [])],
-                        assignees=[a['login'] for a in data.get('assignees', [])]
-                    )
-                    issues.append(issue)
-                return issues
+                return [self._issue_from_data(data) for data in issues_data]
             except (json.JSONDecodeError, KeyError):
                 return []
         return []
     
+    @staticmethod
+    def _issue_from_data(data: Dict[str, Any]) -> GitHubIssue:
+        return GitHubIssue(
+            number=data['number'],
+            title=data['title'],
+            state=data['state'],
+            body=data.get('body', ''),
+            labels=[l['name'] for l in data.get('labels', [])],
+            assignees=[a['login'] for a in data.get('assignees', [])]
+        )
+    
+    async def issue_view(self, issue_number: int, repo: Optional[str] = None) -> Optional[GitHubIssue]:
+        """View an issue; concurrent calls share one API request"""
+        api_repo = self._api_repo(repo)
+        if api_repo:
+            handled, data = await self._api_read(
+                f"issue view {api_repo}#{issue_number}",
+                lambda client: client.issue(api_repo, issue_number)
+            )
+            if handled:
+                return self._issue_from_data(data) if data else None
+        
+        cmd = [self.cli_path, "issue", "view", str(issue_number),
+               "--json", "number,title,state,body,labels,assignees,createdAt,updatedAt"]
+        
+        if repo:
+            cmd.extend(["--repo", repo])
+        
+        success, stdout, stderr = await self._run_command(cmd)
+        
+        if success:
+            try:
+                return self._issue_from_data(json.loads(stdout))
+            except (json.JSONDecodeError, KeyError):
+                return None
+        return None
+    
     async def issue_close(self, issue_number: int, repo: Optional[str] = None) -> bool:
         """Close an issue"""
         cmd = [self.cli_path, "issue", "close", str(issue_number)]
@@ -548,6 +699,15 @@ class GitHubMCP:
         repo: Optional[str] = None
     ) -> List[GitHubPullRequest]:
         """List pull requests"""
+        api_repo = self._api_repo(repo)
+        if api_repo:
+            handled, prs_data = await self._api_read(
+                f"pr list {api_repo}",
+                lambda client: client.pull_requests(api_repo, state, limit, base)
+            )
+            if handled:
+                return [self._pr_from_data(data) for data in prs_data]
+        
         cmd = [self.cli_path, "pr", "list", "--state", state, "--limit", str(limit),
                "--json", "number,title,state,baseRefName,headRefName,body,isDraft,createdAt"]
         
@@ -562,23 +722,51 @@ class GitHubMCP:
         if success:
             try:
                 prs_data = json.loads(stdout)
-                prs = []
-                for data in prs_data:
-                    pr = GitHubPullRequest(
-                        number=data['number'],
-                        title=data['title'],
-                        state=data['state'],
-                        base_branch=data['baseRefName'],
-                        head_branch=data['headRefName'],
-                        body=data.get('body', ''),
-                        draft=data.get('isDraft', False)
-                    )
-                    prs.append(pr)
-                return prs
+                return [self._pr_from_data(data) for data in prs_data]
             except (json.JSONDecodeError, KeyError):
                 return []
         return []
     
+    @staticmethod
+    def _pr_from_data(data: Dict[str, Any]) -> GitHubPullRequest:
+        mergeable = data.get('mergeable')
+        return GitHubPullRequest(
+            number=data['number'],
+            title=data['title'],
+            state=data['state'],
+            base_branch=data['baseRefName'],
+            head_branch=data['headRefName'],
+            body=data.get('body', ''),
+            draft=data.get('isDraft', False),
+            mergeable={'MERGEABLE': True, 'CONFLICTING': False}.get(mergeable)
+        )
+    
+    async def pr_view(self, pr_number: int, repo: Optional[str] = None) -> Optional[GitHubPullRequest]:
+        """View a pull request; concurrent calls share one API request"""
+        api_repo = self._api_repo(repo)
+        if api_repo:
+            handled, data = await self._api_read(
+                f"pr view {api_repo}#{pr_number}",
+                lambda client: client.pull_request(api_repo, pr_number)
+            )
+            if handled:
+                return self._pr_from_data(data) if data else None
+        
+        cmd = [self.cli_path, "pr", "view", str(pr_number),
+               "--json", "number,title,state,baseRefName,headRefName,body,isDraft,mergeable"]
+        
+        if repo:
+            cmd.extend(["--repo", repo])
+        
+        success, stdout, stderr = await self._run_command(cmd)
+        
+        if success:
+            try:
+                return self._pr_from_data(json.loads(stdout))
+            except (json.JSONDecodeError, KeyError):
+                return None
+        return None
+    
     async def pr_merge(
         self,
         pr_number: int,
@@ -826,6 +1014,10 @@ class GitHubMCP:
     
     async def get_current_user(self) -> Optional[Dict[str, Any]]:
         """Get current authenticated user info"""
+        handled, user = await self._api_read("user", lambda client: client.viewer())
+        if handled:
+            return user
+        
         cmd = [self.cli_path, "api", "user"]
         
         success, stdout, stderr = await self._run_command(cmd)
@@ -884,6 +1076,13 @@ class GitHubMCP:
             self.logger.warning(f"Destructive operation {method} blocked")
             return None
         
+        if method == "GET":
+            handled, response = await self._api_read(
+                f"GET {endpoint}", lambda client: client.get(endpoint, data)
+            )
+            if handled:
+                return response if isinstance(response, dict) else {'response': response}
+        
         cmd = [self.cli_path, "api", endpoint, "--method", method]
         
         if data:
@@ -900,6 +1099,10 @@ class GitHubMCP:
             self.logger.error(f"API call failed: {stderr}")
             return None
     
+    def get_api_stats(self) -> Dict[str, Any]:
+        """Request, batching, cache and rate-limit statistics for the API client"""
+        return self.api_client.get_stats() if self.api_client else {}
+    
     async def get_command_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get command execution history"""
         return self.command_history[-limit:]
@@ -954,6 +1157,7 @@ if __name__ == "__main__":
             print(f"✓ Executed {len(history)} commands")
             
             await github.save_state()
+            await github.close()
         else:
             print("✗ Not authenticated. Run: gh auth login")
     
@@ -6,10 +6,13 @@ Provides hierarchical reasoning, decision-making, and context management
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 import yaml
@@ -25,6 +28,7 @@ class ReasoningNode:
     children: List['ReasoningNode'] = None
     parent_id: Optional[str] = None
     timestamp: datetime = None
+    pruned: bool = False  # Sub-goals were not expanded (beam or budget)
     
     def __post_init__(self):
         if self.children is None:
@@ -32,16 +36,52 @@ class ReasoningNode:
         if self.timestamp is None:
             self.timestamp = datetime.now()
 
+# (decision, confidence, evidence, sub-queries) for one query at one level
+Evaluation = Tuple[str, float, List[str], List[str]]
+
+
+@dataclass
+class ReasoningRun:
+    """Per-request expansion limits shared by all branches of one tree"""
+    semaphore: asyncio.Semaphore
+    nodes_left: int
+    node_ids: List[str] = field(default_factory=list)
+
+
 class HRM_MCP:
     """
     Hierarchical Reasoning Model MCP Server
     Provides multi-level reasoning and decision-making capabilities
+    
+    Sibling sub-goals are evaluated concurrently (at most
+    ``max_concurrency`` evaluations at once, ``max_nodes`` nodes per
+    tree), so a deep request costs about one evaluation per level.
+    Evaluations are memoized by a hash of the level, exact query and
+    context, only the ``beam_width`` most confident children at or above
+    ``min_confidence`` are expanded further, and only the ``max_trees``
+    most recently used trees are kept in ``reasoning_tree``.
     """
     
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.reasoning_tree: Dict[str, ReasoningNode] = {}
         self.decision_history: List[Dict[str, Any]] = []
+        
+        # Executor limits
+        self.max_concurrency = self.config.get('max_concurrency', 8)
+        self.max_nodes = self.config.get('max_nodes', 256)
+        self.beam_width = self.config.get('beam_width', 4)
+        self.min_confidence = self.config.get('min_confidence', 0.0)
+        self.memo_size = self.config.get('memo_size', 1024)
+        self.max_trees = self.config.get('max_trees', 50)
+        self.max_history = self.config.get('max_history', 1000)
+        
+        self._memo: "OrderedDict[str, Evaluation]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._trees: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._node_counter = itertools.count()
+        self.memo_hits = 0
+        self.memo_misses = 0
         self.context_layers: Dict[int, Dict[str, Any]] = {
             0: {},  # Strategic layer
             1: {},  # Tactical layer  
@@ -84,32 +124,96 @@ class HRM_MCP:
         Returns:
             ReasoningNode with the reasoning result
         """
-        # Generate node ID
-        node_id = f"node_{len(self.reasoning_tree)}_{datetime.now().timestamp()}"
+        context_key = self._context_key(context)
+        run = ReasoningRun(asyncio.Semaphore(self.max_concurrency), self.max_nodes - 1)
         
-        # Perform reasoning based on level
-        decision, confidence, evidence = await self._perform_reasoning(query, context, level)
+        node = await self._expand(query, context, context_key, level, None, run, expand=True)
+        
+        self._remember_tree(node.node_id, run.node_ids)
+        if len(self.decision_history) > 2 * self.max_history:
+            del self.decision_history[:-self.max_history]
+        
+        return node
+    
+    @staticmethod
+    def _context_key(context: Optional[Dict[str, Any]]) -> str:
+        if not context:
+            return ""
+        return hashlib.sha1(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()
+    
+    @staticmethod
+    def _memo_key(query: str, level: int, context_key: str) -> str:
+        # Decisions and sub-queries quote the query, so only identical text may share an entry
+        return hashlib.sha1(f"{level}\x00{context_key}\x00{query}".encode()).hexdigest()
+    
+    async def _evaluate(self, query: str, context: Dict[str, Any], context_key: str,
+                        level: int, run: ReasoningRun) -> Evaluation:
+        """Reason about one query at one level, sharing results for identical questions"""
+        key = self._memo_key(query, level, context_key)
+        cached = self._memo.get(key)
+        if cached is not None:
+            self._memo.move_to_end(key)
+            self.memo_hits += 1
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            self.memo_misses += 1
+            task = asyncio.ensure_future(self._compute(query, context, level, run))
+            self._inflight[key] = task
+            try:
+                result = await task
+            finally:
+                self._inflight.pop(key, None)
+            self._memo[key] = result
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+            return result
+        
+        self.memo_hits += 1
+        return await asyncio.shield(task)
+    
+    async def _compute(self, query: str, context: Dict[str, Any], level: int,
+                       run: ReasoningRun) -> Evaluation:
+        async with run.semaphore:
+            decision, confidence, evidence = await self._perform_reasoning(query, context, level)
+            sub_queries = await self._decompose_query(query, decision, level) if level < 3 else []
+        return decision, confidence, evidence, sub_queries
+    
+    async def _expand(self, query: str, context: Dict[str, Any], context_key: str,
+                      level: int, parent_id: Optional[str], run: ReasoningRun,
+                      expand: bool) -> ReasoningNode:
+        """Create the node for ``query`` and, if selected, its sub-tree"""
+        decision, confidence, evidence, sub_queries = await self._evaluate(
+            query, context, context_key, level, run
+        )
         
-        # Create reasoning node
         node = ReasoningNode(
-            node_id=node_id,
+            node_id=f"node_{next(self._node_counter)}_{datetime.now().timestamp()}",
             level=level,
             decision=decision,
             confidence=confidence,
-            evidence=evidence
+            evidence=list(evidence),
+            parent_id=parent_id
         )
+        self.reasoning_tree[node.node_id] = node
+        run.node_ids.append(node.node_id)
+        
+        if sub_queries and level < 3:
+            if expand and run.nodes_left >= len(sub_queries):
+                run.nodes_left -= len(sub_queries)
+                # Rank siblings by their (memoized) evaluation before expanding them
+                evaluations = await asyncio.gather(*(
+                    self._evaluate(q, context, context_key, level + 1, run) for q in sub_queries
+                ))
+                selected = self._select_beam(evaluations)
+                node.children = list(await asyncio.gather(*(
+                    self._expand(q, context, context_key, level + 1, node.node_id, run, i in selected)
+                    for i, q in enumerate(sub_queries)
+                )))
+            else:
+                node.pruned = True
         
-        # Store in tree
-        self.reasoning_tree[node_id] = node
-        
-        # If not implementation level, create child nodes
-        if level < 3:
-            child_queries = await self._decompose_query(query, decision, level)
-            for child_query in child_queries:
-                child_node = await self.reason(child_query, context, level + 1)
-                child_node.parent_id = node_id
-                node.children.append(child_node)
-                
         # Store in history
         self.decision_history.append({
             'timestamp': node.timestamp.isoformat(),
@@ -120,6 +224,40 @@ class HRM_MCP:
         })
         
         return node
+    
+    def _select_beam(self, evaluations: List[Evaluation]) -> set:
+        """Indices of the children worth expanding"""
+        ranked = sorted(range(len(evaluations)), key=lambda i: evaluations[i][1], reverse=True)
+        return {
+            i for i in ranked[:self.beam_width]
+            if evaluations[i][1] >= self.min_confidence
+        }
+    
+    def _remember_tree(self, root_id: str, node_ids: List[str]):
+        self._trees[root_id] = node_ids
+        while len(self._trees) > self.max_trees:
+            _, evicted = self._trees.popitem(last=False)
+            for node_id in evicted:
+                self.reasoning_tree.pop(node_id, None)
+    
+    def _touch_tree(self, node: ReasoningNode):
+        """Mark the tree containing ``node`` as recently used"""
+        while node.parent_id and node.parent_id in self.reasoning_tree:
+            node = self.reasoning_tree[node.parent_id]
+        if node.node_id in self._trees:
+            self._trees.move_to_end(node.node_id)
+    
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Memoization and tree cache statistics"""
+        lookups = self.memo_hits + self.memo_misses
+        return {
+            'memo_entries': len(self._memo),
+            'memo_hits': self.memo_hits,
+            'memo_misses': self.memo_misses,
+            'memo_hit_rate': self.memo_hits / lookups if lookups else 0.0,
+            'trees': len(self._trees),
+            'nodes': len(self.reasoning_tree)
+        }
         
     async def _perform_reasoning(
         self,
@@ -266,6 +404,8 @@ class HRM_MCP:
         """Get the complete decision path from root to a specific node"""
         path = []
         current = self.reasoning_tree.get(node_id)
+        if current:
+            self._touch_tree(current)
         
         while current:
             path.insert(0, current)
@@ -281,6 +421,7 @@ class HRM_MCP:
         node = self.reasoning_tree.get(node_id)
         if not node:
             return "No reasoning found for this ID"
+        self._touch_tree(node)
             
         explanation = f"## Reasoning Explanation\n\n"
         explanation += f"**Decision:** {node.decision}\n"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Journaled State Store for MCP Servers
+Independent implementation for LocalAgent project
+Provides append-only write-ahead logging with group commit, periodic
+snapshots with log truncation, and replay on start
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, Any, List, Optional, Callable
+from datetime import datetime
+from pathlib import Path
+
+
+class JournalStore:
+    """
+    Append-only journal backing an MCP server's persisted state
+
+    The snapshot lives at ``state_file`` (same JSON layout the servers have
+    always written, plus a ``journal_seq`` marker) and mutations are appended
+    as JSON lines to ``<state_file>.wal``. Records are buffered and written
+    together with a single fsync (group commit). Once enough records have
+    accumulated, ``checkpoint`` writes a fresh snapshot atomically and
+    truncates the log. On start, ``load`` returns the snapshot and the log
+    records newer than it so the owner can replay them.
+    """
+
+    def __init__(
+        self,
+        state_file: Path,
+        snapshot_interval: int = 500,
+        commit_interval: float = 0.05,
+        fsync: bool = True
+    ):
+        self.state_file = Path(state_file)
+        self.wal_file = self.state_file.with_name(self.state_file.name + '.wal')
+        self.snapshot_interval = snapshot_interval
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.logger = logging.getLogger(__name__)
+
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._pending: List[str] = []
+        self._records_since_snapshot = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def records_since_snapshot(self) -> int:
+        """Number of journal records not yet folded into a snapshot"""
+        return self._records_since_snapshot
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the snapshot and the journal tail
+
+        Returns:
+            Dict with ``snapshot`` (the last snapshot or None) and ``records``
+            (journal records written after that snapshot, in order)
+        """
+        snapshot = None
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    snapshot = json.load(f)
+                self._snapshot_seq = int(snapshot.get('journal_seq', 0))
+            except Exception as e:
+                self.logger.warning(f"Could not load snapshot {self.state_file}: {e}")
+
+        records = []
+        if self.wal_file.exists():
+            with open(self.wal_file, 'r') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn write can only affect the tail; stop replay there
+                        self.logger.warning(
+                            f"Ignoring truncated journal record at {self.wal_file}:{line_no}"
+                        )
+                        break
+                    if record.get('seq', 0) > self._snapshot_seq:
+                        records.append(record)
+
+        self._seq = max([self._snapshot_seq] + [r['seq'] for r in records])
+        self._records_since_snapshot = len(records)
+        return {'snapshot': snapshot, 'records': records}
+
+    def append(self, op: str, data: Dict[str, Any]):
+        """Buffer a mutation record; it is written on the next group commit"""
+        self._seq += 1
+        self._pending.append(json.dumps(
+            {'seq': self._seq, 'op': op, 'data': data},
+            default=str,
+            separators=(',', ':')
+        ))
+        self._records_since_snapshot += 1
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Arm a timer so records appended close together share one fsync"""
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop: write through immediately
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.commit_interval, self._timer_flush)
+
+    def _timer_flush(self):
+        self._flush_handle = None
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error(f"Journal group commit failed: {e}")
+
+    def flush(self):
+        """Write all buffered records with a single write and fsync"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = '\n'.join(self._pending) + '\n'
+        self._pending = []
+        with open(self.wal_file, 'a') as f:
+            f.write(batch)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def needs_snapshot(self) -> bool:
+        """Whether the journal has grown past the snapshot interval"""
+        return self._records_since_snapshot >= self.snapshot_interval
+
+    def write_snapshot(self, state: Dict[str, Any]):
+        """
+        Atomically write a full snapshot and truncate the journal
+
+        Buffered records are flushed first so the snapshot sequence number
+        always covers everything reflected in ``state``.
+        """
+        self.flush()
+        state = dict(state)
+        state['journal_seq'] = self._seq
+        state.setdefault('timestamp', datetime.now().isoformat())
+
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=2, default=str)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+        self._fsync_directory()
+
+        # Records up to journal_seq are now in the snapshot; a crash before
+        # truncation is harmless because replay skips them by sequence number
+        with open(self.wal_file, 'w') as f:
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        self._snapshot_seq = self._seq
+        self._records_since_snapshot = 0
+        self.logger.debug(f"Wrote snapshot {self.state_file} at seq {self._seq}")
+
+    def checkpoint(self, build_state: Callable[[], Dict[str, Any]], force: bool = False) -> bool:
+        """
+        Flush the journal and snapshot if it has grown past the interval
+
+        Args:
+            build_state: Callable producing the full state for a snapshot;
+                only invoked when a snapshot is actually written
+            force: Snapshot regardless of journal size
+
+        Returns:
+            True if a snapshot was written
+        """
+        if force or self.needs_snapshot() or not self.state_file.exists():
+            self.write_snapshot(build_state())
+            return True
+        self.flush()
+        return False
+
+    def _fsync_directory(self):
+        if not self.fsync or not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            fd = os.open(str(self.state_file.parent or Path('.')), os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Flush outstanding records"""
+        self.flush()
+
+
+def create_journal(config: Dict[str, Any], default_state_file: str) -> JournalStore:
+    """Build a JournalStore from an MCP server config dictionary"""
+    return JournalStore(
+        Path(config.get('state_file', default_state_file)),
+        snapshot_interval=config.get('journal_snapshot_interval', 500),
+        commit_interval=config.get('journal_commit_interval', 0.05),
+        fsync=config.get('journal_fsync', True)
+    )
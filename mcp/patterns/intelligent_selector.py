@@ -5,13 +5,22 @@ Analyzes context, requirements, and constraints to choose the best orchestration
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 from mcp.patterns.pattern_registry import (
     pattern_registry, 
     PatternDefinition, 
@@ -19,6 +28,26 @@ from mcp.patterns.pattern_registry import (
     BasePattern
 )
 
+LATENCY_SCORES = {'very low': 1.0, 'low': 0.8, 'medium': 0.5, 'high': 0.3, 'variable': 0.4}
+THROUGHPUT_SCORES = {'very high': 1.0, 'high': 0.8, 'medium': 0.5, 'low': 0.3}
+COMPLEXITY_LEVELS = ('low', 'medium', 'high')
+CATEGORY_COMPLEXITY = {
+    PatternCategory.SEQUENTIAL: 'low',
+    PatternCategory.PIPELINE: 'low',
+    PatternCategory.PARALLEL: 'medium',
+    PatternCategory.HIERARCHICAL: 'medium',
+    PatternCategory.EVENT_DRIVEN: 'medium',
+    PatternCategory.SCATTER_GATHER: 'high',
+    PatternCategory.MESH: 'high',
+    PatternCategory.CONSENSUS: 'high'
+}
+# COMPLEXITY_MATCH[pattern_level][task_level], see _calculate_complexity_score
+COMPLEXITY_MATCH = (
+    (1.0, 0.7, 0.4),
+    (0.7, 1.0, 0.7),
+    (0.4, 0.7, 1.0)
+)
+
 @dataclass
 class PatternSelectionContext:
     """Context for pattern selection"""
@@ -42,16 +71,74 @@ class PatternRecommendation:
     execution_plan: Dict[str, Any]
     estimated_performance: Dict[str, Any]
 
+class PatternFeatures:
+    """
+    Feature vectors for every registered pattern
+    
+    Built once from the registry so candidate filtering and scoring are
+    array operations over all patterns instead of per-pattern Python loops.
+    """
+    
+    def __init__(self, patterns: List[PatternDefinition], parse_memory):
+        self.patterns = patterns
+        self.ids = tuple(p.pattern_id for p in patterns)
+        self.mcp_bits: Dict[str, int] = {}
+        for pattern in patterns:
+            for mcp in pattern.required_mcps:
+                self.mcp_bits.setdefault(mcp, 1 << len(self.mcp_bits))
+        
+        self.required_mask = np.array(
+            [sum(self.mcp_bits[m] for m in set(p.required_mcps)) for p in patterns], dtype=np.int64
+        )
+        self.memory = np.array(
+            [parse_memory(p.docker_requirements.get('memory', '0')) for p in patterns], dtype=np.float64
+        )
+        self.cpu = np.array([float(p.docker_requirements.get('cpu', 0)) for p in patterns])
+        self.latency = np.array([
+            LATENCY_SCORES.get(p.performance_profile.get('latency', 'medium'), 0.5) for p in patterns
+        ])
+        self.throughput = np.array([
+            THROUGHPUT_SCORES.get(p.performance_profile.get('throughput', 'medium'), 0.5) for p in patterns
+        ])
+        self.is_parallel = np.array([p.category == PatternCategory.PARALLEL for p in patterns])
+        self.is_consensus = np.array([p.category == PatternCategory.CONSENSUS for p in patterns])
+        self.is_coord = np.array(['coord' in p.pattern_id for p in patterns])
+        self.is_iterative = np.array(['iterative' in p.pattern_id for p in patterns])
+        self.complexity_scores = {
+            level: np.array([
+                COMPLEXITY_MATCH[COMPLEXITY_LEVELS.index(CATEGORY_COMPLEXITY.get(p.category, 'medium'))][col]
+                for p in patterns
+            ])
+            for col, level in enumerate(COMPLEXITY_LEVELS)
+        }
+    
+    def available_mask(self, available_mcps: List[str]) -> int:
+        return sum(bit for mcp, bit in self.mcp_bits.items() if mcp in available_mcps)
+
+
 class IntelligentPatternSelector:
     """
     Intelligent pattern selection using HRM reasoning and multi-criteria analysis
+    
+    One HRM engine is kept for the selector's lifetime, intent analyses are
+    cached by a fingerprint of the normalized query and metadata, and when
+    NumPy is available all patterns are filtered and scored at once from
+    precomputed PatternFeatures.
     """
     
-    def __init__(self):
+    def __init__(self, intent_cache_size: int = 512):
         self.logger = logging.getLogger("IntelligentSelector")
         self.selection_history: List[Dict[str, Any]] = []
         self.performance_metrics: Dict[str, Dict[str, float]] = {}
         
+        self.intent_cache_size = intent_cache_size
+        self._intent_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.intent_cache_hits = 0
+        self.intent_cache_misses = 0
+        self._hrm = None
+        self._hrm_unavailable = False
+        self._features: Optional[PatternFeatures] = None
+        
     async def select_pattern(
         self, 
         context: PatternSelectionContext
@@ -81,12 +168,45 @@ class IntelligentPatternSelector:
         
         return best_pattern
     
+    @staticmethod
+    def _intent_fingerprint(context: PatternSelectionContext) -> str:
+        normalized = re.sub(r'\s+', ' ', context.query.strip().lower())
+        metadata = json.dumps(context.metadata, sort_keys=True, default=str)
+        return hashlib.sha1(f"{normalized}\x00{metadata}".encode()).hexdigest()
+    
+    async def _get_hrm(self):
+        """Long-lived HRM engine, created on first use"""
+        if self._hrm is None and not self._hrm_unavailable:
+            try:
+                from mcp.hrm_mcp import create_hrm_server
+                self._hrm = await create_hrm_server({'max_trees': 32})
+            except Exception as e:
+                self.logger.warning(f"HRM unavailable: {e}, using fallback analysis")
+                self._hrm_unavailable = True
+        return self._hrm
+    
     async def _analyze_intent(self, context: PatternSelectionContext) -> Dict[str, Any]:
+        """Analyze query intent, reusing earlier analyses of the same query"""
+        key = self._intent_fingerprint(context)
+        cached = self._intent_cache.get(key)
+        if cached is not None:
+            self._intent_cache.move_to_end(key)
+            self.intent_cache_hits += 1
+            return dict(cached)
+        
+        self.intent_cache_misses += 1
+        intent = await self._reason_about_intent(context)
+        self._intent_cache[key] = intent
+        while len(self._intent_cache) > self.intent_cache_size:
+            self._intent_cache.popitem(last=False)
+        return dict(intent)
+    
+    async def _reason_about_intent(self, context: PatternSelectionContext) -> Dict[str, Any]:
         """Analyze query intent using HRM"""
         try:
-            from mcp.hrm_mcp import create_hrm_server
-            
-            hrm = await create_hrm_server()
+            hrm = await self._get_hrm()
+            if hrm is None:
+                return self._fallback_intent_analysis(context)
             
             # Strategic reasoning about the query
             analysis_query = f"""
@@ -154,6 +274,13 @@ class IntelligentPatternSelector:
     ) -> List[PatternDefinition]:
         """Filter candidate patterns based on context and intent"""
         
+        features = self._pattern_features()
+        if features is not None:
+            # _aligns_with_intent currently accepts every pattern, so only
+            # MCP availability and Docker limits filter candidates
+            mask = self._candidate_mask(features, context)
+            return [features.patterns[i] for i in np.flatnonzero(mask)]
+        
         all_patterns = pattern_registry.list_patterns()
         candidates = []
         
@@ -252,6 +379,14 @@ class IntelligentPatternSelector:
     ) -> List[Tuple[PatternDefinition, float]]:
         """Score candidate patterns using multiple criteria"""
         
+        features = self._pattern_features()
+        if features is not None:
+            index = {pattern_id: i for i, pattern_id in enumerate(features.ids)}
+            rows = np.array([index[p.pattern_id] for p in candidates], dtype=np.intp)
+            scores = self._score_vector(features, context, intent)[rows]
+            order = np.argsort(-scores, kind='stable')
+            return [(candidates[i], float(scores[i])) for i in order]
+        
         scored = []
         
         for pattern in candidates:
@@ -280,6 +415,70 @@ class IntelligentPatternSelector:
         
         return scored
     
+    def _pattern_features(self) -> Optional[PatternFeatures]:
+        """Feature vectors for the registry, rebuilt when patterns are added"""
+        if not NUMPY_AVAILABLE:
+            return None
+        if self._features is None or self._features.ids != tuple(pattern_registry.patterns):
+            self._features = PatternFeatures(pattern_registry.list_patterns(), self._parse_memory)
+        return self._features
+    
+    def _candidate_mask(self, features: PatternFeatures, context: PatternSelectionContext):
+        available = features.available_mask(context.available_mcps)
+        mask = (features.required_mask & ~available) == 0
+        
+        constraints = context.docker_constraints
+        if constraints:
+            if 'memory' in constraints:
+                mask &= features.memory <= self._parse_memory(constraints['memory'])
+            if 'cpu' in constraints:
+                mask &= features.cpu <= float(constraints['cpu'])
+        return mask
+    
+    def _score_vector(self, features: PatternFeatures, context: PatternSelectionContext,
+                      intent: Dict[str, Any]):
+        """Scores for every registered pattern, same weights as the scalar criteria"""
+        n = len(features.ids)
+        
+        requirements = context.performance_requirements
+        parts = []
+        if requirements and 'latency' in requirements:
+            parts.append(features.latency)
+        if requirements and 'throughput' in requirements:
+            parts.append(features.throughput)
+        performance = sum(parts) / len(parts) if parts else np.full(n, 0.5)
+        
+        intent_score = (
+            0.3 * (features.is_parallel & bool(intent['parallelizable'])) +
+            0.3 * (features.is_consensus & bool(intent['requires_consensus'])) +
+            0.2 * (features.is_coord & bool(intent['requires_coordination'])) +
+            0.2 * (features.is_iterative & bool(intent['is_iterative'])) +
+            intent.get('confidence', 0.5) * 0.2
+        )
+        intent_score = np.minimum(intent_score, 1.0)
+        
+        historical = np.full(n, 0.5)
+        for i, pattern_id in enumerate(features.ids):
+            if pattern_id in self.performance_metrics:
+                historical[i] = self._calculate_historical_score(features.patterns[i], context.historical_performance)
+        
+        complexity = features.complexity_scores.get(intent.get('complexity', 'medium'))
+        if complexity is None:
+            complexity = np.full(n, 0.4)
+        
+        return performance * 0.3 + intent_score * 0.3 + historical * 0.2 + complexity * 0.2
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Intent cache statistics"""
+        lookups = self.intent_cache_hits + self.intent_cache_misses
+        return {
+            'intent_cache_entries': len(self._intent_cache),
+            'intent_cache_hits': self.intent_cache_hits,
+            'intent_cache_misses': self.intent_cache_misses,
+            'intent_cache_hit_rate': self.intent_cache_hits / lookups if lookups else 0.0,
+            'vectorized_scoring': NUMPY_AVAILABLE
+        }
+    
     def _calculate_performance_score(
         self,
         pattern: PatternDefinition,
@@ -299,8 +498,7 @@ class IntelligentPatternSelector:
             req_latency = requirements['latency']
             pattern_latency = profile.get('latency', 'medium')
             
-            latency_map = {'very low': 1.0, 'low': 0.8, 'medium': 0.5, 'high': 0.3, 'variable': 0.4}
-            score += latency_map.get(pattern_latency, 0.5)
+            score += LATENCY_SCORES.get(pattern_latency, 0.5)
             count += 1
         
         # Throughput requirement
@@ -308,8 +506,7 @@ class IntelligentPatternSelector:
             req_throughput = requirements['throughput']
             pattern_throughput = profile.get('throughput', 'medium')
             
-            throughput_map = {'very high': 1.0, 'high': 0.8, 'medium': 0.5, 'low': 0.3}
-            score += throughput_map.get(pattern_throughput, 0.5)
+            score += THROUGHPUT_SCORES.get(pattern_throughput, 0.5)
             count += 1
         
         return score / count if count > 0 else 0.5
@@ -360,27 +557,11 @@ class IntelligentPatternSelector:
         """Calculate complexity alignment score"""
         
         # Simple heuristic based on pattern category
-        pattern_complexity = {
-            PatternCategory.SEQUENTIAL: 'low',
-            PatternCategory.PIPELINE: 'low',
-            PatternCategory.PARALLEL: 'medium',
-            PatternCategory.HIERARCHICAL: 'medium',
-            PatternCategory.EVENT_DRIVEN: 'medium',
-            PatternCategory.SCATTER_GATHER: 'high',
-            PatternCategory.MESH: 'high',
-            PatternCategory.CONSENSUS: 'high'
-        }
+        pattern_comp = CATEGORY_COMPLEXITY.get(pattern.category, 'medium')
         
-        pattern_comp = pattern_complexity.get(pattern.category, 'medium')
-        
-        if pattern_comp == complexity:
-            return 1.0
-        elif (pattern_comp == 'low' and complexity == 'medium') or \
-             (pattern_comp == 'medium' and complexity in ['low', 'high']) or \
-             (pattern_comp == 'high' and complexity == 'medium'):
-            return 0.7
-        else:
+        if complexity not in COMPLEXITY_LEVELS:
             return 0.4
+        return COMPLEXITY_MATCH[COMPLEXITY_LEVELS.index(pattern_comp)][COMPLEXITY_LEVELS.index(complexity)]
     
     async def _select_best_pattern(
         self,
@@ -15,6 +15,11 @@ from pathlib import Path
 from enum import Enum
 import uuid
 
+try:
+    from mcp.journal import create_journal
+except ImportError:  # Loaded with the mcp directory itself on sys.path
+    from journal import create_journal
+
 @dataclass
 class Task:
     """Individual task representation"""
@@ -78,27 +83,47 @@ class TaskMCP:
         self.task_history: List[Dict[str, Any]] = []
         self.logger = logging.getLogger(__name__)
         self.state_file = Path(self.config.get('state_file', '.task_state.json'))
+        self.journal = create_journal(self.config, '.task_state.json')
         
     async def initialize(self):
         """Initialize the Task MCP server"""
         self.logger.info("Initializing Task MCP Server")
         
-        # Load saved state
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    # Restore tasks
-                    for task_data in state.get('tasks', []):
-                        task = Task.from_dict(task_data)
-                        self.tasks[task.task_id] = task
-                    self.task_history = state.get('history', [])
-                    self.logger.info(f"Loaded {len(self.tasks)} tasks from state")
-            except Exception as e:
-                self.logger.warning(f"Could not load state: {e}")
+        # Load snapshot and replay journaled mutations
+        try:
+            loaded = self.journal.load()
+            state = loaded['snapshot'] or {}
+            # Restore tasks
+            for task_data in state.get('tasks', []):
+                task = Task.from_dict(task_data)
+                self.tasks[task.task_id] = task
+            self.task_history = state.get('history', [])
+            for record in loaded['records']:
+                self._apply_record(record['op'], record['data'])
+            if self.tasks:
+                self.logger.info(
+                    f"Loaded {len(self.tasks)} tasks from state "
+                    f"({len(loaded['records'])} journal records replayed)"
+                )
+        except Exception as e:
+            self.logger.warning(f"Could not load state: {e}")
                 
         return True
     
+    def _apply_record(self, op: str, data: Dict[str, Any]):
+        """Apply a journal record to in-memory state during replay"""
+        if op == 'task':
+            task = Task.from_dict(data)
+            self.tasks[task.task_id] = task
+        elif op == 'history':
+            self.task_history.append(data)
+            if len(self.task_history) > 1000:
+                self.task_history = self.task_history[-1000:]
+    
+    def _journal_task(self, task: Task):
+        """Journal the current version of a single task"""
+        self.journal.append('task', task.to_dict())
+    
     async def create_task(
         self,
         title: str,
@@ -128,6 +153,7 @@ class TaskMCP:
         )
         
         self.tasks[task_id] = task
+        self._journal_task(task)
         
         # Record in history
         self._record_history("create", task_id, {"title": title, "priority": priority})
@@ -163,6 +189,8 @@ class TaskMCP:
             elif old_status == TaskStatus.COMPLETED.value and new_status != TaskStatus.COMPLETED.value:
                 task.completed_at = None
         
+        self._journal_task(task)
+        
         # Record in history
         self._record_history("update", task_id, updates)
         
@@ -344,6 +372,9 @@ class TaskMCP:
         subtask.dependencies.append(parent_id)
         subtask.metadata['parent_id'] = parent_id
         
+        self._journal_task(parent)
+        self._journal_task(subtask)
+        
         return subtask
     
     async def get_task_timeline(self, days: int = 7) -> List[Dict[str, Any]]:
@@ -375,30 +406,37 @@ class TaskMCP:
     
     def _record_history(self, action: str, task_id: str, details: Dict[str, Any]):
         """Record task history"""
-        self.task_history.append({
+        entry = {
             'timestamp': datetime.now().isoformat(),
             'action': action,
             'task_id': task_id,
             'details': details
-        })
+        }
+        self.task_history.append(entry)
+        self.journal.append('history', entry)
         
         # Keep only last 1000 history items
         if len(self.task_history) > 1000:
             self.task_history = self.task_history[-1000:]
     
-    async def save_state(self):
-        """Save current state to disk"""
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Build the full state written to a snapshot"""
+        return {
+            'tasks': [task.to_dict() for task in self.tasks.values()],
+            'history': self.task_history[-100:],  # Save last 100 history items
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    async def save_state(self, force_snapshot: bool = False):
+        """
+        Persist state to disk
+        
+        Mutations are already journaled, so this commits the journal and only
+        writes a full snapshot once the journal has grown past its interval.
+        """
         try:
-            state = {
-                'tasks': [task.to_dict() for task in self.tasks.values()],
-                'history': self.task_history[-100:],  # Save last 100 history items
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
-            
-            self.logger.info(f"Saved task state to {self.state_file}")
+            if self.journal.checkpoint(self._build_snapshot, force=force_snapshot):
+                self.logger.info(f"Saved task state snapshot to {self.state_file}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
@@ -9,12 +9,17 @@ import asyncio
 import json
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 import uuid
 
+try:
+    from mcp.journal import create_journal
+except ImportError:  # Loaded with the mcp directory itself on sys.path
+    from journal import create_journal
+
 @dataclass
 class PhaseResult:
     """Result from a workflow phase execution"""
@@ -109,6 +114,7 @@ class WorkflowStateMCP:
         self.phase_templates: Dict[str, Dict[str, Any]] = self._load_phase_templates()
         self.logger = logging.getLogger(__name__)
         self.state_file = Path(self.config.get('state_file', '.workflow_state.json'))
+        self.journal = create_journal(self.config, '.workflow_state.json')
         
     def _load_phase_templates(self) -> Dict[str, Dict[str, Any]]:
         """Load phase templates with success criteria"""
@@ -185,22 +191,78 @@ class WorkflowStateMCP:
         """Initialize the Workflow State MCP server"""
         self.logger.info("Initializing Workflow State MCP Server")
         
-        # Load saved state
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    # Restore executions
-                    for exec_data in state.get('executions', []):
-                        exec_id = exec_data['execution_id']
-                        self.executions[exec_id] = self._execution_from_dict(exec_data)
-                    self.active_execution = state.get('active_execution')
-                    self.logger.info(f"Loaded {len(self.executions)} workflow executions")
-            except Exception as e:
-                self.logger.warning(f"Could not load state: {e}")
+        # Load snapshot and replay journaled mutations
+        try:
+            loaded = self.journal.load()
+            state = loaded['snapshot'] or {}
+            # Restore executions
+            for exec_data in state.get('executions', []):
+                exec_id = exec_data['execution_id']
+                self.executions[exec_id] = self._execution_from_dict(exec_data)
+            self.active_execution = state.get('active_execution')
+            for record in loaded['records']:
+                self._apply_record(record['op'], record['data'])
+            if self.executions:
+                self.logger.info(f"Loaded {len(self.executions)} workflow executions")
+        except Exception as e:
+            self.logger.warning(f"Could not load state: {e}")
         
         return True
     
+    def _apply_record(self, op: str, data: Dict[str, Any]):
+        """Apply a journal record to in-memory state during replay"""
+        if op == 'execution':
+            execution = self.executions.get(data['execution_id'])
+            if execution is None:
+                self.executions[data['execution_id']] = self._execution_from_dict(
+                    {**data, 'phase_results': []}
+                )
+            else:
+                for key in ['created_at', 'started_at', 'completed_at']:
+                    if data.get(key) and isinstance(data[key], str):
+                        data[key] = datetime.fromisoformat(data[key])
+                for key, value in data.items():
+                    setattr(execution, key, value)
+        elif op == 'phase':
+            execution = self.executions[data['execution_id']]
+            phase_result = self._phase_from_dict(data['phase'])
+            index = data['index']
+            if index < len(execution.phase_results):
+                execution.phase_results[index] = phase_result
+            else:
+                execution.phase_results.append(phase_result)
+        elif op == 'evidence':
+            execution = self.executions[data['execution_id']]
+            execution.phase_results[data['index']].evidence.append(data['evidence'])
+        elif op == 'active_execution':
+            self.active_execution = data['execution_id']
+    
+    def _journal_execution(self, execution: WorkflowExecution):
+        """Journal execution-level fields without its phase results"""
+        header = {}
+        for f in fields(WorkflowExecution):
+            if f.name == 'phase_results':
+                continue
+            value = getattr(execution, f.name)
+            header[f.name] = value.isoformat() if isinstance(value, datetime) else value
+        self.journal.append('execution', header)
+    
+    def _journal_phase(self, execution: WorkflowExecution, index: int):
+        """Journal the phase result at ``index`` of an execution"""
+        self.journal.append('phase', {
+            'execution_id': execution.execution_id,
+            'index': index,
+            'phase': execution.phase_results[index].to_dict()
+        })
+    
+    def _phase_from_dict(self, pr_data: Dict[str, Any]) -> PhaseResult:
+        """Create PhaseResult from dictionary"""
+        if 'started_at' in pr_data and pr_data['started_at']:
+            pr_data['started_at'] = datetime.fromisoformat(pr_data['started_at'])
+        if 'completed_at' in pr_data and pr_data['completed_at']:
+            pr_data['completed_at'] = datetime.fromisoformat(pr_data['completed_at'])
+        return PhaseResult(**pr_data)
+    
     def _execution_from_dict(self, data: Dict[str, Any]) -> WorkflowExecution:
         """Create WorkflowExecution from dictionary"""
         # Convert ISO strings to datetime
@@ -209,15 +271,9 @@ class WorkflowStateMCP:
                 data[key] = datetime.fromisoformat(data[key])
         
         # Convert phase results
-        phase_results = []
-        for pr_data in data.get('phase_results', []):
-            if 'started_at' in pr_data and pr_data['started_at']:
-                pr_data['started_at'] = datetime.fromisoformat(pr_data['started_at'])
-            if 'completed_at' in pr_data and pr_data['completed_at']:
-                pr_data['completed_at'] = datetime.fromisoformat(pr_data['completed_at'])
-            phase_results.append(PhaseResult(**pr_data))
-        
-        data['phase_results'] = phase_results
+        data['phase_results'] = [
+            self._phase_from_dict(pr_data) for pr_data in data.get('phase_results', [])
+        ]
         return WorkflowExecution(**data)
     
     async def create_execution(
@@ -243,6 +299,8 @@ class WorkflowStateMCP:
         
         self.executions[execution_id] = execution
         self.active_execution = execution_id
+        self._journal_execution(execution)
+        self.journal.append('active_execution', {'execution_id': execution_id})
         
         self.logger.info(f"Created workflow execution {execution_id}: {workflow_name}")
         return execution
@@ -275,6 +333,8 @@ class WorkflowStateMCP:
         
         execution.phase_results.append(phase_result)
         execution.current_phase = phase_id
+        self._journal_execution(execution)
+        self._journal_phase(execution, len(execution.phase_results) - 1)
         
         self.logger.info(f"Started phase {phase_id} for execution {execution_id}")
         return phase_result
@@ -297,7 +357,7 @@ class WorkflowStateMCP:
         
         # Find the phase result
         phase_result = None
-        for pr in execution.phase_results:
+        for index, pr in enumerate(execution.phase_results):
             if pr.phase_id == phase_id and pr.status == PhaseStatus.IN_PROGRESS.value:
                 phase_result = pr
                 break
@@ -319,6 +379,8 @@ class WorkflowStateMCP:
             duration = (phase_result.completed_at - phase_result.started_at).total_seconds()
             phase_result.metrics['execution_time_seconds'] = duration
         
+        self._journal_phase(execution, index)
+        
         self.logger.info(f"Completed phase {phase_id} with status {status}")
         
         # Check if workflow is complete
@@ -350,6 +412,7 @@ class WorkflowStateMCP:
             
             execution.completed_at = datetime.now()
             execution.current_phase = None
+            self._journal_execution(execution)
             
             self.logger.info(f"Workflow {execution_id} completed with status {execution.status}")
     
@@ -368,7 +431,7 @@ class WorkflowStateMCP:
         execution = self.executions[execution_id]
         
         # Find the phase
-        for phase_result in execution.phase_results:
+        for index, phase_result in enumerate(execution.phase_results):
             if phase_result.phase_id == phase_id:
                 evidence = {
                     'type': evidence_type,
@@ -377,6 +440,11 @@ class WorkflowStateMCP:
                     'metadata': metadata or {}
                 }
                 phase_result.evidence.append(evidence)
+                self.journal.append('evidence', {
+                    'execution_id': execution_id,
+                    'index': index,
+                    'evidence': evidence
+                })
                 self.logger.debug(f"Added {evidence_type} evidence to phase {phase_id}")
                 return True
         
@@ -399,6 +467,7 @@ class WorkflowStateMCP:
             self.logger.warning(f"Workflow {execution_id} reached max iterations")
             execution.status = WorkflowStatus.FAILED.value
             execution.completed_at = datetime.now()
+            self._journal_execution(execution)
             return False
         
         # Increment iteration count
@@ -417,6 +486,7 @@ class WorkflowStateMCP:
         
         # Reset current phase
         execution.current_phase = None
+        self._journal_execution(execution)
         
         self.logger.info(f"Iterating workflow {execution_id}, iteration {execution.iteration_count}")
         return True
@@ -502,12 +572,15 @@ class WorkflowStateMCP:
         
         # Mark current phase as cancelled
         if execution.current_phase:
-            for pr in execution.phase_results:
+            for index, pr in enumerate(execution.phase_results):
                 if pr.phase_id == execution.current_phase and pr.status == PhaseStatus.IN_PROGRESS.value:
                     pr.status = PhaseStatus.SKIPPED.value
                     pr.completed_at = datetime.now()
+                    self._journal_phase(execution, index)
                     break
         
+        self._journal_execution(execution)
+        
         self.logger.info(f"Cancelled workflow execution {execution_id}")
         return True
     
@@ -557,24 +630,25 @@ class WorkflowStateMCP:
         
         return "\n".join(lines)
     
-    async def save_state(self):
-        """Save current state to disk"""
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Build the full state written to a snapshot"""
+        return {
+            'executions': [execution.to_dict() for execution in self.executions.values()],
+            'active_execution': self.active_execution,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    async def save_state(self, force_snapshot: bool = False):
+        """
+        Persist state to disk
+        
+        Phase transitions and evidence are already journaled, so this commits
+        the journal and only writes a full snapshot once the journal has grown
+        past its interval.
+        """
         try:
-            # Convert executions to serializable format
-            executions_data = []
-            for execution in self.executions.values():
-                executions_data.append(execution.to_dict())
-            
-            state = {
-                'executions': executions_data,
-                'active_execution': self.active_execution,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
-            
-            self.logger.info(f"Saved workflow state to {self.state_file}")
+            if self.journal.checkpoint(self._build_snapshot, force=force_snapshot):
+                self.logger.info(f"Saved workflow state snapshot to {self.state_file}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
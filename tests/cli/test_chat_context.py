@@ -0,0 +1,130 @@
+"""
+Tests for the chat context window, turn log and streaming responses
+"""
+
+import io
+import json
+
+import pytest
+from rich.console import Console
+
+from app.cli.core.config import LocalAgentConfig
+from app.cli.ui.chat import ChatMessage, InteractiveChatSession, MockProviderInterface
+from app.cli.ui.chat_context import ContextWindow, TurnLog
+
+
+def _words(n):
+    return " ".join(f"w{i}" for i in range(n))
+
+
+class TestContextWindow:
+    """Test token budgeting of the conversation window"""
+
+    def test_recent_turns_fit_budget_and_system_prompt_is_pinned(self):
+        window = ContextWindow(max_tokens=400, reserve_tokens=50, summary_tokens=100,
+                               system_prompt="Be brief.")
+        for i in range(100):
+            window.add(ChatMessage('user' if i % 2 == 0 else 'assistant', f"turn {i} " + _words(20)))
+
+        messages = window.build_messages()
+        assert messages[0] == {'role': 'system', 'content': 'Be brief.'}
+        assert messages[1]['content'].startswith("Summary of earlier conversation")
+        assert messages[-1]['content'].startswith("turn 99")
+        assert window.used_tokens <= window.budget
+        assert window.stats()['dropped_messages'] > 0
+
+    def test_token_counts_are_computed_once(self):
+        calls = []
+
+        def counter(text):
+            calls.append(text)
+            return len(text.split())
+
+        window = ContextWindow(max_tokens=10_000, count_tokens=counter)
+        message = ChatMessage('user', "hello there")
+        window.add(message)
+        window.reset()
+        window.add(message)
+
+        assert calls == ["hello there"]
+        assert message.token_count is not None
+
+    def test_keeps_minimum_recent_messages_even_if_over_budget(self):
+        window = ContextWindow(max_tokens=20, reserve_tokens=0, summary_tokens=0)
+        window.add(ChatMessage('user', _words(200)))
+        window.add(ChatMessage('assistant', _words(200)))
+
+        assert len(window.build_messages()) == 2
+
+
+class TestTurnLog:
+    """Test append-only session persistence"""
+
+    def test_replay_honours_clear_and_skips_torn_line(self, tmp_path):
+        log = TurnLog(tmp_path / "s.jsonl")
+        log.write_header({'session_name': 's', 'provider': 'ollama'})
+        log.append_messages([ChatMessage('user', 'old').to_dict()])
+        log.append_clear()
+        log.append_messages([ChatMessage('user', 'new').to_dict()])
+        with open(log.path, 'a') as f:
+            f.write('{"type": "mess')
+
+        header, messages = log.replay()
+        assert header['session_name'] == 's'
+        assert [m['content'] for m in messages] == ['new']
+
+
+class TestStreamingChat:
+    """Test InteractiveChatSession streams and saves incrementally"""
+
+    @pytest.fixture
+    def chat(self, tmp_path):
+        config = LocalAgentConfig(config_dir=tmp_path)
+        chat = InteractiveChatSession(config, provider='ollama', session_name='demo',
+                                      system_prompt="You are helpful.")
+        chat.console = Console(file=io.StringIO(), force_terminal=False)
+        provider = MockProviderInterface('ollama')
+        original = provider.stream_response
+        chat.sent = []
+
+        def recording(messages):
+            chat.sent.append(messages)
+            return original(messages, chunk_delay=0)
+
+        provider.stream_response = recording
+        chat.provider_instance = provider
+        return chat
+
+    @pytest.mark.asyncio
+    async def test_streamed_turns_are_appended_to_log(self, chat, tmp_path):
+        for text in ("first question", "second question"):
+            chat._add_message('user', text)
+            await chat._get_ai_response(text)
+            await chat._save_session()
+
+        reply = chat.session.messages[-1]
+        assert reply.content.endswith("second question")
+        assert reply.metadata['streamed'] is True
+        assert chat.sent[-1][0]['role'] == 'system'
+
+        log_path = tmp_path / "chat_sessions" / "demo.jsonl"
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [r['type'] for r in records] == ['session'] + ['message'] * 4
+
+        # Saving again without new turns appends nothing
+        await chat._save_session()
+        assert len(log_path.read_text().splitlines()) == 5
+
+    @pytest.mark.asyncio
+    async def test_reload_restores_session_and_window(self, chat, tmp_path):
+        chat._add_message('user', "remember me")
+        await chat._get_ai_response("remember me")
+        await chat._save_session()
+
+        config = LocalAgentConfig(config_dir=tmp_path)
+        reopened = InteractiveChatSession(config, provider='ollama', session_name='demo')
+        await reopened._load_session_history()
+
+        assert [m.content for m in reopened.session.messages][0] == "remember me"
+        assert reopened.context_window.build_messages()[0]['content'] == "remember me"
+        assert await reopened._list_saved_sessions() == ['demo']
@@ -0,0 +1,129 @@
+"""
+Tests for slotted records, categorical interning and the record memory report
+"""
+
+import pickle
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+import pytest
+
+from app.cli.intelligence.autocomplete_history import CommandHistoryEntry
+from app.cli.intelligence.behavior_tracker import UserInteraction
+from app.cli.plugins.builtin.shell_plugin import CommandHistory
+from app.cli.ui.memory_optimizer import (
+    InternTable, MemoryOptimizer, compare_record_layouts, record_footprint, slotted
+)
+from app.monitoring.async_cost_monitor import AsyncCallMetric
+
+
+@slotted
+@dataclass
+class Sample:
+    name: str
+    count: int = 0
+    tags: Dict[str, str] = field(default_factory=dict)
+    note: Optional[str] = None
+
+
+class TestSlotted:
+    """Dataclass behaviour is preserved without a __dict__"""
+
+    def test_defaults_equality_and_serialization(self):
+        sample = Sample("a")
+
+        assert not hasattr(sample, '__dict__')
+        assert sample == Sample("a", 0, {}, None)
+        assert Sample("b").tags is not sample.tags
+        assert asdict(Sample("a", 2, {'k': 'v'})) == {'name': 'a', 'count': 2, 'tags': {'k': 'v'}, 'note': None}
+        assert pickle.loads(pickle.dumps(sample)) == sample
+        with pytest.raises(AttributeError):
+            sample.extra = 1
+
+    def test_records_are_slotted(self):
+        interaction = UserInteraction(timestamp=1.0, interaction_type='command_execution', command='ls')
+        entry = CommandHistoryEntry(command='ls', timestamp=1.0)
+        metric = AsyncCallMetric(1.0, 'fetch', 0.1, True, False, 0, 0.0, 0.0)
+
+        for record in (interaction, entry, metric):
+            assert not hasattr(record, '__dict__')
+        assert UserInteraction.from_dict(interaction.to_dict()) == interaction
+        assert CommandHistoryEntry.from_dict(entry.to_dict()) == entry
+
+
+class TestInterning:
+    """Repeated categorical strings share one copy"""
+
+    def test_intern_table_shares_and_bounds(self):
+        table = InternTable(max_size=2)
+        first = table.intern("".join(["git ", "status"]))
+        second = table.intern("".join(["git ", "status"]))
+        table.intern("ls")
+        overflow = "".join(["p", "wd"])
+
+        assert first is second
+        assert table.intern(overflow) is overflow
+        assert len(table) == 2
+        assert table.intern(None) is None
+        assert table.get_stats()['hits'] == 1
+
+    def test_records_intern_categorical_fields(self):
+        a = UserInteraction(timestamp=1.0, interaction_type="".join(["provider_", "usage"]),
+                            command="".join(["git ", "log"]),
+                            context={'provider': "".join(["oll", "ama"]), 'query': "".join(["a", "b"])})
+        b = UserInteraction(timestamp=2.0, interaction_type="".join(["provider_", "usage"]),
+                            command="".join(["git ", "log"]),
+                            context={'provider': "".join(["oll", "ama"]), 'query': "".join(["a", "b"])})
+
+        assert a.interaction_type is b.interaction_type
+        assert a.command is b.command
+        assert a.context['provider'] is b.context['provider']
+        assert a.context['query'] is not b.context['query']
+
+    def test_shell_history_is_bounded_and_interned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(CommandHistory, 'max_entries', 3)
+        history = CommandHistory(tmp_path / "history.json")
+        for _ in range(5):
+            history.add_command("".join(["make ", "test"]), {'success': True, 'working_directory': '/tmp'})
+
+        assert len(history.history) == 3
+        assert history.history[0]['command'] is history.history[2]['command']
+        assert len(CommandHistory(tmp_path / "history.json").history) == 3
+
+
+class TestRecordMemoryReport:
+    """Bytes per record before and after compaction"""
+
+    def _interactions(self, count):
+        return [
+            UserInteraction(timestamp=float(i), interaction_type="".join(["command_", "execution"]),
+                            command="".join(["git ", ("status", "diff", "log")[i % 3]]),
+                            context={'provider': "".join(["oll", "ama"])}, session_id="".join(["session_", "1"]))
+            for i in range(count)
+        ]
+
+    def test_footprint_counts_shared_objects_once(self):
+        shared = "x" * 100
+        total, count = record_footprint([Sample(shared), Sample(shared)])
+        single, _ = record_footprint([Sample(shared)])
+
+        assert count == 2
+        assert total < 2 * single
+
+    def test_compact_interactions_are_meaningfully_smaller(self):
+        report = compare_record_layouts('user_interactions', self._interactions(500))
+
+        assert report.records == 500
+        assert report.compact_bytes_per_record < report.legacy_bytes_per_record
+        assert report.saving > 0.25
+
+    def test_optimizer_reports_registered_sources(self):
+        optimizer = MemoryOptimizer()
+        records = self._interactions(50)
+        optimizer.register_record_source('user_interactions', lambda: records)
+        optimizer.register_record_source('broken', lambda: 1 / 0)
+
+        reports = optimizer.record_memory_report(sample_size=10)
+
+        assert [r.record_type for r in reports] == ['user_interactions']
+        assert reports[0].records == 10
@@ -0,0 +1,126 @@
+"""
+Tests for the dirty-region diff renderer in app/cli/ui/diff_renderer.py
+"""
+
+import io
+
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
+
+from app.cli.ui.animation_engine import VirtualScrollView, VirtualScrollConfig
+from app.cli.ui.diff_renderer import DiffRenderer, changed_span, line_cells
+from app.cli.ui.performance_monitor import FrameRateMonitor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _console():
+    return Console(file=io.StringIO(), width=40, height=10, force_terminal=True,
+                   color_system="truecolor")
+
+
+def _table(rows):
+    table = Table(title="Agents")
+    table.add_column("Agent")
+    table.add_column("Status")
+    for name, status in rows:
+        table.add_row(name, Text(status, style="green" if status == "done" else "yellow"))
+    return table
+
+
+class TestDiffRenderer:
+    """Frame diffing, input skipping and pacing"""
+
+    def test_first_frame_is_full_then_only_changes(self):
+        renderer = DiffRenderer(_console())
+        rows = [("alpha", "running"), ("beta", "running"), ("gamma", "running")]
+
+        first = renderer.render(_table(rows))
+        rows[1] = ("beta", "done")
+        second = renderer.render(_table(rows))
+
+        assert first.startswith('\x1b[H\x1b[2J')
+        assert renderer.stats['full_redraws'] == 1
+        assert renderer.stats['lines_changed'] > 0
+        assert 'done' in second and 'alpha' not in second
+        assert len(second) < len(first) / 4
+        assert renderer.render(_table(rows)) == ''
+
+    def test_unchanged_inputs_skip_building(self):
+        renderer = DiffRenderer(_console())
+        builds = []
+
+        def build():
+            builds.append(1)
+            return Text("static")
+
+        renderer.render(build, inputs=1)
+        assert renderer.render(build, inputs=1) is None
+        renderer.render(build, inputs=2)
+
+        assert len(builds) == 2
+        assert renderer.stats['frames_unchanged'] == 1
+
+    def test_emission_is_paced_by_frame_monitor(self):
+        clock = FakeClock()
+        renderer = DiffRenderer(_console(), frame_monitor=FrameRateMonitor(target_fps=10), clock=clock)
+
+        assert renderer.render(Text("one")) is not None
+        clock.now = 0.05
+        assert renderer.render(Text("two")) is None
+        assert renderer.stats['frames_deferred'] == 1
+
+        flushed = renderer.flush()
+        assert 'two' in flushed
+        assert renderer.flush() is None
+
+    def test_shrinking_frame_clears_stale_rows(self):
+        renderer = DiffRenderer(_console())
+        renderer.render(Text("a\nb\nc"))
+        output = renderer.render(Text("a"))
+
+        assert output.count('\x1b[2K') == 0
+        # Padded frames keep their height, so the old rows are overwritten with blanks
+        assert '\x1b[2;1H' in output and '\x1b[3;1H' in output
+
+    def test_changed_span_covers_wide_characters(self):
+        old = line_cells((Text("ab日本").render(_console())))
+        new = line_cells((Text("ab日x ").render(_console())))
+
+        assert len(old) == len(new) == 6
+        assert changed_span(old, new) == (4, 5)
+        assert changed_span(old, old) is None
+
+
+class TestVirtualScrollCache:
+    """Viewport list reuse"""
+
+    def test_visible_items_reused_until_viewport_moves(self):
+        calls = []
+
+        def render(item, index):
+            calls.append(index)
+            return f"row {item}"
+
+        view = VirtualScrollView(list(range(100)), VirtualScrollConfig(viewport_height=5), render)
+        first = view.get_visible_items()
+        assert view.get_visible_items() is first
+
+        view.scroll_to(10, animate=False)
+        assert view.get_visible_items() == [f"row {i}" for i in range(10, 15)]
+
+        view.items[10] = 'changed'
+        view.invalidate(10)
+        assert view.get_visible_items()[0] == "row changed"
+        assert calls.count(10) == 2
+
+        # Replacing the items with a list of the same length re-renders the rows
+        view.update_items([f"new {i}" for i in range(100)])
+        assert view.get_visible_items()[0] == "row new 10"
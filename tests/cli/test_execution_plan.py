@@ -0,0 +1,152 @@
+"""
+Tests for dependency-aware execution of batch file operations
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.cli.io.atomic import AtomicWriter, AtomicWriteError, FileTransaction
+from app.cli.io.execution_plan import DirectorySyncBatch, plan_waves
+from app.cli.tools.file_ops import FileOperation, FileProcessor, OperationContext
+
+
+class TestPlanWaves:
+    """Test grouping of operations into independent waves"""
+
+    def test_independent_paths_share_a_wave(self, tmp_path):
+        ops = [[tmp_path / f"f{i}.txt"] for i in range(5)]
+        assert plan_waves(ops, lambda paths: paths) == [ops]
+
+    def test_conflicts_keep_submission_order(self, tmp_path):
+        a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+        ops = [("write", [a]), ("move", [a, b]), ("other", [tmp_path / "c.txt"]), ("write", [b])]
+
+        waves = plan_waves(ops, lambda op: op[1])
+
+        assert [[op[0] for op in wave] for wave in waves] == [
+            ["write", "other"], ["move"], ["write"]
+        ]
+
+    def test_directory_conflicts_with_its_contents(self, tmp_path):
+        ops = [[tmp_path / "sub" / "x.txt"], [tmp_path / "sub"], [tmp_path / "sub" / "y.txt"]]
+        assert len(plan_waves(ops, lambda paths: paths)) == 3
+
+    def test_barrier_runs_alone(self, tmp_path):
+        ops = [[tmp_path / "a"], None, [tmp_path / "b"]]
+        waves = plan_waves(range(3), lambda i: ops[i])
+        assert waves == [[0], [1], [2]]
+
+    def test_directory_sync_batch_deduplicates(self, tmp_path):
+        batch = DirectorySyncBatch()
+        for i in range(10):
+            batch.add(tmp_path / f"f{i}")
+        batch.add(tmp_path / "sub" / "g")
+
+        assert len(batch) == 2
+        assert batch.sync() <= 2
+        assert len(batch) == 0
+
+
+class TestConcurrentTransaction:
+    """Test FileTransaction commits planned waves"""
+
+    @pytest.mark.asyncio
+    async def test_many_writes_commit(self, tmp_path):
+        tx = FileTransaction(show_progress=False, max_workers=8)
+        for i in range(50):
+            tx.add_write(tmp_path / f"f{i}.json", {"i": i})
+        tx.add_move(tmp_path / "f0.json", tmp_path / "moved.json")
+
+        assert await tx.commit()
+
+        assert json.loads((tmp_path / "moved.json").read_text()) == {"i": 0}
+        assert not (tmp_path / "f0.json").exists()
+        assert json.loads((tmp_path / "f49.json").read_text()) == {"i": 49}
+
+    @pytest.mark.asyncio
+    async def test_failed_wave_rolls_back_completed_operations(self, tmp_path):
+        existing = tmp_path / "existing.txt"
+        existing.write_text("original")
+        tx = FileTransaction(show_progress=False)
+        tx.add_write(existing, "changed", "text")
+        tx.add_write(tmp_path / "new.json", {"a": 1})
+
+        with patch.object(AtomicWriter, 'write_json', side_effect=Exception("Simulated failure")):
+            with pytest.raises(AtomicWriteError):
+                await tx.commit()
+
+        assert existing.read_text() == "original"
+        assert not (tmp_path / "new.json").exists()
+        assert tx.completed_operations == []
+
+    @pytest.mark.asyncio
+    async def test_known_content_hash_skips_reading_temp_file(self, tmp_path):
+        target = tmp_path / "out.txt"
+        target.write_text("old")
+        original = AtomicWriter._calculate_checksum
+        read_paths = []
+
+        async def tracking(self, path):
+            read_paths.append(path)
+            return await original(self, path)
+
+        with patch.object(AtomicWriter, '_calculate_checksum', tracking):
+            async with AtomicWriter(target, show_progress=False) as writer:
+                await writer.write_text("hello")
+
+        # Only the post-rename verification reads a file back
+        assert read_paths == [target]
+        assert target.read_text() == "hello"
+
+
+class TestConcurrentFileProcessor:
+    """Test FileProcessor runs independent operations together"""
+
+    @pytest.mark.asyncio
+    async def test_copy_results_keep_input_order(self, tmp_path):
+        src = tmp_path / "src"
+        dest = tmp_path / "dest"
+        src.mkdir()
+        dest.mkdir()
+        files = []
+        for i in range(20):
+            path = src / f"f{i:02d}.txt"
+            path.write_text(str(i))
+            files.append(path)
+
+        processor = FileProcessor(max_workers=4)
+        context = OperationContext(operation=FileOperation.COPY, destination=dest)
+        progress = []
+        results = await processor._execute_operations(
+            context, files, lambda done, total: progress.append(done)
+        )
+
+        assert [r.source_path for r in results] == files
+        assert all(r.success for r in results)
+        assert (dest / "f07.txt").read_text() == "7"
+        assert progress[-1] == 20
+        # Worker threads are released once the run is over
+        assert processor.executor._pool is None
+
+    @pytest.mark.asyncio
+    async def test_same_destination_is_serialized(self, tmp_path):
+        first, second = tmp_path / "a" / "x.txt", tmp_path / "b" / "x.txt"
+        for path in (first, second):
+            path.parent.mkdir()
+            path.write_text(path.parent.name)
+        dest = tmp_path / "dest"
+        dest.mkdir()
+
+        processor = FileProcessor()
+        context = OperationContext(operation=FileOperation.COPY, destination=dest)
+        assert len(plan_waves([first, second], lambda p: processor._planned_paths(context, p))) == 2
+
+        results = await processor._execute_operations(context, [first, second])
+
+        assert results[0].success
+        assert not results[1].success
+        assert "Destination exists" in results[1].error
+        assert (dest / "x.txt").read_text() == "a"
@@ -0,0 +1,115 @@
+"""
+Tests for the persistent file index behind FuzzyFileMatcher
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.cli.tools.file_index import FileIndex
+from app.cli.tools.search import FuzzyFileMatcher, SearchContext, SearchType
+
+
+def _touch(path: Path, content: str = "x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _bump_mtime(path: Path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "workspace"
+    _touch(root / "README.md")
+    _touch(root / "app" / "search_manager.py")
+    _touch(root / "app" / "cli" / "commands.py")
+    _touch(root / "docs" / "guide.md")
+    return root
+
+
+class TestFileIndex:
+    """Test building, persisting and incrementally refreshing the index"""
+
+    def test_build_and_reload_from_disk(self, tree, tmp_path):
+        index = FileIndex(tree, cache_dir=tmp_path / "cache")
+        assert index.wait_ready(timeout=10)
+        assert {f.rel_path for f in index.files()} == {
+            "README.md", "app/search_manager.py", "app/cli/commands.py", "docs/guide.md"
+        }
+        assert index.index_file.exists()
+
+        reloaded = FileIndex(tree, cache_dir=tmp_path / "cache")
+        assert reloaded._load()
+        assert len(reloaded) == 4
+
+    def test_vcs_and_dependency_directories_are_skipped_by_default(self, tree, tmp_path):
+        _touch(tree / ".git" / "objects" / "pack.idx")
+        _touch(tree / "node_modules" / "left-pad" / "index.js")
+        _touch(tree / "app" / "__pycache__" / "commands.cpython-312.pyc")
+
+        index = FileIndex(tree, cache_dir=tmp_path / "cache")
+        assert index.wait_ready(timeout=10)
+        assert len(index) == 4
+
+        everything = FileIndex(tree, cache_dir=tmp_path / "all", ignore_dirs=set())
+        assert everything.wait_ready(timeout=10)
+        assert len(everything) == 7
+
+    def test_refresh_picks_up_added_and_removed_paths(self, tree, tmp_path):
+        index = FileIndex(tree, cache_dir=tmp_path / "cache")
+        index.wait_ready(timeout=10)
+
+        _touch(tree / "app" / "cli" / "new_module.py")
+        (tree / "docs" / "guide.md").unlink()
+        (tree / "docs").rmdir()
+        _touch(tree / "tests" / "unit" / "test_new.py")
+        for directory in (tree, tree / "app" / "cli"):
+            _bump_mtime(directory)
+
+        index.refresh()
+
+        paths = {f.rel_path for f in index.files()}
+        assert "app/cli/new_module.py" in paths
+        assert "tests/unit/test_new.py" in paths
+        assert "docs/guide.md" not in paths
+
+    def test_query_prefilters_and_ranks(self, tree, tmp_path):
+        index = FileIndex(tree, cache_dir=tmp_path / "cache")
+        index.wait_ready(timeout=10)
+        calls = []
+
+        def score(query, name):
+            calls.append(name)
+            return 1.0 if query in name else 0.0
+
+        matches = index.query(score, "search", 0.9, 10)
+
+        assert [entry.rel_path for _, entry in matches] == ["app/search_manager.py"]
+        # Names lacking most of the query's characters are never scored
+        assert "guide.md" not in calls
+
+
+class TestFuzzyFileMatcherIndex:
+    """Test FuzzyFileMatcher queries through the index"""
+
+    @pytest.mark.asyncio
+    async def test_find_files_uses_index(self, tree, tmp_path):
+        matcher = FuzzyFileMatcher(cache_dir=tmp_path / "cache")
+        context = SearchContext(
+            query="commands",
+            search_type=SearchType.FILE_NAMES,
+            root_paths=[tree],
+            exclude_patterns=["*.md"]
+        )
+
+        results = await matcher.find_files(context)
+
+        assert results[0].path == tree / "app" / "cli" / "commands.py"
+        assert results[0].confidence_score > 0.5
+        assert results[0].file_size == 1
+        assert all(r.path.suffix != ".md" for r in results)
+        assert len(matcher.indexes) == 1
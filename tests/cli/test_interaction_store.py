@@ -0,0 +1,129 @@
+"""
+Tests for the columnar interaction ring buffer and BehaviorTracker persistence
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.cli.intelligence.behavior_tracker import BehaviorTracker, UserInteraction
+from app.cli.intelligence.interaction_store import InteractionRingBuffer, append_segment, read_segments
+
+
+def _interaction(ts, kind='command_execution', command=None, provider=None, model=None,
+                 response_time=0.0, success=True):
+    context = {}
+    if provider:
+        context['provider'] = provider
+    if model:
+        context['model'] = model
+    return UserInteraction(timestamp=ts, interaction_type=kind, command=command, context=context,
+                           response_time=response_time, success=success)
+
+
+class TestInteractionRingBuffer:
+    """Window queries and vectorized statistics"""
+
+    def test_keeps_most_recent_in_order(self):
+        buffer = InteractionRingBuffer(capacity=5)
+        for i in range(12):
+            buffer.append(_interaction(float(i), command=f"cmd{i % 3}"))
+
+        assert len(buffer) == 5
+        assert [i.timestamp for i in buffer.interactions()] == [7.0, 8.0, 9.0, 10.0, 11.0]
+        assert [i.timestamp for i in buffer.interactions(since=9.5)] == [10.0, 11.0]
+
+    def test_command_counts_filter_by_type_and_time(self):
+        buffer = InteractionRingBuffer()
+        for i in range(10):
+            buffer.append(_interaction(float(i), command='git status' if i % 2 else 'ls'))
+        buffer.append(_interaction(20.0, kind='ui_interaction', command='ls'))
+
+        assert buffer.command_counts(0.0, ['command_execution']) == {'ls': 5, 'git status': 5}
+        assert buffer.command_counts(6.0, ['command_execution']) == {'ls': 2, 'git status': 2}
+        assert buffer.command_counts(0.0, ['missing']) == {}
+
+    def test_provider_stats(self):
+        buffer = InteractionRingBuffer()
+        buffer.append(_interaction(1.0, 'provider_usage', provider='ollama', model='llama', response_time=2.0))
+        buffer.append(_interaction(2.0, 'provider_usage', provider='ollama', model='mistral', success=False))
+        buffer.append(_interaction(3.0, 'provider_usage', provider='openai', model='gpt', response_time=1.0))
+
+        stats = buffer.provider_stats(0.0, ['provider_usage'])
+
+        assert stats['ollama']['usage_count'] == 2
+        assert stats['ollama']['success_rate'] == 0.5
+        assert stats['ollama']['avg_response_time'] == 1.0
+        assert sorted(stats['ollama']['models_used']) == ['llama', 'mistral']
+        assert stats['openai']['models_used'] == ['gpt']
+
+    def test_resize_keeps_latest(self):
+        buffer = InteractionRingBuffer(capacity=10)
+        for i in range(8):
+            buffer.append(_interaction(float(i)))
+        buffer.resize(3)
+        buffer.append(_interaction(8.0))
+
+        assert [i.timestamp for i in buffer.interactions()] == [6.0, 7.0, 8.0]
+
+    def test_segments_append_without_rewriting(self, tmp_path):
+        path = tmp_path / "s.jsonl.gz"
+        first = append_segment(path, [{'n': 1}, {'n': 2}])
+        size = path.stat().st_size
+        append_segment(path, [{'n': 3}])
+
+        assert first == size
+        assert read_segments(path) == [{'n': 1}, {'n': 2}, {'n': 3}]
+
+
+class TestBehaviorTrackerStore:
+    """Tracker queries and persistence through the ring buffer"""
+
+    @pytest.mark.asyncio
+    async def test_recent_patterns_are_not_duplicated(self, tmp_path):
+        tracker = BehaviorTracker(tmp_path)
+        tracker.start_session()
+        for command in ('ls', 'git status', 'ls'):
+            tracker.track_command_execution(command, [], time.time(), time.time() + 0.1, True)
+
+        recent = await tracker.get_recent_patterns(1, ['command_execution'])
+
+        assert [i.command for i in recent] == ['ls', 'git status', 'ls']
+        assert await tracker.get_command_frequency() == {'ls': 2, 'git status': 1}
+        assert tracker.current_session.average_response_time == pytest.approx(0.1, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_flush_appends_only_new_interactions(self, tmp_path):
+        tracker = BehaviorTracker(tmp_path)
+        session_id = tracker.start_session()
+        tracker.track_interaction('command_execution', command='ls')
+
+        assert await tracker.flush_interactions() == 2
+        assert await tracker.flush_interactions() == 0
+        tracker.track_interaction('command_execution', command='pwd')
+        assert await tracker.flush_interactions() == 1
+
+        session = tracker.current_session
+        tracker.current_session = None
+        await tracker._save_session_data(session)
+
+        commands = [i.command for i in tracker.load_session_interactions(session_id)]
+        assert commands == [None, 'ls', 'pwd']
+        summary = (tmp_path / "behavior_data" / f"{session_id}.json").read_text()
+        assert '"interaction_count": 3' in summary and '"interactions":' not in summary
+
+    @pytest.mark.asyncio
+    async def test_overlapping_flushes_write_each_interaction_once(self, tmp_path):
+        tracker = BehaviorTracker(tmp_path)
+        session_id = tracker.start_session()
+        for command in ('ls', 'pwd', 'git status'):
+            tracker.track_interaction('command_execution', command=command)
+
+        session = tracker.current_session
+        tracker.current_session = None
+        await asyncio.gather(tracker.flush_interactions(session), tracker._save_session_data(session))
+
+        commands = [i.command for i in tracker.load_session_interactions(session_id)]
+        assert commands == [None, 'ls', 'pwd', 'git status']
+
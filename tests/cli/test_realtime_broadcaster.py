@@ -0,0 +1,123 @@
+"""
+Tests for the non-blocking event broadcaster in app/cli/monitoring/broadcaster.py
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.cli.monitoring.broadcaster import EventBroadcaster, DROP_NEWEST
+
+
+class FakeClient:
+    """WebSocket stand-in recording sent messages, optionally slow or broken"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.messages = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send(self, message):
+        await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("closed")
+        self.messages.append(json.loads(message))
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+class TestEventBroadcaster:
+    """Fan-out, overflow and coalescing behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_publish(self):
+        broadcaster = EventBroadcaster()
+        fast, slow = FakeClient(), FakeClient(delay=1.0)
+        broadcaster.subscribe(fast)
+        broadcaster.subscribe(slow)
+
+        started = time.perf_counter()
+        for i in range(50):
+            broadcaster.publish({'type': 'tick', 'n': i})
+        assert time.perf_counter() - started < 0.1
+
+        await _drain()
+        assert [m['n'] for m in fast.messages] == list(range(50))
+        assert slow.messages == []
+        await broadcaster.close()
+
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded_and_drops_oldest(self):
+        broadcaster = EventBroadcaster(max_queue=5)
+        client = FakeClient()
+        client.gate.clear()
+        subscriber = broadcaster.subscribe(client)
+
+        for i in range(20):
+            broadcaster.publish({'n': i})
+        await asyncio.sleep(0)
+        assert len(subscriber.pending) <= 5
+
+        client.gate.set()
+        await _drain()
+        # The writer may already hold the first message when the gate closes
+        assert [m['n'] for m in client.messages][-5:] == list(range(15, 20))
+        assert broadcaster.get_stats()['dropped'] >= 14
+        await broadcaster.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_policy_keeps_earliest(self):
+        broadcaster = EventBroadcaster(max_queue=3, policy=DROP_NEWEST)
+        client = FakeClient()
+        client.gate.clear()
+        broadcaster.subscribe(client)
+
+        for i in range(10):
+            broadcaster.publish({'n': i})
+        client.gate.set()
+        await _drain()
+
+        assert [m['n'] for m in client.messages][:3] == [0, 1, 2]
+        await broadcaster.close()
+
+    @pytest.mark.asyncio
+    async def test_coalescing_keeps_latest_status(self):
+        broadcaster = EventBroadcaster()
+        client = FakeClient()
+        client.gate.clear()
+        broadcaster.subscribe(client)
+
+        broadcaster.publish({'n': 'start'})
+        for status in ('queued', 'running', 'done'):
+            broadcaster.publish({'agent': 'a', 'status': status}, coalesce_key=('agent_status', 'a'))
+        broadcaster.publish({'agent': 'b', 'status': 'running'}, coalesce_key=('agent_status', 'b'))
+        client.gate.set()
+        await _drain()
+
+        statuses = [(m['agent'], m['status']) for m in client.messages if 'agent' in m]
+        assert statuses == [('a', 'done'), ('b', 'running')]
+        await broadcaster.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_client_is_removed(self):
+        broadcaster = EventBroadcaster()
+        good, bad = FakeClient(), FakeClient(fail=True)
+        broadcaster.subscribe(good)
+        broadcaster.subscribe(bad)
+
+        broadcaster.publish({'n': 1})
+        await _drain()
+
+        assert len(broadcaster) == 1
+        assert broadcaster.get_stats()['disconnected'] == 1
+        assert good.messages == [{'n': 1}]
+        await broadcaster.close()
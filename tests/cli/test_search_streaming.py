@@ -0,0 +1,123 @@
+"""
+Tests for the streaming ripgrep pipeline in app/cli/tools/search.py
+
+A small fake ``rg`` script emitting ``--json`` records is placed on PATH so
+the tests do not depend on ripgrep being installed.
+"""
+
+import asyncio
+import io
+import os
+import stat
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from app.cli.tools.search import RipgrepIntegrator, SearchContext, SearchManager, MatchType
+
+
+FAKE_RG = textwrap.dedent('''\
+    #!{python}
+    import json, os, sys
+    count = int(os.environ.get("FAKE_RG_COUNT", "-1"))
+    i = 0
+    while count < 0 or i < count:
+        text = "needle " + "x" * (i % 7) + "\\n"
+        sys.stdout.write(json.dumps({{"type": "begin", "data": {{}}}}) + "\\n")
+        sys.stdout.write(json.dumps({{
+            "type": "match",
+            "data": {{
+                "path": {{"text": "file_%d.py" % (i % 3)}},
+                "lines": {{"text": text}},
+                "line_number": i + 1
+            }}
+        }}) + "\\n")
+        sys.stdout.flush()
+        i += 1
+    sys.exit(0 if count else 1)
+''')
+
+
+@pytest.fixture
+def fake_rg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "rg"
+    script.write_text(FAKE_RG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return monkeypatch
+
+
+def _context(max_results=5):
+    return SearchContext(query="needle", match_type=MatchType.EXACT, max_results=max_results)
+
+
+class TestStreamingRipgrep:
+    """Test incremental consumption of rg --json output"""
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_process_at_max_results(self, fake_rg):
+        # The fake rg never ends on its own; the stream must terminate it
+        integrator = RipgrepIntegrator()
+
+        async def collect():
+            return [r async for r in integrator.stream_content(_context(max_results=5))]
+
+        results = await asyncio.wait_for(collect(), timeout=10)
+
+        assert [r.line_number for r in results] == [1, 2, 3, 4, 5]
+        assert all(r.matched_text.startswith("needle") for r in results)
+
+    @pytest.mark.asyncio
+    async def test_search_content_returns_sorted_results(self, fake_rg):
+        fake_rg.setenv("FAKE_RG_COUNT", "20")
+        results = await RipgrepIntegrator().search_content(_context(max_results=50))
+
+        assert len(results) == 20
+        assert results[0].path == Path("file_0.py")
+
+    @pytest.mark.asyncio
+    async def test_no_matches_is_not_an_error(self, fake_rg):
+        fake_rg.setenv("FAKE_RG_COUNT", "0")
+        assert await RipgrepIntegrator().search_content(_context()) == []
+
+    @pytest.mark.asyncio
+    async def test_top_k_keeps_best_matches_with_bounded_heap(self, fake_rg, monkeypatch):
+        fake_rg.setenv("FAKE_RG_COUNT", "200")
+        integrator = RipgrepIntegrator()
+        monkeypatch.setattr(
+            integrator,
+            "_calculate_confidence",
+            lambda query, text, match_type: 1.0 / len(text)
+        )
+
+        top = await integrator.search_content_top_k(_context(), k=3)
+
+        assert len(top) == 3
+        # Shortest lines score highest; ties keep the earliest match first
+        assert [r.line_number for r in top] == [1, 8, 15]
+
+
+class TestStreamingSearchManager:
+    """execute_search shows content matches while the search runs"""
+
+    @pytest.mark.asyncio
+    async def test_execute_search_prints_matches_as_they_arrive(self, fake_rg):
+        output = io.StringIO()
+        manager = SearchManager(Console(file=output, width=100))
+        printed = []
+        manager.console.print = lambda *args, **kwargs: printed.append(str(args[0]) if args else "")
+
+        # The fake rg never ends on its own, so results must come from the stream
+        results = await asyncio.wait_for(manager.execute_search(_context(max_results=4)), timeout=10)
+
+        assert len(results) == 4
+        assert [line for line in printed if line.startswith("file_")][:2] == [
+            "file_0.py:1  needle", "file_1.py:2  needle x"
+        ]
+        assert "Found 4 matches in 3 files" in printed[-1]
+        assert manager.get_search_history()[-1].query == "needle"
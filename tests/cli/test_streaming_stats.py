@@ -0,0 +1,126 @@
+"""
+Tests for the streaming statistics behind PerformancePredictionModel
+"""
+
+import json
+import random
+import statistics
+
+import pytest
+
+from app.cli.intelligence.performance_predictor import (
+    MetricType, PerformanceContext, PerformanceHistoryTracker, PerformancePredictionModel
+)
+from app.cli.intelligence.streaming_stats import DecayedTrend, MetricSketch, P2Quantile, RunningStats
+
+
+class TestEstimators:
+    """Accuracy of the individual estimators"""
+
+    def test_running_stats_match_batch(self):
+        values = [random.Random(1).gauss(100, 15) for _ in range(500)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.std == pytest.approx(statistics.stdev(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+    def test_p2_quantiles_track_exact_quantiles(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(1 / 30) for _ in range(5000)]
+        estimators = {p: P2Quantile(p) for p in (0.5, 0.9, 0.95)}
+        for value in values:
+            for estimator in estimators.values():
+                estimator.add(value)
+
+        ordered = sorted(values)
+        for p, estimator in estimators.items():
+            exact = ordered[int(p * len(ordered))]
+            assert estimator.value() == pytest.approx(exact, rel=0.05)
+
+    def test_p2_is_exact_for_few_observations(self):
+        estimator = P2Quantile(0.5)
+        for value in (5.0, 1.0, 3.0):
+            estimator.add(value)
+
+        assert estimator.value() == 3.0
+
+    def test_decayed_trend_follows_recent_values(self):
+        trend = DecayedTrend()
+        for i in range(100):
+            trend.add(10.0 + i)
+
+        assert trend.slope == pytest.approx(1.0, rel=0.05)
+        assert trend.forecast() == pytest.approx(110.0, rel=0.02)
+
+    def test_snapshot_round_trip_continues_identically(self):
+        rng = random.Random(3)
+        original = MetricSketch()
+        for _ in range(50):
+            original.add(rng.uniform(0, 10))
+
+        restored = MetricSketch.restore(json.loads(json.dumps(original.snapshot())))
+        for _ in range(50):
+            value = rng.uniform(0, 10)
+            original.add(value)
+            restored.add(value)
+
+        assert restored.summary() == original.summary()
+
+
+class TestPredictorUsesSketches:
+    """Predictions and persistence read from O(1) state"""
+
+    def test_tracker_updates_baseline_incrementally(self):
+        tracker = PerformanceHistoryTracker(max_history_size=5)
+        context = PerformanceContext(workflow_type='testing')
+        for value in range(1, 21):
+            tracker.record_execution('testing', {MetricType.EXECUTION_TIME: float(value)}, context)
+
+        # The record history is bounded but the statistics cover every execution
+        assert len(tracker.execution_history) == 5
+        assert tracker.get_baseline('testing', MetricType.EXECUTION_TIME) == pytest.approx(10.5)
+        assert tracker.get_sketch('testing', MetricType.EXECUTION_TIME).count == 20
+
+    @pytest.mark.asyncio
+    async def test_prediction_and_restore(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(PerformancePredictionModel, '_initialize_prediction_system', _noop)
+        model = PerformancePredictionModel(behavior_tracker=None, config_dir=tmp_path)
+        context = PerformanceContext(workflow_type='testing')
+        for i in range(30):
+            await model.record_actual_performance(
+                f'cli-workflow-20260101-1200{i:02d}', {MetricType.EXECUTION_TIME: 100.0 + i % 3}, context
+            )
+
+        prediction = await model._predict_with_statistical_model('testing', MetricType.EXECUTION_TIME, context)
+        assert prediction.historical_average == pytest.approx(101.0, abs=0.1)
+        assert prediction.predicted_value == pytest.approx(101.0, abs=1.0)
+        assert prediction.confidence > 0.9
+
+        await model._save_performance_history()
+        reloaded = PerformancePredictionModel(behavior_tracker=None, config_dir=tmp_path)
+        await reloaded._load_performance_history()
+        await reloaded._build_statistical_models()
+
+        sketch = reloaded.history_tracker.get_sketch('testing', MetricType.EXECUTION_TIME)
+        assert sketch.snapshot() == model.history_tracker.get_sketch('testing', MetricType.EXECUTION_TIME).snapshot()
+        assert reloaded.statistical_models['testing'][MetricType.EXECUTION_TIME]['sample_size'] == 30
+
+    @pytest.mark.asyncio
+    async def test_runs_without_workflow_type_are_not_attributed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(PerformancePredictionModel, '_initialize_prediction_system', _noop)
+        model = PerformancePredictionModel(behavior_tracker=None, config_dir=tmp_path)
+        for i in range(10):
+            await model.record_actual_performance(
+                f'cli-workflow-20260101-1200{i:02d}', {MetricType.EXECUTION_TIME: 100.0}
+            )
+
+        assert not model.history_tracker.sketches
+        assert not model.history_tracker.execution_history
+        assert len(model.accuracy_tracking[MetricType.EXECUTION_TIME]) == 10
+
+
+async def _noop(self):
+    return None
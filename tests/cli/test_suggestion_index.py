@@ -0,0 +1,127 @@
+"""
+Tests for the incremental suggestion index behind CommandIntelligenceEngine
+"""
+
+import asyncio
+import difflib
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from app.cli.intelligence.autocomplete_history import AutocompleteConfig
+from app.cli.intelligence.command_intelligence import CommandContext, CommandIntelligenceEngine
+from app.cli.intelligence.suggestion_index import NextCommandModel, PrefixIndex, TopK, TrigramIndex
+
+
+class TestIndexes:
+    """Top-K, prefix, trigram and Markov structures"""
+
+    def test_top_k_tracks_growing_counts(self):
+        top = TopK(k=2)
+        counts = {}
+        for key in ['a', 'b', 'c', 'c', 'c', 'b', 'a', 'a', 'a']:
+            counts[key] = counts.get(key, 0) + 1
+            top.update(key, counts[key])
+
+        assert top.top() == [('a', 4), ('c', 3)]
+
+    def test_prefix_lookup_matches_full_sort(self):
+        index = PrefixIndex(k=5, max_prefix=4)
+        usage = {'git status': 9, 'git stash': 4, 'git log': 6, 'grep -r': 2, 'Git-lfs pull': 3}
+        for command, count in usage.items():
+            for _ in range(count):
+                index.add(command)
+
+        assert index.lookup('gi', limit=3) == [('git status', 9), ('git log', 6), ('git stash', 4)]
+        assert index.lookup('GIT-') == [('Git-lfs pull', 3)]
+        # Longer than the indexed prefix length
+        assert index.lookup('git sta') == [('git status', 9), ('git stash', 4)]
+        assert index.lookup('zzz') == []
+
+    def test_trigram_matches_agree_with_difflib(self):
+        vocabulary = ['git status', 'git stash', 'docker compose up', 'kubectl get pods', 'pytest -q']
+        index = TrigramIndex()
+        for command in vocabulary:
+            index.add(command)
+
+        for query in ('git stats', 'dokcer compose', 'pytset -q'):
+            expected = difflib.get_close_matches(query, vocabulary, n=10, cutoff=0.6)
+            assert [command for command, _ in index.close_matches(query)] == expected
+
+    def test_markov_prefers_two_command_context(self):
+        model = NextCommandModel(min_support=2)
+        sequence = ['git add .', 'git commit', 'git push'] * 3 + ['vim x', 'git commit', 'git log'] * 3
+        for i in range(1, len(sequence)):
+            model.record(sequence[max(0, i - 2):i], sequence[i])
+
+        assert model.predict(['git add .', 'git commit'])[0][0] == 'git push'
+        assert model.predict(['vim x', 'git commit'])[0][0] == 'git log'
+        # Unseen pair backs off to the previous command
+        assert model.predict(['ls', 'git commit'])[0][2] == 6
+
+        restored = NextCommandModel()
+        restored.restore(model.snapshot())
+        assert restored.predict(['vim x', 'git commit']) == model.predict(['vim x', 'git commit'])
+
+
+@pytest.fixture
+def engine(tmp_path):
+    async def build():
+        engine = CommandIntelligenceEngine(
+            behavior_tracker=Mock(),
+            model_manager=Mock(),
+            config_dir=tmp_path,
+            autocomplete_config=AutocompleteConfig(enable_encryption=False)
+        )
+        await asyncio.sleep(0)
+        return engine
+    return build
+
+
+class TestEngineUsesIndexes:
+    """Suggestions and predictions come from the incremental indexes"""
+
+    @pytest.mark.asyncio
+    async def test_record_updates_suggestions_and_prediction(self, engine):
+        engine = await engine()
+        for command in ['git status', 'git add .', 'git commit', 'git status', 'git add .']:
+            await engine.record_command_execution(command)
+
+        frequency = await engine._get_frequency_suggestions('git')
+        similar = await engine._get_similarity_suggestions('git stats')
+        prediction = await engine.predict_next_command(CommandContext('/', recent_commands=['git status']))
+
+        assert [s.command for s in frequency][:2] == ['git status', 'git add .']
+        assert similar[0].command == 'git status'
+        assert prediction.predicted_command == 'git add .'
+        assert prediction.probability == 1.0
+        assert engine.command_patterns['git add .'] == ['git commit']
+
+    @pytest.mark.asyncio
+    async def test_knowledge_round_trip(self, engine, tmp_path):
+        first = await engine()
+        for command in ['make', 'make test', 'make', 'make test']:
+            await first.record_command_execution(command)
+        await first.save_command_knowledge()
+
+        second = await engine()
+        await second._load_command_knowledge()
+
+        assert second.command_frequency == first.command_frequency
+        assert second.prefix_index.lookup('make') == first.prefix_index.lookup('make')
+        assert second.next_command_model.predict(['make']) == first.next_command_model.predict(['make'])
+
+    @pytest.mark.asyncio
+    async def test_lookup_cost_does_not_grow_with_vocabulary(self, engine):
+        engine = await engine()
+        for i in range(20000):
+            engine._learn_command(f"task-{i % 97} run --id {i}", True, success_weight=0.1)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            await engine._get_frequency_suggestions('task-1')
+            await engine.predict_next_command(CommandContext('/', recent_commands=['task-1 run --id 1']))
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 100
+
+        assert elapsed_ms < 5.0
@@ -0,0 +1,216 @@
+"""
+Tests for the event-driven intelligence task scheduler
+"""
+
+import asyncio
+import functools
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app.cli.intelligence import task_scheduler
+from app.cli.intelligence.integration_manager import IntelligenceConfig, IntelligenceIntegrationManager
+from app.cli.intelligence.task_scheduler import IntelligenceScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+CHILD_BURN = (
+    "import time\n"
+    "end = time.process_time() + 0.2\n"
+    "while time.process_time() < end:\n"
+    "    pass\n"
+)
+
+
+def burn_cpu(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return IntelligenceScheduler(cpu_budget=0.5, budget_window=10.0, idle_delay=1.0, clock=clock)
+
+
+class TestTriggers:
+    """Work runs only when events are pending, coalesced into one run"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_coalesced(self, scheduler, clock):
+        calls = []
+        scheduler.register('flush', lambda: calls.append(clock()), triggers=('interactions',), min_events=3)
+
+        scheduler.notify('interactions')
+        scheduler.notify('interactions')
+        assert scheduler.next_wakeup() is None
+        assert await scheduler.run_due() == []
+
+        for _ in range(3):
+            scheduler.notify('interactions')
+        assert await scheduler.run_due() == ['flush']
+        assert await scheduler.run_due() == []
+
+        stats = scheduler.get_stats()['tasks']['flush']
+        assert len(calls) == 1
+        assert stats['runs'] == 1
+        assert stats['events_processed'] == 5
+
+    @pytest.mark.asyncio
+    async def test_max_delay_and_min_interval(self, scheduler, clock):
+        runs = []
+
+        async def save():
+            runs.append(clock())
+
+        scheduler.register('save', save, triggers=('learned',), min_events=10, max_delay=30, min_interval=60)
+        scheduler.notify('learned')
+
+        clock.now += 10
+        assert scheduler.next_wakeup() == pytest.approx(20)
+        assert await scheduler.run_due() == []
+        clock.now += 20
+        assert await scheduler.run_due() == ['save']
+
+        # Plenty of new events, but not before the minimum interval
+        scheduler.notify('learned', count=50)
+        assert scheduler.next_wakeup() == pytest.approx(60)
+        clock.now += 60
+        assert await scheduler.run_due() == ['save']
+        assert len(runs) == 2
+
+    @pytest.mark.asyncio
+    async def test_foreground_activity_defers_work(self, scheduler, clock):
+        scheduler.register('status', lambda: None)
+        scheduler.notify('status')
+        scheduler.note_foreground()
+
+        assert await scheduler.run_due() == []
+        assert scheduler.next_wakeup() == pytest.approx(1.0)
+        clock.now += 1.0
+        assert await scheduler.run_due() == ['status']
+        assert scheduler.get_stats()['tasks']['status']['budget_deferrals'] == 0
+
+
+class TestBudget:
+    """Background CPU stays within the budget and is reported per task"""
+
+    @pytest.mark.asyncio
+    async def test_budget_defers_until_usage_ages_out(self, clock):
+        scheduler = IntelligenceScheduler(cpu_budget=0.001, budget_window=10.0, idle_delay=0, clock=clock)
+        scheduler.register('heavy', lambda: burn_cpu(0.02))
+        scheduler.register('light', lambda: None)
+        scheduler.notify('heavy')
+        scheduler.notify('light')
+
+        assert await scheduler.run_due() == ['heavy']
+        assert scheduler.budget_used() >= 0.001
+        assert scheduler.next_wakeup() == pytest.approx(10.0)
+
+        clock.now += 10.0
+        assert await scheduler.run_due() == ['light']
+        stats = scheduler.get_stats()['tasks']
+        assert stats['heavy']['cpu_ms'] >= 20
+        assert stats['light']['budget_deferrals'] == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_off_loop_and_is_charged(self, scheduler):
+        threads = []
+
+        def prepare(n):
+            threads.append(threading.get_ident())
+            burn_cpu(0.01)
+            return n * 2
+
+        async def retrain():
+            assert await scheduler.run_in_worker(prepare, 21) == 42
+
+        scheduler.idle_delay = 0
+        scheduler.register('retrain', retrain)
+        scheduler.notify('retrain')
+        await scheduler.run_due()
+        await scheduler.stop()
+
+        assert threads and threads[0] != threading.get_ident()
+        assert scheduler.get_stats()['tasks']['retrain']['cpu_ms'] >= 10
+
+    @pytest.mark.asyncio
+    async def test_child_processes_are_charged(self, scheduler):
+        async def train():
+            run = functools.partial(subprocess.run, [sys.executable, '-c', CHILD_BURN], check=True)
+            await scheduler.run_in_worker(run)
+
+        scheduler.idle_delay = 0
+        scheduler.register('train', train)
+        scheduler.notify('train')
+        await scheduler.run_due()
+        await scheduler.stop()
+
+        assert scheduler.get_stats()['tasks']['train']['cpu_ms'] >= 150
+
+    @pytest.mark.asyncio
+    async def test_foreground_work_during_await_is_not_charged(self, scheduler):
+        async def wait_for_io():
+            await asyncio.sleep(0.05)
+
+        async def foreground():
+            await asyncio.sleep(0)
+            burn_cpu(0.05)
+
+        scheduler.idle_delay = 0
+        scheduler.register('io', wait_for_io)
+        scheduler.notify('io')
+        typing = asyncio.ensure_future(foreground())
+        await scheduler.run_due()
+        await typing
+        await scheduler.stop()
+
+        assert scheduler.get_stats()['tasks']['io']['cpu_ms'] < 10
+
+    @pytest.mark.asyncio
+    async def test_loop_sleeps_until_notified(self):
+        scheduler = IntelligenceScheduler(idle_delay=0)
+        ran = asyncio.Event()
+        scheduler.register('save', ran.set, triggers=('learned',))
+
+        await asyncio.sleep(0.05)
+        assert not ran.is_set()
+
+        scheduler.notify('learned')
+        await asyncio.wait_for(ran.wait(), timeout=1.0)
+        await scheduler.stop()
+
+
+class TestIntegration:
+    """The integration manager schedules its work instead of polling"""
+
+    @pytest.mark.asyncio
+    async def test_manager_registers_event_driven_tasks(self, tmp_path, monkeypatch):
+        scheduler = IntelligenceScheduler(idle_delay=0)
+        monkeypatch.setattr(task_scheduler, '_global_scheduler', scheduler)
+        manager = IntelligenceIntegrationManager(IntelligenceConfig(background_cpu_budget=0.05), tmp_path)
+
+        await manager._start_background_services()
+        manager._track_request_performance(3.0)
+
+        assert scheduler.cpu_budget == 0.05
+        assert {'system_status', 'user_analysis', 'cache_maintenance', 'interaction_flush'} <= set(scheduler.tasks)
+        assert scheduler.tasks['system_status'].pending == 1
+        assert scheduler.tasks['interaction_flush'].pending == 0
+        assert 'background_tasks' in manager.get_system_status()
+        await manager.shutdown()
@@ -0,0 +1,136 @@
+"""
+Tests for the terminal profiling service in app/cli/ui/terminal_profile.py
+
+A thread on the master side of a pty plays the terminal and answers
+cursor position queries.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from app.cli.ui.terminal_profile import TerminalProfiler, measure_terminal, profile_key
+
+pty = pytest.importorskip("pty")
+
+
+class FakeTerminal:
+    """Answers DSR queries after an optional delay"""
+
+    def __init__(self, delay: float = 0.0, answer: bool = True):
+        self.master, self.slave = pty.openpty()
+        self.delay = delay
+        self.answer = answer
+        self.received = 0
+        self.queries = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop:
+            try:
+                data = os.read(self.master, 65536)
+            except OSError:
+                return
+            self.received += len(data)
+            for _ in range(data.count(b'\x1b[6n')):
+                self.queries += 1
+                if self.answer:
+                    time.sleep(self.delay)
+                    os.write(self.master, b'\x1b[1;1R')
+
+    def close(self):
+        self._stop = True
+        os.close(self.slave)
+        os.close(self.master)
+
+
+@pytest.fixture
+def terminal():
+    fake = FakeTerminal(delay=0.005)
+    yield fake
+    fake.close()
+
+
+class TestMeasurement:
+    """DSR round trip and throughput on a pty"""
+
+    def test_measures_round_trip_and_throughput(self, terminal):
+        result = measure_terminal(terminal.slave, terminal.slave, payload_bytes=8192)
+
+        assert result is not None
+        round_trip_ms, throughput = result
+        assert round_trip_ms >= 5.0
+        assert throughput > 0
+        assert terminal.received > 8192
+        assert terminal.queries == 4
+
+    def test_silent_terminal_times_out(self):
+        fake = FakeTerminal(answer=False)
+        try:
+            assert measure_terminal(fake.slave, fake.slave, timeout=0.05) is None
+        finally:
+            fake.close()
+
+
+class TestProfiler:
+    """Caching keyed by environment"""
+
+    ENV = {'TERM': 'xterm-256color', 'TERM_PROGRAM': 'test', 'SSH_CONNECTION': '1 2 3 4'}
+
+    def test_profile_is_measured_once_and_reused(self, terminal, tmp_path):
+        cache = tmp_path / "profile.json"
+        first = TerminalProfiler(cache, environ=self.ENV, fds=(terminal.slave, terminal.slave))
+        measured = first.get_profile()
+        queries = terminal.queries
+
+        second = TerminalProfiler(cache, environ=self.ENV, fds=(terminal.slave, terminal.slave))
+        cached = second.get_profile()
+
+        assert measured.source == "measured"
+        assert cached.source == "cached"
+        assert cached.round_trip_ms == measured.round_trip_ms
+        assert terminal.queries == queries
+        assert first.get_profile() is measured
+
+    def test_failed_measurement_is_not_repeated(self, tmp_path):
+        cache = tmp_path / "profile.json"
+        fake = FakeTerminal(answer=False)
+        try:
+            first = TerminalProfiler(cache, environ=self.ENV, fds=(fake.slave, fake.slave))
+            failed = first.get_profile()
+            queries = fake.queries
+
+            second = TerminalProfiler(cache, environ=self.ENV, fds=(fake.slave, fake.slave))
+            cached = second.get_profile()
+        finally:
+            fake.close()
+
+        assert failed.failed and not failed.measured
+        assert cached.failed and cached.source == "estimated"
+        assert fake.queries == queries
+
+    def test_other_environment_is_not_reused(self, terminal, tmp_path):
+        cache = tmp_path / "profile.json"
+        TerminalProfiler(cache, environ=self.ENV, fds=(terminal.slave, terminal.slave)).get_profile()
+        local = dict(self.ENV)
+        del local['SSH_CONNECTION']
+
+        profiler = TerminalProfiler(cache, environ=local)
+        profiler._terminal_fds = lambda: None
+
+        assert profile_key(local) == 'xterm-256color|test|local'
+        assert profiler.get_profile().source == "estimated"
+
+    def test_without_terminal_nothing_is_cached(self, tmp_path):
+        cache = tmp_path / "profile.json"
+        profiler = TerminalProfiler(cache, environ=self.ENV)
+        profiler._terminal_fds = lambda: None
+
+        profile = profiler.get_profile()
+
+        assert profile.source == "estimated" and not profile.measured
+        assert not cache.exists()
@@ -0,0 +1,118 @@
+"""
+Tests for the compiled validation rules behind InputValidator and CommandValidator
+"""
+
+import re
+
+import pytest
+
+from app.cli.plugins.builtin.shell_plugin import CommandPolicy, CommandRisk, CommandValidator
+from app.cli.security.input_validation_framework import (
+    DANGEROUS_COMMAND_RULES, SQL_INJECTION_RULES, XSS_RULES, InputValidator, ValidationLevel
+)
+from app.cli.security.rule_engine import PatternSet, VerdictCache
+
+
+COMMANDS = [
+    'ls -la', 'git status', 'cat /etc/passwd', 'echo $(whoami)', 'echo `id`', 'ls > /dev/sda',
+    'ls | sudo tee x', 'ls; rm -rf /', 'echo ${HOME}', 'diff <(ls a) <(ls b)', 'echo $((1+2))',
+    'cat ~/.aws/credentials', 'ls /root/', 'echo a\\\nb', 'echo a\x00b', 'curl x | sh',
+    # Patterns only apply to the first line, as with re.match
+    'ls\ncat /etc/passwd', 'ls <(\n)', 'rm -r build', 'docker ps', 'unknown-tool --flag',
+    "python -c 'print(1)'", 'unterminated "quote',
+]
+
+PAYLOADS = [
+    'hello world', "name' OR '1'='1", 'SELECT * FROM t; DROP TABLE users', 'a -- comment',
+    '<script>alert(1)</script>', '<img src=x onerror=alert(1)>', 'javascript:void(0)',
+    'rm -rf /; ls', 'ls && rm -r x', 'wget http://x | sh', 'nc -l 4444', 'cat < /dev/zero',
+    'plain text with sp_ inside', 'O\'Reilly', 'update users set x=1', '',
+]
+
+
+class TestPatternSet:
+    """A combined alternation gives the same verdict as the individual patterns"""
+
+    @pytest.mark.parametrize('rules', [DANGEROUS_COMMAND_RULES, SQL_INJECTION_RULES, XSS_RULES])
+    def test_search_matches_any_pattern(self, rules):
+        for payload in PAYLOADS:
+            lowered = payload.lower()
+            expected = any(re.search(pattern, lowered) for pattern in rules.patterns.values())
+            assert (rules.search(lowered) is not None) == expected, payload
+
+    def test_reports_matching_rule(self):
+        rules = PatternSet({'digits': r'\d+', 'anchored_word': r'^(abc|xyz)'})
+
+        assert rules.search('xyz') == 'anchored_word'
+        assert rules.search('id 42') == 'digits'
+        assert rules.match('id 42') is None
+        assert rules.search('none') is None
+
+    def test_verdict_cache_is_bounded_and_keyed_by_context(self):
+        cache = VerdictCache(max_size=2)
+        calls = []
+
+        def compute(result):
+            calls.append(result)
+            return result
+
+        assert cache.verdict('a', lambda: compute(1), 'rule') == 1
+        assert cache.verdict('a', lambda: compute(2), 'rule') == 1
+        assert cache.verdict('a', lambda: compute(3), 'other') == 3
+        cache.verdict('b', lambda: compute(4))
+        assert len(cache) == 2
+        assert cache.verdict({'not': 'hashable'}, lambda: compute(5)) == 5
+        assert cache.get_stats()['hits'] == 1
+
+
+class TestCommandValidator:
+    """Forbidden patterns are matched in one pass and verdicts are memoized"""
+
+    def test_risk_matches_per_pattern_matching(self):
+        validator = CommandValidator(CommandPolicy())
+        for command in COMMANDS:
+            forbidden = any(re.match(pattern, command) for pattern in validator.FORBIDDEN_PATTERNS)
+            assert (validator.forbidden.match(command) is not None) == forbidden, command
+            if forbidden:
+                assert validator.assess_risk(command) == CommandRisk.FORBIDDEN, command
+
+    def test_verdicts_follow_policy_and_batch(self):
+        policy = CommandPolicy()
+        validator = CommandValidator(policy)
+
+        assert validator.assess_risk('sudo ls') == CommandRisk.FORBIDDEN
+        policy.allow_sudo = True
+        assert validator.assess_risk('sudo ls') == CommandRisk.DANGEROUS
+
+        results = validator.validate_many(['ls', 'cat /etc/shadow', 'ls'])
+        assert results[0] == results[2] == validator.validate_command('ls')
+        assert results[1] == (False, "Command is forbidden by security policy")
+        assert validator.verdicts.hits >= 2
+
+
+class TestInputValidator:
+    """Validation results are unchanged and repeated inputs hit the cache"""
+
+    def test_validate_many_matches_validate(self):
+        validator = InputValidator()
+        reference = InputValidator()
+
+        batch = validator.validate_many(PAYLOADS * 2, ['xss_safe', 'sql_safe', 'command'], 'input')
+
+        assert batch[:len(PAYLOADS)] == [
+            reference.validate(payload, ['xss_safe', 'sql_safe', 'command'], 'input') for payload in PAYLOADS
+        ]
+        assert batch[len(PAYLOADS):] == batch[:len(PAYLOADS)]
+        cache = validator.get_statistics()['verdict_cache']
+        assert cache['hits'] == 3 * len(PAYLOADS)
+        assert validator.stats['validations_performed'] == 2 * len(PAYLOADS)
+
+    def test_api_key_and_level_dependent_verdicts(self):
+        validator = InputValidator()
+
+        assert validator.validate('sk-live-8f3a9c2d1e7b', ['api_key'])['valid']
+        assert not validator.validate('your-api-key', ['api_key'])['valid']
+        assert not validator.validate('abcdefghijkl', ['api_key'])['valid']
+        assert validator.validate('/etc/hosts', ['file_path'])['valid']
+        validator.level = ValidationLevel.STRICT
+        assert not validator.validate('/etc/hosts', ['file_path'])['valid']
@@ -16,6 +16,7 @@ from contextlib import asynccontextmanager
 import concurrent.futures
 from pathlib import Path
 
+from app.benchmarks.history import BenchmarkHistory, compare_revisions, format_comparisons
 from app.llm_providers.base_provider import CompletionRequest, CompletionResponse
 from tests.mocks.mock_provider import MockProvider, MockProviderFactory, MockScenario
 
@@ -147,10 +148,11 @@ class PerformanceMonitor:
 class BenchmarkRunner:
     """Main benchmark execution engine"""
     
-    def __init__(self, output_dir: str = "benchmark_results"):
+    def __init__(self, output_dir: str = "benchmark_results", history_path: Optional[str] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.monitor = PerformanceMonitor()
+        self.history_path = Path(history_path) if history_path else self.output_dir / "history.sqlite3"
     
     async def run_benchmark(
         self,
@@ -388,6 +390,16 @@ class BenchmarkRunner:
         with open(filepath, 'w') as f:
             json.dump(result_dict, f, indent=2)
         
+        # Keep raw samples per revision and machine for regression checks
+        with BenchmarkHistory(self.history_path) as history:
+            history.record(
+                result.name,
+                [m.duration for m in result.individual_metrics if m.success],
+                throughput=result.throughput_ops_sec,
+                metadata={'error_rate': result.error_rate, 'memory_peak': result.memory_peak,
+                          'result_file': filename}
+            )
+        
         print(f"Results saved to: {filepath}")
 
 
@@ -677,6 +689,11 @@ class BenchmarkReportGenerator:
         
         return str(report_path)
     
+    def generate_regression_report(self, baseline: str, candidate: str, **options) -> str:
+        """Compare two revisions recorded in the results directory's history"""
+        with BenchmarkHistory(self.results_dir / "history.sqlite3") as history:
+            return format_comparisons(compare_revisions(history, baseline, candidate, **options))
+    
     def load_results(self, pattern: str = "*.json") -> List[BenchmarkResult]:
         """Load benchmark results from JSON files"""
         results = []
@@ -0,0 +1,100 @@
+"""
+Benchmark history store and regression detection tests
+"""
+
+import random
+
+import pytest
+
+from app.benchmarks import history as history_module
+from app.benchmarks.history import (
+    BenchmarkHistory, compare_revisions, compare_samples, mann_whitney_u, REGRESSION, UNCHANGED, INSUFFICIENT
+)
+from tests.performance.benchmark_framework import BenchmarkRunner
+
+
+def _latencies(seed, scale=1.0, n=300):
+    rng = random.Random(seed)
+    return [0.010 * scale * rng.lognormvariate(0, 0.3) for _ in range(n)]
+
+
+class TestComparisonEngine:
+    """Test bootstrap and Mann-Whitney regression detection"""
+
+    def test_twenty_percent_slowdown_is_flagged(self):
+        results = {m.metric: m for m in compare_samples(_latencies(1), _latencies(2, scale=1.2))}
+
+        assert results['p50'].status == REGRESSION
+        assert results['p95'].status == REGRESSION
+        assert results['p50'].ci_low > 0
+        assert results['p50'].p_value < 0.001
+
+    def test_same_distribution_is_unchanged(self):
+        results = compare_samples(_latencies(1), _latencies(2))
+
+        assert {m.status for m in results} == {UNCHANGED}
+
+    def test_small_samples_are_not_judged(self):
+        results = compare_samples([0.01] * 3, [0.05] * 3)
+
+        assert {m.status for m in results} == {INSUFFICIENT}
+
+    def test_throughput_needs_runs_on_both_sides(self):
+        slower = compare_samples(_latencies(1), _latencies(2), [100, 102, 99, 101], [80, 81, 79, 80])
+        single = compare_samples(_latencies(1), _latencies(2), [100], [80])
+
+        assert slower[-1].metric == 'throughput' and slower[-1].status == REGRESSION
+        assert single[-1].status == INSUFFICIENT
+
+    def test_pure_python_bootstrap_matches_decision(self, monkeypatch):
+        monkeypatch.setattr(history_module, "NUMPY_AVAILABLE", False)
+        results = {m.metric: m for m in compare_samples(_latencies(1), _latencies(2, scale=1.2), resamples=300)}
+
+        assert results['p50'].status == REGRESSION
+
+    def test_mann_whitney_handles_ties(self):
+        assert mann_whitney_u([1, 1, 1, 1], [1, 1, 1, 1]) == 1.0
+        assert mann_whitney_u(list(range(20)), list(range(100, 120))) < 0.001
+
+
+class TestBenchmarkHistory:
+    """Test storage keyed by name, revision and machine"""
+
+    def test_compare_only_matches_same_machine(self, tmp_path):
+        with BenchmarkHistory(tmp_path / "h.sqlite3") as history:
+            history.record("chat", _latencies(1), 100.0, revision="a", machine="m1")
+            history.record("chat", _latencies(2, 1.3), 70.0, revision="b", machine="m1")
+            history.record("chat", _latencies(3), 100.0, revision="b", machine="m2")
+
+            comparisons = compare_revisions(history, "a", "b")
+            assert history.revisions("chat") == ["a", "b"]
+
+        assert len(comparisons) == 1
+        assert comparisons[0].machine == "m1"
+        assert [m.metric for m in comparisons[0].regressions][:3] == ['p50', 'p95', 'p99']
+
+    def test_cli_exits_nonzero_on_regression(self, tmp_path, capsys):
+        db = tmp_path / "h.sqlite3"
+        with BenchmarkHistory(db) as history:
+            history.record("chat", _latencies(1), revision="a")
+            history.record("chat", _latencies(2, 1.25), revision="b")
+            history.record("chat", _latencies(3), revision="c")
+
+        assert history_module.main(['--db', str(db), 'compare', 'a', 'b']) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+        assert history_module.main(['--db', str(db), 'compare', 'a', 'c']) == 0
+
+    @pytest.mark.asyncio
+    async def test_runner_records_history(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BENCHMARK_REVISION", "rev1")
+        runner = BenchmarkRunner(str(tmp_path))
+
+        async def operation():
+            return None
+
+        await runner.run_benchmark("noop", operation, iterations=5, warmup_iterations=0)
+        with BenchmarkHistory(runner.history_path) as history:
+            runs = history.runs("noop", "rev1")
+
+        assert len(runs) == 1 and len(runs[0].samples) == 5
+        assert runs[0].throughput > 0
@@ -0,0 +1,66 @@
+"""
+Send/receive throughput benchmark for CoordinationMCP mailboxes
+"""
+
+import random
+
+import pytest
+
+from tests.performance.benchmark_framework import BenchmarkRunner
+from mcp.coordination_mcp import CoordinationMCP, MessageType
+
+
+AGENT_COUNT = 100
+MESSAGES_PER_AGENT = 20
+
+
+class TestCoordinationThroughput:
+    """Benchmark mailbox throughput with 100 agents"""
+
+    @pytest.mark.asyncio
+    async def test_send_receive_throughput_100_agents(self, tmp_path):
+        coord = CoordinationMCP({"state_file": str(tmp_path / "coord.json")})
+        agent_ids = [f"agent_{i:03d}" for i in range(AGENT_COUNT)]
+        for agent_id in agent_ids:
+            await coord.register_agent(agent_id, "worker")
+        rng = random.Random(42)
+
+        async def round_operation():
+            sent = 0
+            for sender in agent_ids:
+                for _ in range(MESSAGES_PER_AGENT):
+                    await coord.send_message(
+                        sender,
+                        rng.choice(agent_ids),
+                        MessageType.TASK_REQUEST,
+                        {"payload": sent},
+                        priority=rng.randint(0, 3)
+                    )
+                    sent += 1
+            await coord.broadcast_message("system", MessageType.STATUS_UPDATE, {"tick": True})
+
+            received = 0
+            for agent_id in agent_ids:
+                while True:
+                    batch = await coord.get_messages(agent_id, limit=50)
+                    if not batch:
+                        break
+                    received += len(batch)
+            return {'metrics': {'sent': sent, 'received': received}}
+
+        runner = BenchmarkRunner(output_dir=str(tmp_path / "results"))
+        result = await runner.run_benchmark(
+            "coordination_mailbox_throughput",
+            round_operation,
+            iterations=10,
+            warmup_iterations=1
+        )
+
+        assert result.error_rate == 0.0
+        expected = AGENT_COUNT * MESSAGES_PER_AGENT + AGENT_COUNT
+        for metric in result.individual_metrics:
+            assert metric.custom_metrics['received'] == expected
+        assert (await coord.get_coordination_stats())['pending_messages'] == 0
+
+        messages_per_sec = expected / result.avg_duration
+        print(f"Coordination mailbox: {messages_per_sec:,.0f} messages/sec with {AGENT_COUNT} agents")
@@ -0,0 +1,137 @@
+"""
+Mock Ollama server and open-loop load generator tests
+"""
+
+import json
+import random
+
+import aiohttp
+import pytest
+
+from app.benchmarks import (
+    LatencyDistribution, LoadConfig, MockOllamaConfig, MockOllamaServer, OpenLoopLoadGenerator,
+    ProviderBenchmark
+)
+from app.benchmarks.load_generator import arrival_offsets
+from app.llm_providers.enhanced_ollama_provider import EnhancedOllamaProvider
+from app.resilience import initialize_global_pool, shutdown_global_pool
+from app.resilience.circuit_breaker import CircuitBreakerManager
+from app.resilience.rate_limiter import RateLimiter
+
+CHAT = {'model': 'llama2:7b', 'messages': [{'role': 'user', 'content': 'hello'}],
+        'options': {'num_predict': 8}}
+
+
+async def _post(url, payload):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{url}/api/chat", json=payload) as response:
+            return response.status, await response.text()
+
+
+class TestMockOllamaServer:
+    """Test the mock API, determinism and fault injection"""
+
+    @pytest.mark.asyncio
+    async def test_responses_are_deterministic(self):
+        bodies = []
+        for _ in range(2):
+            async with MockOllamaServer(MockOllamaConfig(seed=7)) as server:
+                status, text = await _post(server.url, dict(CHAT, stream=False))
+                assert status == 200
+                bodies.append(json.loads(text)['message']['content'])
+
+        assert bodies[0] == bodies[1]
+        assert len(bodies[0].split()) == 8
+
+    @pytest.mark.asyncio
+    async def test_streams_ndjson_chunks(self):
+        config = MockOllamaConfig(chunk_tokens=3)
+        async with MockOllamaServer(config) as server:
+            status, text = await _post(server.url, dict(CHAT, stream=True))
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{server.url}/api/tags") as response:
+                    models = (await response.json())['models']
+
+        lines = [json.loads(line) for line in text.splitlines()]
+        assert status == 200
+        assert len(lines) == 3 + 1
+        assert lines[-1]['done'] and lines[-1]['eval_count'] == 8
+        assert [m['name'] for m in models] == config.models
+
+    @pytest.mark.asyncio
+    async def test_error_and_reset_injection(self):
+        async with MockOllamaServer(MockOllamaConfig(error_rate=1.0, error_status=503)) as server:
+            status, _ = await _post(server.url, dict(CHAT, stream=False))
+        assert status == 503
+
+        async with MockOllamaServer(MockOllamaConfig(reset_rate=1.0)) as server:
+            with pytest.raises(aiohttp.ClientError):
+                await _post(server.url, dict(CHAT, stream=False))
+            assert server.stats['resets'] == 1
+
+    def test_latency_distributions_are_seeded(self):
+        lognormal = LatencyDistribution('lognormal', mean=0.05, spread=0.5)
+        first = [lognormal.sample(random.Random(3)) for _ in range(3)]
+        second = [lognormal.sample(random.Random(3)) for _ in range(3)]
+
+        assert first == second
+        assert LatencyDistribution('normal', mean=0.0, spread=1.0).sample(random.Random(1)) >= 0.0
+
+
+class TestOpenLoopLoad:
+    """Drive the full Ollama provider stack against the mock server"""
+
+    @pytest.fixture
+    def provider_factory(self):
+        def make(url):
+            provider = EnhancedOllamaProvider({'base_url': url})
+            # Fresh limiter and breaker so runs do not share state
+            provider.rate_limiter = RateLimiter()
+            provider.circuit_manager = CircuitBreakerManager()
+            return provider
+        return make
+
+    def test_poisson_arrivals_are_reproducible(self):
+        config = LoadConfig(rate_rps=100, duration=2.0, seed=5)
+        offsets = arrival_offsets(config)
+
+        assert offsets == arrival_offsets(config)
+        assert 150 < len(offsets) < 250
+        assert offsets == sorted(offsets)
+        assert len(arrival_offsets(LoadConfig(rate_rps=10, duration=1.0, arrival='uniform'))) == 10
+
+    @pytest.mark.asyncio
+    async def test_open_loop_does_not_wait_for_responses(self, provider_factory):
+        server_config = MockOllamaConfig(first_token_latency=LatencyDistribution('constant', 0.2))
+        async with MockOllamaServer(server_config) as server:
+            await initialize_global_pool()
+            try:
+                provider = provider_factory(server.url)
+                config = LoadConfig(rate_rps=40, duration=0.5, arrival='uniform', max_tokens=4)
+                result = await OpenLoopLoadGenerator(provider, config, server).run()
+            finally:
+                await shutdown_global_pool()
+
+        assert result.scheduled == 20
+        assert result.completed == 20
+        # Closed-loop sequential sending would need at least 20 * 0.2s
+        assert result.elapsed < 1.5
+        assert min(result.latencies) >= 0.2
+        assert result.client_overhead is not None and result.client_overhead < 0.1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_by_kind(self, provider_factory):
+        async with MockOllamaServer(MockOllamaConfig(seed=1, error_rate=0.5)) as server:
+            await initialize_global_pool()
+            try:
+                provider = provider_factory(server.url)
+                benchmark = ProviderBenchmark()
+                config = LoadConfig(rate_rps=30, duration=0.3, arrival='uniform', stream=True)
+                result = await benchmark.run_open_loop(provider, config, server)
+            finally:
+                await shutdown_global_pool()
+
+        assert result.total_requests == 9
+        assert 0 < result.failed_requests < 9
+        assert result.successful_requests + result.failed_requests == 9
+        assert "open_loop_30rps" in benchmark.generate_report()
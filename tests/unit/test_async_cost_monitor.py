@@ -0,0 +1,145 @@
+"""
+Tests for the streaming anti-pattern detectors in AsyncCostMonitor
+"""
+
+import time
+
+from app.cli.ui.memory_optimizer import intern_category
+from app.monitoring.async_cost_monitor import AsyncCostMonitor, CountMinSketch, SlidingWindowCounter
+
+
+def _patterns(monitor):
+    return [a.pattern_type for a in monitor.alerts]
+
+
+class TestDetectorPrimitives:
+    """Sliding windows and count-min sketch"""
+
+    def test_sliding_window_expires_old_buckets(self):
+        counter = SlidingWindowCounter(window=10.0, buckets=10)
+        for t in range(10):
+            counter.add(1000.0 + t)
+
+        assert counter.count(1009.5) == 10
+        assert counter.count(1014.5) == 5
+        assert counter.span(1014.5) == 9.5
+        assert counter.count(1100.0) == 0
+
+    def test_count_min_never_undercounts(self):
+        sketch = CountMinSketch(width=16, depth=3)
+        for i in range(200):
+            sketch.add(i % 40)
+
+        assert all(sketch.estimate(k) >= 5 for k in range(40))
+        assert sketch.add('new') >= 1
+
+
+class TestStreamingDetection:
+    """Alerts fire as soon as a pattern appears in the stream"""
+
+    def test_duplicate_calls_alert_immediately(self):
+        monitor = AsyncCostMonitor()
+        now = 10_000.0
+        for i in range(4):
+            monitor.track_async_call('fetch', now + i * 0.01, now + i * 0.01 + 0.005, parallel=True)
+
+        # Fires on the third call, once two of three are duplicates
+        assert _patterns(monitor) == ['race_conditions']
+        assert monitor.alerts[0].evidence == {
+            'function': 'fetch', 'total_calls': 3, 'duplicate_calls': 2, 'duplicate_rate': 2 / 3
+        }
+
+    def test_distinct_call_keys_are_not_duplicates(self):
+        monitor = AsyncCostMonitor()
+        now = 10_000.0
+        for i in range(10):
+            monitor.track_async_call('fetch', now + i * 0.01, now + i * 0.01, parallel=True, call_key=i)
+
+        assert 'race_conditions' not in _patterns(monitor)
+
+    def test_session_recreation_beyond_old_window(self):
+        monitor = AsyncCostMonitor(window=600.0)
+        now = 10_000.0
+        # Spread over far more than 100 calls of other traffic
+        for i in range(300):
+            monitor.track_async_call('noise', now + i, now + i, parallel=True, call_key=i)
+            if i % 40 == 0:
+                monitor.track_async_call('ollama_provider.complete', now + i + 0.5, now + i + 0.6,
+                                         parallel=True, call_key=i)
+
+        alerts = [a for a in monitor.alerts if a.pattern_type == 'session_recreation']
+        # Sixth provider call, 200 seconds and 200+ other calls after the first
+        assert alerts[0].timestamp == now + 200.5
+        assert alerts[0].severity == 'critical'
+
+    def test_alerts_respect_cooldown(self):
+        monitor = AsyncCostMonitor(alert_cooldown=60.0)
+        now = 10_000.0
+        for i in range(100):
+            monitor.track_async_call('fetch', now + i * 0.01, now + i * 0.01, parallel=True)
+
+        assert _patterns(monitor).count('race_conditions') == 1
+        assert monitor.detector_stats['alerts_suppressed'] > 0
+
+    def test_sustained_sequential_load_alerts_once_per_cooldown(self):
+        monitor = AsyncCostMonitor(alert_cooldown=60.0)
+        now = 10_000.0
+        for i in range(300):
+            # 10 sequential calls per second, each a distinct function, for 30 seconds
+            monitor.track_async_call(f'step_{i}', now + i * 0.1, now + i * 0.1, parallel=False)
+
+        assert _patterns(monitor).count('sequential_execution') == 1
+        assert sum(1 for pattern, _ in monitor._last_alert if pattern == 'sequential_execution') == 1
+
+    def test_late_events_do_not_reset_the_current_window(self):
+        monitor = AsyncCostMonitor(window=60.0)
+        now = 10_000.0
+        monitor.track_async_call('fetch', now, now, parallel=True)
+        # A call that started minutes ago finishes now
+        monitor.track_async_call('slow_report', now - 200, now, parallel=True)
+        for i in range(1, 4):
+            monitor.track_async_call('fetch', now + i * 0.01, now + i * 0.01, parallel=True)
+
+        assert 'race_conditions' in _patterns(monitor)
+
+        for i in range(3):
+            monitor.track_async_call(f'step_{i}', now + 10, now + 10, parallel=False)
+        monitor.track_async_call('late_step', now + 5, now + 10, parallel=False)
+        for i in range(3, 6):
+            monitor.track_async_call(f'step_{i}', now + 10.5, now + 10.5, parallel=False)
+
+        assert 'sequential_execution' in _patterns(monitor)
+
+    def test_function_names_share_the_category_table(self):
+        monitor = AsyncCostMonitor()
+        canonical = intern_category('provider.complete')
+        for i in range(3):
+            monitor.track_async_call(''.join(['provider', '.complete']), 10_000.0 + i, 10_000.0 + i, parallel=True)
+
+        assert all(metric.function_name is canonical for metric in monitor.metrics)
+
+    def test_memory_growth_detected_from_ewma(self):
+        monitor = AsyncCostMonitor()
+        now = 10_000.0
+        for i in range(60):
+            monitor._check_memory(100.0, now + i)
+        assert 'memory_leaks' not in _patterns(monitor)
+
+        for i in range(20):
+            monitor._check_memory(200.0, now + 60 + i)
+        assert 'memory_leaks' in _patterns(monitor)
+
+    def test_tracking_cost_is_constant(self):
+        monitor = AsyncCostMonitor()
+        now = time.time()
+
+        def timed(n):
+            started = time.perf_counter()
+            for i in range(n):
+                monitor.track_async_call(f'fn{i % 20}', now + i * 0.001, now + i * 0.001, parallel=True, call_key=i)
+            return (time.perf_counter() - started) / n
+
+        first = timed(2000)
+        later = timed(2000)
+        assert later < first * 3
+        assert later < 0.001
@@ -0,0 +1,144 @@
+"""
+Unit tests for segmented audit log storage
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.security.audit import AuditLogger
+from app.security.audit_segments import AuditSegmentStore, ACTIVE_SEGMENT
+
+KEY = b"test-audit-key"
+
+
+def _entry(store, minutes_ago, operation, severity="INFO"):
+    entry = {
+        "timestamp": (datetime.utcnow() - timedelta(minutes=minutes_ago)).isoformat(),
+        "event_type": "key_operation",
+        "operation": operation,
+        "severity": severity,
+        "details": {"pad": "x" * 200}
+    }
+    entry["_signature"] = store.sign_entry(entry)
+    return entry
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AuditSegmentStore(tmp_path, signing_key=KEY, max_segment_size=2048, max_segments=100)
+
+
+def _fill(store, count=40):
+    # Oldest first; one entry per simulated minute
+    for i in range(count):
+        operation = "api_key_retrieved" if i % 4 == 0 else "data_encrypted"
+        store.append([_entry(store, count - i, operation)])
+
+
+class TestSegmentStore:
+    """Test sealing, querying and verification of audit segments"""
+
+    def test_segments_are_sealed_with_footers_and_indexes(self, store, tmp_path):
+        _fill(store)
+
+        sealed = store.sealed_indexes()
+        assert len(sealed) > 3
+        assert (tmp_path / "audit-000001.idx").exists()
+        last_line = (tmp_path / "audit-000001.log").read_text().splitlines()[-1]
+        assert "_footer" in json.loads(last_line)
+        assert sealed[1].prev_chain_head == sealed[0].chain_head
+        total = sum(i.entry_count for i in sealed) + store.active_index().entry_count
+        assert total == 40
+
+    def test_verification_is_incremental(self, store):
+        _fill(store)
+
+        first = store.verify()
+        assert first["verified"], first["errors"]
+        assert first["total_entries"] == 40
+        assert first["segments_skipped"] == 0
+
+        store.append([_entry(store, 0, "data_encrypted")])
+        second = store.verify()
+        assert second["verified"]
+        assert second["segments_verified"] <= 1
+        assert second["segments_skipped"] >= len(store.sealed_indexes()) - 1
+        assert second["total_entries"] == 41
+
+    def test_tampered_segment_fails(self, store, tmp_path):
+        _fill(store)
+        path = tmp_path / "audit-000002.log"
+        path.write_text(path.read_text().replace("data_encrypted", "data_encrypteX", 1))
+
+        result = store.verify()
+        assert not result["verified"]
+        assert result["failed_entries"] == 1
+
+    def test_removed_segment_breaks_chain(self, store, tmp_path):
+        _fill(store)
+        (tmp_path / "audit-000002.log").unlink()
+        (tmp_path / "audit-000002.idx").unlink()
+
+        result = store.verify()
+        assert not result["verified"]
+        assert any("Chain does not continue" in e for e in result["errors"])
+
+    def test_pruning_anchors_the_chain(self, tmp_path):
+        store = AuditSegmentStore(tmp_path, signing_key=KEY, max_segment_size=2048, max_segments=2)
+        _fill(store)
+
+        assert len(store.sealed_indexes()) == 2
+        assert store.verify()["verified"]
+
+    def test_query_reads_only_matching_buckets(self, store, monkeypatch):
+        _fill(store)
+        read = []
+        original = store.read_ranges
+
+        def tracking(path, ranges):
+            read.extend(end - start for start, end in ranges)
+            return original(path, ranges)
+
+        monkeypatch.setattr(store, "read_ranges", tracking)
+        since = (datetime.utcnow() - timedelta(minutes=10, seconds=30)).timestamp()
+        events = list(store.query(since=since, operations={"api_key_retrieved"}))
+
+        assert [e["operation"] for e in events] == ["api_key_retrieved"] * 2
+        # Only the buckets holding those two entries are read
+        assert len(read) == 2
+
+    def test_restart_recovers_active_segment(self, store, tmp_path):
+        _fill(store, count=5)
+        head = store.active_index().chain_head
+        store.close()
+        with open(tmp_path / ACTIVE_SEGMENT, "a") as f:
+            f.write('{"torn": ')
+
+        reopened = AuditSegmentStore(tmp_path, signing_key=KEY, max_segment_size=2048, max_segments=100)
+
+        assert reopened.active_index().chain_head == head
+        reopened.append([_entry(reopened, 0, "after_restart")])
+        assert reopened.verify()["verified"]
+
+
+class TestAuditLoggerSegments:
+    """Test AuditLogger on top of the segment store"""
+
+    def test_summary_and_query(self, tmp_path):
+        logger = AuditLogger(log_dir=str(tmp_path), max_log_size=4096)
+        for i in range(30):
+            logger.log_key_operation("api_key_retrieved" if i % 3 == 0 else "key_derived", {"i": i})
+        logger.log_key_operation("failure", {}, severity="ERROR")
+        logger.flush()
+
+        summary = logger.get_audit_summary(hours=1)
+        assert summary["events"]["by_operation"]["api_key_retrieved"] == 10
+        assert summary["events"]["errors"] == 1
+        assert summary["segments_merged"] >= 1
+
+        recent = logger.query_events(since=datetime.utcnow() - timedelta(hours=1),
+                                     operations=["api_key_retrieved"])
+        assert [e["details"]["i"] for e in recent] == list(range(0, 30, 3))
+        assert logger.verify_log_integrity()["verified"]
@@ -0,0 +1,131 @@
+"""
+Unit tests for the group-commit audit writer
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.cli.io.atomic import AuditTrail
+from app.security.audit import AuditLogger
+from app.security.audit_writer import AuditWriteError, GroupCommitWriter, DURABILITY_BUFFERED, DURABILITY_SYNC
+
+
+class RecordingSink:
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.syncs = 0
+        self.delay = delay
+
+    def write_batch(self, entries):
+        time.sleep(self.delay)
+        self.batches.append(list(entries))
+
+    def sync(self):
+        self.syncs += 1
+
+
+class TestGroupCommitWriter:
+    """Test batching, durability and backpressure"""
+
+    def test_entries_are_batched_with_one_sync_per_batch(self):
+        sink = RecordingSink()
+        writer = GroupCommitWriter(sink, max_batch=100, max_delay=0.05)
+        for i in range(250):
+            writer.submit(i)
+        assert writer.flush(timeout=5)
+        writer.close()
+
+        assert [e for batch in sink.batches for e in batch] == list(range(250))
+        assert len(sink.batches) < 10
+        assert sink.syncs == len(sink.batches)
+
+    def test_buffered_durability_skips_sync(self):
+        sink = RecordingSink()
+        writer = GroupCommitWriter(sink, durability=DURABILITY_BUFFERED)
+        writer.submit("a")
+        writer.close()
+
+        assert sink.batches == [["a"]]
+        assert sink.syncs == 0
+
+    def test_sync_durability_waits_and_shares_commits(self):
+        sink = RecordingSink(delay=0.01)
+        writer = GroupCommitWriter(sink, max_delay=0.0, durability=DURABILITY_SYNC)
+
+        def produce(n):
+            for i in range(10):
+                writer.submit((n, i))
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every submit returned only after its batch was committed
+        assert writer.stats["entries"] == 80
+        assert writer.stats["batches"] < 80
+        writer.close()
+
+    def test_full_queue_applies_backpressure(self):
+        sink = RecordingSink(delay=0.02)
+        writer = GroupCommitWriter(sink, max_batch=2, max_delay=0.0, max_queue=2)
+        for i in range(12):
+            writer.submit(i)
+        writer.close()
+
+        assert writer.stats["blocked"] > 0
+        assert [e for batch in sink.batches for e in batch] == list(range(12))
+
+    def test_sink_errors_are_reported_not_committed(self):
+        class FlakySink(RecordingSink):
+            def write_batch(self, entries):
+                if "bad" in entries:
+                    raise OSError("disk full")
+                super().write_batch(entries)
+
+        writer = GroupCommitWriter(FlakySink(), max_delay=0.0)
+        with pytest.raises(AuditWriteError):
+            writer.submit("bad", wait=True, timeout=2)
+        assert writer.submit("good", wait=True, timeout=2)
+        with pytest.raises(AuditWriteError):
+            writer.flush(timeout=2)
+        assert writer.flush(timeout=2)
+
+        assert writer.stats["errors"] == 1
+        assert writer.stats["lost"] == 1
+        assert writer.stats["entries"] == 1
+        writer.close()
+
+
+class TestAuditConsumers:
+    """Test AuditTrail and AuditLogger on the shared writer"""
+
+    def test_audit_trail_shares_one_writer_per_file(self, tmp_path):
+        audit_file = tmp_path / "audit.jsonl"
+        first, second = AuditTrail(audit_file), AuditTrail(audit_file)
+        assert first._writer is second._writer
+
+        # No running event loop is needed any more
+        for i in range(50):
+            first.log_operation("write", tmp_path / f"f{i}", status="completed")
+        second.log_operation("move", tmp_path / "x", status="started")
+        assert second.flush(timeout=5)
+
+        lines = [json.loads(line) for line in audit_file.read_text().splitlines()]
+        assert len(lines) == 51
+        assert first._writer.stats["batches"] < 51
+
+    def test_audit_logger_signs_batched_entries(self, tmp_path):
+        logger = AuditLogger(log_dir=str(tmp_path))
+        for i in range(100):
+            logger.log_key_operation("key_derived", {"i": i})
+        logger.flush()
+
+        assert logger.writer.stats["batches"] < 101
+        result = logger.verify_log_integrity()
+        assert result["verified"]
+        assert result["total_entries"] == 101
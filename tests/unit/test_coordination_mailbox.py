@@ -0,0 +1,70 @@
+"""
+Unit tests for CoordinationMCP priority mailboxes
+"""
+
+import dataclasses
+
+import pytest
+
+from mcp.coordination_mcp import CoordinationMCP, MessageType
+
+
+@pytest.fixture
+def coord(tmp_path):
+    return CoordinationMCP({"state_file": str(tmp_path / "coord.json")})
+
+
+class TestMailboxes:
+    """Test priority ordering, acknowledgements and shared broadcasts"""
+
+    @pytest.mark.asyncio
+    async def test_priority_then_send_order(self, coord):
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "low-1")
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "high", priority=5)
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "low-2")
+
+        first = await coord.get_messages("b", limit=2)
+        rest = await coord.get_messages("b")
+
+        assert [m.content for m in first] == ["high", "low-1"]
+        assert [m.content for m in rest] == ["low-2"]
+        assert await coord.get_messages("b") == []
+
+    @pytest.mark.asyncio
+    async def test_type_filter_leaves_other_messages_queued(self, coord):
+        await coord.send_message("a", "b", MessageType.STATUS_UPDATE, "status")
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "task")
+
+        tasks = await coord.get_messages("b", message_type=MessageType.TASK_REQUEST)
+        remaining = await coord.get_messages("b")
+
+        assert [m.content for m in tasks] == ["task"]
+        assert [m.content for m in remaining] == ["status"]
+
+    @pytest.mark.asyncio
+    async def test_unacked_messages_can_be_requeued(self, coord):
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "one")
+        await coord.send_message("a", "b", MessageType.TASK_REQUEST, "two")
+
+        pulled = await coord.get_messages("b", auto_ack=False)
+        assert await coord.get_messages("b") == []
+        assert await coord.ack_messages("b", [pulled[0].message_id]) == 1
+        assert await coord.requeue_unacked("b") == 1
+
+        redelivered = await coord.get_messages("b")
+        assert [m.content for m in redelivered] == ["two"]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_immutable_message(self, coord):
+        for agent_id in ("x", "y", "z"):
+            await coord.register_agent(agent_id, "worker")
+        for agent_id in ("x", "y", "z"):
+            await coord.get_messages(agent_id, limit=100)
+
+        await coord.broadcast_message("x", MessageType.BROADCAST, {"note": "hi"})
+
+        received = [(await coord.get_messages(a))[0] for a in ("y", "z")]
+        assert received[0] is received[1]
+        assert await coord.get_messages("x") == []
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            received[0].priority = 10
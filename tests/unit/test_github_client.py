@@ -0,0 +1,286 @@
+"""
+Unit tests for batched GraphQL and ETag-cached GitHub access, against a local fake GitHub server
+"""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+
+from mcp.github_client import GitHubAPIError, GitHubClient, GitHubRateLimitError, RateLimitScheduler
+from mcp.github_mcp import GitHubMCP
+
+FIELD_LINE = re.compile(r'^\s*(f\d+): (.*)$')
+REPO_ARGS = re.compile(r'repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+ISSUE_COUNT = 150
+
+
+def _repo(owner, name):
+    return {'name': name, 'nameWithOwner': f"{owner}/{name}", 'description': f"{name} repo",
+            'isPrivate': False, 'url': f"https://github.com/{owner}/{name}", 'sshUrl': None,
+            'createdAt': None, 'updatedAt': None, 'owner': {'login': owner},
+            'defaultBranchRef': {'name': 'main'}}
+
+
+def _issue(number):
+    return {'number': number, 'title': f"Issue {number}", 'state': 'OPEN', 'body': '',
+            'labels': {'nodes': [{'name': 'bug'}]}, 'assignees': {'nodes': []}}
+
+
+def _page(field, make):
+    offset = int(re.search(r'after: "(\d+)"', field).group(1)) if 'after:' in field else 0
+    first = int(re.search(r'first: (\d+)', field).group(1))
+    end = min(offset + first, ISSUE_COUNT)
+    return {'nodes': [make(n) for n in range(offset + 1, end + 1)],
+            'pageInfo': {'hasNextPage': end < ISSUE_COUNT, 'endCursor': str(end)}}
+
+
+def _resolve(alias, field, errors):
+    if field.startswith('viewer'):
+        return {'repositories': {'nodes': [_repo('me', 'one'), _repo('me', 'two')],
+                                 'pageInfo': {'hasNextPage': False, 'endCursor': None}}}
+    owner, name = REPO_ARGS.match(field).groups()
+    if name == 'missing':
+        errors.append({'path': [alias], 'message': f"Could not resolve to a Repository {owner}/{name}"})
+        return None
+    if 'issues(' in field:
+        return {'issues': _page(field, _issue)}
+    if 'issue(' in field:
+        return {'issue': _issue(int(re.search(r'issue\(number: (\d+)', field).group(1)))}
+    if 'pullRequests(' in field:
+        return {'pullRequests': {'nodes': [{'number': 7, 'title': 'PR', 'state': 'OPEN', 'body': '',
+                                            'baseRefName': 'main', 'headRefName': 'feature',
+                                            'isDraft': False, 'mergeable': 'MERGEABLE'}],
+                                 'pageInfo': {'hasNextPage': False, 'endCursor': None}}}
+    return _repo(owner, name)
+
+
+@asynccontextmanager
+async def fake_github():
+    """Serve a minimal GitHub REST and GraphQL API on localhost"""
+    state = {'graphql': [], 'rest': [], 'throttled': 0}
+
+    async def graphql(request):
+        query = (await request.json())['query']
+        state['graphql'].append(query)
+        data, errors = {}, []
+        for line in query.splitlines():
+            match = FIELD_LINE.match(line)
+            if match:
+                data[match.group(1)] = _resolve(match.group(1), match.group(2), errors)
+        if 'rateLimit' in query:
+            data['rateLimit'] = {'limit': 5000, 'remaining': 4990, 'resetAt': '2030-01-01T00:00:00Z', 'cost': 1}
+        body = {'data': data}
+        if errors:
+            body['errors'] = errors
+        return web.json_response(body)
+
+    async def user(request):
+        state['rest'].append(request.headers.get('If-None-Match'))
+        headers = {'ETag': '"v1"', 'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': '1900000000',
+                   'X-RateLimit-Resource': 'core'}
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers=headers)
+        return web.json_response({'login': 'me'}, headers=headers)
+
+    async def throttled(request):
+        state['throttled'] += 1
+        if state['throttled'] == 1:
+            return web.json_response({'message': 'secondary rate limit'}, status=429,
+                                     headers={'Retry-After': '0'})
+        return web.json_response({'ok': True})
+
+    async def slow(request):
+        await asyncio.sleep(1.0)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post('/graphql', graphql)
+    app.router.add_get('/user', user)
+    app.router.add_get('/throttled', throttled)
+    app.router.add_get('/slow', slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}", state
+    finally:
+        await runner.cleanup()
+
+
+def _no_gh(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("gh subprocess should not be used")
+    monkeypatch.setattr(GitHubMCP, "_run_command", fail)
+
+
+class TestBatchedReads:
+    """Test concurrent reads are combined into GraphQL queries"""
+
+    @pytest.mark.asyncio
+    async def test_repository_heavy_phase_makes_one_request(self, tmp_path, monkeypatch):
+        _no_gh(monkeypatch)
+        async with fake_github() as (url, state):
+            github = GitHubMCP({'token': 't', 'api_url': url, 'state_file': tmp_path / 'state.json'})
+            names = [f"org/repo{i}" for i in range(20)]
+            repos, issues, prs, issue = await asyncio.gather(
+                github.repo_view_many(names),
+                github.issue_list(repo="org/app", limit=10),
+                github.pr_list(repo="org/app"),
+                github.issue_view(3, repo="org/app")
+            )
+            stats = github.get_api_stats()
+            await github.close()
+
+        assert len(state['graphql']) == 1
+        assert [r.full_name for r in repos] == names
+        assert repos[0].owner == 'org' and repos[0].default_branch == 'main'
+        assert [i.number for i in issues] == list(range(1, 11))
+        assert issues[0].labels == ['bug']
+        assert prs[0].head_branch == 'feature' and prs[0].mergeable is True
+        assert issue.title == "Issue 3"
+        assert stats['http_requests'] == 1
+        assert stats['batched_fields'] == 23
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_an_alias(self):
+        async with fake_github() as (url, state):
+            async with GitHubClient(token='t', base_url=url) as client:
+                results = await asyncio.gather(*(client.repository("org/same") for _ in range(5)))
+                stats = client.get_stats()
+
+        assert all(r['nameWithOwner'] == "org/same" for r in results)
+        assert state['graphql'][0].count("repository(") == 1
+        assert stats['coalesced_fields'] == 4
+        assert stats['rate_limits']['graphql']['remaining'] == 4990
+
+    @pytest.mark.asyncio
+    async def test_field_error_fails_only_that_read(self):
+        async with fake_github() as (url, state):
+            async with GitHubClient(token='t', base_url=url) as client:
+                found, missing = await client.repositories(["org/app", "org/missing"])
+
+        assert found['name'] == 'app'
+        assert missing is None
+        assert len(state['graphql']) == 1
+
+    @pytest.mark.asyncio
+    async def test_large_lists_are_paginated(self):
+        async with fake_github() as (url, state):
+            async with GitHubClient(token='t', base_url=url) as client:
+                issues = await client.issues("org/app", limit=ISSUE_COUNT)
+
+        assert [i['number'] for i in issues] == list(range(1, ISSUE_COUNT + 1))
+        assert len(state['graphql']) == 2
+
+
+class TestConditionalRequests:
+    """Test ETag revalidation and the persisted response cache"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_response_is_served_from_cache(self, tmp_path, monkeypatch):
+        _no_gh(monkeypatch)
+        cache_file = tmp_path / "cache.json"
+        async with fake_github() as (url, state):
+            github = GitHubMCP({'token': 't', 'api_url': url, 'api_cache_file': cache_file})
+            assert await github.get_current_user() == {'login': 'me'}
+            assert await github.get_current_user() == {'login': 'me'}
+            assert github.get_api_stats()['not_modified'] == 1
+            await github.close()
+
+            # A new process revalidates with the persisted ETag
+            async with GitHubClient(token='t', base_url=url, cache_file=cache_file) as client:
+                assert await client.viewer() == {'login': 'me'}
+                assert client.stats['not_modified'] == 1
+                assert client.scheduler.limits['core']['remaining'] == 4000
+
+        assert state['rest'] == [None, '"v1"', '"v1"']
+
+    @pytest.mark.asyncio
+    async def test_secondary_rate_limit_is_retried(self):
+        async with fake_github() as (url, state):
+            async with GitHubClient(token='t', base_url=url) as client:
+                assert await client.get('throttled') == {'ok': True}
+                assert client.stats['retries'] == 1
+
+        assert state['throttled'] == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_reported_as_api_error(self):
+        async with fake_github() as (url, state):
+            async with GitHubClient(token='t', base_url=url, timeout=0.05) as client:
+                with pytest.raises(GitHubAPIError):
+                    await client.get('slow')
+
+
+class TestRateLimitScheduler:
+    """Test requests are held until the rate-limit window resets"""
+
+    @pytest.mark.asyncio
+    async def test_low_budget_waits_for_reset(self):
+        now = [1000.0]
+        slept = []
+
+        async def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        scheduler = RateLimitScheduler(reserve=5, max_wait=60, clock=lambda: now[0], sleep=sleep)
+        scheduler.update('core', remaining=3, reset_at=1030.0)
+        await scheduler.acquire('core')
+        scheduler.release()
+        await scheduler.acquire('graphql')
+        scheduler.release()
+
+        assert slept == [30.0]
+        assert scheduler.stats['waits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_distant_reset_raises(self):
+        scheduler = RateLimitScheduler(max_wait=10, clock=lambda: 0.0)
+        scheduler.update('core', remaining=0, reset_at=3600.0)
+
+        with pytest.raises(GitHubRateLimitError):
+            await scheduler.acquire('core')
+        assert scheduler.delay_for('core') == 3600.0
+
+
+class TestCliFallback:
+    """Test reads still go through gh without an API token"""
+
+    @pytest.mark.asyncio
+    async def test_without_token_uses_gh(self, monkeypatch):
+        monkeypatch.delenv('GH_TOKEN', raising=False)
+        monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+        commands = []
+
+        async def run(self, command, timeout=30, check=True):
+            commands.append(command)
+            return True, '[{"number": 1, "title": "t", "state": "OPEN", "labels": [], "assignees": []}]', ''
+
+        monkeypatch.setattr(GitHubMCP, "_run_command", run)
+        issues = await GitHubMCP().issue_list(repo="org/app")
+
+        assert issues[0].number == 1
+        assert commands[0][:3] == ['gh', 'issue', 'list']
+
+    @pytest.mark.asyncio
+    async def test_writes_use_gh_even_with_token(self, tmp_path, monkeypatch):
+        commands = []
+
+        async def run(self, command, timeout=30, check=True):
+            commands.append(command)
+            return True, '{"id": 1}', ''
+
+        monkeypatch.setattr(GitHubMCP, "_run_command", run)
+        github = GitHubMCP({'token': 't', 'api_url': 'http://127.0.0.1:9', 'allow_destructive': True,
+                            'state_file': tmp_path / 'state.json'})
+        github.authenticated = True
+
+        assert await github.run_api_command('repos/org/app/issues', 'POST', {'title': 'x'}) == {'id': 1}
+        assert commands[0][:5] == ['gh', 'api', 'repos/org/app/issues', '--method', 'POST']
+        assert github.api_client is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for the concurrent, memoized HRM reasoning executor
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp.hrm_mcp import HRM_MCP
+
+QUERY = "Fix the authentication bug in the login system"
+
+
+def _count(node):
+    return 1 + sum(_count(child) for child in node.children)
+
+
+class SlowHRM(HRM_MCP):
+    """Each evaluation takes a fixed time, like a model call would"""
+
+    def __init__(self, config=None, delay=0.05):
+        super().__init__(config)
+        self.delay = delay
+        self.evaluations = 0
+
+    async def _perform_reasoning(self, query, context, level):
+        self.evaluations += 1
+        await asyncio.sleep(self.delay)
+        return await super()._perform_reasoning(query, context, level)
+
+
+class TestReasoningExecutor:
+    """Test concurrency, memoization, beam pruning and tree eviction"""
+
+    @pytest.mark.asyncio
+    async def test_full_tree_is_built_with_shared_evaluations(self):
+        hrm = HRM_MCP()
+        root = await hrm.reason(QUERY, context={'project_type': 'python'})
+
+        assert _count(root) == 1 + 4 + 16 + 48
+        assert len(hrm.reasoning_tree) == _count(root)
+        assert all(child.parent_id == root.node_id for child in root.children)
+        stats = hrm.get_executor_stats()
+        assert stats['memo_hits'] > stats['memo_misses']
+
+        path = await hrm.get_decision_path(root.children[0].children[0].node_id)
+        assert [n.level for n in path] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_deep_request_costs_about_one_evaluation_per_level(self):
+        hrm = SlowHRM(delay=0.05)
+        started = time.perf_counter()
+        root = await hrm.reason(QUERY)
+        elapsed = time.perf_counter() - started
+
+        assert _count(root) == 69
+        # Sequential expansion would take 69 * 0.05s
+        assert elapsed < 0.6
+        assert hrm.evaluations < 69
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_is_served_from_memo(self):
+        hrm = SlowHRM(delay=0.0)
+        await hrm.reason(QUERY)
+        first = hrm.evaluations
+        await hrm.reason(QUERY)
+
+        assert hrm.evaluations == first
+
+    @pytest.mark.asyncio
+    async def test_reworded_query_is_not_answered_with_another_querys_text(self):
+        hrm = HRM_MCP()
+        await hrm.reason("Rename the helper", level=3)
+        node = await hrm.reason("rename the helper.", level=3)
+
+        assert node.decision == "Execute: rename the helper...."
+
+    @pytest.mark.asyncio
+    async def test_beam_limits_expanded_children(self):
+        hrm = HRM_MCP({'beam_width': 2})
+        root = await hrm.reason(QUERY)
+
+        expanded = [child for child in root.children if child.children]
+        assert len(root.children) == 4
+        assert len(expanded) == 2
+        assert sum(child.pruned for child in root.children) == 2
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_branches_are_not_expanded(self):
+        hrm = HRM_MCP({'min_confidence': 0.8})
+        root = await hrm.reason(QUERY)
+
+        # Tactical decisions for these sub-goals score 0.75
+        assert root.children and all(child.pruned for child in root.children)
+
+    @pytest.mark.asyncio
+    async def test_node_budget_caps_tree_size(self):
+        hrm = HRM_MCP({'max_nodes': 10})
+        root = await hrm.reason(QUERY)
+
+        assert _count(root) <= 10
+
+    @pytest.mark.asyncio
+    async def test_old_trees_are_evicted(self):
+        hrm = HRM_MCP({'max_trees': 2})
+        first = await hrm.reason(QUERY)
+        second = await hrm.reason("Create a new workflow")
+        await hrm.explain_reasoning(first.node_id)
+        third = await hrm.reason("Implement caching")
+
+        assert first.node_id in hrm.reasoning_tree
+        assert second.node_id not in hrm.reasoning_tree
+        assert third.node_id in hrm.reasoning_tree
+        assert len(hrm.reasoning_tree) == _count(first) + _count(third)
@@ -0,0 +1,107 @@
+"""
+Unit tests for cached intent analysis and vectorized pattern scoring
+"""
+
+import importlib
+import time
+
+import pytest
+
+import mcp.hrm_mcp
+from mcp.patterns.intelligent_selector import IntelligentPatternSelector, PatternSelectionContext
+
+# mcp.patterns re-exports the selector instance under the module's name
+selector_module = importlib.import_module("mcp.patterns.intelligent_selector")
+
+ALL_MCPS = ['hrm', 'task', 'coordination', 'workflow_state', 'github']
+
+
+def _context(query, **kwargs):
+    return PatternSelectionContext(query=query, available_mcps=kwargs.pop('available_mcps', ALL_MCPS), **kwargs)
+
+
+class TestIntentCache:
+    """Test the selector reuses its HRM engine and intent analyses"""
+
+    @pytest.mark.asyncio
+    async def test_hrm_engine_created_once(self, monkeypatch):
+        created = []
+        original = mcp.hrm_mcp.create_hrm_server
+
+        async def counting(config=None):
+            created.append(config)
+            return await original(config)
+
+        monkeypatch.setattr(mcp.hrm_mcp, "create_hrm_server", counting)
+        selector = IntelligentPatternSelector()
+        await selector.select_pattern(_context("Process files in parallel"))
+        await selector.select_pattern(_context("Reach consensus on a release"))
+
+        assert len(created) == 1
+
+    @pytest.mark.asyncio
+    async def test_normalized_query_hits_cache(self):
+        selector = IntelligentPatternSelector()
+        first = await selector.select_pattern(_context("Process files in parallel"))
+        second = await selector.select_pattern(_context("  process FILES   in parallel "))
+
+        assert second.pattern_id == first.pattern_id
+        stats = selector.get_cache_stats()
+        assert stats['intent_cache_hits'] == 1
+        assert stats['intent_cache_misses'] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self):
+        selector = IntelligentPatternSelector(intent_cache_size=3)
+        for i in range(5):
+            await selector._analyze_intent(_context(f"task {i}"))
+
+        assert selector.get_cache_stats()['intent_cache_entries'] == 3
+
+
+class TestVectorizedScoring:
+    """Test array scoring matches the per-pattern criteria"""
+
+    CONTEXTS = [
+        _context("Process files in parallel"),
+        _context("Coordinate services", performance_requirements={'latency': 'low'}),
+        _context("Build pipeline", performance_requirements={'latency': 'low', 'throughput': 'high'},
+                 docker_constraints={'memory': '512MB', 'cpu': '0.5'}),
+        _context("Iterate until tests pass", available_mcps=['task', 'workflow_state']),
+    ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("index", range(len(CONTEXTS)))
+    async def test_matches_scalar_scoring(self, index, monkeypatch):
+        context = self.CONTEXTS[index]
+        selector = IntelligentPatternSelector()
+        await selector.learn_from_execution('task_pipeline', {'success': True, 'execution_time': 2.0,
+                                                              'expected_time': 1.0})
+        intent = await selector._analyze_intent(context)
+        intent['parallelizable'] = True
+        intent['is_iterative'] = True
+
+        candidates = await selector._filter_candidates(context, intent)
+        vectorized = await selector._score_patterns(candidates, context, intent)
+
+        monkeypatch.setattr(selector_module, "NUMPY_AVAILABLE", False)
+        scalar_candidates = await selector._filter_candidates(context, intent)
+        scalar = await selector._score_patterns(scalar_candidates, context, intent)
+
+        assert [p.pattern_id for p in candidates] == [p.pattern_id for p in scalar_candidates]
+        assert [p.pattern_id for p, _ in vectorized] == [p.pattern_id for p, _ in scalar]
+        assert [s for _, s in vectorized] == pytest.approx([s for _, s in scalar])
+
+    @pytest.mark.asyncio
+    async def test_warm_selection_is_fast(self):
+        selector = IntelligentPatternSelector()
+        context = _context("Process multiple files in parallel and aggregate results")
+        await selector.select_pattern(context)
+
+        runs = 200
+        started = time.perf_counter()
+        for _ in range(runs):
+            await selector.select_pattern(context)
+        per_selection = (time.perf_counter() - started) / runs
+
+        assert per_selection < 0.002
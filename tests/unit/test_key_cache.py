@@ -0,0 +1,195 @@
+"""
+Unit tests for the derived-key cache and envelope encryption
+"""
+
+import base64
+import time
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.security.audit import AuditAggregator
+from app.security.encryption import EncryptionService, ENVELOPE_SCHEME
+from app.security.key_cache import KeyCache, SecureBuffer
+
+
+@pytest.fixture(autouse=True)
+def audit_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAGENT_AUDIT_LOG_DIR", str(tmp_path / "audit"))
+
+
+class TestKeyCache:
+    """Test KeyCache expiry and zeroization"""
+
+    def test_factory_runs_once_until_expiry(self):
+        cache = KeyCache(ttl_seconds=0.05)
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return b"k" * 32
+
+        assert cache.use("a", factory, bytes) == b"k" * 32
+        assert cache.use("a", factory, bytes) == b"k" * 32
+        assert len(calls) == 1
+
+        time.sleep(0.06)
+        cache.use("a", factory, bytes)
+        assert len(calls) == 2
+        assert cache.stats()["hits"] == 1
+
+    def test_invalidate_zeroizes_buffer(self):
+        cache = KeyCache()
+        held = []
+        cache.use("a", lambda: b"\x07" * 16, held.append)
+
+        assert cache.invalidate() == 1
+        assert bytes(held[0]) == b"\x00" * 16
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = KeyCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            cache.use(name, lambda: b"x" * 8, len)
+        assert not cache.contains("a")
+        assert cache.contains("c")
+
+    def test_secure_buffer_zeroize(self):
+        buffer = SecureBuffer(b"secret")
+        buffer.zeroize()
+        assert bytes(buffer.data) == b"\x00" * 6
+
+
+class TestEnvelopeEncryption:
+    """Test EncryptionService derives the master key once per unlock"""
+
+    def test_master_key_derived_once(self, monkeypatch):
+        service = EncryptionService(master_password="envelope-test")
+        derivations = []
+        original = service._derive_master_key
+        monkeypatch.setattr(
+            service, "_derive_master_key",
+            lambda salt, iterations: derivations.append(iterations) or original(salt, iterations)
+        )
+
+        records = [service.encrypt_aes_gcm(f"secret-{i}", "api_key") for i in range(20)]
+        records.append(service.encrypt_fernet("fernet", "api_key"))
+
+        assert service.decrypt_many(records)[-1] == b"fernet"
+        assert service.decrypt_many(records[:3]) == [b"secret-0", b"secret-1", b"secret-2"]
+        assert derivations == [service.kdf_iterations]
+        assert records[0]["scheme"] == ENVELOPE_SCHEME
+        assert records[0]["kdf"] == "PBKDF2"
+        assert len({r["salt"] for r in records}) == len(records)
+
+    def test_other_process_can_decrypt(self):
+        record = EncryptionService(master_password="shared").encrypt_aes_gcm("hello", "cfg")
+        assert EncryptionService(master_password="shared").decrypt_aes_gcm(record) == b"hello"
+
+    def test_legacy_records_still_decrypt(self):
+        service = EncryptionService(master_password="legacy")
+        record = service.encrypt_aes_gcm("old data", "cfg")
+        # Re-encrypt the way records were written before the envelope scheme
+        salt = base64.b64decode(record["salt"])
+        nonce = base64.b64decode(record["nonce"])
+        key = service._derive_key(salt, "cfg")
+        legacy = {
+            "ciphertext": base64.b64encode(AESGCM(key).encrypt(nonce, b"old data", None)).decode(),
+            "salt": record["salt"],
+            "nonce": record["nonce"],
+            "purpose": "cfg",
+            "kdf": "PBKDF2",
+            "iterations": service.kdf_iterations,
+        }
+
+        assert service.decrypt_aes_gcm(legacy) == b"old data"
+
+    def test_lock_and_rotation_drop_data_keys(self):
+        service = EncryptionService(master_password="rotate")
+        record = service.encrypt_aes_gcm("v1 data", "cfg")
+        assert len(service._data_keys) == 1
+
+        service.rotate_key()
+        assert len(service._data_keys) == 0
+        assert service.decrypt_aes_gcm(record) == b"v1 data"
+
+        service.lock()
+        assert len(service._master_keys) == 0
+
+    def test_decrypt_many_without_raising(self):
+        service = EncryptionService(master_password="batch")
+        good = service.encrypt_aes_gcm("ok", "cfg")
+        bad = dict(good, ciphertext=service.encrypt_aes_gcm("other", "cfg")["ciphertext"])
+
+        assert service.decrypt_many([good, bad], raise_on_error=False) == [b"ok", None]
+        with pytest.raises(Exception):
+            service.decrypt_many([bad])
+
+
+class TestAuditAggregator:
+    """Test aggregation of routine audit events"""
+
+    def test_events_are_summarized_per_group(self):
+        logged = []
+
+        class Recorder:
+            def log_key_operation(self, operation, details, **kwargs):
+                logged.append((operation, details))
+
+        aggregator = AuditAggregator(Recorder(), flush_interval=3600)
+        for _ in range(5):
+            aggregator.record("data_decrypted", {"purpose": "a"}, size=10)
+        aggregator.record("data_decrypted", {"purpose": "b"})
+        assert logged == []
+
+        assert aggregator.flush() == 2
+        summary = next(details for _, details in logged if details["purpose"] == "a")
+        assert summary["count"] == 5
+        assert summary["total_bytes"] == 50
+        assert summary["aggregated"] is True
+
+    def test_flush_when_too_many_pending(self):
+        logged = []
+
+        class Recorder:
+            def log_key_operation(self, operation, details, **kwargs):
+                logged.append(details)
+
+        aggregator = AuditAggregator(Recorder(), flush_interval=3600, max_pending=3)
+        for _ in range(3):
+            aggregator.record("key_derived", {"purpose": "x"})
+
+        assert [entry["count"] for entry in logged] == [3]
+        assert aggregator.pending == 0
+
+    def test_pending_events_are_flushed_without_further_events(self):
+        logged = []
+
+        class Recorder:
+            def log_key_operation(self, operation, details, **kwargs):
+                logged.append(details)
+
+        aggregator = AuditAggregator(Recorder(), flush_interval=0.05)
+        aggregator.record("key_derived", {"purpose": "x"})
+
+        deadline = time.monotonic() + 2.0
+        while not logged and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [entry["count"] for entry in logged] == [1]
+        assert aggregator.pending == 0
+
+    def test_close_writes_pending_summaries(self):
+        logged = []
+
+        class Recorder:
+            def log_key_operation(self, operation, details, **kwargs):
+                logged.append(details)
+
+        aggregator = AuditAggregator(Recorder(), flush_interval=3600)
+        aggregator.record("key_derived", {"purpose": "x"})
+        aggregator.record("key_derived", {"purpose": "x"})
+
+        assert aggregator.close() == 1
+        assert [entry["count"] for entry in logged] == [2]
+        aggregator.record("key_derived", {"purpose": "x"})
+        assert len(logged) == 2
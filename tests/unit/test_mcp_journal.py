@@ -0,0 +1,148 @@
+"""
+Unit tests for the journaled MCP state store
+"""
+
+import json
+
+import pytest
+
+from mcp.journal import JournalStore
+from mcp.task_mcp import TaskMCP
+from mcp.workflow_state_mcp import WorkflowStateMCP
+from mcp.coordination_mcp import CoordinationMCP
+
+
+class TestJournalStore:
+    """Test JournalStore write-ahead log and snapshots"""
+
+    def test_append_flush_and_load(self, tmp_path):
+        store = JournalStore(tmp_path / "state.json", fsync=False)
+        store.append("set", {"key": "a"})
+        store.append("set", {"key": "b"})
+
+        reopened = JournalStore(tmp_path / "state.json")
+        loaded = reopened.load()
+
+        assert loaded["snapshot"] is None
+        assert [r["data"]["key"] for r in loaded["records"]] == ["a", "b"]
+
+    def test_snapshot_truncates_log(self, tmp_path):
+        store = JournalStore(tmp_path / "state.json", snapshot_interval=2, fsync=False)
+        store.append("set", {"key": "a"})
+        store.append("set", {"key": "b"})
+        assert store.needs_snapshot()
+
+        assert store.checkpoint(lambda: {"keys": ["a", "b"]})
+        assert store.wal_file.read_text() == ""
+
+        store.append("set", {"key": "c"})
+        loaded = JournalStore(tmp_path / "state.json").load()
+        assert loaded["snapshot"]["keys"] == ["a", "b"]
+        assert [r["data"]["key"] for r in loaded["records"]] == ["c"]
+
+    def test_records_covered_by_snapshot_are_skipped(self, tmp_path):
+        store = JournalStore(tmp_path / "state.json", fsync=False)
+        store.append("set", {"key": "a"})
+        store.flush()
+        stale_log = store.wal_file.read_text()
+        store.write_snapshot({"keys": ["a"]})
+
+        # Simulate a crash between snapshot rename and log truncation
+        store.wal_file.write_text(stale_log)
+        assert JournalStore(tmp_path / "state.json").load()["records"] == []
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        store = JournalStore(tmp_path / "state.json", fsync=False)
+        store.append("set", {"key": "a"})
+        with open(store.wal_file, "a") as f:
+            f.write('{"seq": 2, "op": "se')
+
+        loaded = JournalStore(tmp_path / "state.json").load()
+        assert [r["data"]["key"] for r in loaded["records"]] == ["a"]
+
+
+class TestServerReplay:
+    """Test that MCP servers recover state from the journal"""
+
+    @pytest.mark.asyncio
+    async def test_task_mcp_replays_unsnapshotted_changes(self, tmp_path):
+        config = {"state_file": str(tmp_path / "tasks.json"), "journal_fsync": False}
+        server = TaskMCP(config)
+        await server.initialize()
+        parent = await server.create_task("Parent", priority="high")
+        child = await server.create_subtask(parent.task_id, "Child")
+        await server.update_task(parent.task_id, status="completed")
+        await server.save_state()
+        await server.create_task("After snapshot")
+        server.journal.flush()
+
+        restored = TaskMCP(config)
+        await restored.initialize()
+
+        assert len(restored.tasks) == 3
+        assert restored.tasks[parent.task_id].status == "completed"
+        assert restored.tasks[parent.task_id].completed_at is not None
+        assert restored.tasks[parent.task_id].subtasks == [child.task_id]
+        assert restored.tasks[child.task_id].dependencies == [parent.task_id]
+
+    @pytest.mark.asyncio
+    async def test_workflow_state_replays_phases_and_evidence(self, tmp_path):
+        config = {"state_file": str(tmp_path / "workflow.json"), "journal_fsync": False}
+        server = WorkflowStateMCP(config)
+        await server.initialize()
+        execution = await server.create_execution("Journal test")
+        await server.start_phase(execution.execution_id, "1_research_discovery")
+        await server.complete_phase(
+            execution.execution_id,
+            "1_research_discovery",
+            evidence=[{"type": "research_results", "data": "done"}]
+        )
+        await server.start_phase(execution.execution_id, "2_strategic_planning")
+        await server.add_evidence(
+            execution.execution_id, "2_strategic_planning", "note", {"found": True}
+        )
+        server.journal.flush()
+
+        restored = WorkflowStateMCP(config)
+        await restored.initialize()
+
+        replayed = restored.executions[execution.execution_id]
+        assert restored.active_execution == execution.execution_id
+        assert replayed.to_dict() == execution.to_dict()
+        assert replayed.current_phase == "2_strategic_planning"
+        assert replayed.phase_results[0].status == "completed"
+        assert replayed.phase_results[0].evidence[0]["data"] == "done"
+        assert replayed.phase_results[1].evidence[0]["data"] == {"found": True}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_execution_replays(self, tmp_path):
+        config = {"state_file": str(tmp_path / "workflow.json"), "journal_fsync": False}
+        server = WorkflowStateMCP(config)
+        await server.initialize()
+        execution = await server.create_execution("Cancel test")
+        await server.start_phase(execution.execution_id, "1_research_discovery")
+        assert await server.cancel_execution(execution.execution_id)
+        server.journal.flush()
+
+        restored = WorkflowStateMCP(config)
+        await restored.initialize()
+
+        replayed = restored.executions[execution.execution_id]
+        assert replayed.to_dict() == execution.to_dict()
+        assert replayed.status == "cancelled"
+        assert replayed.phase_results[0].status == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_coordination_scratch_survives_restart(self, tmp_path):
+        config = {"state_file": str(tmp_path / "coord.json"), "journal_fsync": False}
+        server = CoordinationMCP(config)
+        await server.initialize()
+        await server.set_scratch_data("plan", {"phase": 4})
+        await server.save_state()
+
+        restored = CoordinationMCP(config)
+        await restored.initialize()
+
+        assert await restored.get_scratch_data("plan") == {"phase": 4}
+        snapshot = json.loads((tmp_path / "coord.json").read_text())
+        assert snapshot["scratch"] == {"plan": {"phase": 4}}